@@ -1,16 +1,20 @@
 import logging
-from typing import Optional
+from typing import AsyncIterator, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
 
 from embedding_studio.api.api_v1.schemas.clickstream_client import (
+    BulkSessionEvent,
     SessionAddEventsRequest,
     SessionCreateRequest,
+    SessionEventsBulkResponse,
     SessionGetResponse,
     SessionMarkIrrelevantRequest,
 )
 from embedding_studio.context.app_context import context
 from embedding_studio.core.config import settings
+from embedding_studio.data_access.events_buffer import SessionEventsBuffer
 from embedding_studio.models.clickstream.session_events import SessionEvent
 from embedding_studio.models.clickstream.sessions import (
     Session,
@@ -22,6 +26,14 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Events pushed by requests, written by batches in the background
+events_buffer = SessionEventsBuffer(
+    push=context.clickstream_dao.push_events,
+    max_batch_size=settings.CLICKSTREAM_EVENTS_BATCH_SIZE,
+    flush_interval=settings.CLICKSTREAM_EVENTS_FLUSH_INTERVAL_SEC,
+    max_pending=settings.CLICKSTREAM_EVENTS_MAX_PENDING,
+)
+
 
 @router.post(
     "/session",
@@ -78,23 +90,80 @@ def push_events(body: SessionAddEventsRequest) -> None:
 
     Processes and normalizes timestamps for each event before storing them
     in the clickstream data store. Captures user interactions such as clicks,
-    allowing for analysis of user behavior.
+    allowing for analysis of user behavior. Events are buffered and written
+    by batches, a retried event with the same event_id is stored once.
     """
-    logger.debug(f"Push session events: body")
+    logger.debug(f"Push session events: session_id={body.session_id}")
     session_id = body.session_id
+    now = datetime_utils.utc_timestamp()
+    # Events are already validated by the request model
     events = [
-        SessionEvent.model_validate(
-            dict(
-                session_id=session_id,
-                created_at=_ensure_timestamp(event.created_at),
-                **event.model_dump(
-                    exclude={"created_at"},
-                ),
+        SessionEvent.model_construct(
+            session_id=session_id,
+            created_at=_ensure_timestamp(event.created_at, now),
+            **event.model_dump(
+                exclude={"created_at"},
             ),
         )
         for event in body.events
     ]
-    context.clickstream_dao.push_events(events)
+    if settings.CLICKSTREAM_EVENTS_FLUSH_INTERVAL_SEC > 0:
+        events_buffer.add(events)
+    else:
+        context.clickstream_dao.push_events(events)
+
+
+@router.post(
+    "/session/events/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=SessionEventsBulkResponse,
+)
+async def push_events_bulk(request: Request) -> SessionEventsBulkResponse:
+    """
+    Adds user interaction events of many sessions from an NDJSON body.
+
+    Each line is a JSON object with a session_id and event fields. The body
+    is streamed and written by unordered batches, events already stored are
+    skipped, so logs can be replayed safely. Replayed events keep their
+    timestamps, only timestamps in the future are rejected.
+    """
+    logger.debug("Push session events in bulk")
+    response = SessionEventsBulkResponse()
+    now = datetime_utils.utc_timestamp()
+    batch: List[SessionEvent] = []
+    max_line_length = settings.CLICKSTREAM_BULK_MAX_LINE_BYTES
+    async for line_number, line in _iter_lines(request, max_line_length):
+        if line is not None and not line.strip():
+            continue
+
+        try:
+            if line is None:
+                raise ValueError(
+                    f"Line is longer than {max_line_length} bytes"
+                )
+            batch.append(_parse_bulk_event(line, now))
+        except ValueError as e:
+            response.rejected += 1
+            if (
+                len(response.errors)
+                < settings.CLICKSTREAM_BULK_MAX_REPORTED_ERRORS
+            ):
+                response.errors.append(f"Line {line_number}: {e}")
+            continue
+
+        response.accepted += 1
+        if len(batch) >= settings.CLICKSTREAM_EVENTS_BATCH_SIZE:
+            await run_in_threadpool(context.clickstream_dao.push_events, batch)
+            batch = []
+
+    if batch:
+        await run_in_threadpool(context.clickstream_dao.push_events, batch)
+
+    logger.debug(
+        f"Bulk events pushed: accepted={response.accepted}, "
+        f"rejected={response.rejected}"
+    )
+    return response
 
 
 @router.post(
@@ -120,13 +189,18 @@ def mark_session_irrelevant(body: SessionMarkIrrelevantRequest) -> None:
     logger.debug(f"Irrelevant session marked: {session}")
 
 
-def _ensure_timestamp(request_timestamp: Optional[int]) -> int:
+def _ensure_timestamp(
+    request_timestamp: Optional[int], now: Optional[int] = None
+) -> int:
+    if now is None:
+        now = datetime_utils.utc_timestamp()
     if request_timestamp is None:
-        return datetime_utils.utc_timestamp()
+        return now
     timestamp_ok = datetime_utils.check_utc_timestamp(
         request_timestamp,
         delta_minus_sec=settings.CLICKSTREAM_TIME_MAX_DELTA_MINUS_SEC,
         delta_plus_sec=settings.CLICKSTREAM_TIME_MAX_DELTA_PLUS_SEC,
+        current_timestamp=now,
     )
     if not timestamp_ok:
         raise HTTPException(
@@ -134,3 +208,60 @@ def _ensure_timestamp(request_timestamp: Optional[int]) -> int:
             detail=f"Invalid utc timestamp: {request_timestamp}",
         )
     return request_timestamp
+
+
+async def _iter_lines(
+    request: Request, max_length: int
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Stream lines of a request body with their numbers.
+
+    Lines longer than `max_length` bytes aren't kept in memory, they're
+    yielded as None.
+
+    :param request: Request with an NDJSON body
+    :param max_length: Max length of a line in bytes
+    :return: Async iterator of (line number, line or None)
+    """
+    line_number = 0
+    rest = b""
+    too_long = False
+    async for chunk in request.stream():
+        lines = chunk.split(b"\n")
+        for line in lines[:-1]:
+            line_number += 1
+            if too_long or len(rest) + len(line) > max_length:
+                yield line_number, None
+            else:
+                yield line_number, rest + line
+            rest, too_long = b"", False
+
+        if not too_long:
+            rest += lines[-1]
+            if len(rest) > max_length:
+                rest, too_long = b"", True
+
+    if rest or too_long:
+        yield line_number + 1, None if too_long else rest
+
+
+def _parse_bulk_event(line: bytes, now: int) -> SessionEvent:
+    """
+    Parse a line of an NDJSON bulk upload.
+
+    :param line: JSON object with a session_id and event fields
+    :param now: Current utc timestamp
+    :return: Session event
+    :raises ValueError: If the line is invalid
+    """
+    event = BulkSessionEvent.model_validate_json(line)
+    if event.created_at is None:
+        event.created_at = now
+    elif not datetime_utils.check_utc_timestamp(
+        event.created_at,
+        delta_plus_sec=settings.CLICKSTREAM_TIME_MAX_DELTA_PLUS_SEC,
+        current_timestamp=now,
+    ):
+        raise ValueError(f"Invalid utc timestamp: {event.created_at}")
+
+    return SessionEvent.model_construct(**event.model_dump())
@@ -11,6 +11,7 @@ from embedding_studio.api.api_v1.schemas.similarity_search import SearchResult
 from embedding_studio.context.app_context import context
 from embedding_studio.core.config import settings
 from embedding_studio.models.embeddings.objects import SearchResults
+from embedding_studio.vectordb.memory_index import InMemoryIndexHolder
 
 # Initialize logger for this module
 logger = logging.getLogger(__name__)
@@ -18,6 +19,9 @@ logger = logging.getLogger(__name__)
 # Initialize FastAPI router for handling API endpoints
 router = APIRouter()
 
+# In-memory index of the blue categories collection
+categories_index = InMemoryIndexHolder()
+
 
 def _get_similar_categories(search_query: Any) -> List[SearchResults]:
     # Retrieve the collection where embeddings are stored
@@ -52,15 +56,33 @@ def _get_similar_categories(search_query: Any) -> List[SearchResults]:
         query_vector = inference_client.forward_query(search_query)[0]
         logger.debug("Searching for similar categories.")
 
-        # Search for similar objects in the collection
-        found_objects, _ = collection.find_similar_objects(
-            query_vector=query_vector.tolist(),
-            offset=0,
-            limit=plugin.get_max_similar_categories(),
-            max_distance=plugin.get_max_margin(),
-            with_vectors=categories_selector.vectors_are_needed,
-            meta_info=settings.QUERY_PARSING_DB_META_INFO,
-        )
+        memory_index = None
+        if settings.QUERY_PARSING_IN_MEMORY_INDEX:
+            try:
+                memory_index = categories_index.get(collection)
+            except Exception:
+                logger.exception(
+                    "Failed to get in-memory index of categories."
+                )
+
+        if memory_index is not None:
+            # Exact search of the collection kept in memory
+            found_objects = memory_index.find_similar_objects(
+                query_vector=query_vector.tolist(),
+                limit=plugin.get_max_similar_categories(),
+                max_distance=plugin.get_max_margin(),
+                with_vectors=categories_selector.vectors_are_needed,
+            )
+        else:
+            # Search for similar objects in the collection
+            found_objects, _ = collection.find_similar_objects(
+                query_vector=query_vector.tolist(),
+                offset=0,
+                limit=plugin.get_max_similar_categories(),
+                max_distance=plugin.get_max_margin(),
+                with_vectors=categories_selector.vectors_are_needed,
+                meta_info=settings.QUERY_PARSING_DB_META_INFO,
+            )
         logger.debug(f"Found {len(found_objects)} similar categories.")
 
     except Exception:
@@ -76,12 +98,13 @@ def _get_similar_categories(search_query: Any) -> List[SearchResults]:
     if len(found_objects) == 0:
         return []
 
-    final_indexes = categories_selector.select(found_objects, query_vector)
+    final_indexes = categories_selector.select(
+        found_objects, query_vector.tolist()
+    )
     results = []
     for index in final_indexes:
         results.append(found_objects[index])
 
-    print(results)
     return results
 
 
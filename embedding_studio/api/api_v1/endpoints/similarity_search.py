@@ -1,6 +1,6 @@
 import logging
 import uuid
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Union
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException, status
 
@@ -17,6 +17,7 @@ from embedding_studio.models.clickstream.sessions import (
     SearchResultItem,
     Session,
 )
+from embedding_studio.models.embeddings.counts import CountResult
 from embedding_studio.models.embeddings.objects import (
     Object,
     ObjectPart,
@@ -61,7 +62,17 @@ def _find_by_payload_fiter(body: SimilaritySearchRequest) -> SearchResults:
     return search_results
 
 
-def _count_by_payload_filter(body: PayloadCountRequest) -> int:
+def _count_by_payload_filter(
+    body: Union[PayloadCountRequest, SimilaritySearchRequest],
+) -> CountResult:
+    """
+    Count objects matching the payload filter of a request with its count
+    strategy.
+
+    :param body: Request body containing the filter and the count strategy.
+    :return: Count of matching objects and whether it's approximate.
+    :raises HTTPException: If the collection is not initialized.
+    """
     # Retrieve the collection where embeddings are stored
     collection = context.vectordb.get_blue_collection()
 
@@ -71,13 +82,14 @@ def _count_by_payload_filter(body: PayloadCountRequest) -> int:
             detail="Model is not initialized yet.",
         )
 
-    total_count = collection.count_by_payload_filter(
+    count_result = collection.estimate_count_by_payload_filter(
         payload_filter=PayloadFilter.model_validate(body.filter.model_dump())
         if body.filter
         else None,
+        count_strategy=body.count_strategy,
     )
 
-    return total_count
+    return count_result
 
 
 def _find_similars(
@@ -196,6 +208,27 @@ def _find_similars(
         )
 
 
+def _total_count_fields(
+    body: SimilaritySearchRequest, search_results: SearchResults
+) -> Dict[str, Any]:
+    """
+    Get total count fields of a search response.
+
+    :param body: Request body containing the requested count strategy.
+    :param search_results: Results of the search.
+    :return: Keyword arguments for SimilaritySearchResponse.
+    """
+    if body.count_strategy is None:
+        return dict(total_count=search_results.total_count)
+
+    count_result = _count_by_payload_filter(body)
+    return dict(
+        total_count=count_result.total_count,
+        is_approximate_count=count_result.is_approximate,
+        total_count_error_bound=count_result.error_bound,
+    )
+
+
 def _create_session_object(
     body: SimilaritySearchRequest,
     session_id: str,
@@ -333,6 +366,7 @@ def similarity_search(
         ],
         next_page_offset=search_results.next_offset,
         meta_info=search_results.meta_info,
+        **_total_count_fields(body, search_results),
     )
 
 
@@ -387,7 +421,7 @@ def payload_search(body: PayloadSearchRequest) -> Any:
             for found_object in search_results.found_objects
         ],
         next_page_offset=search_results.next_offset,
-        total_count=search_results.total_count,
+        **_total_count_fields(body, search_results),
     )
 
 
@@ -406,6 +440,10 @@ def count_payload(body: PayloadCountRequest) -> Any:
     """
     logger.debug(f"POST /embeddings/payload-count: {body}")
 
-    total_count = _count_by_payload_filter(body)
+    count_result = _count_by_payload_filter(body)
 
-    return CountResponse(total_count=total_count)
+    return CountResponse(
+        total_count=count_result.total_count,
+        is_approximate=count_result.is_approximate,
+        error_bound=count_result.error_bound,
+    )
@@ -1,6 +1,11 @@
+from typing import List, Optional
+
 from fastapi import APIRouter, HTTPException, Query, status
 
 from embedding_studio.api.api_v1.schemas.suggesting import (
+    DomainSuggestions,
+    GetBatchSuggestionsRequest,
+    GetBatchSuggestionsResponse,
     GetSuggestionsRequest,
     GetSuggestionsResponse,
     ListPhrasesRequest,
@@ -19,32 +24,21 @@ from embedding_studio.api.api_v1.schemas.suggesting import (
     Suggestion,
 )
 from embedding_studio.context.app_context import context
+from embedding_studio.models.suggesting import (
+    Suggest,
+    SuggestingRequest,
+    SuggestionsCacheStats,
+)
+from embedding_studio.suggesting.suggestions_cache import suggestions_cache
 from embedding_studio.utils.redis_utils import ft_unescape_punctuation
 from embedding_studio.utils.string_utils import combine_chunks
 
 router = APIRouter()
 
 
-# TODO: add LRU-cache
-
-
-@router.post(
-    "/get-top-k",
-    response_model=GetSuggestionsResponse,
-    status_code=status.HTTP_200_OK,
-    response_model_by_alias=False,
-    response_model_exclude_none=True,
-)
-def get_suggestions(body: GetSuggestionsRequest):
-    suggestion_request = (
-        context.suggester.phrases_manager.convert_phrase_to_request(
-            phrase=body.phrase, domain=body.domain
-        )
-    )
-    raw_suggestions = context.suggester.get_topk_suggestions(
-        request=suggestion_request, top_k=body.top_k
-    )
-
+def _convert_suggestions(
+    suggestion_request: SuggestingRequest, raw_suggestions: List[Suggest]
+) -> List[Suggestion]:
     suggestions = []
     for raw_suggestion in raw_suggestions:
         # Build the suggestion body from the suggestion’s chunks.
@@ -115,7 +109,6 @@ def get_suggestions(body: GetSuggestionsRequest):
             )
 
         else:
-
             # Combine all prefix chunks except the last one.
             combined_prefix = combine_chunks(
                 [
@@ -151,7 +144,124 @@ def get_suggestions(body: GetSuggestionsRequest):
                 )
             )
 
-    return GetSuggestionsResponse(suggestions=suggestions)
+    return suggestions
+
+
+def _build_suggestions(
+    phrase: str, domain: Optional[str], top_k: int
+) -> GetSuggestionsResponse:
+    suggestion_request = (
+        context.suggester.phrases_manager.convert_phrase_to_request(
+            phrase=phrase, domain=domain
+        )
+    )
+    raw_suggestions = context.suggester.get_topk_suggestions(
+        request=suggestion_request, top_k=top_k
+    )
+    return GetSuggestionsResponse(
+        suggestions=_convert_suggestions(suggestion_request, raw_suggestions)
+    )
+
+
+@router.post(
+    "/get-top-k",
+    response_model=GetSuggestionsResponse,
+    status_code=status.HTTP_200_OK,
+    response_model_by_alias=False,
+    response_model_exclude_none=True,
+)
+def get_suggestions(body: GetSuggestionsRequest):
+    phrase = body.phrase
+    version = suggestions_cache.get_version(
+        context.suggester.phrases_manager.get_version
+    )
+    if version is None:
+        return _build_suggestions(phrase, body.domain, body.top_k)
+
+    cached = suggestions_cache.get(version, phrase, body.top_k, body.domain)
+    if cached is not None:
+        return GetSuggestionsResponse(**cached)
+
+    response = _build_suggestions(phrase, body.domain, body.top_k)
+    suggestions_cache.put(
+        version, phrase, body.top_k, body.domain, response.model_dump()
+    )
+    return response
+
+
+@router.post(
+    "/get-top-k-batch",
+    response_model=GetBatchSuggestionsResponse,
+    status_code=status.HTTP_200_OK,
+    response_model_by_alias=False,
+    response_model_exclude_none=True,
+)
+def get_batch_suggestions(body: GetBatchSuggestionsRequest):
+    """
+    Return suggestions of the same phrase for several domains at once.
+    The phrase is tokenized once and domains, which aren't cached, are
+    queried in a single round-trip.
+    """
+    phrase = body.phrase
+    version = suggestions_cache.get_version(
+        context.suggester.phrases_manager.get_version
+    )
+
+    responses = dict()
+    if version is not None:
+        for domain in body.domains:
+            cached = suggestions_cache.get(version, phrase, body.top_k, domain)
+            if cached is not None:
+                responses[domain] = GetSuggestionsResponse(**cached)
+
+    missed_domains = [d for d in body.domains if d not in responses]
+    if missed_domains:
+        suggestion_request = (
+            context.suggester.phrases_manager.convert_phrase_to_request(
+                phrase=phrase
+            )
+        )
+        raw_suggestions_by_domains = (
+            context.suggester.get_topk_suggestions_by_domains(
+                request=suggestion_request,
+                domains=missed_domains,
+                top_k=body.top_k,
+            )
+        )
+        for domain, raw_suggestions in zip(
+            missed_domains, raw_suggestions_by_domains
+        ):
+            response = GetSuggestionsResponse(
+                suggestions=_convert_suggestions(
+                    suggestion_request, raw_suggestions
+                )
+            )
+            responses[domain] = response
+            if version is not None:
+                suggestions_cache.put(
+                    version, phrase, body.top_k, domain, response.model_dump()
+                )
+
+    return GetBatchSuggestionsResponse(
+        results=[
+            DomainSuggestions(
+                domain=domain, suggestions=responses[domain].suggestions
+            )
+            for domain in body.domains
+        ]
+    )
+
+
+@router.get(
+    "/cache-stats",
+    response_model=SuggestionsCacheStats,
+    status_code=status.HTTP_200_OK,
+)
+def get_cache_stats():
+    """
+    Return hits and misses of the suggestions cache of this process.
+    """
+    return suggestions_cache.stats()
 
 
 @router.post(
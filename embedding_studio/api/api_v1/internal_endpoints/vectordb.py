@@ -3,6 +3,7 @@ import logging
 from fastapi import APIRouter, HTTPException, status
 
 from embedding_studio.api.api_v1.internal_schemas.vectrordb import (
+    AdvisePayloadIndexesRequest,
     CreateCollectionRequest,
     CreateIndexRequest,
     DeleteCollectionRequest,
@@ -16,8 +17,12 @@ from embedding_studio.api.api_v1.internal_schemas.vectrordb import (
     UpsertObjectsRequest,
 )
 from embedding_studio.context.app_context import context
+from embedding_studio.core.config import settings
 from embedding_studio.utils.plugin_utils import get_vectordb
 from embedding_studio.vectordb.exceptions import CollectionNotFoundError
+from embedding_studio.vectordb.pgvector.index_advisor import (
+    PayloadIndexAdvisorOptimization,
+)
 from embedding_studio.vectordb.vectordb import VectorDb
 
 logger = logging.getLogger(__name__)
@@ -111,6 +116,35 @@ def create_categories_index(body: CreateIndexRequest):
     query_collection.create_index()
 
 
+@router.post(
+    "/collections/advise-payload-indexes",
+    status_code=status.HTTP_200_OK,
+)
+def advise_payload_indexes(body: AdvisePayloadIndexesRequest):
+    """
+    Proposes and optionally creates indexes for frequently used payload fields.
+
+    Payload fields filtered and sorted by searches are recorded per collection.
+    Fields used often enough get indexes matching the generated SQL. In dry run
+    mode only the proposals are returned, so they can be reviewed first.
+    """
+    try:
+        collection = context.vectordb.get_collection(body.embedding_model_id)
+    except CollectionNotFoundError as err:
+        logger.debug(f"Collection not found: {err}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"{err}"
+        )
+
+    advisor = PayloadIndexAdvisorOptimization(
+        min_hits=body.min_hits
+        if body.min_hits is not None
+        else settings.PAYLOAD_INDEX_ADVISOR_MIN_HITS,
+        dry_run=body.dry_run,
+    )
+    return advisor(collection)
+
+
 def _delete_collection(vectordb: VectorDb, collection_id: str):
     try:
         collection = vectordb.get_collection(collection_id)
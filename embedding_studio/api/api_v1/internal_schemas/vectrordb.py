@@ -121,3 +121,15 @@ class FindSimilarObjectsRequest(BaseModel):
     offset: Optional[int] = None
     max_distance: Optional[float] = None
     embedding_model_id: str
+
+
+class AdvisePayloadIndexesRequest(BaseModel):
+    """
+    Request schema for running the payload index advisor on a collection.
+    Indexes are proposed for payload fields frequently used by searches.
+    With dry_run only the proposals are returned, nothing is created.
+    """
+
+    embedding_model_id: str
+    dry_run: bool = True
+    min_hits: Optional[int] = None
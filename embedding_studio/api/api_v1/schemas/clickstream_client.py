@@ -75,6 +75,28 @@ class SessionAddEventsRequest(BaseModel):
     events: List[NewSessionEvent]
 
 
+class BulkSessionEvent(NewSessionEvent):
+    """
+    A single line of an NDJSON bulk upload of interaction events.
+    Carries its session ID, so events of many sessions share one upload.
+    Used to replay logged interactions, which may be older than live ones.
+    """
+
+    session_id: str
+
+
+class SessionEventsBulkResponse(BaseModel):
+    """
+    Outcome of an NDJSON bulk upload of interaction events.
+    Counts accepted and rejected lines, already stored events are accepted.
+    Lists the first errors with line numbers to fix the uploaded log.
+    """
+
+    accepted: int = 0
+    rejected: int = 0
+    errors: List[str] = []
+
+
 class SessionMarkIrrelevantRequest(BaseModel):
     """
     Request to flag an entire session as irrelevant for analytics purposes.
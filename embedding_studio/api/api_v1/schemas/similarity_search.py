@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field
 
 from embedding_studio.api.api_v1.schemas.payload_filter import PayloadFilter
 from embedding_studio.api.api_v1.schemas.sorting_options import SortByOptions
+from embedding_studio.models.embeddings.counts import CountStrategy
 
 
 class PayloadCountRequest(BaseModel):
@@ -16,6 +17,7 @@ class PayloadCountRequest(BaseModel):
 
     search_query: Any
     filter: Optional[PayloadFilter] = None
+    count_strategy: CountStrategy = CountStrategy.EXACT
 
 
 class CountRequest(PayloadCountRequest):
@@ -48,6 +50,7 @@ class SimilaritySearchRequest(BaseModel):
     :param sort_by: Optional sorting configuration for the results
     :param similarity_first: Whether to prioritize similarity over other sorting criteria
     :param meta_info: Optional additional metadata to associate with the search
+    :param count_strategy: How to count objects matching the filter, no count if None
     """
 
     search_query: Any
@@ -61,6 +64,7 @@ class SimilaritySearchRequest(BaseModel):
     sort_by: Optional[SortByOptions] = None
     similarity_first: bool = Field(default=False)
     meta_info: Optional[Any] = None
+    count_strategy: Optional[CountStrategy] = None
 
 
 class PayloadSearchRequest(SimilaritySearchRequest):
@@ -98,6 +102,8 @@ class SimilaritySearchResponse(BaseModel):
     session_id: Optional[str] = None
     search_results: List[SearchResult]
     total_count: Optional[int] = None
+    is_approximate_count: Optional[bool] = None
+    total_count_error_bound: Optional[int] = None
     meta_info: Optional[Any] = None
 
 
@@ -110,3 +116,5 @@ class CountResponse(BaseModel):
     """
 
     total_count: int
+    is_approximate: bool = False
+    error_bound: Optional[int] = None
@@ -18,6 +18,24 @@ class GetSuggestionsRequest(BaseModel):
     )
 
 
+class GetBatchSuggestionsRequest(BaseModel):
+    """
+    Request model for obtaining autocompletion suggestions of one phrase
+    for several domains at once, e.g. brands, categories and free text.
+    The phrase is tokenized once and all domains are queried together.
+    """
+
+    phrase: str = Field(description="The phrase to suggest")
+    domains: List[Optional[str]] = Field(
+        min_length=1,
+        max_length=20,
+        description="Domains to suggest from, null means any domain",
+    )
+    top_k: int = Field(
+        default=3, ge=0, le=100, description="The top k suggestions per domain"
+    )
+
+
 class Span(BaseModel):
     """
     Represents a text position range with start and end indices.
@@ -262,3 +280,27 @@ class ListPhrasesResponse(BaseModel):
         default_factory=list,
         description="List of phrases with full details.",
     )
+
+
+class DomainSuggestions(BaseModel):
+    """
+    Suggestions of a single domain in a batch response.
+    """
+
+    domain: Optional[str] = Field(
+        default=None, description="The domain, null means any domain"
+    )
+    suggestions: List[Suggestion] = Field(
+        default_factory=list, description="Suggestions list"
+    )
+
+
+class GetBatchSuggestionsResponse(BaseModel):
+    """
+    Suggestions of a phrase grouped by domain, in the order of requested
+    domains.
+    """
+
+    results: List[DomainSuggestions] = Field(
+        default_factory=list, description="Suggestions per domain"
+    )
@@ -133,5 +133,6 @@ context = AppContext(
         tokenizer=SuggestingTokenizer(),
         index_name=settings.SUGGESTING_REDIS_COLLECTION,
         max_chunks=settings.SUGGESTING_MAX_CHUNKS,
+        fetch_factor=settings.SUGGESTING_FETCH_FACTOR,
     ),
 )
@@ -44,6 +44,27 @@ class Settings(BaseSettings):
     SUGGESTING_REDIS_COLLECTION: str = os.getenv(
         "SUGGESTING_REDIS_COLLECTION", "suggestion_phrases"
     )
+    # Documents fetched per requested suggestion, extra ones replace
+    # duplicates and documents with already suggested labels
+    SUGGESTING_FETCH_FACTOR: int = int(os.getenv("SUGGESTING_FETCH_FACTOR", 5))
+    # Responses of /suggesting/get-top-k, 0 disables the in-process cache
+    SUGGESTING_CACHE_MAX_SIZE: int = int(
+        os.getenv("SUGGESTING_CACHE_MAX_SIZE", 10000)
+    )
+    # Share cached responses between processes through Redis
+    SUGGESTING_CACHE_USE_REDIS: bool = (
+        str(os.getenv("SUGGESTING_CACHE_USE_REDIS", False)).lower() == "true"
+    )
+    SUGGESTING_CACHE_REDIS_TTL: int = int(
+        os.getenv("SUGGESTING_CACHE_REDIS_TTL", 10 * 60)
+    )
+    SUGGESTING_CACHE_PREFIX: str = os.getenv(
+        "SUGGESTING_CACHE_PREFIX", "suggestions_cache"
+    )
+    # Seconds to reuse the phrases version before checking it again
+    SUGGESTING_CACHE_VERSION_TTL: float = float(
+        os.getenv("SUGGESTING_CACHE_VERSION_TTL", 1.0)
+    )
 
     # Constant Improvement
     SESSIONS_FOR_IMPROVEMENT_MONGO_HOST: str = os.getenv(
@@ -195,6 +216,10 @@ class Settings(BaseSettings):
     UPSERTION_IGNORE_FAILED_ITEMS: bool = os.getenv(
         "UPSERTION_IGNORE_FAILED_ITEMS", True
     )
+    # Don't embed items again if their content fingerprint is unchanged.
+    UPSERTION_SKIP_UNCHANGED_ITEMS: bool = os.getenv(
+        "UPSERTION_SKIP_UNCHANGED_ITEMS", True
+    )
     UPSERTION_PASS_TO_REINDEXING_MODEL: int = os.getenv(
         "UPSERTION_PASS_TO_REINDEXING_MODEL", True
     )
@@ -213,6 +238,16 @@ class Settings(BaseSettings):
     # Reindex
     REINDEX_BATCH_SIZE: int = 16
     REINDEX_MAX_SUBTASKS_COUNT: int = 4
+    # Subtasks concurrency starts from REINDEX_MAX_SUBTASKS_COUNT, grows
+    # while subtasks succeed and halves when they fail
+    REINDEX_MAX_SUBTASKS_LIMIT: int = os.getenv(
+        "REINDEX_MAX_SUBTASKS_LIMIT", 16
+    )
+    # Subtasks failed in a row without completing a range (e.g. a missing
+    # model or collection), beyond it the reindex task is failed
+    REINDEX_MAX_IDLE_FAILED_SUBTASKS: int = os.getenv(
+        "REINDEX_MAX_IDLE_FAILED_SUBTASKS", 3
+    )
     REINDEX_MAX_TASKS_COUNT: int = 2
     REINDEX_IGNORE_FAILED_ITEMS: bool = True
     REINDEX_TASK_DELAY_TIME: int = 20 * 60 * 1000  # 20 minutes in milliseconds
@@ -240,6 +275,20 @@ class Settings(BaseSettings):
         "REINDEX_SUBWORKER_LOOP_WAIT_TIME", 10
     )
 
+    # Reindex ranges are claimed by subtasks from a queue in Redis,
+    # a range of a crashed subtask is claimed again after its lease expiry
+    REINDEX_RANGES_PREFIX: str = os.getenv(
+        "REINDEX_RANGES_PREFIX", "reindex_ranges"
+    )
+    REINDEX_RANGE_LEASE_TIME: int = os.getenv("REINDEX_RANGE_LEASE_TIME", 300)
+    REINDEX_RANGE_HEARTBEAT_TIME: int = os.getenv(
+        "REINDEX_RANGE_HEARTBEAT_TIME", 60
+    )
+    # Times a failed range is processed before its items are marked failed
+    REINDEX_RANGE_MAX_ATTEMPTS: int = os.getenv(
+        "REINDEX_RANGE_MAX_ATTEMPTS", 3
+    )
+
     REINDEX_INITIATE_MODEL_DEPLOYMENT: bool = os.getenv(
         "REINDEX_INITIATE_MODEL_DEPLOYMENT", True
     )
@@ -256,6 +305,15 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: str = os.getenv("REDIS_PASSWORD", "redispassword")
     REDIS_URL: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/0"
 
+    # Task events (completion signals of subtasks for their parent tasks)
+    TASK_EVENTS_PREFIX: str = os.getenv("TASK_EVENTS_PREFIX", "task_events")
+    TASK_EVENTS_TTL: int = os.getenv("TASK_EVENTS_TTL", 24 * 60 * 60)
+
+    # Collection versions (bumped on writes, refresh in-memory indexes)
+    COLLECTION_VERSIONS_PREFIX: str = os.getenv(
+        "COLLECTION_VERSIONS_PREFIX", "collection_versions"
+    )
+
     # minio
     MINIO_HOST: str = os.getenv("MINIO_HOST", "localhost")
     MINIO_PORT: int = os.getenv("MINIO_PORT", 9000)
@@ -299,6 +357,21 @@ class Settings(BaseSettings):
         "FINE_TUNING_WORKER_TIME_LIMIT", 18000000
     )
 
+    # Image preprocessing
+    # Processes decoding and transforming images, 0 disables the pool.
+    IMAGE_TRANSFORM_WORKERS: int = os.getenv("IMAGE_TRANSFORM_WORKERS", 4)
+    # Smaller batches are transformed in the calling process.
+    IMAGE_TRANSFORM_MIN_BATCH_SIZE: int = os.getenv(
+        "IMAGE_TRANSFORM_MIN_BATCH_SIZE", 4
+    )
+    # Directory of transformed pixel values cached for fine-tuning,
+    # empty string disables the cache.
+    IMAGE_PIXELS_CACHE_DIR: str = os.getenv("IMAGE_PIXELS_CACHE_DIR", "")
+    # Max size of pixel values cached per item, least recently used are evicted.
+    IMAGE_PIXELS_CACHE_MAX_BYTES: int = os.getenv(
+        "IMAGE_PIXELS_CACHE_MAX_BYTES", 20 * 1024**3
+    )
+
     # Retry strategy
     DEFAULT_MAX_ATTEMPTS: int = os.getenv("DEFAULT_MAX_ATTEMPTS", 3)
     DEFAULT_WAIT_TIME_SECONDS: float = os.getenv(
@@ -319,6 +392,17 @@ class Settings(BaseSettings):
     S3_DOWNLOAD_DATA_WAIT_TIME_SECONDS: float = os.getenv(
         "S3_DOWNLOAD_DATA_WAIT_TIME_SECONDS", DEFAULT_WAIT_TIME_SECONDS
     )
+    # Files downloaded at the same time by a loader, 1 - one by one.
+    S3_DOWNLOAD_CONCURRENCY: int = os.getenv("S3_DOWNLOAD_CONCURRENCY", 16)
+    # HTTP connections kept by a client, shared by download threads.
+    S3_MAX_POOL_CONNECTIONS: int = os.getenv("S3_MAX_POOL_CONNECTIONS", 64)
+    # Larger files are downloaded by parallel ranged requests.
+    S3_MULTIPART_THRESHOLD: int = os.getenv(
+        "S3_MULTIPART_THRESHOLD", 8 * 1024**2
+    )
+    S3_TRANSFER_MAX_CONCURRENCY: int = os.getenv(
+        "S3_TRANSFER_MAX_CONCURRENCY", 4
+    )
 
     # GCP
     GCP_READ_CREDENTIALS_ATTEMPTS: int = os.getenv(
@@ -334,6 +418,36 @@ class Settings(BaseSettings):
     GCP_DOWNLOAD_DATA_WAIT_TIME_SECONDS: float = os.getenv(
         "GCP_DOWNLOAD_DATA_WAIT_TIME_SECONDS", DEFAULT_WAIT_TIME_SECONDS
     )
+    # Files downloaded at the same time by a loader, 1 - one by one.
+    GCP_DOWNLOAD_CONCURRENCY: int = os.getenv("GCP_DOWNLOAD_CONCURRENCY", 16)
+    # HTTP connections kept by a client, shared by download threads.
+    GCP_MAX_POOL_CONNECTIONS: int = os.getenv("GCP_MAX_POOL_CONNECTIONS", 64)
+
+    # Downloaded items cache
+    # Directory of items downloaded by data loaders, empty string disables it.
+    DATA_LOADER_CACHE_DIR: str = os.getenv("DATA_LOADER_CACHE_DIR", "")
+    DATA_LOADER_CACHE_MAX_BYTES: int = os.getenv(
+        "DATA_LOADER_CACHE_MAX_BYTES", 10 * 1024**3
+    )
+    # Cached items older than this are downloaded again, 0 - never.
+    # Items without a known version (e.g. S3 ETag) are cached only if set.
+    DATA_LOADER_CACHE_MAX_AGE: float = os.getenv(
+        "DATA_LOADER_CACHE_MAX_AGE", 0
+    )
+    # Seconds to trust a cached item before checking its version again.
+    DATA_LOADER_CACHE_REVALIDATE_AFTER: float = os.getenv(
+        "DATA_LOADER_CACHE_REVALIDATE_AFTER", 10 * 60
+    )
+
+    # Aggregated data loader
+    # Threads loading items of different sources at the same time.
+    AGGREGATED_DATA_LOADER_MAX_WORKERS: int = os.getenv(
+        "AGGREGATED_DATA_LOADER_MAX_WORKERS", 8
+    )
+    # Items of a source are loaded and yielded by chunks of this size.
+    AGGREGATED_DATA_LOADER_CHUNK_SIZE: int = os.getenv(
+        "AGGREGATED_DATA_LOADER_CHUNK_SIZE", 32
+    )
 
     # PGSQL
     PGSQL_DATA_LOADER_ATTEMPTS: int = os.getenv(
@@ -342,6 +456,18 @@ class Settings(BaseSettings):
     PGSQL_DATA_LOADER_WAIT_TIME_SECONDS: float = os.getenv(
         "PGSQL_DATA_LOADER_WAIT_TIME_SECONDS", DEFAULT_WAIT_TIME_SECONDS
     )
+    PGSQL_DATA_LOADER_POOL_SIZE: int = os.getenv(
+        "PGSQL_DATA_LOADER_POOL_SIZE", 5
+    )
+    # Max number of IDs fetched by a single query.
+    PGSQL_DATA_LOADER_FETCH_BATCH_SIZE: int = os.getenv(
+        "PGSQL_DATA_LOADER_FETCH_BATCH_SIZE", 1000
+    )
+    # Iterate over all rows with a server-side cursor and keyset pagination
+    # instead of LIMIT/OFFSET pages.
+    PGSQL_DATA_LOADER_STREAMING: bool = os.getenv(
+        "PGSQL_DATA_LOADER_STREAMING", True
+    )
 
     # HuggingFace
     MODEL_DOWNLOAD_MAX_ATTPEMPTS: int = os.getenv(
@@ -458,6 +584,26 @@ class Settings(BaseSettings):
     CLICKSTREAM_TIME_MAX_DELTA_PLUS_SEC: int = os.getenv(
         "CLICKSTREAM_TIME_MAX_DELTA_PLUS_SEC", 5 * 60
     )
+    # Pushed events are buffered and written by batches in the background,
+    # 0 writes them on the request thread
+    CLICKSTREAM_EVENTS_FLUSH_INTERVAL_SEC: float = float(
+        os.getenv("CLICKSTREAM_EVENTS_FLUSH_INTERVAL_SEC", 1.0)
+    )
+    CLICKSTREAM_EVENTS_BATCH_SIZE: int = int(
+        os.getenv("CLICKSTREAM_EVENTS_BATCH_SIZE", 500)
+    )
+    # Beyond this number of buffered events requests write them themselves
+    CLICKSTREAM_EVENTS_MAX_PENDING: int = int(
+        os.getenv("CLICKSTREAM_EVENTS_MAX_PENDING", 50000)
+    )
+    # Max number of invalid lines reported by the NDJSON bulk endpoint
+    CLICKSTREAM_BULK_MAX_REPORTED_ERRORS: int = int(
+        os.getenv("CLICKSTREAM_BULK_MAX_REPORTED_ERRORS", 100)
+    )
+    # Longer lines of the NDJSON bulk endpoint are rejected unread
+    CLICKSTREAM_BULK_MAX_LINE_BYTES: int = int(
+        os.getenv("CLICKSTREAM_BULK_MAX_LINE_BYTES", 1024 * 1024)
+    )
 
     # postgres
     POSTGRES_HOST: str = os.getenv("POSTGRES_HOST", "localhost")
@@ -479,8 +625,63 @@ class Settings(BaseSettings):
         f"{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
     )
 
+    # pgvector
+    # Filtered searches whose estimated filtered set is smaller than this
+    # are executed as an exact scan, larger ones go through HNSW.
+    PGVECTOR_EXACT_SEARCH_MAX_ROWS: int = os.getenv(
+        "PGVECTOR_EXACT_SEARCH_MAX_ROWS", 20000
+    )
+    # Chosen strategies are reused for the same filter, 0 - always EXPLAIN.
+    SEARCH_STRATEGY_CACHE_TTL: float = os.getenv(
+        "SEARCH_STRATEGY_CACHE_TTL", 60.0
+    )
+    SEARCH_STRATEGY_CACHE_MAX_SIZE: int = os.getenv(
+        "SEARCH_STRATEGY_CACHE_MAX_SIZE", 1024
+    )
+    # Possible values: off, relaxed_order, strict_order (pgvector >= 0.8.0)
+    PGVECTOR_HNSW_ITERATIVE_SCAN: str = os.getenv(
+        "PGVECTOR_HNSW_ITERATIVE_SCAN", "relaxed_order"
+    )
+    PGVECTOR_HNSW_MAX_SCAN_TUPLES: int = os.getenv(
+        "PGVECTOR_HNSW_MAX_SCAN_TUPLES", 20000
+    )
+    # Approximate counts fall back to an exact one below this estimate.
+    PGVECTOR_EXACT_COUNT_MAX_ROWS: int = os.getenv(
+        "PGVECTOR_EXACT_COUNT_MAX_ROWS", 20000
+    )
+    # Share of table pages read by sampled counts (TABLESAMPLE SYSTEM).
+    PGVECTOR_COUNT_SAMPLE_PERCENT: float = os.getenv(
+        "PGVECTOR_COUNT_SAMPLE_PERCENT", 1.0
+    )
+    COUNT_CACHE_TTL: float = os.getenv("COUNT_CACHE_TTL", 60.0)
+    COUNT_CACHE_MAX_SIZE: int = os.getenv("COUNT_CACHE_MAX_SIZE", 1024)
+    # Payload fields used by searches are recorded for the index advisor
+    PAYLOAD_USAGE_FLUSH_SIZE: int = os.getenv("PAYLOAD_USAGE_FLUSH_SIZE", 200)
+    PAYLOAD_USAGE_FLUSH_INTERVAL: float = os.getenv(
+        "PAYLOAD_USAGE_FLUSH_INTERVAL", 60.0
+    )
+    PAYLOAD_INDEX_ADVISOR_MIN_HITS: int = os.getenv(
+        "PAYLOAD_INDEX_ADVISOR_MIN_HITS", 100
+    )
+
     # Query Parsing
     QUERY_PARSING_DB_META_INFO: Any = {"enlarged_limit": 36}
+    # Search categories by an exact in-memory index instead of pgvector
+    QUERY_PARSING_IN_MEMORY_INDEX: bool = (
+        str(os.getenv("QUERY_PARSING_IN_MEMORY_INDEX", True)).lower() == "true"
+    )
+    # Larger categories collections are searched by pgvector
+    QUERY_PARSING_IN_MEMORY_INDEX_MAX_OBJECTS: int = int(
+        os.getenv("QUERY_PARSING_IN_MEMORY_INDEX_MAX_OBJECTS", 200000)
+    )
+    # Seconds between checks of the categories collection version
+    QUERY_PARSING_IN_MEMORY_INDEX_CHECK_INTERVAL: float = float(
+        os.getenv("QUERY_PARSING_IN_MEMORY_INDEX_CHECK_INTERVAL", 5.0)
+    )
+    # Seconds to wait for more writes before rebuilding the index
+    QUERY_PARSING_IN_MEMORY_INDEX_REBUILD_DELAY: float = float(
+        os.getenv("QUERY_PARSING_IN_MEMORY_INDEX_REBUILD_DELAY", 1.0)
+    )
 
     # Inference
     INFERENCE_QUERY_EMBEDDING_ATTEMPTS: int = os.getenv(
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from embedding_studio.models.clickstream.session_batches import (
     SessionBatch,
@@ -78,6 +78,33 @@ class ClickstreamDao(ABC):
         """
         raise NotImplementedError()
 
+    def iter_batch_sessions(
+        self,
+        batch_id: str,
+        after_number: Optional[int] = None,
+        events_limit: Optional[int] = None,
+        page_size: int = 1000,
+    ) -> Iterator[SessionWithEvents]:
+        """Iterate over registered sessions with events by batch_id by pages
+
+        :param batch_id: session batch id
+        :param after_number: sessions with less session_number will be skipped (including this number)
+        :param events_limit: max event list length in each returning session
+        :param page_size: number of sessions read at once
+        :return: iterator of found sessions with events
+        """
+        while True:
+            sessions = self.get_batch_sessions(
+                batch_id=batch_id,
+                after_number=after_number,
+                limit=page_size,
+                events_limit=events_limit,
+            )
+            yield from sessions
+            if len(sessions) < page_size:
+                return
+            after_number = sessions[-1].session_number
+
     @abstractmethod
     def get_batch(self, batch_id: str) -> Optional[SessionBatch]:
         """Get session batch
@@ -0,0 +1,157 @@
+import logging
+import threading
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Tuple
+
+from embedding_studio.models.clickstream.session_events import SessionEvent
+
+logger = logging.getLogger(__name__)
+
+
+class SessionEventsBuffer:
+    """
+    In-process buffer of session events, written by batches from
+    a background thread, so a request doesn't wait for a database write
+    and events of many requests share a single bulk insert.
+
+    A batch is written when `max_batch_size` events are pending or
+    `flush_interval` seconds have passed. `event_id` is an idempotency key:
+    an event retried while it's still pending is ignored, and the storage
+    ignores events that are already written.
+
+    A batch, which failed to be written, is returned to the buffer and
+    retried after `flush_interval`, unless the buffer is full. Beyond
+    `max_pending` events callers write batches themselves, so write errors
+    are raised to them.
+
+    Pending events are lost if the process is killed, `close` writes them
+    on a graceful shutdown.
+
+    :param push: Function writing a batch of events
+    :param max_batch_size: Max number of events written by a single insert
+    :param flush_interval: Max seconds an event waits to be written
+    :param max_pending: Max number of pending events, beyond this limit
+                        events are written on the calling thread
+    """
+
+    def __init__(
+        self,
+        push: Callable[[List[SessionEvent]], None],
+        max_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 50000,
+    ):
+        self._push = push
+        self._max_batch_size = int(max_batch_size)
+        self._flush_interval = float(flush_interval)
+        self._max_pending = int(max_pending)
+
+        self._condition = threading.Condition()
+        # (session_id, event_id) -> event, keeps insertion order
+        self._pending: Dict[Tuple[str, str], SessionEvent] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="session-events-buffer", daemon=True
+            )
+            self._thread.start()
+
+    def add(self, events: List[SessionEvent]):
+        """
+        Add events to be written.
+
+        :param events: Session events
+        """
+        with self._condition:
+            closed = self._closed
+            if not closed:
+                for event in events:
+                    self._pending.setdefault(
+                        (event.session_id, event.event_id), event
+                    )
+                self._ensure_thread()
+                if len(self._pending) >= self._max_batch_size:
+                    self._condition.notify()
+                overflow = len(self._pending) >= self._max_pending
+
+        if closed:
+            self._push(events)
+        elif overflow:
+            # Storage can't keep up: slow clients down instead of growing
+            # the buffer
+            self.flush()
+
+    def _take_batch(self) -> List[SessionEvent]:
+        keys = list(islice(self._pending, self._max_batch_size))
+        return [self._pending.pop(key) for key in keys]
+
+    def _requeue(self, batch: List[SessionEvent]):
+        dropped = 0
+        with self._condition:
+            for event in batch:
+                key = (event.session_id, event.event_id)
+                if len(self._pending) >= self._max_pending:
+                    dropped += 1
+                else:
+                    self._pending.setdefault(key, event)
+
+        if dropped > 0:
+            logger.error(
+                f"Buffer of session events is full, {dropped} events "
+                f"failed to be written are dropped"
+            )
+
+    def _write(self, batch: List[SessionEvent]) -> bool:
+        try:
+            self._push(batch)
+            return True
+        except Exception:
+            logger.exception(
+                f"Failed to write {len(batch)} session events, "
+                f"they will be retried"
+            )
+            self._requeue(batch)
+            return False
+
+    def flush(self):
+        """
+        Write all pending events on the calling thread.
+
+        :raises Exception: If a batch failed to be written, it's returned
+                           to the buffer
+        """
+        while True:
+            with self._condition:
+                batch = self._take_batch()
+            if not batch:
+                return
+
+            try:
+                self._push(batch)
+            except Exception:
+                self._requeue(batch)
+                raise
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if len(self._pending) < self._max_batch_size:
+                    self._condition.wait(self._flush_interval)
+                if self._closed and not self._pending:
+                    return
+                batch = self._take_batch()
+
+            if batch and not self._write(batch):
+                # Don't retry a failed batch at once
+                with self._condition:
+                    self._condition.wait(self._flush_interval)
+
+    def close(self):
+        """Stop the background thread and write all pending events."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self.flush()
@@ -1,5 +1,5 @@
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import pymongo
 
@@ -49,6 +49,8 @@ class MongoClickstreamDao(ClickstreamDao):
     _RELEASE_ID: str = "release_id"
     _RELEASED_AT: str = "released_at"
 
+    _DUPLICATE_KEY_ERROR: int = 11000
+
     _STATUS_COLLECTING: str = SessionBatchStatus.collecting.value
     _STATUS_RELEASED: str = SessionBatchStatus.released.value
 
@@ -61,6 +63,13 @@ class MongoClickstreamDao(ClickstreamDao):
                 dict(keys=self._BATCH_ID),
                 dict(keys=self._SESSION_NUMBER),
                 dict(keys=self._CREATED_AT),
+                # Pages of batch sessions are read by this index in order
+                dict(
+                    keys=[
+                        (self._BATCH_ID, pymongo.ASCENDING),
+                        (self._SESSION_NUMBER, pymongo.ASCENDING),
+                    ]
+                ),
             ],
         )
         self._event_dao = MongoDao[SessionEvent](
@@ -99,6 +108,15 @@ class MongoClickstreamDao(ClickstreamDao):
                 dict(keys=self._CREATED_AT),
             ],
         )
+        # Fields read by batch sessions queries
+        self._session_projection = {
+            field: True for field in RegisteredSession.model_fields
+        }
+        self._session_projection["_id"] = False
+        self._event_projection = {
+            field: True for field in SessionEvent.model_fields
+        }
+        self._event_projection["_id"] = False
 
     def register_session(self, session: Session) -> RegisteredSession:
         """
@@ -148,16 +166,29 @@ class MongoClickstreamDao(ClickstreamDao):
         """
         Store multiple session events in the database.
 
-        Attempts to insert all events, logging warnings for any duplicate events.
+        Attempts to insert all events, events already stored (with the same
+        session_id and event_id) are skipped.
 
         :param session_events: List of session events to store
         """
         try:
             self._event_dao.insert_many(session_events, ordered=False)
         except pymongo.errors.BulkWriteError as err:
-            logger.warning(
-                f"Some errors occurred during events insertion: {err}"
-            )
+            write_errors = err.details.get("writeErrors", [])
+            errors = [
+                error
+                for error in write_errors
+                if error.get("code") != self._DUPLICATE_KEY_ERROR
+            ]
+            if len(errors) < len(write_errors):
+                logger.debug(
+                    f"Skipped {len(write_errors) - len(errors)} "
+                    f"already stored events"
+                )
+            if errors:
+                logger.warning(
+                    f"Some errors occurred during events insertion: {errors}"
+                )
 
     def mark_session_irrelevant(
         self, session_id
@@ -203,23 +234,37 @@ class MongoClickstreamDao(ClickstreamDao):
         :param events_limit: Maximum number of events to retrieve per session
         :return: List of SessionWithEvents objects
         """
-        after_number = after_number or 0
-        limit = limit or 0
-        events_limit = events_limit or 0
-        sessions = self._session_dao.find(
-            sort_args=[self._SESSION_NUMBER],
-            filter={
-                self._BATCH_ID: batch_id,
-                self._SESSION_NUMBER: {"$gt": after_number},
-            },
-            limit=limit,
+        if not limit:
+            return list(
+                self.iter_batch_sessions(
+                    batch_id=batch_id,
+                    after_number=after_number,
+                    events_limit=events_limit,
+                )
+            )
+
+        sessions = list(
+            self._session_dao.collection.find(
+                filter={
+                    self._BATCH_ID: batch_id,
+                    self._SESSION_NUMBER: {"$gt": after_number or 0},
+                },
+                projection=self._session_projection,
+                sort=[(self._SESSION_NUMBER, pymongo.ASCENDING)],
+                limit=limit,
+            )
+        )
+        if not sessions:
+            return []
+
+        events = self._get_sessions_events(
+            [session[self._SESSION_ID] for session in sessions],
+            limit=events_limit or 0,
         )
+        # Documents are validated once, right into the resulting models
         return [
-            SessionWithEvents(
-                **session.model_dump(),
-                events=self._get_session_events(
-                    session_id=session.session_id, limit=events_limit
-                ),
+            SessionWithEvents.model_validate(
+                dict(session, events=events[session[self._SESSION_ID]])
             )
             for session in sessions
         ]
@@ -294,6 +339,29 @@ class MongoClickstreamDao(ClickstreamDao):
             sort_args=None, filter={self._SESSION_ID: session_id}, limit=limit
         )
 
+    def _get_sessions_events(
+        self, session_ids: List[str], limit: int = 0
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieve events of several sessions by a single query.
+
+        :param session_ids: IDs of sessions to retrieve events for
+        :param limit: Maximum number of events per session, 0 - no limit
+        :return: Event documents by session ID
+        """
+        events: Dict[str, List[Dict[str, Any]]] = {
+            session_id: [] for session_id in session_ids
+        }
+        cursor = self._event_dao.collection.find(
+            filter={self._SESSION_ID: {"$in": session_ids}},
+            projection=self._event_projection,
+        )
+        for event in cursor:
+            session_events = events[event[self._SESSION_ID]]
+            if not limit or len(session_events) < limit:
+                session_events.append(event)
+        return events
+
     def _increment_session_batch(self) -> SessionBatch:
         """
         Increment the session counter in the current collecting batch.
@@ -1,16 +1,26 @@
+import logging
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from typing import Dict, Generator, List, Optional, Type
 
-from datasets import Dataset
+from datasets import Dataset, concatenate_datasets
 
+from embedding_studio.core.config import settings
 from embedding_studio.data_storage.loaders.data_loader import DataLoader
 from embedding_studio.data_storage.loaders.downloaded_item import (
     DownloadedItem,
+    LoadedBatch,
+    get_listed_count,
+)
+from embedding_studio.data_storage.loaders.exceptions import (
+    SourcesLoadingException,
 )
 from embedding_studio.data_storage.loaders.item_meta import (
     ItemMetaWithSourceInfo,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class AggregatedDataLoader(DataLoader):
     """
@@ -20,23 +30,35 @@ class AggregatedDataLoader(DataLoader):
     loaded from different sources through a single interface. It routes load requests
     to the appropriate loader based on the source name in the item metadata.
 
+    Sources are loaded concurrently, items of each source are split into chunks
+    that are yielded by `iter_items` as soon as they're loaded. A failure of
+    one source doesn't stop loading from the others.
+
     :param loaders: Dictionary mapping source names to their respective DataLoader instances
     :param item_meta_cls: The ItemMetaWithSourceInfo class type to use for metadata
+    :param max_workers: Max number of chunks loaded at the same time
+    :param chunk_size: Number of items of a source loaded at once
     """
 
     def __init__(
         self,
         loaders: Dict[str, DataLoader],
         item_meta_cls: Type[ItemMetaWithSourceInfo],
+        max_workers: int = settings.AGGREGATED_DATA_LOADER_MAX_WORKERS,
+        chunk_size: int = settings.AGGREGATED_DATA_LOADER_CHUNK_SIZE,
     ) -> None:
         """
         Initialize an AggregatedDataLoader with multiple data loaders.
 
         :param loaders: Dictionary mapping source names to their respective DataLoader instances
         :param item_meta_cls: The ItemMetaWithSourceInfo class type to use for metadata
+        :param max_workers: Max number of chunks loaded at the same time
+        :param chunk_size: Number of items of a source loaded at once
         """
         self.loaders = loaders
         self._item_meta_cls = item_meta_cls
+        self.max_workers = max(int(max_workers), 1)
+        self.chunk_size = max(int(chunk_size), 1)
 
     @property
     def item_meta_cls(self):
@@ -47,29 +69,117 @@ class AggregatedDataLoader(DataLoader):
         """
         return self._item_meta_cls
 
+    @staticmethod
+    def _group_by_source(
+        items_data: List[ItemMetaWithSourceInfo],
+    ) -> Dict[str, List[ItemMetaWithSourceInfo]]:
+        grouped_items_data = defaultdict(list)
+        for item in items_data:
+            grouped_items_data[item.source_name].append(item)
+        return grouped_items_data
+
+    def get_versions(
+        self, items_data: List[ItemMetaWithSourceInfo]
+    ) -> Dict[str, str]:
+        """
+        Get current versions of items from loaders of their sources.
+
+        :param items_data: List of ItemMetaWithSourceInfo objects identifying the items
+        :return: Versions by item IDs, items with unknown versions are omitted
+        """
+        versions = dict()
+        for key, items in self._group_by_source(items_data).items():
+            try:
+                versions.update(self.loaders[key].get_versions(items))
+            except Exception as e:
+                logger.warning(f"Failed to get versions of {key} items: {e}")
+        return versions
+
     def load(self, items_data: List[ItemMetaWithSourceInfo]) -> Dataset:
         """
         Load data items from multiple sources and combine them into a single dataset.
 
         This method groups items by source, delegates loading to the appropriate loader
-        for each source, and then concatenates the results into a single dataset.
+        for each source concurrently, and then concatenates the results into a single
+        dataset in the order of sources.
 
         :param items_data: List of ItemMetaWithSourceInfo objects identifying the items to load
         :return: A unified Dataset containing data from all sources
         """
-        grouped_items_data = defaultdict(list)
-        for item in items_data:
-            grouped_items_data[item.source_name].append(item)
+        grouped_items_data = self._group_by_source(items_data)
+        if not grouped_items_data:
+            return Dataset.from_dict({})
 
-        results = []
-        for key, items in grouped_items_data.items():
-            results += self.loaders[key].load(items)
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(grouped_items_data)),
+            thread_name_prefix="aggregated_load",
+        ) as executor:
+            futures = [
+                executor.submit(self.loaders[key].load, items)
+                for key, items in grouped_items_data.items()
+            ]
+            results = [future.result() for future in futures]
 
-        return (
-            results[0].concatenate(results[1:])
-            if results
-            else Dataset.from_dict({})
+        return concatenate_datasets(results)
+
+    def iter_items(
+        self,
+        items_data: List[ItemMetaWithSourceInfo],
+        ignore_failures: bool = False,
+    ) -> Generator[DownloadedItem, None, None]:
+        """
+        Load individual items from multiple sources concurrently, yielding them
+        by chunks in the order chunks are loaded.
+
+        A failed chunk is logged and doesn't stop loading of the others. Once
+        everything else is yielded, SourcesLoadingException with failed
+        sources and items is raised, unless `ignore_failures` is set.
+
+        :param items_data: List of ItemMetaWithSourceInfo objects identifying the items to load
+        :param ignore_failures: Whether to skip failed chunks silently
+        :yield: DownloadedItem objects from all sources
+        """
+        grouped_items_data = self._group_by_source(items_data)
+        chunks = [
+            (key, items[i : i + self.chunk_size])
+            for key, items in grouped_items_data.items()
+            for i in range(0, len(items), self.chunk_size)
+        ]
+        if not chunks:
+            return
+
+        failures = dict()
+        failed_items = []
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(chunks)),
+            thread_name_prefix="aggregated_load",
         )
+        try:
+            futures: Dict[Future, int] = {
+                executor.submit(self.loaders[key].load_items, chunk): index
+                for index, (key, chunk) in enumerate(chunks)
+            }
+            for future in as_completed(futures):
+                key, chunk = chunks[futures[future]]
+                try:
+                    downloaded_items = future.result()
+                except Exception as e:
+                    logger.exception(
+                        f"Failed to load {len(chunk)} items from "
+                        f"source {key}: {e}"
+                    )
+                    failures[key] = e
+                    failed_items += chunk
+                    continue
+
+                yield from downloaded_items
+
+        finally:
+            # Loads aren't needed anymore if the consumer stopped early
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if failures and not ignore_failures:
+            raise SourcesLoadingException(failures, failed_items)
 
     def load_items(
         self, items_data: List[ItemMetaWithSourceInfo]
@@ -78,20 +188,12 @@ class AggregatedDataLoader(DataLoader):
         Load individual items from multiple sources.
 
         This method groups items by source and delegates loading to the
-        appropriate loader for each source, then combines the results.
+        appropriate loader for each source concurrently, then combines the results.
 
         :param items_data: List of ItemMetaWithSourceInfo objects identifying the items to load
         :return: Combined list of DownloadedItem objects from all sources
         """
-        grouped_items_data = defaultdict(list)
-        for item in items_data:
-            grouped_items_data[item.source_name].append(item)
-
-        results = []
-        for key, items in grouped_items_data.items():
-            results += self.loaders[key].load_items(items)
-
-        return results
+        return list(self.iter_items(items_data))
 
     def _load_batch_with_offset(
         self, offset: int, batch_size: int, **kwargs
@@ -106,12 +208,15 @@ class AggregatedDataLoader(DataLoader):
         :param kwargs: Additional parameters for customizing the batch loading process
         :return: A combined list of DownloadedItem objects from all sources
         """
-        all_batches = []
-        for loader in self.loaders:
+        all_batches = LoadedBatch(listed=0)
+        for loader in self.loaders.values():
             batch = loader._load_batch_with_offset(
                 offset, batch_size, **kwargs
             )
             all_batches.extend(batch)
+            all_batches.listed += get_listed_count(batch)
+            if isinstance(batch, LoadedBatch):
+                all_batches.failed.update(batch.failed)
         return all_batches
 
     def total_count(self, **kwargs) -> Optional[int]:
@@ -121,7 +226,9 @@ class AggregatedDataLoader(DataLoader):
         :param kwargs: Additional parameters passed to each loader's total_count method
         :return: Sum of all available counts, or None if no counts are available
         """
-        counts = [loader.total_count(**kwargs) for loader in self.loaders]
+        counts = [
+            loader.total_count(**kwargs) for loader in self.loaders.values()
+        ]
         return sum(filter(None, counts)) if any(counts) else None
 
     def load_all(
@@ -139,13 +246,11 @@ class AggregatedDataLoader(DataLoader):
         """
         offset = 0
         while True:
-            all_batches = []
-            for loader in self.loaders:
-                batch = loader._load_batch_with_offset(
-                    offset, batch_size, **kwargs
-                )
-                all_batches.extend(batch)
-            if not all_batches:
+            all_batches = self._load_batch_with_offset(
+                offset, batch_size, **kwargs
+            )
+            if get_listed_count(all_batches) == 0:
                 break
-            yield all_batches
+            if all_batches:
+                yield all_batches
             offset += batch_size
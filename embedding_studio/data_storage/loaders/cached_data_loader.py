@@ -0,0 +1,350 @@
+import logging
+import time
+from collections import defaultdict
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from datasets import Dataset
+
+from embedding_studio.core.config import settings
+from embedding_studio.data_storage.loaders.data_loader import DataLoader
+from embedding_studio.data_storage.loaders.downloaded_item import (
+    DownloadedItem,
+)
+from embedding_studio.data_storage.loaders.item_meta import ItemMeta
+from embedding_studio.data_storage.loaders.loader_cursor import LoaderCursor
+from embedding_studio.utils.disk_cache import DiskLRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class _CachedValue(NamedTuple):
+    version: Optional[str]
+    validated_at: float
+    value: Any
+
+
+class CachedDataLoader(DataLoader):
+    """
+    A DataLoader wrapper keeping downloaded items in an on-disk cache.
+
+    Items are keyed by the wrapped loader class and `ItemMeta.derived_id`,
+    so the same item is downloaded once across fine-tuning iterations,
+    upsertions and reindexes sharing the cache directory. Only missed items
+    are passed to the wrapped loader.
+
+    Cached items keep their version: `ItemMeta.version`, or the current one
+    reported by the wrapped loader (`get_versions`, e.g. S3 ETag or GCS
+    generation). Versions are asked only for missed items and for cached
+    items checked more than `revalidate_after` seconds ago, so a changed
+    item may be served from the cache for at most this long. A changed item
+    without a known version can't be told from the cached one, so such
+    items are cached only if the cache has a max age.
+
+    Dataset rows (`load`) and downloaded items data (`load_items`) are cached
+    separately, as loaders may shape them differently.
+
+    :param loader: The DataLoader to wrap
+    :param cache: Cache of downloaded items
+    :param revalidate_after: Seconds to trust cached items without checking
+        their versions
+    """
+
+    def __init__(
+        self,
+        loader: DataLoader,
+        cache: DiskLRUCache,
+        revalidate_after: float = 10 * 60,
+    ):
+        super(CachedDataLoader, self).__init__()
+        self.loader = loader
+        self.cache = cache
+        self.revalidate_after = float(revalidate_after)
+
+    @property
+    def item_meta_cls(self) -> Type[ItemMeta]:
+        """
+        Returns the ItemMeta class used by the wrapped loader.
+
+        :return: The ItemMeta class type
+        """
+        return self.loader.item_meta_cls
+
+    def get_versions(self, items_data: List[ItemMeta]) -> Dict[str, str]:
+        """
+        Get current versions of items from the wrapped loader.
+
+        :param items_data: List of ItemMeta objects identifying the items
+        :return: Versions by item IDs, items with unknown versions are omitted
+        """
+        return self.loader.get_versions(items_data)
+
+    def _get_key(self, kind: str, item: ItemMeta) -> str:
+        return (
+            f"{kind}:{type(self.loader).__module__}."
+            f"{type(self.loader).__qualname__}:{item.derived_id}"
+        )
+
+    def _get_versions(self, items_data: List[ItemMeta]) -> Dict[str, str]:
+        if not items_data:
+            return dict()
+
+        try:
+            return self.loader.get_versions(items_data)
+        except Exception as e:
+            logger.warning(
+                f"Failed to get versions of {len(items_data)} items: {e}"
+            )
+            return dict()
+
+    def _is_fresh(self, key: str, cached: _CachedValue) -> bool:
+        # Revalidation time is kept apart, not to rewrite the cached value
+        validated_at = max(
+            cached.validated_at, self.cache.get(f"{key}:validated") or 0.0
+        )
+        return time.time() - validated_at < self.revalidate_after
+
+    def _get_cached(
+        self, kind: str, items_data: List[ItemMeta]
+    ) -> Tuple[
+        Dict[str, Any],
+        List[ItemMeta],
+        Dict[str, Tuple[str, Optional[str]]],
+    ]:
+        # Cached values by item IDs, missed items, cache keys and versions
+        cached: Dict[str, Any] = dict()
+        stale: Dict[str, Tuple[str, _CachedValue]] = dict()
+        missed: List[ItemMeta] = []
+        for item in items_data:
+            key = self._get_key(kind, item)
+            value = self.cache.get(key)
+            if value is None or (
+                item.version is not None and item.version != value.version
+            ):
+                missed.append(item)
+            elif (
+                item.version is not None
+                or value.version is None
+                or self._is_fresh(key, value)
+            ):
+                cached[item.id] = value.value
+            else:
+                stale[item.id] = (key, value)
+
+        versions = self._get_versions(
+            [item for item in items_data if item.id in stale]
+            + [item for item in missed if item.version is None]
+        )
+        for item in items_data:
+            if item.id not in stale:
+                continue
+
+            key, value = stale[item.id]
+            if versions.get(item.id) == value.version:
+                cached[item.id] = value.value
+                self.cache.put(f"{key}:validated", time.time())
+            else:
+                missed.append(item)
+
+        missed_keys: Dict[str, Tuple[str, Optional[str]]] = dict()
+        for item in missed:
+            version = item.version or versions.get(item.id)
+            if version is not None or self.cache.max_age > 0:
+                missed_keys[item.id] = (self._get_key(kind, item), version)
+
+        logger.info(
+            f"Items cache: {len(cached)} hits, {len(missed)} misses, "
+            f"{len(missed) - len(missed_keys)} of them can't be cached, "
+            f"{len(stale)} versions checked"
+        )
+        return cached, missed, missed_keys
+
+    def _put(
+        self,
+        item_id: Optional[str],
+        value: Any,
+        keys: Dict[str, Tuple[str, Optional[str]]],
+    ):
+        if item_id is not None and value and item_id in keys:
+            key, version = keys[item_id]
+            self.cache.put(key, _CachedValue(version, time.time(), value))
+
+    def load(self, items_data: List[ItemMeta]) -> Dataset:
+        """
+        Load a dataset, downloading only items that aren't cached.
+
+        :param items_data: List of ItemMeta objects identifying the items to load
+        :return: A Dataset object containing the loaded data
+        """
+        rows_by_id, missed, missed_keys = self._get_cached("rows", items_data)
+        features = getattr(self.loader, "features", None)
+        if missed:
+            dataset = self.loader.load(missed)
+            features = dataset.features
+            missed_rows = defaultdict(list)
+            for row in dataset:
+                missed_rows[row["item_id"]].append(row)
+
+            for item in missed:
+                if item.id in missed_rows:
+                    rows_by_id[item.id] = missed_rows[item.id]
+                    self._put(item.id, rows_by_id[item.id], missed_keys)
+
+        rows = [
+            row for item in items_data for row in rows_by_id.get(item.id, [])
+        ]
+        if not rows:
+            return Dataset.from_dict({})
+
+        return Dataset.from_list(rows, features=features)
+
+    def load_items(self, items_data: List[ItemMeta]) -> List[DownloadedItem]:
+        """
+        Load items, downloading only items that aren't cached.
+
+        :param items_data: List of ItemMeta objects identifying the items to load
+        :return: List of DownloadedItem objects
+        """
+        data_by_id, missed, missed_keys = self._get_cached("items", items_data)
+        if missed:
+            missed_data = defaultdict(list)
+            for downloaded in self.loader.load_items(missed):
+                missed_data[downloaded.id].append(downloaded.data)
+
+            for item in missed:
+                if item.id in missed_data:
+                    data_by_id[item.id] = missed_data[item.id]
+                    self._put(item.id, data_by_id[item.id], missed_keys)
+
+        return [
+            DownloadedItem(id=item.id, data=data, meta=item)
+            for item in items_data
+            for data in data_by_id.get(item.id, [])
+        ]
+
+    def iter_items(
+        self, items_data: List[ItemMeta]
+    ) -> Generator[DownloadedItem, None, None]:
+        """
+        Yield cached items, then items streamed by the wrapped loader.
+
+        A streamed item is cached as soon as the stream moves on to another
+        item, so items already consumed stay cached even if the stream fails
+        or the consumer stops early. Data of a single item is expected to be
+        streamed consecutively, an item streamed again after others isn't
+        cached.
+
+        :param items_data: List of ItemMeta objects identifying the items to load
+        :yield: DownloadedItem objects
+        """
+        cached, missed, missed_keys = self._get_cached("items", items_data)
+        for item in items_data:
+            for item_data in cached.get(item.id, []):
+                yield DownloadedItem(id=item.id, data=item_data, meta=item)
+
+        if not missed:
+            return
+
+        current_id, current_data = None, []
+        written = set()
+        for downloaded in self.loader.iter_items(missed):
+            if downloaded.id != current_id:
+                self._put(current_id, current_data, missed_keys)
+                written.add(current_id)
+                current_id, current_data = downloaded.id, []
+                if downloaded.id in written and downloaded.id in missed_keys:
+                    # Its cached data is incomplete
+                    key, _ = missed_keys.pop(downloaded.id)
+                    self.cache.delete(key)
+
+            current_data.append(downloaded.data)
+            yield downloaded
+
+        self._put(current_id, current_data, missed_keys)
+
+    def _load_batch_with_offset(
+        self, offset: int, batch_size: int, **kwargs
+    ) -> List[DownloadedItem]:
+        """
+        Load a batch of items with the wrapped loader, listing isn't cached.
+
+        :param offset: The offset from where to start loading items.
+        :param batch_size: The number of items to load in a single batch.
+        :return: A list of downloaded items.
+        """
+        return self.loader._load_batch_with_offset(
+            offset, batch_size, **kwargs
+        )
+
+    def total_count(self, **kwargs) -> Optional[int]:
+        """
+        Total count of items of the wrapped loader.
+
+        :return: int if count is accessible, or None if is not.
+        """
+        return self.loader.total_count(**kwargs)
+
+    def load_all(self, batch_size: int, **kwargs):
+        """
+        Iterate over all items of the wrapped loader in batches.
+
+        :param batch_size: The size of each batch to load.
+        :yield: Each batch as a list of DownloadedItem.
+        """
+        yield from self.loader.load_all(batch_size, **kwargs)
+
+    def load_all_with_cursor(
+        self,
+        batch_size: int,
+        cursor: Optional[LoaderCursor] = None,
+        **kwargs,
+    ):
+        """
+        Iterate over all items of the wrapped loader starting from a cursor.
+
+        :param batch_size: The size of each batch to load.
+        :param cursor: Position to start from, None - from the beginning.
+        :yield: Tuples of a batch and the cursor after it.
+        """
+        yield from self.loader.load_all_with_cursor(
+            batch_size, cursor, **kwargs
+        )
+
+
+_cache: Optional[DiskLRUCache] = None
+
+
+def with_items_cache(loader: DataLoader) -> DataLoader:
+    """
+    Wrap a loader with the downloaded items cache, if it's enabled by
+    DATA_LOADER_CACHE_DIR setting.
+
+    :param loader: The DataLoader to wrap
+    :return: CachedDataLoader or the loader itself
+    """
+    global _cache
+    if not settings.DATA_LOADER_CACHE_DIR or isinstance(
+        loader, CachedDataLoader
+    ):
+        return loader
+
+    if _cache is None:
+        _cache = DiskLRUCache(
+            settings.DATA_LOADER_CACHE_DIR,
+            max_bytes=settings.DATA_LOADER_CACHE_MAX_BYTES,
+            max_age=settings.DATA_LOADER_CACHE_MAX_AGE,
+        )
+
+    return CachedDataLoader(
+        loader,
+        _cache,
+        revalidate_after=settings.DATA_LOADER_CACHE_REVALIDATE_AFTER,
+    )
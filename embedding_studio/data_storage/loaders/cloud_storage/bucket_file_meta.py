@@ -1,5 +1,5 @@
 import hashlib
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from embedding_studio.data_storage.loaders.item_meta import ItemMeta
 
@@ -17,11 +17,15 @@ class BucketFileMeta(ItemMeta):
     :param index: Optional index for sub-items within the file (e.g., chunks or lines)
     :param object_id: Optional explicit identifier for the item
     :param payload: Optional dictionary containing additional metadata
+    :param range_start: Optional first byte to read, for items stored in a part of a large file
+    :param range_end: Optional last byte to read (inclusive), None - till the end of the file
     """
 
     bucket: str
     file: str
     index: Optional[int] = None
+    range_start: Optional[int] = None
+    range_end: Optional[int] = None
     object_id: Optional[str] = None
     payload: Optional[Dict[str, Any]] = None
 
@@ -37,11 +41,28 @@ class BucketFileMeta(ItemMeta):
         ensuring that each file can be uniquely identified even across different buckets or within
         the same bucket but different paths. If an index is provided, it is appended to differentiate
         between multiple items that may come from the same file (such as data chunks or lines).
+        A byte range, if set, is appended to the file path the same way.
         """
+        path = f"{self.bucket}/{self.file}"
+        if self.byte_range is not None:
+            start, end = self.byte_range
+            path += f"@{start}-{'' if end is None else end}"
+
         if self.index is None:
-            return f"{self.bucket}/{self.file}"
+            return path
         else:
-            return f"{self.bucket}/{self.file}:{self.index}"
+            return f"{path}:{self.index}"
+
+    @property
+    def byte_range(self) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        Range of bytes of the file to read, if only a part of it is needed.
+
+        :return: (first byte, last byte or None) tuple, or None for the whole file
+        """
+        if self.range_start is None and self.range_end is None:
+            return None
+        return self.range_start or 0, self.range_end
 
     def __hash__(self) -> int:
         """
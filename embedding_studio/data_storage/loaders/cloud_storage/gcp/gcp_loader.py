@@ -1,11 +1,13 @@
 import io
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple, Type
 
 from datasets import Dataset, Features
 from google.cloud import storage
 from google.cloud.storage import Blob
 from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 
 from embedding_studio.core.config import settings
 from embedding_studio.data_storage.loaders.cloud_storage.gcp.item_meta import (
@@ -14,8 +16,10 @@ from embedding_studio.data_storage.loaders.cloud_storage.gcp.item_meta import (
 from embedding_studio.data_storage.loaders.data_loader import DataLoader
 from embedding_studio.data_storage.loaders.downloaded_item import (
     DownloadedItem,
+    LoadedBatch,
 )
 from embedding_studio.data_storage.loaders.item_meta import ItemMeta
+from embedding_studio.data_storage.loaders.loader_cursor import LoaderCursor
 from embedding_studio.utils.retry import retry_method
 from embedding_studio.workers.fine_tuning.utils.config import (
     RetryConfig,
@@ -44,7 +48,10 @@ class GCPCredentials(BaseModel):
 
 
 def read_from_gcp(
-    bucket: str, file: str, client: storage.Client
+    bucket: str,
+    file: str,
+    client: storage.Client,
+    byte_range: Optional[Tuple[int, Optional[int]]] = None,
 ) -> io.BytesIO:
     """
     Read a file from GCP Cloud Storage.
@@ -52,6 +59,7 @@ def read_from_gcp(
     :param bucket: Name of the GCP bucket.
     :param file: File name to be downloaded.
     :param client: Initialized GCP storage client.
+    :param byte_range: Optional (first byte, last byte or None) to read only a part of the file.
     :return: io.BytesIO object containing the file's contents.
     """
     if not isinstance(bucket, str) or not bucket:
@@ -62,7 +70,11 @@ def read_from_gcp(
 
     blob = client.bucket(bucket).blob(file)
     outfile = io.BytesIO()
-    blob.download_to_file(outfile)
+    if byte_range is not None:
+        start, end = byte_range
+        blob.download_to_file(outfile, start=start, end=end)
+    else:
+        blob.download_to_file(outfile)
     outfile.seek(0)
     return outfile
 
@@ -70,12 +82,16 @@ def read_from_gcp(
 class GCPDataLoader(DataLoader):
     """
     Items loader from GCP Cloud Storage.
+
+    Files are downloaded by a bounded pool of threads sharing one client
+    and its connection pool, while items are yielded in the requested order.
     """
 
     def __init__(
         self,
         retry_config: Optional[RetryConfig] = None,
         features: Optional[Features] = None,
+        download_concurrency: int = settings.GCP_DOWNLOAD_CONCURRENCY,
         **kwargs,
     ):
         """
@@ -83,6 +99,7 @@ class GCPDataLoader(DataLoader):
 
         :param retry_config: Retry strategy configuration.
         :param features: Schema for data to be loaded.
+        :param download_concurrency: Max number of files downloaded at the same time.
         :param kwargs: Keyword arguments for GcpCredentials.
         """
         super(GCPDataLoader, self).__init__(**kwargs)
@@ -96,6 +113,9 @@ class GCPDataLoader(DataLoader):
         self.attempt_exception_types = [
             Exception
         ]  # Update based on GCP exceptions
+        self.download_concurrency = max(int(download_concurrency), 1)
+        # (bucket, offset) -> page token to list consecutive batches
+        self._offset_tokens: Dict[Tuple[str, int], str] = dict()
 
     @property
     def item_meta_cls(self) -> Type[ItemMeta]:
@@ -130,16 +150,23 @@ class GCPDataLoader(DataLoader):
         return config
 
     @retry_method(name="download_data")
-    def _read_from_gcp(self, client, bucket: str, file: str) -> Any:
+    def _read_from_gcp(
+        self,
+        client,
+        bucket: str,
+        file: str,
+        byte_range: Optional[Tuple[int, Optional[int]]] = None,
+    ) -> Any:
         """
         Wrapper for retrying reading a file from GCP Cloud Storage.
 
         :param client: Initialized GCP storage client.
         :param bucket: Name of the bucket.
         :param file: Name of the file to download.
+        :param byte_range: Optional range of bytes to read.
         :return: File content as io.BytesIO.
         """
-        return read_from_gcp(bucket, file, client)
+        return read_from_gcp(bucket, file, client, byte_range)
 
     @retry_method(name="credentials")
     def _get_client(self) -> storage.Client:
@@ -149,12 +176,21 @@ class GCPDataLoader(DataLoader):
         :return: Initialized GCP storage client.
         """
         if self.credentials.use_system_info:
-            return storage.Client.create_anonymous_client()
+            client = storage.Client.create_anonymous_client()
         else:
-            return storage.Client.from_service_account_json(
+            client = storage.Client.from_service_account_json(
                 self.credentials.credentials_path
             )
 
+        # Default pool keeps 10 connections, too few for parallel downloads
+        adapter = HTTPAdapter(
+            pool_connections=settings.GCP_MAX_POOL_CONNECTIONS,
+            pool_maxsize=settings.GCP_MAX_POOL_CONNECTIONS,
+        )
+        client._http.mount("https://", adapter)
+        client._http.mount("http://", adapter)
+        return client
+
     def _get_item(self, file: io.BytesIO) -> Any:
         """
         Retrieve item data from the file object.
@@ -174,18 +210,25 @@ class GCPDataLoader(DataLoader):
         :param ignore_failures: If True, continues with next files after a failure; otherwise, raises an exception.
         :return: An iterable of tuples, each containing the data dictionary and its corresponding GCPFileMeta.
         """
-        uploaded = (
-            {}
-        )  # Cache to store downloaded data and avoid re-downloading.
         if not files:
             logger.warning("Nothing to download")
             return
 
         logger.info("Connecting to GCP Cloud Storage...")
+        executor = None
         try:
             gcp_client = self._get_client()
-            logger.info("Start downloading data from GCP...")
+            logger.info(
+                f"Start downloading data from GCP "
+                f"(concurrency: {self.download_concurrency})..."
+            )
 
+            executor = ThreadPoolExecutor(
+                max_workers=self.download_concurrency,
+                thread_name_prefix="gcp_download",
+            )
+            # Cache to store downloads and avoid re-downloading.
+            uploaded = self._submit_downloads(executor, gcp_client, files)
             for file_meta in files:
                 yield from self._process_file_meta(
                     gcp_client, file_meta, ignore_failures, uploaded
@@ -195,12 +238,63 @@ class GCPDataLoader(DataLoader):
             logger.error(f"Failed to load dataset from GCP: {err}")
             raise err
 
+        finally:
+            # Downloads aren't needed anymore if the consumer stopped early
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _get_cache_key(file_meta: GCPFileMeta) -> Tuple:
+        return file_meta.bucket, file_meta.file, file_meta.byte_range
+
+    def _download_item(
+        self, gcp_client: storage.Client, file_meta: GCPFileMeta
+    ) -> Any:
+        """
+        Downloads a file from GCP and converts it into an item.
+
+        :param gcp_client: GCP storage client.
+        :param file_meta: Metadata of the file to download.
+        :return: Item data.
+        """
+        return self._get_item(
+            self._read_from_gcp(
+                gcp_client,
+                file_meta.bucket,
+                file_meta.file,
+                file_meta.byte_range,
+            )
+        )
+
+    def _submit_downloads(
+        self,
+        executor: ThreadPoolExecutor,
+        gcp_client: storage.Client,
+        files: List[GCPFileMeta],
+    ) -> Dict[Tuple, Future]:
+        """
+        Schedules a download of each distinct file.
+
+        :param executor: Pool of download threads.
+        :param gcp_client: GCP storage client, shared by threads.
+        :param files: Metadata of files to download.
+        :return: Cache dictionary of download futures.
+        """
+        uploaded = dict()
+        for file_meta in files:
+            cache_key = self._get_cache_key(file_meta)
+            if cache_key not in uploaded:
+                uploaded[cache_key] = executor.submit(
+                    self._download_item, gcp_client, file_meta
+                )
+        return uploaded
+
     def _process_file_meta(
         self,
         gcp_client: storage.Client,
         file_meta: GCPFileMeta,
         ignore_failures: bool,
-        uploaded: Dict[Tuple[str, str], Any],
+        uploaded: Dict[Tuple, Any],
     ) -> Generator[Tuple[Dict, GCPFileMeta], None, None]:
         """
         Processes a single file metadata to download the file and prepare data objects.
@@ -230,25 +324,25 @@ class GCPDataLoader(DataLoader):
         self,
         gcp_client: storage.Client,
         file_meta: GCPFileMeta,
-        uploaded: Dict[Tuple[str, str], Any],
+        uploaded: Dict[Tuple, Any],
     ) -> Any:
         """
         Attempts to download the file from GCP if not already downloaded and cached.
+        Waits for the download if it's scheduled, its failure is raised here.
 
         :param gcp_client: GCP storage client.
         :param file_meta: Metadata of the file to download.
-        :param uploaded: Cache dictionary to store and retrieve downloaded files.
+        :param uploaded: Cache dictionary to store and retrieve downloaded files or their futures.
         :return: Downloaded or cached item data.
         """
-        cache_key = (file_meta.bucket, file_meta.file)
+        cache_key = self._get_cache_key(file_meta)
         if cache_key not in uploaded:
-            item = self._get_item(
-                self._read_from_gcp(
-                    gcp_client, file_meta.bucket, file_meta.file
-                )
-            )
-            uploaded[cache_key] = item
-        return uploaded[cache_key]
+            uploaded[cache_key] = self._download_item(gcp_client, file_meta)
+
+        item = uploaded[cache_key]
+        if isinstance(item, Future):
+            item = item.result()
+        return item
 
     def _yield_item_objects(
         self, item: Any, file_meta: GCPFileMeta
@@ -330,6 +424,40 @@ class GCPDataLoader(DataLoader):
 
         return result
 
+    def get_versions(self, items_data: List[GCPFileMeta]) -> Dict[str, str]:
+        """
+        Get generations of blobs by metadata requests, sent in parallel.
+
+        :param items_data: List of GCPFileMeta objects identifying the blobs
+        :return: Generations by item IDs, missing or failed blobs are omitted
+        """
+        if not items_data:
+            return dict()
+
+        gcp_client = self._get_client()
+
+        def get_version(item: GCPFileMeta) -> Optional[str]:
+            try:
+                blob = gcp_client.bucket(item.bucket).get_blob(item.file)
+            except Exception as e:
+                logger.warning(f"Failed to get generation of {item.file}: {e}")
+                return None
+            if blob is None or blob.generation is None:
+                return None
+            return str(blob.generation)
+
+        with ThreadPoolExecutor(
+            max_workers=self.download_concurrency,
+            thread_name_prefix="gcp_head",
+        ) as executor:
+            versions = list(executor.map(get_version, items_data))
+
+        return {
+            item.id: version
+            for item, version in zip(items_data, versions)
+            if version is not None
+        }
+
     @retry_method(name="download_data")
     def _download_blob(self, blob: Blob) -> Any:
         content = io.BytesIO()
@@ -352,63 +480,166 @@ class GCPDataLoader(DataLoader):
         bucket = gcp_client.bucket(bucket)
         return list(bucket.list_blobs())
 
+    @retry_method(name="download_data")
+    def _list_blobs_page(
+        self,
+        gcp_client: storage.Client,
+        bucket: str,
+        max_results: int,
+        token: Optional[str] = None,
+    ) -> Tuple[List[Blob], Optional[str]]:
+        """
+        List blobs of a bucket, resuming from a page token.
+
+        :param gcp_client: GCP storage client.
+        :param bucket: The name of the GCP Cloud Storage bucket.
+        :param max_results: Max number of blobs to list.
+        :param token: Page token to start from, None - from the beginning.
+        :return: Listed blobs and the page token after them, None if there are no more blobs.
+        """
+        iterator = gcp_client.list_blobs(
+            bucket, max_results=max_results, page_token=token
+        )
+        blobs = list(iterator)
+        return blobs, iterator.next_page_token
+
+    def _download_blobs(self, bucket: str, blobs: List[Blob]) -> LoadedBatch:
+        """
+        Download listed blobs in parallel, skipping failed ones.
+
+        :param bucket: The name of the GCP Cloud Storage bucket.
+        :param blobs: Blobs to download.
+        :return: A batch of downloaded items in the order of blobs, errors of
+                 failed ones are kept in its `failed`.
+        """
+        failed: Dict[str, str] = dict()
+
+        def download(blob: Blob) -> Optional[DownloadedItem]:
+            try:
+                content = self._download_blob(blob)
+                return DownloadedItem(
+                    id=blob.name,
+                    data=self._get_item(content),
+                    meta=GCPFileMeta(
+                        bucket=bucket,
+                        file=blob.name,
+                        version=(
+                            str(blob.generation)
+                            if blob.generation is not None
+                            else None
+                        ),
+                    ),
+                )
+            except Exception as e:
+                logger.exception(
+                    f"Error fetching batch item {blob.name} from GCP"
+                )
+                failed[blob.name] = str(e)
+                return None
+
+        with ThreadPoolExecutor(
+            max_workers=self.download_concurrency,
+            thread_name_prefix="gcp_download",
+        ) as executor:
+            batch = list(executor.map(download, blobs))
+
+        return LoadedBatch(
+            [item for item in batch if item is not None],
+            listed=len(blobs),
+            failed=failed,
+        )
+
     def _load_batch_with_offset(
         self, offset: int, batch_size: int, **kwargs
     ) -> List[DownloadedItem]:
         """
         Load a batch of files from GCP starting from a given offset up to the specified batch size.
 
+        GCP lists by page tokens only, so the token after each batch is
+        remembered and the next consecutive batch is listed from it. Other
+        offsets (e.g. batches loaded out of order or by another loader
+        instance) are reached by listing all blobs before them, which is
+        logged as a warning.
+
         :param offset: The offset from where to start loading files.
         :param batch_size: The number of files to load.
         :param kwargs: Additional keyword arguments including the bucket name.
         :return: A list of DownloadedItem, each containing the file key (ID), its content and metadata.
+                 Failed downloads are skipped, `listed` of the batch counts them
+                 and `failed` keeps their errors.
         """
+        bucket = kwargs["bucket"]
+        logger.info("Connecting to GCP Cloud Storage...")
+        gcp_client = self._get_client()
 
-        blobs = self._list_blobs(kwargs["bucket"])
-        batch = []
-
-        for index, blob in enumerate(blobs[offset : offset + batch_size]):
-            try:
-                content = self._download_blob(blob)
+        token = self._offset_tokens.pop((bucket, offset), None)
+        if token is None and offset > 0:
+            logger.warning(
+                f"Offset {offset} of bucket {bucket} doesn't follow "
+                f"a loaded batch, listing {offset} blobs to reach it"
+            )
+            _, token = self._list_blobs_page(gcp_client, bucket, offset)
+            if token is None:
+                return []
 
-                batch.append(
-                    DownloadedItem(
-                        id=blob.name,
-                        data=self._get_item(content),
-                        meta=GCPFileMeta(
-                            bucket=kwargs["bucket"], file=blob.name
-                        ),
-                    )
-                )
-            except Exception:
-                # TODO: pass failed_ids and related exceptions to the worker status
-                logger.exception(
-                    f"Error fetching batch item {blob.name} from GCP"
-                )
+        blobs, token = self._list_blobs_page(
+            gcp_client, bucket, batch_size, token
+        )
+        if token is not None:
+            self._offset_tokens[(bucket, offset + len(blobs))] = token
 
-        return batch
+        return self._download_blobs(bucket, blobs)
 
-    def load_all(
-        self, batch_size: int, **kwargs
-    ) -> Generator[DownloadedItem, None, None]:
+    def load_all_with_cursor(
+        self,
+        batch_size: int,
+        cursor: Optional[LoaderCursor] = None,
+        **kwargs,
+    ) -> Generator[Tuple[List[DownloadedItem], LoaderCursor], None, None]:
         """
-        A generator that iteratively loads batches using the `_load_batch_with_offset` method.
-        This allows for managing large datasets by processing them in manageable chunks.
+        Iterate over all files of buckets in batches, starting from a checkpointed cursor.
+
+        Each batch is listed resuming from the page token of the previous one,
+        the token is kept in the yielded cursor.
 
         :param batch_size: The size of each batch to load.
+        :param cursor: Position to start from, None - from the beginning.
         :param kwargs: Additional parameters including bucket names.
-        :yield: Each batch as a list of DownloadedItem.
+        :yield: Tuples of a batch as a list of downloaded items and the cursor after it.
         """
-        for bucket in kwargs["buckets"]:
-            offset = 0
+        cursor = cursor if cursor is not None else LoaderCursor()
+        if cursor.finished:
+            return
+
+        buckets = list(kwargs["buckets"])
+        start = 0 if cursor.source is None else buckets.index(cursor.source)
+        token, offset = cursor.token, cursor.offset
+        logger.info("Connecting to GCP Cloud Storage...")
+        gcp_client = self._get_client()
+        for index in range(start, len(buckets)):
+            bucket = buckets[index]
             while True:
-                current_batch = self._load_batch_with_offset(
-                    offset, batch_size, bucket=bucket
+                blobs, token = self._list_blobs_page(
+                    gcp_client, bucket, batch_size, token
                 )
-                if not current_batch:
-                    break  # Stop yielding if no more data is returned.
-                yield current_batch
-                offset += len(current_batch)
+                offset += len(blobs)
+                if token is not None:
+                    next_cursor = LoaderCursor(
+                        source=bucket, token=token, offset=offset
+                    )
+                elif index + 1 < len(buckets):
+                    next_cursor = LoaderCursor(source=buckets[index + 1])
+                else:
+                    next_cursor = LoaderCursor(finished=True)
+
+                if blobs:
+                    batch = self._download_blobs(bucket, blobs)
+                    yield batch, next_cursor
+
+                if token is None:
+                    break
+
+            offset = 0
 
     def total_count(self, **kwargs) -> Optional[int]:
         """
@@ -1,9 +1,11 @@
 import io
 import logging
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple, Type
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore import UNSIGNED
 from botocore.client import BaseClient, Config
 from botocore.exceptions import ClientError, EndpointConnectionError
@@ -17,8 +19,10 @@ from embedding_studio.data_storage.loaders.cloud_storage.s3.item_meta import (
 from embedding_studio.data_storage.loaders.data_loader import DataLoader
 from embedding_studio.data_storage.loaders.downloaded_item import (
     DownloadedItem,
+    LoadedBatch,
 )
 from embedding_studio.data_storage.loaders.item_meta import ItemMeta
+from embedding_studio.data_storage.loaders.loader_cursor import LoaderCursor
 from embedding_studio.utils.retry import retry_method
 from embedding_studio.workers.fine_tuning.utils.config import (
     RetryConfig,
@@ -27,6 +31,9 @@ from embedding_studio.workers.fine_tuning.utils.config import (
 
 logger = logging.getLogger(__name__)
 
+# Max number of keys S3 returns by a single list request
+S3_MAX_LIST_KEYS = 1000
+
 
 class AwsS3Credentials(BaseModel):
     """
@@ -49,15 +56,25 @@ class AwsS3Credentials(BaseModel):
     use_system_info: bool = False
 
 
-def read_from_s3(client, bucket: str, file: str) -> io.BytesIO:
+def read_from_s3(
+    client,
+    bucket: str,
+    file: str,
+    byte_range: Optional[Tuple[int, Optional[int]]] = None,
+    transfer_config: Optional[TransferConfig] = None,
+) -> io.BytesIO:
     """
     Reads a file from S3 and returns it as a BytesIO object.
 
     Helper function used by the AwsS3DataLoader to download files.
+    Whole files larger than the multipart threshold of `transfer_config` are
+    downloaded by parallel ranged requests.
 
     :param client: Boto3 S3 client
     :param bucket: S3 bucket name
     :param file: File path/key within the bucket
+    :param byte_range: Optional (first byte, last byte or None) to read only a part of the file
+    :param transfer_config: Optional config of whole file downloads
     :return: BytesIO object containing the file content or None if not found
     :raises ValueError: If bucket or file parameters are empty or not strings
     :raises ClientError: For S3 errors other than 404 (Not Found)
@@ -70,12 +87,23 @@ def read_from_s3(client, bucket: str, file: str) -> io.BytesIO:
 
     outfile = io.BytesIO()
     try:
-        client.download_fileobj(bucket, file, outfile)
+        if byte_range is not None:
+            start, end = byte_range
+            response = client.get_object(
+                Bucket=bucket,
+                Key=file,
+                Range=f"bytes={start}-{'' if end is None else end}",
+            )
+            outfile.write(response["Body"].read())
+        else:
+            client.download_fileobj(
+                bucket, file, outfile, Config=transfer_config
+            )
         outfile.seek(0)
         return outfile
 
     except ClientError as e:
-        if e.response["Error"]["Code"] == "404":
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
             logger.error(f"Object {file} not found in bucket {bucket}")
             return None
         else:
@@ -89,9 +117,12 @@ class AwsS3DataLoader(DataLoader):
 
     This class provides functionality to load data items from AWS S3 buckets
     with retry capabilities and customizable authentication methods.
+    Files are downloaded by a bounded pool of threads sharing one client
+    and its connection pool, while items are yielded in the requested order.
 
     :param retry_config: Configuration for retry strategies when operations fail
     :param features: Expected features schema for loaded datasets
+    :param download_concurrency: Max number of files downloaded at the same time
     :param kwargs: Additional parameters for AWS S3 credentials configuration
     """
 
@@ -99,12 +130,14 @@ class AwsS3DataLoader(DataLoader):
         self,
         retry_config: Optional[RetryConfig] = None,
         features: Optional[Features] = None,
+        download_concurrency: int = settings.S3_DOWNLOAD_CONCURRENCY,
         **kwargs,
     ):
         """Items loader from AWS S3.
 
         :param retry_config: retry strategy (default: None)
         :param features: expected features (default: None)
+        :param download_concurrency: max number of parallel downloads
         :param kwargs: dict data for AwsS3Credentials
         """
         super(AwsS3DataLoader, self).__init__(**kwargs)
@@ -116,6 +149,13 @@ class AwsS3DataLoader(DataLoader):
         self.features = features
         self.credentials = AwsS3Credentials(**kwargs)
         self.attempt_exception_types = [EndpointConnectionError]
+        self.download_concurrency = max(int(download_concurrency), 1)
+        # (bucket, offset) -> continuation token to list consecutive batches
+        self._offset_tokens: Dict[Tuple[str, int], str] = dict()
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            max_concurrency=settings.S3_TRANSFER_MAX_CONCURRENCY,
+        )
 
     @property
     def item_meta_cls(self) -> Type[ItemMeta]:
@@ -152,8 +192,28 @@ class AwsS3DataLoader(DataLoader):
         )
         return config
 
+    @staticmethod
+    def _get_client_config(**kwargs) -> Config:
+        """
+        Creates a botocore config with a connection pool large enough for
+        parallel downloads.
+
+        :param kwargs: Additional botocore config parameters
+        :return: Botocore client config
+        """
+        return Config(
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+            **kwargs,
+        )
+
     @retry_method(name="download_data")
-    def _read_from_s3(self, client, bucket: str, file: str) -> Any:
+    def _read_from_s3(
+        self,
+        client,
+        bucket: str,
+        file: str,
+        byte_range: Optional[Tuple[int, Optional[int]]] = None,
+    ) -> Any:
         """
         Reads a file from S3 with retry capabilities.
 
@@ -163,9 +223,12 @@ class AwsS3DataLoader(DataLoader):
         :param client: Boto3 S3 client
         :param bucket: S3 bucket name
         :param file: File path/key within the bucket
+        :param byte_range: Optional range of bytes to read
         :return: File content as BytesIO object
         """
-        return read_from_s3(client, bucket, file)
+        return read_from_s3(
+            client, bucket, file, byte_range, self.transfer_config
+        )
 
     @retry_method(name="credentials")
     def _get_client(self, task_id: str):
@@ -187,7 +250,8 @@ class AwsS3DataLoader(DataLoader):
                 "No specific AWS credentials, use Anonymous session"
             )
             s3_client = boto3.client(
-                "s3", config=Config(signature_version=UNSIGNED)
+                "s3",
+                config=self._get_client_config(signature_version=UNSIGNED),
             )
         else:
             sts_client = boto3.client(
@@ -212,6 +276,7 @@ class AwsS3DataLoader(DataLoader):
                 aws_access_key_id=credentials["AccessKeyId"],
                 aws_secret_access_key=credentials["SecretAccessKey"],
                 aws_session_token=credentials["SessionToken"],
+                config=self._get_client_config(),
             )
         return s3_client
 
@@ -244,9 +309,6 @@ class AwsS3DataLoader(DataLoader):
         :param ignore_failures: If True, continues with next files after a failure; otherwise, raises an exception.
         :return: An iterable of tuples, each containing the data dictionary and its corresponding S3FileMeta.
         """
-        uploaded = (
-            {}
-        )  # Cache to store downloaded data and avoid re-downloading.
         if not files:
             logger.warning("Nothing to download")
             return
@@ -254,19 +316,78 @@ class AwsS3DataLoader(DataLoader):
         logger.info("Connecting to AWS S3...")
         task_id = str(uuid.uuid4())
         s3_client = self._get_client(task_id)
-        logger.info("Start downloading data from S3...")
+        logger.info(
+            f"Start downloading data from S3 "
+            f"(concurrency: {self.download_concurrency})..."
+        )
 
-        for file_meta in files:
-            yield from self._process_file_meta(
-                s3_client, file_meta, ignore_failures, uploaded
+        executor = ThreadPoolExecutor(
+            max_workers=self.download_concurrency,
+            thread_name_prefix="s3_download",
+        )
+        try:
+            # Cache to store downloads and avoid re-downloading.
+            uploaded = self._submit_downloads(executor, s3_client, files)
+            for file_meta in files:
+                yield from self._process_file_meta(
+                    s3_client, file_meta, ignore_failures, uploaded
+                )
+        finally:
+            # Downloads aren't needed anymore if the consumer stopped early
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _get_cache_key(file_meta: S3FileMeta) -> Tuple:
+        return file_meta.bucket, file_meta.file, file_meta.byte_range
+
+    def _download_item(
+        self, s3_client: BaseClient, file_meta: S3FileMeta
+    ) -> Any:
+        """
+        Downloads a file from S3 and converts it into an item.
+
+        :param s3_client: Boto3 S3 client.
+        :param file_meta: Metadata of the file to download.
+        :return: Item data.
+        """
+        return self._get_item(
+            self._read_from_s3(
+                s3_client,
+                file_meta.bucket,
+                file_meta.file,
+                file_meta.byte_range,
             )
+        )
+
+    def _submit_downloads(
+        self,
+        executor: ThreadPoolExecutor,
+        s3_client: BaseClient,
+        files: List[S3FileMeta],
+    ) -> Dict[Tuple, Future]:
+        """
+        Schedules a download of each distinct file.
+
+        :param executor: Pool of download threads.
+        :param s3_client: Boto3 S3 client, shared by threads.
+        :param files: Metadata of files to download.
+        :return: Cache dictionary of download futures.
+        """
+        uploaded = dict()
+        for file_meta in files:
+            cache_key = self._get_cache_key(file_meta)
+            if cache_key not in uploaded:
+                uploaded[cache_key] = executor.submit(
+                    self._download_item, s3_client, file_meta
+                )
+        return uploaded
 
     def _process_file_meta(
         self,
         s3_client: BaseClient,
         file_meta: S3FileMeta,
         ignore_failures: bool,
-        uploaded: Dict[Tuple[str, str], Any],
+        uploaded: Dict[Tuple, Any],
     ) -> Generator[Tuple[Dict, S3FileMeta], None, None]:
         """
         Processes a single file metadata to download the file and prepare data objects.
@@ -296,23 +417,25 @@ class AwsS3DataLoader(DataLoader):
         self,
         s3_client: BaseClient,
         file_meta: S3FileMeta,
-        uploaded: Dict[Tuple[str, str], Any],
+        uploaded: Dict[Tuple, Any],
     ) -> Any:
         """
         Attempts to download the file from S3 if not already downloaded and cached.
+        Waits for the download if it's scheduled, its failure is raised here.
 
         :param s3_client: Boto3 S3 client.
         :param file_meta: Metadata of the file to download.
-        :param uploaded: Cache dictionary to store and retrieve downloaded files.
+        :param uploaded: Cache dictionary to store and retrieve downloaded files or their futures.
         :return: Downloaded or cached item data.
         """
-        cache_key = (file_meta.bucket, file_meta.file)
+        cache_key = self._get_cache_key(file_meta)
         if cache_key not in uploaded:
-            item = self._get_item(
-                self._read_from_s3(s3_client, file_meta.bucket, file_meta.file)
-            )
-            uploaded[cache_key] = item
-        return uploaded[cache_key]
+            uploaded[cache_key] = self._download_item(s3_client, file_meta)
+
+        item = uploaded[cache_key]
+        if isinstance(item, Future):
+            item = item.result()
+        return item
 
     def _yield_item_objects(
         self, item: Any, file_meta: S3FileMeta
@@ -397,76 +520,208 @@ class AwsS3DataLoader(DataLoader):
 
         return result
 
+    def get_versions(self, items_data: List[S3FileMeta]) -> Dict[str, str]:
+        """
+        Get ETags of files by HEAD requests, sent in parallel.
+
+        :param items_data: List of S3FileMeta objects identifying the files
+        :return: ETags by item IDs, files failed to be requested are omitted
+        """
+        if not items_data:
+            return dict()
+
+        s3_client = self._get_client(str(uuid.uuid4()))
+
+        def get_version(item: S3FileMeta) -> Optional[str]:
+            try:
+                return s3_client.head_object(
+                    Bucket=item.bucket, Key=item.file
+                ).get("ETag")
+            except ClientError as e:
+                logger.warning(f"Failed to get ETag of {item.file}: {e}")
+                return None
+
+        with ThreadPoolExecutor(
+            max_workers=self.download_concurrency,
+            thread_name_prefix="s3_head",
+        ) as executor:
+            versions = list(executor.map(get_version, items_data))
+
+        return {
+            item.id: version
+            for item, version in zip(items_data, versions)
+            if version is not None
+        }
+
+    @retry_method(name="download_data")
+    def _list_keys(
+        self,
+        s3_client: BaseClient,
+        bucket: str,
+        max_keys: int,
+        token: Optional[str] = None,
+    ) -> Tuple[List[str], Optional[str]]:
+        """
+        List keys of a bucket, resuming from a continuation token.
+
+        :param s3_client: Boto3 S3 client.
+        :param bucket: S3 bucket name.
+        :param max_keys: Max number of keys to list.
+        :param token: Continuation token to start from, None - from the beginning.
+        :return: Listed keys and the continuation token after them, None if there are no more keys.
+        """
+        keys = []
+        while len(keys) < max_keys:
+            params = dict(
+                Bucket=bucket,
+                MaxKeys=min(max_keys - len(keys), S3_MAX_LIST_KEYS),
+            )
+            if token is not None:
+                params["ContinuationToken"] = token
+
+            response = s3_client.list_objects_v2(**params)
+            keys += [item["Key"] for item in response.get("Contents", [])]
+            token = (
+                response.get("NextContinuationToken")
+                if response.get("IsTruncated")
+                else None
+            )
+            if token is None:
+                break
+
+        return keys, token
+
+    def _download_keys(
+        self, s3_client: BaseClient, bucket: str, keys: List[str]
+    ) -> LoadedBatch:
+        """
+        Download listed files of a bucket in parallel, skipping failed ones.
+
+        :param s3_client: Boto3 S3 client.
+        :param bucket: S3 bucket name.
+        :param keys: Keys of files to download.
+        :return: A batch of downloaded items in the order of keys, errors of
+                 failed ones are kept in its `failed`.
+        """
+        failed: Dict[str, str] = dict()
+
+        def download(key: str) -> Optional[DownloadedItem]:
+            try:
+                response = s3_client.get_object(Bucket=bucket, Key=key)
+                content = io.BytesIO(response["Body"].read())
+                return DownloadedItem(
+                    id=key,
+                    data=self._get_item(content),
+                    meta=S3FileMeta(
+                        bucket=bucket, file=key, version=response.get("ETag")
+                    ),
+                )
+            except ClientError as e:
+                logger.exception(f"Error fetching batch item {key} from S3")
+                failed[key] = str(e)
+                return None
+
+        with ThreadPoolExecutor(
+            max_workers=self.download_concurrency,
+            thread_name_prefix="s3_download",
+        ) as executor:
+            batch = list(executor.map(download, keys))
+
+        return LoadedBatch(
+            [item for item in batch if item is not None],
+            listed=len(keys),
+            failed=failed,
+        )
+
     def _load_batch_with_offset(
         self, offset: int, batch_size: int, **kwargs
     ) -> List[DownloadedItem]:
         """
         Load a batch of files from S3 starting from the given offset up to the batch size.
 
+        S3 lists by continuation tokens only, so the token after each batch is
+        remembered and the next consecutive batch is listed from it. Other
+        offsets (e.g. batches loaded out of order or by another loader
+        instance) are reached by listing all keys before them, which is
+        logged as a warning.
+
         :param offset: The offset from where to start loading files.
         :param batch_size: The number of files to load.
         :return: A list of downloaded items, each containing the file key (ID), its content and metadata.
+                 Failed downloads are skipped, `listed` of the batch counts them
+                 and `failed` keeps their errors.
         """
+        bucket = kwargs["bucket"]
         logger.info("Connecting to aws s3...")
         task_id: str = str(uuid.uuid4())
         s3_client = self._get_client(task_id)
 
-        paginator = s3_client.get_paginator("list_objects_v2")
-        page_iterator = paginator.paginate(
-            Bucket=kwargs["bucket"],
-            PaginationConfig={
-                "PageSize": batch_size,
-                "StartingToken": str(offset),
-            },
-        )
+        token = self._offset_tokens.pop((bucket, offset), None)
+        if token is None and offset > 0:
+            logger.warning(
+                f"Offset {offset} of bucket {bucket} doesn't follow "
+                f"a loaded batch, listing {offset} keys to reach it"
+            )
+            _, token = self._list_keys(s3_client, bucket, offset)
+            if token is None:
+                return []
 
-        batch = []
-        for page in page_iterator:
-            for item in page.get("Contents", []):
-                key = item["Key"]
-                try:
-                    response = s3_client.get_object(
-                        Bucket=kwargs["bucket"], Key=key
-                    )
-                    content = io.BytesIO(response["Body"].read())
-                    batch.append(
-                        DownloadedItem(
-                            id=key,
-                            data=self._get_item(content),
-                            meta=S3FileMeta(bucket=kwargs["bucket"], file=key),
-                        )
-                    )
-                    if len(batch) >= batch_size:
-                        return batch
-                except ClientError:
-                    # TODO: pass failed_ids and related exceptions to the worker status
-                    logger.exception(
-                        f"Error fetching batch item {key} from S3"
-                    )
+        keys, token = self._list_keys(s3_client, bucket, batch_size, token)
+        if token is not None:
+            self._offset_tokens[(bucket, offset + len(keys))] = token
 
-        return batch
+        return self._download_keys(s3_client, bucket, keys)
 
-    def load_all(
-        self, batch_size: int, **kwargs
-    ) -> Generator[DownloadedItem, None, None]:
+    def load_all_with_cursor(
+        self,
+        batch_size: int,
+        cursor: Optional[LoaderCursor] = None,
+        **kwargs,
+    ) -> Generator[Tuple[List[DownloadedItem], LoaderCursor], None, None]:
         """
-        A generator that iteratively loads batches using the `load_batch` method.
-        This allows for managing large datasets by processing them in manageable chunks.
-        Each batch is yielded to the caller, which can handle or process the batch as needed.
+        Iterate over all files of buckets in batches, starting from a checkpointed cursor.
+
+        Each batch is listed with a single request resuming from the continuation
+        token of the previous one, the token is kept in the yielded cursor.
 
         :param batch_size: The size of each batch to load.
-        :yield: Each batch as a list of downloaded items (id, data, item_info).
+        :param cursor: Position to start from, None - from the beginning.
+        :param kwargs: Additional parameters including bucket names.
+        :yield: Tuples of a batch as a list of downloaded items and the cursor after it.
         """
-        for bucket in kwargs["buckets"]:
-            offset = 0
+        cursor = cursor if cursor is not None else LoaderCursor()
+        if cursor.finished:
+            return
+
+        buckets = list(kwargs["buckets"])
+        start = 0 if cursor.source is None else buckets.index(cursor.source)
+        token, offset = cursor.token, cursor.offset
+        for index in range(start, len(buckets)):
+            bucket = buckets[index]
             while True:
-                current_batch = self._load_batch_with_offset(
-                    offset, batch_size, bucket=bucket
+                logger.info("Connecting to aws s3...")
+                s3_client = self._get_client(str(uuid.uuid4()))
+                keys, token = self._list_keys(
+                    s3_client, bucket, batch_size, token
                 )
-                if not current_batch:
-                    break  # Stop yielding if no more data is returned.
-                yield current_batch
-                offset += batch_size
+                offset += len(keys)
+                if token is not None:
+                    next_cursor = LoaderCursor(
+                        source=bucket, token=token, offset=offset
+                    )
+                elif index + 1 < len(buckets):
+                    next_cursor = LoaderCursor(source=buckets[index + 1])
+                else:
+                    next_cursor = LoaderCursor(finished=True)
+
+                if keys:
+                    batch = self._download_keys(s3_client, bucket, keys)
+                    yield batch, next_cursor
+
+                if token is None:
+                    break
+
+            offset = 0
 
     def total_count(self, **kwargs) -> Optional[int]:
         """
@@ -1,12 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Generator, List, Optional, Type
+from typing import Dict, Generator, List, Optional, Tuple, Type
 
 from datasets import Dataset
 
 from embedding_studio.data_storage.loaders.downloaded_item import (
     DownloadedItem,
+    get_listed_count,
 )
 from embedding_studio.data_storage.loaders.item_meta import ItemMeta
+from embedding_studio.data_storage.loaders.loader_cursor import LoaderCursor
 
 
 class DataLoader(ABC):
@@ -86,6 +88,34 @@ class DataLoader(ABC):
         """
         raise NotImplemented
 
+    def iter_items(
+        self, items_data: List[ItemMeta]
+    ) -> Generator[DownloadedItem, None, None]:
+        """
+        Load individual items, yielding them as soon as they're loaded, so
+        a consumer can start processing before the whole list is loaded.
+
+        Base implementation yields the result of `load_items`, loaders able to
+        stream (e.g. AggregatedDataLoader) override it.
+
+        :param items_data: List of ItemMeta objects identifying the items to load
+        :yield: DownloadedItem objects containing the loaded data and metadata
+        """
+        yield from self.load_items(items_data)
+
+    def get_versions(self, items_data: List[ItemMeta]) -> Dict[str, str]:
+        """
+        Get current versions of items content in their storage (e.g. ETag),
+        without downloading the content.
+
+        Base implementation knows no versions, loaders able to get them
+        cheaply (e.g. by S3 HEAD requests) override it.
+
+        :param items_data: List of ItemMeta objects identifying the items
+        :return: Versions by item IDs, items with unknown versions are omitted
+        """
+        return dict()
+
     @abstractmethod
     def _load_batch_with_offset(
         self, offset: int, batch_size: int, **kwargs
@@ -138,10 +168,40 @@ class DataLoader(ABC):
         :param batch_size: The size of each batch to load.
         :yield: Each batch as a list of tuples (id, data, item_info).
         """
-        offset = 0
+        for current_batch, _ in self.load_all_with_cursor(
+            batch_size, **kwargs
+        ):
+            yield current_batch
+
+    def load_all_with_cursor(
+        self,
+        batch_size: int,
+        cursor: Optional[LoaderCursor] = None,
+        **kwargs,
+    ) -> Generator[Tuple[List[DownloadedItem], LoaderCursor], None, None]:
+        """
+        Iterate over all items in batches, starting from a checkpointed cursor.
+
+        Each batch is yielded with a cursor pointing right after it. Store it
+        once the batch is processed to resume from there later.
+
+        Base implementation moves the cursor by offsets, loaders with native
+        page tokens (e.g. cloud storages) override it to avoid re-listing.
+
+        :param batch_size: The size of each batch to load.
+        :param cursor: Position to start from, None - from the beginning.
+        :yield: Tuples of a batch as a list of downloaded items and the cursor after it.
+        """
+        cursor = cursor if cursor is not None else LoaderCursor()
+        if cursor.finished:
+            return
+
+        offset = cursor.offset
         while True:
             current_batch = self._load_batch_with_offset(offset, batch_size)
-            if not current_batch:
-                break  # Stop yielding if no more data is returned.
-            yield current_batch
+            if get_listed_count(current_batch) == 0:
+                break  # Stop yielding if no more data is listed.
             offset += batch_size
+            # A batch with all downloads failed is skipped, not the rest
+            if current_batch:
+                yield current_batch, LoaderCursor(offset=offset)
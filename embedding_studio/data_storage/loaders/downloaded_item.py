@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Dict, Iterable, List, Optional
 
 from pydantic import BaseModel
 
@@ -20,3 +20,36 @@ class DownloadedItem(BaseModel):
     id: str
     data: Any
     meta: ItemMeta
+
+
+class LoadedBatch(list):
+    """
+    A batch of items loaded by offset, which remembers how many items were
+    listed for it. Items failed to be downloaded are listed but not loaded,
+    so iteration stops when nothing is listed, not when nothing is loaded.
+    Their errors are kept, so a task can report them in its status.
+
+    :param items: Loaded items
+    :param listed: Number of listed items, None - the number of loaded ones
+    :param failed: Errors of items failed to be downloaded by their IDs
+    """
+
+    def __init__(
+        self,
+        items: Iterable[DownloadedItem] = (),
+        listed: Optional[int] = None,
+        failed: Optional[Dict[str, str]] = None,
+    ):
+        super(LoadedBatch, self).__init__(items)
+        self.listed = len(self) if listed is None else int(listed)
+        self.failed: Dict[str, str] = dict(failed or dict())
+
+
+def get_listed_count(batch: List[DownloadedItem]) -> int:
+    """
+    Get the number of items listed for a batch.
+
+    :param batch: Batch returned by `_load_batch_with_offset`
+    :return: Number of listed items, the batch size for plain lists
+    """
+    return batch.listed if isinstance(batch, LoadedBatch) else len(batch)
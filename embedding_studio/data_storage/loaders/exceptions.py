@@ -0,0 +1,23 @@
+from typing import Dict, List
+
+from embedding_studio.data_storage.loaders.item_meta import ItemMeta
+
+
+class SourcesLoadingException(Exception):
+    """
+    Raised by a multi-source loader once items of all sources are loaded,
+    if loading from some of them failed.
+
+    :param failures: Source name -> exception raised while loading from it
+    :param failed_items: Items which weren't loaded
+    """
+
+    def __init__(
+        self, failures: Dict[str, Exception], failed_items: List[ItemMeta]
+    ):
+        super(SourcesLoadingException, self).__init__(
+            f"Failed to load {len(failed_items)} items from sources: "
+            f"{', '.join(failures.keys())}"
+        )
+        self.failures = failures
+        self.failed_items = failed_items
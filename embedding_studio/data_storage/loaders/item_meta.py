@@ -18,6 +18,16 @@ from pydantic import BaseModel
 # Why it's needed: A universal way to get a unique identifier for the item, whether it is directly set or calculated.
 # When it is used: Always, when a unique identifier for the item is needed.
 #
+# version
+# What it is: An optional version of the item content in its storage (e.g. S3 ETag, GCS generation, row update time).
+# Why it's needed: Cached downloads keep it, so a changed item is downloaded again.
+# When it is used: When items are loaded through CachedDataLoader.
+#
+# content_fingerprint
+# What it is: A digest of the item content after preprocessing, set by the upsertion pipeline.
+# Why it's needed: It's stored with the object's storage meta, so an unchanged item isn't embedded again on a resync or reindex.
+# When it is used: When items are upserted into a collection which already has them.
+#
 # Hash
 # Why it's needed: So that instances of ItemMeta can be used as keys in dictionaries or stored in sets. The hash is calculated based on the id, ensuring uniqueness.
 # When it is used: When storing or comparing multiple items, allowing it to be done efficiently and correctly.
@@ -33,10 +43,14 @@ class ItemMeta(BaseModel):
 
     :param object_id: Optional explicit identifier for the item
     :param payload: Optional dictionary containing additional metadata
+    :param version: Optional version of the item content in its storage (e.g. ETag)
+    :param content_fingerprint: Digest of the preprocessed content, set on upsertion
     """
 
     object_id: Optional[str] = None
     payload: Optional[Dict[str, Any]] = None
+    version: Optional[str] = None
+    content_fingerprint: Optional[str] = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -0,0 +1,24 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class LoaderCursor(BaseModel):
+    """
+    Durable position of iterating over all items of a data loader.
+
+    A cursor is yielded along with each batch of `DataLoader.load_all_with_cursor`
+    and points right after the batch. It's JSON serializable, so a task can
+    checkpoint it once the batch is processed and resume from it after a crash
+    instead of listing the source from the start.
+
+    :param source: Source (e.g. a bucket) the iteration is in, None - the first one
+    :param token: Opaque token of the next page within the source (e.g. S3 continuation token)
+    :param offset: Number of items already loaded from the source
+    :param finished: Whether all items are loaded
+    """
+
+    source: Optional[str] = None
+    token: Optional[str] = None
+    offset: int = 0
+    finished: bool = False
@@ -1,16 +1,19 @@
+import json
 import logging
+import time
 from typing import Any, Dict, Generator, List, Optional, Tuple, Type
 
 from datasets import Dataset, Features
 from sqlalchemy import create_engine
 from sqlalchemy.engine.row import Row
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import DBAPIError, OperationalError, SQLAlchemyError
 
 from embedding_studio.core.config import settings
 from embedding_studio.data_storage.loaders.data_loader import DataLoader
 from embedding_studio.data_storage.loaders.downloaded_item import (
     DownloadedItem,
 )
+from embedding_studio.data_storage.loaders.loader_cursor import LoaderCursor
 from embedding_studio.data_storage.loaders.sql.pgsql.item_meta import (
     PgsqlFileMeta,
 )
@@ -33,10 +36,17 @@ class PgsqlDataLoader(DataLoader):
     using SQLAlchemy. It supports fetching individual items, batches, and
     complete datasets with configurable retry logic.
 
+    In streaming mode all rows are read by a single query through a
+    server-side cursor, ordered by ID, so memory doesn't depend on the table
+    size and the position is resumable by the last read ID.
+
     :param connection_string: PostgreSQL connection string
     :param query_generator: PostgreSQL query generator class
     :param retry_config: Retry strategy (default: None)
     :param features: Expected features for the dataset (default: None)
+    :param streaming: Whether to stream all rows instead of LIMIT/OFFSET pages
+    :param version_column: Column with a version of a row content (e.g.
+                           updated_at), used as a version of listed items
     :return: A new PgsqlDataLoader instance
     """
 
@@ -46,6 +56,8 @@ class PgsqlDataLoader(DataLoader):
         query_generator: Type[AbstractQueryGenerator],
         retry_config: Optional[RetryConfig] = None,
         features: Optional[Features] = None,
+        streaming: bool = settings.PGSQL_DATA_LOADER_STREAMING,
+        version_column: Optional[str] = None,
         **kwargs,
     ):
         """Items loader from PostgreSQL.
@@ -54,6 +66,8 @@ class PgsqlDataLoader(DataLoader):
         :param query_generator: PostgreSQL query generator class.
         :param retry_config: retry strategy (default: None).
         :param features: expected features (default: None).
+        :param streaming: stream all rows with a server-side cursor (default: PGSQL_DATA_LOADER_STREAMING).
+        :param version_column: column with a version of a row content, e.g. updated_at (default: None).
         """
         super(PgsqlDataLoader, self).__init__(**kwargs)
         self.connection_string = connection_string
@@ -61,10 +75,16 @@ class PgsqlDataLoader(DataLoader):
             retry_config if retry_config else self._get_default_retry_config()
         )
         self.features = features
+        self.streaming = streaming
+        self.version_column = version_column
         self.engine = create_engine(
             self.connection_string,
+            pool_size=settings.PGSQL_DATA_LOADER_POOL_SIZE,
+            pool_pre_ping=True,
         )
         self.query_generator = query_generator(self.engine)
+        # offset -> ID of the row before it, to page consecutive batches
+        self._offset_last_ids: Dict[int, Any] = dict()
 
     @property
     def item_meta_cls(self) -> Type[PgsqlFileMeta]:
@@ -92,30 +112,34 @@ class PgsqlDataLoader(DataLoader):
         )
         return config
 
+    @staticmethod
+    def _row_to_dict(row: Any) -> Dict[str, Any]:
+        return dict(row._mapping) if isinstance(row, Row) else dict(row)
+
     @retry_method(name="fetch_data")
     def _fetch_data(self, row_ids: List[int]) -> List[Dict[str, Any]]:
         """Fetch data from PostgreSQL based on a list of row IDs.
 
+        IDs are fetched in chunks of PGSQL_DATA_LOADER_FETCH_BATCH_SIZE over
+        a single pooled connection.
+
         :param row_ids: The list of row IDs to fetch data for.
         :return: A list of dictionaries containing the data for the given row IDs.
         """
+        chunk_size = max(int(settings.PGSQL_DATA_LOADER_FETCH_BATCH_SIZE), 1)
         try:
             with self.engine.connect() as connection:
-                query = self.query_generator.fetch_all(
-                    row_ids
-                )  # Using fetch_all with multiple row_ids
-                results = connection.execute(query).fetchall()
-
-                return (
-                    [
-                        dict(row._mapping)
-                        if isinstance(row, Row)
-                        else dict(row)
-                        for row in results
+                data_list = []
+                for start in range(0, len(row_ids), chunk_size):
+                    query = self.query_generator.fetch_all(
+                        row_ids[start : start + chunk_size]
+                    )  # Using fetch_all with multiple row_ids
+                    data_list += [
+                        self._row_to_dict(row)
+                        for row in connection.execute(query)
                     ]
-                    if results
-                    else []
-                )
+
+                return data_list
         except SQLAlchemyError as e:
             logger.exception(
                 f"Failed to fetch data for row IDs {row_ids}: {str(e)}"
@@ -232,11 +256,35 @@ class PgsqlDataLoader(DataLoader):
             )
         return result
 
+    def _rows_to_batch(self, rows: List[Any]) -> List[DownloadedItem]:
+        """Convert fetched rows into downloaded items.
+
+        :param rows: Rows fetched from PostgreSQL.
+        :return: A list of downloaded items, each containing the row ID, its content, and metadata.
+        """
+        batch = []
+        for row in rows:
+            data = self._row_to_dict(row)
+            version = (
+                data.get(self.version_column) if self.version_column else None
+            )
+            item_meta = PgsqlFileMeta(
+                object_id=data.get("id"),
+                version=str(version) if version is not None else None,
+            )
+            batch.append(
+                DownloadedItem(id=item_meta.id, data=data, meta=item_meta)
+            )
+        return batch
+
     def _load_batch_with_offset(
         self, offset: int, batch_size: int, **kwargs
     ) -> List[DownloadedItem]:
         """Load a batch of rows from PostgreSQL starting from the given offset up to the batch size.
 
+        The last ID of each batch is remembered, so the next consecutive batch
+        is fetched by keys (`id > last_id`) instead of skipping rows by OFFSET.
+
         :param offset: The offset from where to start loading rows.
         :param batch_size: The number of rows to load.
         :return: A list of downloaded items, each containing the row ID, its content, and metadata.
@@ -246,40 +294,124 @@ class PgsqlDataLoader(DataLoader):
         )
         try:
             with self.engine.connect() as connection:
-                query = self.query_generator.all(
-                    offset=offset, batch_size=batch_size
-                )
-                results = connection.execute(query).fetchall()
-
-                batch = []
-                for result in results:
-                    data = dict(result)
-                    item_meta = PgsqlFileMeta(object_id=data.get("id"))
-                    batch.append(
-                        DownloadedItem(
-                            id=item_meta.id, data=data, meta=item_meta
+                query = None
+                if offset in self._offset_last_ids:
+                    try:
+                        query = self.query_generator.all_after(
+                            self._offset_last_ids.pop(offset), batch_size
                         )
+                    except NotImplementedError:
+                        pass
+
+                if query is None:
+                    query = self.query_generator.all(
+                        offset=offset, batch_size=batch_size
                     )
+
+                batch = self._rows_to_batch(
+                    connection.execute(query).fetchall()
+                )
+                if batch:
+                    last_id = batch[-1].data.get("id")
+                    self._offset_last_ids[offset + len(batch)] = last_id
                 return batch
         except SQLAlchemyError as e:
             logger.exception(f"Error fetching batch: {str(e)}")
             return []
 
-    def load_all(
-        self, batch_size: int, **kwargs
-    ) -> Generator[DownloadedItem, None, None]:
-        """A generator that iteratively loads batches from PostgreSQL using the `load_batch` method.
+    def load_all_with_cursor(
+        self,
+        batch_size: int,
+        cursor: Optional[LoaderCursor] = None,
+        **kwargs,
+    ) -> Generator[Tuple[List[DownloadedItem], LoaderCursor], None, None]:
+        """Iterate over all rows in batches, starting from a checkpointed cursor.
+
+        In streaming mode rows are read by a single query ordered by ID through
+        a server-side cursor of one pooled connection, `batch_size` rows at
+        a time. The yielded cursor keeps the last read ID, so a resumed
+        iteration starts right after it. A lost connection is retried with
+        "fetch_data" retry params, resuming after the last yielded row.
 
         :param batch_size: The size of each batch to load.
-        :yield: Each batch as a list of downloaded items (id, data, item_info).
+        :param cursor: Position to start from, None - from the beginning.
+        :yield: Tuples of a batch as a list of downloaded items and the cursor after it.
         """
-        offset = 0
+        cursor = cursor if cursor is not None else LoaderCursor()
+        if cursor.finished:
+            return
+
+        last_id = json.loads(cursor.token) if cursor.token else None
+        query = None
+        if self.streaming and (cursor.token or not cursor.offset):
+            try:
+                query = self.query_generator.all_after(last_id)
+            except NotImplementedError:
+                logger.warning(
+                    f"{type(self.query_generator).__name__} doesn't "
+                    f"support keyset pagination, use offsets"
+                )
+
+        if query is None:
+            yield from super(PgsqlDataLoader, self).load_all_with_cursor(
+                batch_size, cursor, **kwargs
+            )
+            return
+
+        retry_params = self.retry_config["fetch_data"]
+        offset, attempts = cursor.offset, 0
         while True:
-            current_batch = self._load_batch_with_offset(offset, batch_size)
-            if not current_batch:
-                break  # Stop yielding if no more data is returned.
-            yield current_batch
-            offset += batch_size
+            try:
+                for batch in self._stream_batches(query, batch_size):
+                    attempts = 0
+                    offset += len(batch)
+                    last_id = batch[-1].data.get("id")
+                    yield batch, LoaderCursor(
+                        token=json.dumps(last_id, default=str), offset=offset
+                    )
+                return
+
+            except SQLAlchemyError as e:
+                attempts += 1
+                if not self.is_retryable_error(e) or attempts >= (
+                    retry_params.max_attempts or 1
+                ):
+                    raise
+
+                logger.warning(
+                    f"Streaming rows after ID {last_id} failed "
+                    f"(attempt {attempts}), resume: {e}"
+                )
+                time.sleep(retry_params.wait_time_seconds)
+                # Rows up to the last yielded one aren't read again
+                query = self.query_generator.all_after(last_id)
+
+    def _stream_batches(
+        self, query: Any, batch_size: int
+    ) -> Generator[List[DownloadedItem], None, None]:
+        """Stream rows of a query through a server-side cursor in batches.
+
+        :param query: Query of rows ordered by ID.
+        :param batch_size: The size of each batch to load.
+        :yield: Batches of downloaded items.
+        """
+        with self.engine.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=batch_size
+            ).execute(query)
+            for rows in result.partitions(batch_size):
+                yield self._rows_to_batch(rows)
+
+    @staticmethod
+    def is_retryable_error(e: Exception) -> bool:
+        """Whether a failed query may succeed on a new connection.
+
+        :param e: Raised exception.
+        :return: True for lost connections and other operational errors.
+        """
+        return isinstance(e, OperationalError) or (
+            isinstance(e, DBAPIError) and e.connection_invalidated
+        )
 
     def total_count(self) -> Optional[int]:
         """Returns the total count of rows in the specified table.
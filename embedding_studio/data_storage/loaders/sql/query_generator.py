@@ -1,7 +1,33 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, List, Optional
+
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Engine,
+    MetaData,
+    Select,
+    Table,
+    any_,
+    func,
+    literal,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+def ids_filter(column: Column, row_ids: List[Any]) -> ColumnElement:
+    """
+    Build a `column = ANY(:row_ids)` condition.
+
+    Unlike `IN (...)`, IDs are sent as a single array parameter, so the
+    statement text and its plan don't depend on the number of IDs.
 
-from sqlalchemy import Engine, MetaData, Select, Table, func, select
+    :param column: ID column.
+    :param row_ids: List of IDs.
+    :return: A SQLAlchemy condition.
+    """
+    return column == any_(literal(list(row_ids), ARRAY(column.type)))
 
 
 class AbstractQueryGenerator(ABC):
@@ -73,6 +99,29 @@ class AbstractQueryGenerator(ABC):
             return select(func.count()).select_from(table)
         """
 
+    def all_after(
+        self, last_id: Optional[Any], batch_size: Optional[int] = None
+    ) -> Select:
+        """
+        Generate a SELECT query to fetch rows ordered by ID following the
+        given one (keyset pagination). Unlike offsets, rows before the
+        position aren't read again.
+
+        Optional, loaders fall back to `all` if it's not implemented.
+
+        :param last_id: ID of the last fetched row, None - from the beginning.
+        :param batch_size: Maximum number of rows to return, None - all rows.
+        :return: A SQLAlchemy Select object representing the query.
+
+        Example implementation:
+            table = Table('my_table', self.metadata, autoload_with=self.engine)
+            query = select(table).order_by(table.c.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(table.c.id > last_id)
+            return query
+        """
+        raise NotImplementedError
+
 
 class QueryGenerator(AbstractQueryGenerator):
     """
@@ -82,6 +131,8 @@ class QueryGenerator(AbstractQueryGenerator):
     operations on a specified table.
     """
 
+    id_column_name: str = "id"
+
     def __init__(self, table_name: str, engine: Engine) -> None:
         """
         Initialize the query generator with a table name and database engine.
@@ -98,7 +149,7 @@ class QueryGenerator(AbstractQueryGenerator):
         Generate a SELECT query to fetch multiple rows by their IDs.
 
         Creates a query that selects all rows whose ID column value
-        is in the provided list of row IDs.
+        is in the provided list of row IDs, passed as a single array.
 
         :param row_ids: List of row identifiers to fetch.
         :return: A SQLAlchemy Select object representing the query.
@@ -106,7 +157,7 @@ class QueryGenerator(AbstractQueryGenerator):
         table = Table(
             self.table_name, self.metadata, autoload_with=self.engine
         )
-        return select(table).where(table.c.id.in_(row_ids))
+        return select(table).where(ids_filter(table.c.id, row_ids))
 
     def one(self, row_id: str) -> Select:
         """
@@ -153,3 +204,25 @@ class QueryGenerator(AbstractQueryGenerator):
             self.table_name, self.metadata, autoload_with=self.engine
         )
         return select(func.count()).select_from(table)
+
+    def all_after(
+        self, last_id: Optional[Any], batch_size: Optional[int] = None
+    ) -> Select:
+        """
+        Generate a SELECT query to fetch rows ordered by ID following the
+        given one (keyset pagination).
+
+        The query is derived from `all`, so subclasses customizing it (e.g.
+        with joins) get keyset pagination too, as long as they order by ID.
+
+        :param last_id: ID of the last fetched row, None - from the beginning.
+        :param batch_size: Maximum number of rows to return, None - all rows.
+        :return: A SQLAlchemy Select object representing the query.
+        """
+        table = Table(
+            self.table_name, self.metadata, autoload_with=self.engine
+        )
+        query = self.all(0, 1).limit(batch_size).offset(None)
+        if last_id is not None:
+            query = query.where(table.c[self.id_column_name] > last_id)
+        return query
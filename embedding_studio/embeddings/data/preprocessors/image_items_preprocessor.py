@@ -4,6 +4,7 @@ import numpy as np
 from datasets import DatasetDict
 from PIL.Image import Image
 
+from embedding_studio.core.config import settings
 from embedding_studio.embeddings.data.items.items_set import ItemsSet
 from embedding_studio.embeddings.data.preprocessors.preprocessor import (
     ItemsDatasetDictPreprocessor,
@@ -11,6 +12,9 @@ from embedding_studio.embeddings.data.preprocessors.preprocessor import (
 from embedding_studio.embeddings.data.transforms.image.center_padded import (
     resize_by_longest_and_pad_transform,
 )
+from embedding_studio.embeddings.data.transforms.image.pixels_cache import (
+    materialize_pixel_values,
+)
 from embedding_studio.embeddings.data.transforms.image.transforms import (
     image_transforms,
 )
@@ -27,12 +31,15 @@ class ImageItemsDatasetDictPreprocessor(ItemsDatasetDictPreprocessor):
         field_normalizer: DatasetFieldsNormalizer,
         n_pixels: int = 224,
         transform: Optional[Callable] = resize_by_longest_and_pad_transform,
+        pixels_cache_dir: Optional[str] = settings.IMAGE_PIXELS_CACHE_DIR,
     ):
         """Preprocessor for image data items.
 
         :param field_normalizer: how to normalize field names
         :param n_pixels: side size
         :param transform: function to get pixels (np.array) out of images
+        :param pixels_cache_dir: directory to materialize transformed pixels in,
+                                 if empty - images are transformed on each access
         """
         self._field_normalizer = field_normalizer
 
@@ -43,6 +50,7 @@ class ImageItemsDatasetDictPreprocessor(ItemsDatasetDictPreprocessor):
         self._n_pixels = n_pixels
 
         self._transform = transform
+        self._pixels_cache_dir = pixels_cache_dir
 
     def __call__(self, item: Image) -> np.ndarray:
         return self._transform(self._n_pixels)(item)
@@ -58,6 +66,23 @@ class ImageItemsDatasetDictPreprocessor(ItemsDatasetDictPreprocessor):
         """
         dataset: DatasetDict = self._field_normalizer(dataset)
 
+        if self._pixels_cache_dir:
+            # Transform once, epochs and trials read memory mapped pixels
+            dataset = DatasetDict(
+                {
+                    key: materialize_pixel_values(
+                        dataset[key],
+                        cache_dir=self._pixels_cache_dir,
+                        transform=self._transform,
+                        n_pixels=self._n_pixels,
+                        image_field_name=self._field_normalizer.item_field_name,
+                        id_field_name=self._field_normalizer.id_field_name,
+                        pixel_values_name=ImageItemsDatasetDictPreprocessor.IMAGES_FEATURE_PIXEL_NAME,
+                    )
+                    for key in dataset.keys()
+                }
+            )
+
         sets: Dict[ItemsSet] = {}
         # TODO: use more optimal way to iterate over DatasetDict
         for key in dataset.keys():
@@ -68,6 +93,15 @@ class ImageItemsDatasetDictPreprocessor(ItemsDatasetDictPreprocessor):
             )
 
         sets: DatasetDict = DatasetDict(sets)
+        if self._pixels_cache_dir:
+            return sets.with_format(
+                "torch",
+                columns=[
+                    ImageItemsDatasetDictPreprocessor.IMAGES_FEATURE_PIXEL_NAME
+                ],
+                output_all_columns=True,
+            )
+
         sets = sets.with_transform(
             lambda examples: image_transforms(
                 examples,
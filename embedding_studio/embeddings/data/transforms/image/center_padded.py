@@ -1,14 +1,20 @@
 from PIL import Image
-from torchvision.transforms import Compose, Lambda, Pad, Resize, ToTensor
+from torchvision.transforms import Compose, Pad, Resize, ToTensor
 
 from embedding_studio.embeddings.data.transforms.image.clip_original import (
     NORMALIZE_COLOR,
     convert_image_to_rgb,
+    convert_image_to_uint8,
 )
 
 
-def _resize_and_pad(n_px: int):
-    def resize_and_pad(img: Image) -> Image:
+class _ResizeAndPad:
+    # A class instead of a closure, so transforms can be sent to processes
+    def __init__(self, n_px: int):
+        self.n_px = n_px
+
+    def __call__(self, img: Image) -> Image:
+        n_px: int = self.n_px
         # Determine the aspect ratio
         aspect: float = img.width / img.height
 
@@ -37,7 +43,9 @@ def _resize_and_pad(n_px: int):
 
         return img
 
-    return Lambda(resize_and_pad)
+
+def _resize_and_pad(n_px: int):
+    return _ResizeAndPad(n_px)
 
 
 def resize_by_longest_and_pad_transform(n_px: int):
@@ -57,3 +65,19 @@ def resize_by_longest_and_pad_transform(n_px: int):
             NORMALIZE_COLOR,
         ]
     )
+
+
+def resize_by_longest_and_pad_uint8_transform(n_px: int):
+    """Same as resize_by_longest_and_pad_transform, but colors are not
+    normalized: the result is uint8 HWC pixels to be normalized by the model.
+
+    :param n_px: the size of the target side.
+    :return: uint8 pixels.
+    """
+    return Compose(
+        [
+            _resize_and_pad(n_px),
+            convert_image_to_rgb,
+            convert_image_to_uint8,
+        ]
+    )
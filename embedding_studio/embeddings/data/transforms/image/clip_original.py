@@ -1,3 +1,4 @@
+import numpy as np
 from PIL import Image
 from torchvision.transforms import (
     CenterCrop,
@@ -20,6 +21,10 @@ def convert_image_to_rgb(image: Image) -> Image:
     return image.convert("RGB")
 
 
+def convert_image_to_uint8(image: Image) -> np.ndarray:
+    return np.asarray(image, dtype=np.uint8)
+
+
 def center_crop_transform(n_px: int):
     """Original CLIP image normalization.
     1. Resize an image without saving a ratio.
@@ -38,3 +43,22 @@ def center_crop_transform(n_px: int):
             NORMALIZE_COLOR,
         ]
     )
+
+
+def center_crop_uint8_transform(n_px: int):
+    """Original CLIP image geometry without color normalization.
+    1. Resize an image without saving a ratio.
+    2. Do a center crop
+    3. Convert to uint8 HWC pixels, to be normalized by the model.
+
+    :param n_px: the size of the target side.
+    :return: uint8 pixels.
+    """
+    return Compose(
+        [
+            Resize(n_px, interpolation=InterpolationMode.BICUBIC),
+            CenterCrop(n_px),
+            convert_image_to_rgb,
+            convert_image_to_uint8,
+        ]
+    )
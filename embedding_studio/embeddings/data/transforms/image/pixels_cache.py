@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Callable, Dict, List
+
+import numpy as np
+from datasets import Array3D, Dataset
+
+from embedding_studio.core.config import settings
+from embedding_studio.embeddings.data.transforms.image.pool import (
+    get_image_transform_pool,
+)
+from embedding_studio.utils.disk_cache import DiskLRUCache
+
+logger = logging.getLogger(__name__)
+
+# Caches of transformed pixel values by their directories
+_caches: Dict[str, DiskLRUCache] = dict()
+
+
+def _get_cache(cache_dir: str) -> DiskLRUCache:
+    if cache_dir not in _caches:
+        _caches[cache_dir] = DiskLRUCache(
+            os.path.join(cache_dir, "items"),
+            max_bytes=int(settings.IMAGE_PIXELS_CACHE_MAX_BYTES),
+        )
+    return _caches[cache_dir]
+
+
+def _transform_key(transform: Callable, n_pixels: int) -> str:
+    return f"{transform.__module__}.{transform.__qualname__}:{n_pixels}"
+
+
+def pixels_cache_key(transform: Callable, n_pixels: int, item_id: str) -> str:
+    """
+    Compute a cache key of transformed pixel values of an item.
+
+    The same item transformed the same way shares cached pixel values across
+    runs, whatever other items are in the dataset.
+
+    :param transform: Factory of the transform applied to images
+    :param n_pixels: Side size of transformed images
+    :param item_id: ID of the item
+    :return: Cache key
+    """
+    return f"{_transform_key(transform, n_pixels)}:{item_id}"
+
+
+def _transform_cached(
+    examples: Dict[str, List],
+    cache: DiskLRUCache,
+    transform: Callable,
+    n_pixels: int,
+    image_field_name: str,
+    id_field_name: str,
+    pixel_values_name: str,
+) -> Dict[str, List]:
+    keys = [
+        pixels_cache_key(transform, n_pixels, str(item_id))
+        for item_id in examples[id_field_name]
+    ]
+    pixel_values = [cache.get(key) for key in keys]
+    missed = [i for i, values in enumerate(pixel_values) if values is None]
+    if missed:
+        images = examples[image_field_name]
+        transformed = get_image_transform_pool().map_transform_factory(
+            transform, n_pixels, [images[i] for i in missed], mode="RGB"
+        )
+        for i, values in zip(missed, transformed):
+            pixel_values[i] = np.asarray(values, dtype=np.float32)
+            cache.put(keys[i], pixel_values[i])
+
+    examples[pixel_values_name] = pixel_values
+    return examples
+
+
+def materialize_pixel_values(
+    dataset: Dataset,
+    cache_dir: str,
+    transform: Callable,
+    n_pixels: int,
+    image_field_name: str,
+    id_field_name: str,
+    pixel_values_name: str,
+) -> Dataset:
+    """
+    Store pixel values of a dataset in a memory mapped Arrow file, so epochs
+    and trials read them instead of transforming images again.
+
+    Pixel values are cached per item, so only items missed by the cache are
+    transformed. The Arrow file itself is reused by runs over the same items
+    in the same order.
+
+    :param dataset: Dataset with images
+    :param cache_dir: Directory of cache files
+    :param transform: Factory of the transform applied to images
+    :param n_pixels: Side size of transformed images
+    :param image_field_name: Name of the image field
+    :param id_field_name: Name of the item ID field
+    :param pixel_values_name: Name of the field to store pixel values in
+    :return: Dataset with a pixel values column
+    """
+    digest = hashlib.sha256(_transform_key(transform, n_pixels).encode())
+    digest.update(json.dumps(dataset[id_field_name], default=str).encode())
+    fingerprint = digest.hexdigest()[:32]
+
+    os.makedirs(cache_dir, exist_ok=True)
+    features = dataset.features.copy()
+    features[pixel_values_name] = Array3D(
+        shape=(3, n_pixels, n_pixels), dtype="float32"
+    )
+    return dataset.map(
+        _transform_cached,
+        fn_kwargs=dict(
+            cache=_get_cache(cache_dir),
+            transform=transform,
+            n_pixels=n_pixels,
+            image_field_name=image_field_name,
+            id_field_name=id_field_name,
+            pixel_values_name=pixel_values_name,
+        ),
+        batched=True,
+        features=features,
+        cache_file_name=os.path.join(cache_dir, f"pixels-{fingerprint}.arrow"),
+        load_from_cache_file=True,
+        new_fingerprint=fingerprint,
+        desc="Transforming images",
+    )
@@ -0,0 +1,254 @@
+import io
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageFile
+
+from embedding_studio.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Transforms built in the current process: (factory, n_pixels) -> transform
+_TRANSFORMS: Dict[Tuple[Callable, int], Callable] = dict()
+
+
+def _to_numpy(value: Any) -> Any:
+    # Numpy arrays are cheaper to send between processes than tensors
+    if hasattr(value, "detach"):
+        return value.detach().cpu().numpy()
+    return value
+
+
+@dataclass(frozen=True)
+class EncodedImage:
+    """
+    Image file sent to workers instead of an opened image: pickling
+    a PIL image decodes its pixels, so it would be decoded by the sender.
+
+    :param data: Content of the image file
+    :param path: Path of the image file, if it's opened from a disk
+    """
+
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+
+    @classmethod
+    def from_image(cls, image: Any) -> Optional["EncodedImage"]:
+        """
+        Get the file of an image that wasn't decoded yet.
+
+        :param image: Any item
+        :return: Image file or None if the item isn't a lazily opened image
+        """
+        if (
+            not isinstance(image, ImageFile.ImageFile)
+            or not image.tile
+            or image.fp is None
+            or image.tell() != 0
+        ):
+            return None
+
+        if image.filename and os.path.isfile(image.filename):
+            return cls(path=image.filename)
+        if isinstance(image.fp, io.BytesIO):
+            return cls(data=image.fp.getvalue())
+        return None
+
+    def open(self) -> Image.Image:
+        """Open the image, it's decoded on the first access to pixels."""
+        if self.path is not None:
+            return Image.open(self.path)
+        return Image.open(io.BytesIO(self.data))
+
+
+def _encode(item: Any) -> Any:
+    encoded = EncodedImage.from_image(item)
+    return encoded if encoded is not None else item
+
+
+def _decode(item: Any) -> Any:
+    return item.open() if isinstance(item, EncodedImage) else item
+
+
+def apply_transform_factory(
+    transform_factory: Callable[[int], Callable],
+    n_pixels: int,
+    image: Any,
+    mode: Optional[str] = None,
+) -> Any:
+    """
+    Apply a transform built by a factory, e.g. center_crop_transform.
+    Built transforms are reused by the process.
+
+    :param transform_factory: Function building a transform by the side size
+    :param n_pixels: Side size of the result
+    :param image: Image to transform
+    :param mode: PIL mode the image is converted to before the transform
+    :return: Transformed image
+    """
+    key = (transform_factory, n_pixels)
+    transform = _TRANSFORMS.get(key)
+    if transform is None:
+        transform = transform_factory(n_pixels)
+        _TRANSFORMS[key] = transform
+
+    if mode is not None:
+        image = image.convert(mode)
+    return transform(image)
+
+
+def _apply(func: Callable, chunk: List[Any]) -> List[Any]:
+    return [_to_numpy(func(_decode(item))) for item in chunk]
+
+
+class ImageTransformPool:
+    """
+    Pool of processes decoding, resizing and normalizing images.
+
+    Image transforms are CPU bound and mostly hold the GIL, so they're spread
+    over processes. Items are sent in chunks, one per worker, and results come
+    back as numpy arrays. Small batches and functions that can't be pickled
+    (e.g. lambdas) are handled in the calling process.
+
+    Images that aren't decoded yet (opened from a file or bytes) are sent
+    as encoded files and decoded by workers.
+
+    Workers are started with `spawn`, so a pool is safe to use from processes
+    that have already initialized CUDA.
+
+    :param max_workers: Number of worker processes, 0 disables the pool
+    :param min_batch_size: Min number of items to use the workers for
+    """
+
+    def __init__(
+        self,
+        max_workers: int = settings.IMAGE_TRANSFORM_WORKERS,
+        min_batch_size: int = settings.IMAGE_TRANSFORM_MIN_BATCH_SIZE,
+    ):
+        self._max_workers = int(max_workers)
+        self._min_batch_size = max(int(min_batch_size), 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self._max_workers <= 0:
+            return None
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def map(self, func: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """
+        Apply a function to every item, preserving the order.
+
+        :param func: Picklable function transforming a single item
+        :param items: List of items (PIL images, numpy arrays, bytes, ...)
+        :return: List of transformed items, tensors are converted to numpy
+        """
+        items = list(items)
+        executor = (
+            self._get_executor()
+            if len(items) >= self._min_batch_size
+            else None
+        )
+        if executor is None:
+            return _apply(func, items)
+
+        try:
+            pickle.dumps(func)
+        except Exception:
+            logger.debug(f"{func} can't be pickled, transforming in place")
+            return _apply(func, items)
+
+        num_chunks = min(self._max_workers, len(items))
+        chunk_size = (len(items) + num_chunks - 1) // num_chunks
+        encoded = [_encode(item) for item in items]
+        chunks = [
+            encoded[i : i + chunk_size]
+            for i in range(0, len(encoded), chunk_size)
+        ]
+        try:
+            futures = [
+                executor.submit(_apply, func, chunk) for chunk in chunks
+            ]
+            results = []
+            for future in futures:
+                results.extend(future.result())
+            return results
+
+        except BrokenProcessPool:
+            # E.g. a worker was killed by OOM, it's restarted with the pool
+            logger.exception("Image transform pool is broken, restarting")
+            self._reset_executor()
+            return _apply(func, items)
+
+    def map_transform_factory(
+        self,
+        transform_factory: Callable[[int], Callable],
+        n_pixels: int,
+        images: List[Any],
+        mode: Optional[str] = None,
+    ) -> List[np.ndarray]:
+        """
+        Apply a transform built by a factory to every image.
+
+        Built transforms often contain closures that can't be pickled, while
+        factories are plain module functions, so workers build transforms
+        themselves.
+
+        :param transform_factory: Function building a transform by the side size
+        :param n_pixels: Side size of the result
+        :param images: List of images
+        :param mode: PIL mode images are converted to before the transform
+        :return: List of transformed images
+        """
+        return self.map(
+            partial(
+                apply_transform_factory,
+                transform_factory,
+                n_pixels,
+                mode=mode,
+            ),
+            images,
+        )
+
+    def shutdown(self):
+        """Stop worker processes."""
+        self._reset_executor()
+
+
+_pool: Optional[ImageTransformPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_image_transform_pool() -> ImageTransformPool:
+    """
+    Get the image transform pool shared by the process.
+
+    :return: Shared ImageTransformPool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ImageTransformPool()
+        return _pool
@@ -1,11 +1,15 @@
 import logging
 from typing import Callable, Optional
 
+import torch
 from datasets import Dataset
 
 from embedding_studio.embeddings.data.transforms.image.clip_original import (
     center_crop_transform,
 )
+from embedding_studio.embeddings.data.transforms.image.pool import (
+    get_image_transform_pool,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,7 @@ def image_transforms(
 ) -> Dataset:
     """
     Applies a transformation to the images in a dataset.
+    Images are transformed in parallel by the shared image transform pool.
 
     :param examples: The input dataset containing images.
     :param transform: A callable that applies a transformation to an image.
@@ -41,10 +46,14 @@ def image_transforms(
         )
 
     if image_field_name in examples:
-        transform_func = transform(n_pixels)
+        pixel_values = get_image_transform_pool().map_transform_factory(
+            transform,
+            n_pixels,
+            examples[image_field_name],
+            mode="RGB",
+        )
         examples[pixel_values_name] = [
-            transform_func(img.convert("RGB"))
-            for img in examples[image_field_name]
+            torch.as_tensor(values) for values in pixel_values
         ]
         if del_images:
             logger.debug(f"Delete {image_field_name} field from dataset")
@@ -1,5 +1,7 @@
 import gc
+import logging
 from copy import deepcopy
+from functools import partial
 from typing import Callable, List, Optional, Union
 
 import cv2
@@ -15,12 +17,82 @@ from transformers import (
 from tritonclient.grpc import InferInput
 
 from embedding_studio.context.app_context import context
+from embedding_studio.embeddings.data.transforms.image.pool import (
+    get_image_transform_pool,
+)
 from embedding_studio.embeddings.inference.triton.client import (
     TritonClient,
     TritonClientFactory,
 )
+from embedding_studio.inference_management.triton.utils.image_input import (
+    ImageInputMode,
+    pixel_values_to_uint8,
+)
 from embedding_studio.workers.fine_tuning.utils.config import RetryConfig
 
+logger = logging.getLogger(__name__)
+
+
+def _to_pil_image(image: Union[np.ndarray, Image.Image]) -> Image.Image:
+    if isinstance(image, np.ndarray):  # Convert from OpenCV BGR to RGB
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        image = Image.fromarray(image)
+    return image
+
+
+def _to_fp32_pixel_values(
+    transform: Optional[Callable],
+    image: Union[np.ndarray, Image.Image],
+) -> np.ndarray:
+    """
+    Transform an image into float32 pixel values for the FP32 input mode.
+
+    :param transform: A function to preprocess images.
+    :param image: PIL.Image instance or numpy array from an image prepared using cv2.
+    :return: float32 pixel values.
+    """
+    image = _to_pil_image(image)
+    if transform:
+        image = transform(image)
+
+    if isinstance(image, Image.Image):
+        image = np.array(image)  # Ensure it's a numpy array for Triton
+
+    if isinstance(image, torch.Tensor):
+        image = image.detach().cpu().numpy()
+
+    return image.astype(np.float32, copy=False)
+
+
+def _to_uint8_pixels(
+    transform: Optional[Callable],
+    uint8_transform: Optional[Callable],
+    image: Union[np.ndarray, Image.Image],
+) -> np.ndarray:
+    """
+    Transform an image into uint8 HWC pixels for the UINT8 input mode.
+
+    :param transform: A function to preprocess images, used if there is no uint8_transform.
+    :param uint8_transform: A function to resize images into uint8 HWC pixels.
+    :param image: PIL.Image instance or numpy array from an image prepared using cv2.
+    :return: uint8 pixels.
+    """
+    image = _to_pil_image(image)
+    if uint8_transform:
+        return np.asarray(uint8_transform(image), dtype=np.uint8)
+
+    if transform:
+        image = transform(image)
+
+    if not isinstance(image, torch.Tensor):
+        image = torch.as_tensor(np.array(image))
+
+    if image.dtype != torch.uint8:
+        # Normalized CHW pixel values
+        image = pixel_values_to_uint8(image.detach().cpu())
+
+    return image.numpy()
+
 
 class CLIPModelTritonClient(TritonClient):
     """
@@ -36,6 +108,8 @@ class CLIPModelTritonClient(TritonClient):
         tokenizer: Union[PreTrainedTokenizer, PreTrainedTokenizerFast],
         transform: Callable[[Image.Image], torch.Tensor] = None,
         retry_config: Optional[RetryConfig] = None,
+        items_input_mode: Optional[ImageInputMode] = None,
+        uint8_transform: Callable[[Image.Image], np.ndarray] = None,
     ):
         """
         Initialize the Triton client with the capability to process text and image data.
@@ -46,6 +120,10 @@ class CLIPModelTritonClient(TritonClient):
         :param tokenizer: query text tokenizer
         :param transform: A function to preprocess images before sending them to the server.
         :param retry_config: retry policy (default: None).
+        :param items_input_mode: how images are sent to the items model,
+                                 if None - detected from the deployed model metadata.
+        :param uint8_transform: A function to resize images into uint8 HWC pixels for UINT8 mode,
+                                if None - output of `transform` is converted back to uint8.
         """
         super().__init__(
             url,
@@ -56,6 +134,38 @@ class CLIPModelTritonClient(TritonClient):
         )
         self.tokenizer = tokenizer
         self.transform = transform
+        self.items_input_mode = items_input_mode
+        self.uint8_transform = uint8_transform
+
+    def _get_items_input_mode(self) -> ImageInputMode:
+        """
+        Get how images should be sent to the items model. Unless set explicitly,
+        the mode is detected once by the `pixel_values` input data type.
+
+        :return: Input mode of the deployed items model.
+        """
+        if self.items_input_mode is None:
+            try:
+                metadata = self.client.get_model_metadata(
+                    self.items_model_info.name, model_version="1"
+                )
+                datatypes = {
+                    model_input.name: model_input.datatype
+                    for model_input in metadata.inputs
+                }
+                self.items_input_mode = (
+                    ImageInputMode.UINT8
+                    if datatypes.get("pixel_values") == "UINT8"
+                    else ImageInputMode.FP32
+                )
+            except Exception as e:
+                # Don't cache, so the mode is detected once the model is up
+                logger.warning(
+                    f"Failed to get items model metadata, using FP32: {e}"
+                )
+                return ImageInputMode.FP32
+
+        return self.items_input_mode
 
     def _prepare_query(self, query: str) -> List[InferInput]:
         """
@@ -88,38 +198,29 @@ class CLIPModelTritonClient(TritonClient):
         """
         Prepare a batch of image inputs for the Triton server. Handles both PIL images and numpy arrays,
         converting them as needed and applying a specified transformation.
+        Images are transformed in parallel by the shared image transform pool,
+        images that aren't decoded yet are decoded by its workers.
 
         :param data: A list of PIL.Image instances or numpy arrays from images prepared using cv2.
         """
-        processed_images = []
-
-        for image in data:
-            if isinstance(
-                image, np.ndarray
-            ):  # Convert from OpenCV BGR to RGB if needed
-                image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                image = Image.fromarray(image)
-
-            if self.transform:
-                image = self.transform(image)
-
-            if isinstance(image, Image.Image):
-                image = np.array(image)  # Ensure it's a numpy array for Triton
-
-            if isinstance(image, torch.Tensor):
-                image = (
-                    image.detach().cpu().numpy()
-                )  # Ensure it's a numpy array for Triton
-
-            if image.dtype != np.float32:
-                image = image.astype(np.float32)
-
-            processed_images.append(image)
+        if self._get_items_input_mode() == ImageInputMode.UINT8:
+            processed_images = get_image_transform_pool().map(
+                partial(
+                    _to_uint8_pixels, self.transform, self.uint8_transform
+                ),
+                data,
+            )
+            datatype = "UINT8"
+        else:
+            processed_images = get_image_transform_pool().map(
+                partial(_to_fp32_pixel_values, self.transform), data
+            )
+            datatype = "FP32"
 
         batch_images = np.stack(
             processed_images, axis=0
         )  # Stack images into a batch
-        infer_input = InferInput("pixel_values", batch_images.shape, "FP32")
+        infer_input = InferInput("pixel_values", batch_images.shape, datatype)
         infer_input.set_data_from_numpy(batch_images)
         return [
             infer_input,
@@ -141,6 +242,8 @@ class CLIPModelTritonClientFactory(TritonClientFactory):
             str
         ] = "EmbeddingStudio/sentence-transformers-clip-ViT-B-32-tokenizer",
         retry_config: Optional[RetryConfig] = None,
+        items_input_mode: Optional[ImageInputMode] = None,
+        uint8_transform: Callable[[Image.Image], np.ndarray] = None,
     ):
         """
         Initialize the factory with common configuration parameters.
@@ -151,6 +254,9 @@ class CLIPModelTritonClientFactory(TritonClientFactory):
         :param model_name: The name of the model for which the tokenizer is tailored (default is 'clip-ViT-B-32').
         :param tokenizer_name: Specific tokenizer name, if None - use model_name.
         :param retry_config: retry policy (default: None).
+        :param items_input_mode: how images are sent to the items model,
+                                 if None - detected from the deployed model metadata.
+        :param uint8_transform: A function to resize images into uint8 HWC pixels for UINT8 mode.
         """
         super(CLIPModelTritonClientFactory, self).__init__(
             url=url,
@@ -159,6 +265,8 @@ class CLIPModelTritonClientFactory(TritonClientFactory):
             retry_config=retry_config,
         )
         self.transform = transform
+        self.items_input_mode = items_input_mode
+        self.uint8_transform = uint8_transform
         self.model_name = model_name
         self.tokenizer_name = tokenizer_name
         tokenizer_name = (
@@ -197,4 +305,6 @@ class CLIPModelTritonClientFactory(TritonClientFactory):
             transform=self.transform,
             tokenizer=self.tokenizer,
             retry_config=self.retry_config,
+            items_input_mode=self.items_input_mode,
+            uint8_transform=self.uint8_transform,
         )
@@ -23,6 +23,12 @@ from embedding_studio.inference_management.triton.jit_trace_manager import (
 from embedding_studio.inference_management.triton.manager import (
     TritonModelStorageManager,
 )
+from embedding_studio.inference_management.triton.uint8_image_jit_trace_manager import (
+    UInt8ImageJitTraceTritonModelStorageManager,
+)
+from embedding_studio.inference_management.triton.utils.image_input import (
+    ImageInputMode,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -40,17 +46,28 @@ class TextToImageCLIPModel(EmbeddingsModelInterface):
     ```
 
     :param clip_model: A CLIP model from the SentenceTransformer package
+    :param items_input_mode: How images are sent to the deployed vision model
     """
 
-    def __init__(self, clip_model: SentenceTransformer):
+    # Models saved before input modes were introduced are deployed as is
+    items_input_mode: ImageInputMode = ImageInputMode.FP32
+
+    def __init__(
+        self,
+        clip_model: SentenceTransformer,
+        items_input_mode: ImageInputMode = ImageInputMode.FP32,
+    ):
         """Initialize the TextToImageCLIPModel with a CLIP SentenceTransformer model.
 
         Extracts the text and vision components from the provided CLIP model and configures them
         for separate query (text) and item (image) processing.
 
         :param clip_model: A CLIP model from the SentenceTransformer package
+        :param items_input_mode: How images are sent to the deployed vision model.
+            With UINT8 the deployed model receives resized uint8 NHWC pixels and normalizes them itself.
         """
         super(TextToImageCLIPModel, self).__init__(same_query_and_items=False)
+        self.items_input_mode = items_input_mode
         self.tokenizer = clip_model[0].processor.tokenizer
 
         self.text_model = torch.nn.Sequential(
@@ -198,8 +215,12 @@ class TextToImageCLIPModel(EmbeddingsModelInterface):
     ) -> Type[TritonModelStorageManager]:
         """Get the class for managing vision model inference in Triton.
 
-        :return: JitTraceTritonModelStorageManager class for vision model inference
+        :return: JitTraceTritonModelStorageManager class for vision model inference,
+            UInt8ImageJitTraceTritonModelStorageManager if the model receives uint8 pixels
         """
+        if self.items_input_mode == ImageInputMode.UINT8:
+            return UInt8ImageJitTraceTritonModelStorageManager
+
         return JitTraceTritonModelStorageManager
 
     def fix_query_model(self, num_fixed_layers: int):
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from embedding_studio.models.embeddings.objects import ObjectWithDistance
+
+
+@dataclass
+class SelectionCandidates:
+    """
+    Columnar batch of objects found for a single query.
+
+    :param object_ids: IDs of found objects, shape [N]
+    :param distances: Distances returned by a search, shape [N]
+    :param vectors: Part vectors padded with zeros, shape [N, M, D]
+    :param parts_mask: True for real parts, False for padding, shape [N, M]
+    :param norms: L2 norms of part vectors, shape [N, M]
+    """
+
+    object_ids: List[str]
+    distances: np.ndarray
+    vectors: Optional[np.ndarray] = None
+    parts_mask: Optional[np.ndarray] = None
+    norms: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.object_ids)
+
+    @classmethod
+    def from_objects(
+        cls, objects: List[ObjectWithDistance], with_vectors: bool = False
+    ) -> "SelectionCandidates":
+        """
+        Convert found objects into a columnar batch.
+
+        :param objects: Objects returned by a search
+        :param with_vectors: Whether to collect vectors of object parts
+        :return: Batch of candidates
+        """
+        distances = np.asarray(
+            [obj.distance for obj in objects], dtype=np.float32
+        )
+        if not with_vectors or not objects:
+            return cls([obj.object_id for obj in objects], distances)
+
+        max_parts = max(len(obj.parts) for obj in objects)
+        dimensions = len(objects[0].parts[0].vector)
+        vectors = np.zeros(
+            (len(objects), max_parts, dimensions), dtype=np.float32
+        )
+        parts_mask = np.zeros((len(objects), max_parts), dtype=bool)
+        for index, obj in enumerate(objects):
+            if obj.parts:
+                vectors[index, : len(obj.parts)] = [
+                    part.vector for part in obj.parts
+                ]
+                parts_mask[index, : len(obj.parts)] = True
+
+        return cls(
+            [obj.object_id for obj in objects],
+            distances,
+            vectors,
+            parts_mask,
+            np.linalg.norm(vectors, axis=-1),
+        )
+
+
+def stack_distances(batches: List[SelectionCandidates]) -> np.ndarray:
+    """
+    Stack distances of several queries, padding them with NaN.
+
+    :param batches: Candidates of each query
+    :return: Array of shape [Q, N] where N is the largest batch size
+    """
+    size = max((len(batch) for batch in batches), default=0)
+    distances = np.full((len(batches), size), np.nan, dtype=np.float32)
+    for index, batch in enumerate(batches):
+        distances[index, : len(batch)] = batch.distances
+    return distances
+
+
+def stack_vectors(batches: List[SelectionCandidates]):
+    """
+    Stack part vectors of several queries, padding them with zeros.
+
+    :param batches: Candidates of each query, collected with vectors
+    :return: Vectors of shape [Q, N, M, D], parts mask and norms of
+             shape [Q, N, M]
+    """
+    size = max((len(batch) for batch in batches), default=0)
+    max_parts = max(
+        (batch.vectors.shape[1] for batch in batches if len(batch)),
+        default=0,
+    )
+    dimensions = max(
+        (batch.vectors.shape[2] for batch in batches if len(batch)),
+        default=0,
+    )
+
+    vectors = np.zeros(
+        (len(batches), size, max_parts, dimensions), dtype=np.float32
+    )
+    parts_mask = np.zeros((len(batches), size, max_parts), dtype=bool)
+    norms = np.zeros((len(batches), size, max_parts), dtype=np.float32)
+    for index, batch in enumerate(batches):
+        if len(batch) == 0:
+            continue
+        n, m = batch.parts_mask.shape
+        vectors[index, :n, :m] = batch.vectors
+        parts_mask[index, :n, :m] = batch.parts_mask
+        norms[index, :n, :m] = batch.norms
+    return vectors, parts_mask, norms
+
+
+def unstack_labels(
+    bin_labels: np.ndarray, batches: List[SelectionCandidates]
+) -> List[List[int]]:
+    """
+    Convert stacked binary labels into indexes of selected candidates.
+
+    :param bin_labels: Binary labels of shape [Q, N]
+    :param batches: Candidates of each query
+    :return: Indexes of selected candidates of each query
+    """
+    return [
+        np.flatnonzero(labels[: len(batch)]).tolist()
+        for labels, batch in zip(bin_labels, batches)
+    ]
@@ -1,14 +1,18 @@
 from abc import abstractmethod
 from typing import List, Optional
 
-import torch
+import numpy as np
 
+from embedding_studio.embeddings.selectors.candidates import (
+    SelectionCandidates,
+    stack_distances,
+    unstack_labels,
+)
 from embedding_studio.embeddings.selectors.selector import AbstractSelector
 from embedding_studio.models.embeddings.models import (
     MetricType,
     SearchIndexInfo,
 )
-from embedding_studio.models.embeddings.objects import ObjectWithDistance
 
 
 class DistBasedSelector(AbstractSelector):
@@ -51,78 +55,73 @@ class DistBasedSelector(AbstractSelector):
 
     @abstractmethod
     def _calculate_binary_labels(
-        self, corrected_values: torch.Tensor
-    ) -> torch.Tensor:
+        self, corrected_values: np.ndarray
+    ) -> np.ndarray:
         """
         Calculates binary selection labels (0 or 1) from corrected distance values.
 
         This abstract method must be implemented by subclasses to define the specific
         decision boundary for selection based on the corrected distance values.
 
-        :param corrected_values: Tensor of distances that have been adjusted by the margin
-        :return: Binary tensor indicating which items should be selected (1) or not (0)
+        :param corrected_values: Array of distances that have been adjusted by the margin
+        :return: Boolean array indicating which items should be selected
 
         Example implementation:
         ```python
-        def _calculate_binary_labels(self, corrected_values: torch.Tensor) -> torch.Tensor:
+        def _calculate_binary_labels(self, corrected_values: np.ndarray) -> np.ndarray:
             # Simple threshold-based selection
             return corrected_values > 0
         ```
         """
         raise NotImplementedError
 
-    def _convert_values(
-        self, categories: List[ObjectWithDistance]
-    ) -> torch.Tensor:
+    def _convert_values(self, distances: np.ndarray) -> np.ndarray:
         """
-        Converts raw distance values from objects to a normalized tensor.
+        Converts raw distance values returned by a search to normalized values.
 
-        This method extracts distance values from objects and normalizes them
-        based on the metric type and similarity/distance mode.
+        Values are normalized based on the metric type and similarity/distance mode.
 
-        :param categories: List of objects with distance metrics
-        :return: Tensor of normalized distance values
+        :param distances: Array of distances returned by a search
+        :return: Array of normalized distance values
         """
-        values = []
-        for category in categories:
-            value = category.distance
-            if self._is_similarity:
-                if self._search_index_info.metric_type == MetricType.DOT:
-                    value = value * -1.0
+        if not self._is_similarity:
+            return distances
 
-                elif self._search_index_info.metric_type == MetricType.COSINE:
-                    value = 1.0 - value
+        if self._search_index_info.metric_type == MetricType.DOT:
+            return -distances
 
-                elif self._search_index_info.metric_type == MetricType.EUCLID:
-                    value = 1.0 / max(value, 1e-8)
+        elif self._search_index_info.metric_type == MetricType.COSINE:
+            return 1.0 - distances
 
-            values.append(value)
+        elif self._search_index_info.metric_type == MetricType.EUCLID:
+            return 1.0 / np.maximum(distances, 1e-8)
 
-        return torch.tensor(values)
+        return distances
 
-    def select(
+    def select_batch(
         self,
-        categories: List[ObjectWithDistance],
-        query_vector: Optional[torch.Tensor] = None,
-    ) -> List[int]:
+        candidates: List[SelectionCandidates],
+        query_vectors: Optional[np.ndarray] = None,
+    ) -> List[List[int]]:
         """
-        Selects indices of objects based on their distance values.
+        Selects indices of candidates based on their distance values.
 
         This method implements the selection logic by:
-        1. Converting raw distances to normalized values
-        2. Applying the margin threshold
-        3. Calculating binary selection labels
-        4. Returning indices of selected objects
-
-        :param categories: List of objects with distance metrics
-        :param query_vector: Optional query vector (not used in distance-based selectors)
-        :return: List of indices of selected objects
+        1. Stacking distances of all queries into a single array
+        2. Converting raw distances to normalized values
+        3. Applying the margin threshold
+        4. Calculating binary selection labels
+        5. Returning indices of selected candidates of each query
+
+        :param candidates: Candidates found for each query
+        :param query_vectors: Optional query vectors (not used in distance-based selectors)
+        :return: Indices of selected candidates for each query
         """
-        values = self._convert_values(categories)
+        values = self._convert_values(stack_distances(candidates))
 
         positive_threshold_min = (
             1 - self._margin if self._is_similarity else self._margin
         )
         corrected_values = values - positive_threshold_min
         bin_labels = self._calculate_binary_labels(corrected_values)
-        return torch.nonzero(bin_labels).T[0].tolist()
+        return unstack_labels(bin_labels, candidates)
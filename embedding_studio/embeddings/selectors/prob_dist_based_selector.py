@@ -1,4 +1,6 @@
-import torch
+import math
+
+import numpy as np
 
 from embedding_studio.embeddings.selectors.dist_based_selector import (
     DistBasedSelector,
@@ -43,21 +45,28 @@ class ProbsDistBasedSelector(DistBasedSelector):
 
         self._scale = scale
         self._prob_threshold = prob_threshold
+        # sigmoid(x) > p <=> x > logit(p), so no sigmoid is computed
+        if 0.0 < prob_threshold < 1.0:
+            self._logit_threshold = math.log(
+                prob_threshold / (1.0 - prob_threshold)
+            )
+        else:
+            self._logit_threshold = (
+                -math.inf if prob_threshold <= 0.0 else math.inf
+            )
 
     def _calculate_binary_labels(
-        self, corrected_values: torch.Tensor
-    ) -> torch.Tensor:
+        self, corrected_values: np.ndarray
+    ) -> np.ndarray:
         """
         Calculates binary selection labels using a sigmoid probability function.
 
         This method implements the abstract method from DistBasedSelector by:
-        1. Converting corrected distance values to probabilities using sigmoid
-        2. Applying the probability threshold to determine selection
+        1. Scaling corrected distance values into sigmoid logits
+        2. Comparing them with the logit of the probability threshold, which is
+           the same as comparing sigmoid probabilities with the threshold
 
-        :param corrected_values: Tensor of distances that have been adjusted by the margin
-        :return: Binary tensor indicating which items should be selected (1) or not (0)
+        :param corrected_values: Array of distances that have been adjusted by the margin
+        :return: Boolean array indicating which items should be selected
         """
-        return (
-            torch.sigmoid(corrected_values * self._scale)
-            > self._prob_threshold
-        )
+        return corrected_values * self._scale > self._logit_threshold
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, List, Optional
 
-import torch
+import numpy as np
 
+from embedding_studio.embeddings.selectors.candidates import (
+    SelectionCandidates,
+)
 from embedding_studio.models.embeddings.objects import ObjectWithDistance
 
 
@@ -12,43 +15,41 @@ class AbstractSelector(ABC):
 
     This class provides the framework for implementing different selection strategies
     for filtering objects based on their distance metrics and embedding vectors.
+    Selection works on columnar batches of candidates and is vectorized in numpy
+    across candidates and queries.
     """
 
-    def _get_categories_tensor(
-        self, items: List[ObjectWithDistance]
-    ) -> torch.Tensor:
+    @abstractmethod
+    def select_batch(
+        self,
+        candidates: List[SelectionCandidates],
+        query_vectors: Optional[np.ndarray] = None,
+    ) -> List[List[int]]:
         """
-        Converts a list of ObjectWithDistance instances into a padded tensor of vectors.
+        Selects indices of candidates that meet the selection criteria for
+        several queries at once.
 
-        This method creates a tensor containing all part vectors from the provided objects,
-        padding as necessary to ensure consistent dimensions across all objects.
+        :param candidates: Candidates found for each query
+        :param query_vectors: Optional array of shape [Q, D] with query embeddings
+        :return: Indices of selected candidates for each query
 
-        :param items: List of objects with distance metrics and embedding vectors
-        :return: A tensor of shape [N, D, M] where:
-                 - N is the number of objects
-                 - D is the embedding dimension
-                 - M is the maximum number of parts across all objects
-        """
-        max_parts = max(len(obj.parts) for obj in items)
-        category_vectors = torch.stack(
-            [
-                torch.stack(
-                    [torch.Tensor(part.vector) for part in obj.parts]
-                    + [torch.zeros(len(obj.parts[0].vector))]
-                    * (max_parts - len(obj.parts)),
-                    dim=1,
-                )  # Pad
-                for obj in items
+        Example implementation:
+        ```python
+        def select_batch(self, candidates: List[SelectionCandidates],
+                         query_vectors: Optional[np.ndarray] = None) -> List[List[int]]:
+            # Apply threshold to distances returned by the search
+            threshold = 0.5
+            return [
+                np.flatnonzero(batch.distances < threshold).tolist()
+                for batch in candidates
             ]
-        ).transpose(1, 2)
-
-        return category_vectors
+        ```
+        """
 
-    @abstractmethod
     def select(
         self,
         categories: List[ObjectWithDistance],
-        query_vector: Optional[torch.Tensor] = None,
+        query_vector: Optional[Any] = None,
     ) -> List[int]:
         """
         Selects indices of objects that meet the selection criteria.
@@ -57,23 +58,18 @@ class AbstractSelector(ABC):
         based on their distances, vectors, and the optional query vector.
 
         :param categories: List of objects with distance metrics and embedding vectors
-        :param query_vector: Optional tensor representing the query embedding
+        :param query_vector: Optional query embedding (list, array or tensor)
         :return: List of indices of selected objects
-
-        Example implementation:
-        ```python
-        def select(self, categories: List[ObjectWithDistance],
-                  query_vector: Optional[torch.Tensor] = None) -> List[int]:
-            # Convert raw distances to selection scores
-            scores = torch.tensor([obj.distance for obj in categories])
-
-            # Apply threshold to determine which objects to select
-            threshold = 0.5
-            selected_indices = torch.where(scores < threshold)[0].tolist()
-
-            return selected_indices
-        ```
         """
+        candidates = SelectionCandidates.from_objects(
+            categories, self.vectors_are_needed
+        )
+        query_vectors = None
+        if query_vector is not None:
+            query_vectors = np.asarray(query_vector, dtype=np.float32)
+            query_vectors = query_vectors.reshape(1, -1)
+
+        return self.select_batch([candidates], query_vectors)[0]
 
     @property
     @abstractmethod
@@ -1,15 +1,18 @@
 from typing import List, Optional
 
-import torch
-import torch.nn.functional as F
+import numpy as np
 
+from embedding_studio.embeddings.selectors.candidates import (
+    SelectionCandidates,
+    stack_vectors,
+    unstack_labels,
+)
 from embedding_studio.embeddings.selectors.selector import AbstractSelector
 from embedding_studio.models.embeddings.models import (
     MetricAggregationType,
     MetricType,
     SearchIndexInfo,
 )
-from embedding_studio.models.embeddings.objects import ObjectWithDistance
 
 
 class VectorsBasedSelector(AbstractSelector):
@@ -51,35 +54,37 @@ class VectorsBasedSelector(AbstractSelector):
 
     def _calculate_distance(
         self,
-        query_vector: torch.Tensor,  # Shape: [N1, D]
-        item_vectors: torch.Tensor,  # Shape: [N2, M, D]
+        query_vectors: np.ndarray,  # Shape: [Q, D]
+        item_vectors: np.ndarray,  # Shape: [Q, N, M, D]
+        parts_mask: np.ndarray,  # Shape: [Q, N, M]
+        item_norms: np.ndarray,  # Shape: [Q, N, M]
         softmin_temperature: float = 1.0,  # Temperature for soft minimum
         is_similarity: bool = False,
-    ) -> torch.Tensor:
+    ) -> np.ndarray:
         """
-        Compute similarity or distance between queries and items.
+        Compute similarity or distance between queries and their items.
 
-        This method calculates distances or similarities between query vectors
-        and item vectors using the configured metric type and aggregation method.
+        This method calculates distances or similarities between each query vector
+        and vectors of items found for it using the configured metric type and
+        aggregation method. All metrics are derived from a single batched dot product
+        and precomputed norms of item vectors, padded parts are ignored.
 
-        :param query_vector: Tensor of shape [N1, D] representing query embeddings
-        :param item_vectors: Tensor of shape [N2, M, D] representing item embeddings
+        :param query_vectors: Array of shape [Q, D] representing query embeddings
+        :param item_vectors: Array of shape [Q, N, M, D] representing item embeddings
+        :param parts_mask: Boolean array of shape [Q, N, M], False for padded parts
+        :param item_norms: Array of shape [Q, N, M] with L2 norms of item vectors
         :param softmin_temperature: Temperature for differentiable softmin approximation
         :param is_similarity: Whether to treat values as similarity or distance
-        :return: Tensor of shape [N1, N2] containing distances/similarities between queries and items
+        :return: Array of shape [Q, N] containing distances/similarities between queries and items
         """
-        # Calculate initial similarities/distances [N1, N2, M]
+        # Calculate initial similarities/distances [Q, N, M]
+        products = np.einsum("qnmd,qd->qnm", item_vectors, query_vectors)
         if self._search_index_info.metric_type == MetricType.COSINE:
-            queries_norm = (
-                F.normalize(query_vector, p=2, dim=-1)
-                .unsqueeze(1)
-                .unsqueeze(2)
-            )  # [N1, 1, 1, D]
-            items_norm = F.normalize(item_vectors, p=2, dim=-1)  # [N2, M, D]
-            items_norm = items_norm.unsqueeze(0)  # [1, N2, M, D]
-            values = torch.sum(
-                queries_norm * items_norm, dim=-1
-            )  # [N1, N2, M]
+            query_norms = np.linalg.norm(query_vectors, axis=-1)
+            values = products / (
+                np.maximum(item_norms, 1e-12)
+                * np.maximum(query_norms, 1e-12)[:, None, None]
+            )
             if self._scale_to_one:
                 values = (values + 1) / 2
 
@@ -87,27 +92,33 @@ class VectorsBasedSelector(AbstractSelector):
                 values = 1 - values
 
         elif self._search_index_info.metric_type == MetricType.DOT:
-            queries_exp = query_vector.unsqueeze(1).unsqueeze(
-                2
-            )  # [N1, 1, 1, D]
-            items_exp = item_vectors.unsqueeze(0)  # [1, N2, M, D]
-            values = torch.sum(queries_exp * items_exp, dim=-1)  # [N1, N2, M]
-            print(values)
+            values = products
             if self._scale_to_one:
-                mean = torch.mean(values)
-                std_dev = torch.std(values, unbiased=True)
-                values = (values - mean) / std_dev
+                # Standardize values of each query by its real parts
+                counts = parts_mask.sum(axis=(1, 2))
+                masked = np.where(parts_mask, values, 0.0)
+                mean = masked.sum(axis=(1, 2)) / np.maximum(counts, 1)
+                deviations = np.where(
+                    parts_mask, values - mean[:, None, None], 0.0
+                )
+                std_dev = np.sqrt(
+                    (deviations**2).sum(axis=(1, 2))
+                    / np.maximum(counts - 1, 1)
+                )
+                values = (values - mean[:, None, None]) / np.maximum(
+                    std_dev, 1e-12
+                )[:, None, None]
 
             if not is_similarity:
                 values = -values
 
         elif self._search_index_info.metric_type == MetricType.EUCLID:
-            queries_exp = query_vector.unsqueeze(1).unsqueeze(
-                2
-            )  # [N1, 1, 1, D]
-            items_exp = item_vectors.unsqueeze(0)  # [1, N2, M, D]
-            differences = queries_exp - items_exp  # [N1, N2, M, D]
-            values = torch.norm(differences, dim=-1)  # [N1, N2, M]
+            squared = (
+                item_norms**2
+                - 2 * products
+                + np.sum(query_vectors**2, axis=-1)[:, None, None]
+            )
+            values = np.sqrt(np.maximum(squared, 0.0))
             if is_similarity:
                 values = -values
 
@@ -116,27 +127,33 @@ class VectorsBasedSelector(AbstractSelector):
                 f"Unsupported MetricType: {self._search_index_info.metric_type}"
             )
 
-        # Aggregate across the `M` dimension -> [N1, N2]
+        # Aggregate across the `M` dimension -> [Q, N]
         if (
             self._search_index_info.metric_aggregation_type
             == MetricAggregationType.MIN
         ):
-            # Differentiable soft minimum using log-sum-exp
-            softmin_weights = torch.exp(
-                -values / softmin_temperature
-            )  # [N1, N2, M]
-            softmin_weights /= softmin_weights.sum(
-                dim=-1, keepdim=True
+            # Soft minimum: softmax of negated values over real parts
+            logits = np.where(
+                parts_mask, -values / softmin_temperature, -np.inf
+            )
+            max_logits = logits.max(axis=-1, keepdims=True)
+            max_logits = np.where(np.isfinite(max_logits), max_logits, 0.0)
+            softmin_weights = np.exp(logits - max_logits)  # [Q, N, M]
+            softmin_weights /= np.maximum(
+                softmin_weights.sum(axis=-1, keepdims=True), 1e-30
             )  # Normalize weights along M
-            values = torch.sum(
-                softmin_weights * values, dim=-1
-            )  # Weighted sum -> [N1, N2]
+            values = np.sum(
+                softmin_weights * np.where(parts_mask, values, 0.0), axis=-1
+            )  # Weighted sum -> [Q, N]
 
         elif (
             self._search_index_info.metric_aggregation_type
             == MetricAggregationType.AVG
         ):
-            values = values.mean(dim=-1)  # [N1, N2]
+            counts = np.maximum(parts_mask.sum(axis=-1), 1)
+            values = (
+                np.where(parts_mask, values, 0.0).sum(axis=-1) / counts
+            )  # [Q, N]
 
         else:
             raise ValueError(
@@ -146,50 +163,60 @@ class VectorsBasedSelector(AbstractSelector):
         return values
 
     def _calculate_binary_labels(
-        self, corrected_values: torch.Tensor
-    ) -> torch.Tensor:
+        self, corrected_values: np.ndarray
+    ) -> np.ndarray:
         """
         Calculates binary selection labels from corrected distance values.
 
         This abstract method must be implemented by subclasses to define the specific
         decision boundary for selection based on the corrected distance values.
 
-        :param corrected_values: Tensor of distances that have been adjusted by the margin
-        :return: Binary tensor indicating which items should be selected (1) or not (0)
+        :param corrected_values: Array of distances that have been adjusted by the margin
+        :return: Boolean array indicating which items should be selected
 
         Example implementation:
         ```python
-        def _calculate_binary_labels(self, corrected_values: torch.Tensor) -> torch.Tensor:
+        def _calculate_binary_labels(self, corrected_values: np.ndarray) -> np.ndarray:
             # Simple threshold-based selection
             return corrected_values > 0
         ```
         """
         raise NotImplementedError
 
-    def select(
+    def select_batch(
         self,
-        categories: List[ObjectWithDistance],
-        query_vector: Optional[torch.Tensor] = None,
-    ) -> List[int]:
+        candidates: List[SelectionCandidates],
+        query_vectors: Optional[np.ndarray] = None,
+    ) -> List[List[int]]:
         """
-        Selects indices of objects based on vector comparisons.
+        Selects indices of candidates based on vector comparisons.
 
         This method implements the selection logic by:
-        1. Converting objects to tensors
-        2. Calculating distances/similarities between query and category vectors
+        1. Stacking vectors of candidates of all queries into a single array
+        2. Calculating distances/similarities between queries and their candidates
         3. Applying the margin threshold
         4. Calculating binary selection labels
-        5. Returning indices of selected objects
+        5. Returning indices of selected candidates of each query
 
-        :param categories: List of objects with distance metrics and vectors
-        :param query_vector: Query vector to compare against object vectors
-        :return: List of indices of selected objects
+        :param candidates: Candidates found for each query, collected with vectors
+        :param query_vectors: Array of shape [Q, D] with query embeddings
+        :return: Indices of selected candidates for each query
         """
-        query_vector = torch.Tensor(query_vector).unsqueeze(0)
-        category_vectors = self._get_categories_tensor(categories)
+        if query_vectors is None:
+            raise ValueError("Query vectors are required by the selector")
+
+        if all(len(batch) == 0 for batch in candidates):
+            return [[] for _ in candidates]
+
+        query_vectors = np.asarray(query_vectors, dtype=np.float32).reshape(
+            len(candidates), -1
+        )
+        item_vectors, parts_mask, item_norms = stack_vectors(candidates)
         values = self._calculate_distance(
-            query_vector,
-            category_vectors,
+            query_vectors,
+            item_vectors,
+            parts_mask,
+            item_norms,
             self._softmin_temperature,
             self._is_similarity,
         )
@@ -198,4 +225,4 @@ class VectorsBasedSelector(AbstractSelector):
         )
         corrected_values = values - positive_threshold_min
         bin_labels = self._calculate_binary_labels(corrected_values)
-        return torch.nonzero(bin_labels).T[1].tolist()
+        return unstack_labels(bin_labels, candidates)
@@ -0,0 +1,94 @@
+from typing import Dict, List, Optional, Sequence
+
+import torch
+from torch import nn
+
+from embedding_studio.inference_management.triton.jit_trace_manager import (
+    JitTraceTritonModelStorageManager,
+)
+from embedding_studio.inference_management.triton.model_storage_info import (
+    ModelStorageInfo,
+)
+from embedding_studio.inference_management.triton.utils.image_input import (
+    CLIP_MEAN,
+    CLIP_STD,
+    UInt8ImageInputModel,
+    pixel_values_to_uint8,
+)
+
+
+class UInt8ImageJitTraceTritonModelStorageManager(
+    JitTraceTritonModelStorageManager
+):
+    """
+    A JIT trace storage manager for image models receiving uint8 NHWC pixels.
+
+    The model is wrapped with UInt8ImageInputModel before tracing, so the
+    deployed model scales, normalizes and transposes pixels itself. Clients
+    send 1 byte per channel instead of 4 and skip normalization.
+
+    :param storage_info: Information about where and how the model should be stored.
+    :param do_dynamic_batching: Whether to enable dynamic batching for the model.
+    :param mean: Per channel mean used for normalization (CLIP by default).
+    :param std: Per channel standard deviation used for normalization (CLIP by default).
+    :return: A manager for handling JIT-traced model storage operations.
+    """
+
+    def __init__(
+        self,
+        storage_info: ModelStorageInfo,
+        do_dynamic_batching: bool = True,
+        mean: Optional[Sequence[float]] = None,
+        std: Optional[Sequence[float]] = None,
+    ):
+        super(UInt8ImageJitTraceTritonModelStorageManager, self).__init__(
+            storage_info, do_dynamic_batching
+        )
+        self.mean = mean if mean is not None else CLIP_MEAN
+        self.std = std if std is not None else CLIP_STD
+
+    def _generate_triton_config_model_input(
+        self, example_inputs: Dict[str, torch.Tensor]
+    ) -> List[str]:
+        """
+        Generates the input section of the Triton configuration, declaring
+        the NHWC layout of the uint8 pixels.
+
+        :param example_inputs: Dictionary mapping input names to example tensors.
+        :return: A list of configuration lines for the model inputs section.
+        """
+        config_lines = super(
+            UInt8ImageJitTraceTritonModelStorageManager, self
+        )._generate_triton_config_model_input(example_inputs)
+
+        formatted_lines = []
+        for line in config_lines:
+            formatted_lines.append(line)
+            if line.strip().startswith("data_type:"):
+                formatted_lines.append("    format: FORMAT_NHWC")
+        return formatted_lines
+
+    def save_model(
+        self,
+        model: nn.Module,
+        example_inputs: Dict[str, torch.Tensor],
+        named_inputs: bool = False,
+    ):
+        """
+        Wraps the model to accept uint8 NHWC pixels and deploys it.
+
+        :param model: The PyTorch model expecting normalized float NCHW pixel values.
+        :param example_inputs: Dictionary mapping input names to normalized example pixel values.
+        :param named_inputs: Whether to pass inputs to the model as named arguments.
+        :return: None
+        """
+        device = next(iter(example_inputs.values())).device
+        wrapped_model = UInt8ImageInputModel(model, self.mean, self.std)
+        wrapped_model = wrapped_model.to(device).eval()
+        uint8_inputs = {
+            name: pixel_values_to_uint8(tensor, self.mean, self.std)
+            for name, tensor in example_inputs.items()
+        }
+        super(UInt8ImageJitTraceTritonModelStorageManager, self).save_model(
+            wrapped_model, uint8_inputs, named_inputs
+        )
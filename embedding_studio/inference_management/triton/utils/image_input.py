@@ -0,0 +1,73 @@
+from enum import Enum
+from typing import Sequence
+
+import torch
+from torch import nn
+
+# Color normalization of the original CLIP preprocessing
+CLIP_MEAN = (0.48145466, 0.4578275, 0.40821073)
+CLIP_STD = (0.26862954, 0.26130258, 0.27577711)
+
+
+class ImageInputMode(str, Enum):
+    """
+    How images are sent to a deployed items model.
+
+    FP32: normalized float32 NCHW pixel values (~600 KB per 224px image)
+    UINT8: resized uint8 NHWC pixels, normalized by the model (~150 KB)
+    """
+
+    FP32 = "fp32"
+    UINT8 = "uint8"
+
+
+class UInt8ImageInputModel(nn.Module):
+    """
+    Wraps an image model expecting normalized float NCHW pixel values,
+    so it accepts uint8 NHWC pixels instead. Scaling, normalization and layout
+    conversion become a part of the traced model and run on the inference
+    server.
+
+    :param model: Model expecting normalized float NCHW pixel values
+    :param mean: Per channel mean used for normalization
+    :param std: Per channel standard deviation used for normalization
+    """
+
+    def __init__(
+        self,
+        model: nn.Module,
+        mean: Sequence[float] = CLIP_MEAN,
+        std: Sequence[float] = CLIP_STD,
+    ):
+        super(UInt8ImageInputModel, self).__init__()
+        self.model = model
+        self.register_buffer(
+            "mean", torch.tensor(mean, dtype=torch.float32).view(1, -1, 1, 1)
+        )
+        self.register_buffer(
+            "std", torch.tensor(std, dtype=torch.float32).view(1, -1, 1, 1)
+        )
+
+    def forward(self, pixels: torch.Tensor) -> torch.Tensor:
+        pixel_values = pixels.permute(0, 3, 1, 2).float().div(255.0)
+        return self.model((pixel_values - self.mean) / self.std)
+
+
+def pixel_values_to_uint8(
+    pixel_values: torch.Tensor,
+    mean: Sequence[float] = CLIP_MEAN,
+    std: Sequence[float] = CLIP_STD,
+) -> torch.Tensor:
+    """
+    Convert normalized float pixel values back to uint8 pixels.
+
+    :param pixel_values: Normalized pixel values, (C, H, W) or (N, C, H, W)
+    :param mean: Per channel mean used for normalization
+    :param std: Per channel standard deviation used for normalization
+    :return: uint8 pixels, (H, W, C) or (N, H, W, C)
+    """
+    shape = (-1, 1, 1)
+    mean = torch.tensor(mean, device=pixel_values.device).view(shape)
+    std = torch.tensor(std, device=pixel_values.device).view(shape)
+    pixels = ((pixel_values * std + mean) * 255.0).round().clamp(0, 255)
+    return pixels.movedim(-3, -1).to(torch.uint8)
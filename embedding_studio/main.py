@@ -6,6 +6,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from embedding_studio.api.api_v1.api import api_router
+from embedding_studio.api.api_v1.endpoints.clickstream_client import (
+    events_buffer,
+)
 from embedding_studio.core.config import settings
 from embedding_studio.utils.initializer_actions import (
     init_nltk,
@@ -23,6 +26,7 @@ async def lifespan(app: FastAPI):
 
     yield
     # post actions
+    events_buffer.close()
 
 
 origins = ["*"]
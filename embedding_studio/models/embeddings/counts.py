@@ -0,0 +1,31 @@
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CountStrategy(str, Enum):
+    """
+    CountStrategy: An enum defining how the number of objects matching a filter
+    is computed. EXACT runs a full count, ESTIMATE takes the query planner's
+    row estimate and SAMPLED counts over a random sample of the table and
+    scales the result. Approximate strategies trade accuracy for latency on
+    large collections.
+    """
+
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    SAMPLED = "sampled"
+
+
+class CountResult(BaseModel):
+    """
+    CountResult: The number of objects matching a filter along with how it was
+    obtained. An approximate count may carry an error bound (the half-width of
+    a ~95% confidence interval) when the strategy is able to provide one.
+    """
+
+    total_count: int
+    is_approximate: bool = False
+    error_bound: Optional[int] = None
+    count_strategy: CountStrategy = CountStrategy.EXACT
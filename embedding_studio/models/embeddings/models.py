@@ -1,6 +1,7 @@
 from enum import Enum
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class MetricType(str, Enum):
@@ -29,26 +30,63 @@ class MetricAggregationType(str, Enum):
 class HnswParameters(BaseModel):
     """
     HnswParameters: Configures the Hierarchical Navigable Small World (HNSW) graph
-    index parameters like m (maximum connections per node) and ef_construction
-    (search width during index building). Tunes the performance and accuracy
-    tradeoffs of vector searches.
+    index parameters like m (maximum connections per node), ef_construction
+    (search width during index building) and ef_search (search width during
+    querying). Tunes the performance and accuracy tradeoffs of vector searches.
     """
 
     m: int = 16
     ef_construction: int = 64
+    ef_search: int = 40
+
+
+class PartitioningType(str, Enum):
+    """
+    PartitioningType: An enum defining how collection tables are partitioned.
+    HASH spreads objects evenly by object ID hash, LIST groups vectors by the
+    value of a payload field (e.g. a tenant), so filters by it skip the other
+    partitions.
+    """
+
+    HASH = "hash"
+    LIST = "list"
+
+
+class PartitioningInfo(BaseModel):
+    """
+    PartitioningInfo: Configures partitioning of a very large collection. Each
+    partition gets its own HNSW index, which keeps index builds, VACUUM and
+    memory per graph bounded. For HASH partitioning `partitions` sets the
+    number of partitions, for LIST partitioning `field` is the payload field
+    and `values` are the field values getting a dedicated partition, other
+    values go to a default one.
+    """
+
+    type: PartitioningType = PartitioningType.HASH
+    partitions: int = 8
+    field: Optional[str] = None
+    values: List[str] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def check_field(self) -> "PartitioningInfo":
+        if self.type == PartitioningType.LIST and not self.field:
+            raise ValueError("LIST partitioning requires a partition field")
+        return self
 
 
 class SearchIndexInfo(BaseModel):
     """
     SearchIndexInfo: Contains configuration for a vector search index, including
-    dimensions, metric type, aggregation method, and HNSW parameters. Provides the
-    technical specifications for how vectors are indexed and searched.
+    dimensions, metric type, aggregation method, HNSW parameters and optional
+    table partitioning. Provides the technical specifications for how vectors
+    are indexed and searched.
     """
 
     dimensions: int
     metric_type: MetricType = MetricType.COSINE
     metric_aggregation_type: MetricAggregationType = MetricAggregationType.MIN
     hnsw: HnswParameters = HnswParameters()
+    partitioning: Optional[PartitioningInfo] = None
 
 
 class EmbeddingModelInfo(SearchIndexInfo):
@@ -66,3 +66,8 @@ class BaseDataHandlingTask(BaseModel):
 
     items: List[DataItem] = Field(default_factory=list)
     failed_items: List[FailedDataItem] = Field(default_factory=list)
+    skipped_count: int = Field(
+        default=0,
+        ge=0,
+        description="Number of unchanged items, which weren't embedded again",
+    )
@@ -68,6 +68,16 @@ class ReindexTask(BaseTaskInfo):
     total: Optional[int] = Field(
         default=None, ge=0.0, description="Total number of items to process"
     )
+    skipped_count: int = Field(
+        default=0,
+        ge=0,
+        description="Number of unchanged items, which weren't embedded again",
+    )
+    estimated_time_left: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        description="Estimated number of seconds left",
+    )
 
     children: List[PyObjectId] = Field(default_factory=list)
     failed_items: List[FailedDataItem] = Field(default_factory=list)
@@ -82,6 +92,21 @@ class ReindexTask(BaseTaskInfo):
         self.count += additional_count
         self.progress = self.count / self.total
 
+    def set_count(self, count: int, elapsed_seconds: float):
+        """
+        Set the number of processed items and estimate the time left.
+
+        :param count: Number of processed items so far
+        :param elapsed_seconds: Seconds passed since processing start
+        """
+        self.count = count
+        if self.total:
+            self.progress = min(self.count / self.total, 1.0)
+        if self.count > 0 and self.total is not None:
+            self.estimated_time_left = max(
+                elapsed_seconds * (self.total - self.count) / self.count, 0.0
+            )
+
 
 class ReindexSubtask(BaseDataHandlingTask, BaseTaskInfo, BaseTaskMetadata):
     """
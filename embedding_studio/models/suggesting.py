@@ -26,6 +26,35 @@ class SuggestingPhrase(BaseModel):
         return prob
 
 
+class SuggestingPhrasesIngestionReport(BaseModel):
+    """
+    Outcome of a bulk ingestion of suggestion phrases.
+    """
+
+    total: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    elapsed_seconds: float = 0.0
+    index_memory_mb: Optional[float] = None
+
+    @property
+    def phrases_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.total / self.elapsed_seconds
+
+
+class SuggestionsCacheStats(BaseModel):
+    """
+    Counters of the suggestions cache since the process start.
+    """
+
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    hit_rate: float = 0.0
+
+
 class Chunk(BaseModel):
     """
     A simple container for a text fragment or piece of a phrase.
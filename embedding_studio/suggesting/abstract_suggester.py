@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
 from embedding_studio.models.suggesting import Suggest, SuggestingRequest
 from embedding_studio.suggesting.abtract_phrase_manager import (
@@ -48,6 +48,31 @@ class AbstractSuggester(ABC):
         ```
         """
 
+    def get_topk_suggestions_by_domains(
+        self,
+        request: SuggestingRequest,
+        domains: List[Optional[str]],
+        top_k: int = 10,
+    ) -> List[List[Suggest]]:
+        """
+        Returns the top-k suggestions of the same request for each domain.
+
+        The request is tokenized once by the caller. This implementation runs
+        a query per domain, backends override it to query all domains in
+        a single round-trip.
+
+        :param request: The request, its domain is ignored
+        :param domains: Domains to get suggestions for, None means any domain
+        :param top_k: The number of suggestions per domain. Defaults to 10
+        :return: A list of suggestions for each domain, in the same order
+        """
+        return [
+            self.get_topk_suggestions(
+                request.model_copy(update={"domain": domain}), top_k
+            )
+            for domain in domains
+        ]
+
     @property
     @abstractmethod
     def phrases_manager(self) -> AbstractSuggestionPhraseManager:
@@ -294,3 +294,15 @@ class AbstractSuggestionPhraseManager(ABC):
             return result
         ```
         """
+
+    def get_version(self) -> Optional[int]:
+        """
+        Get the version of stored phrases, every mutation increases it.
+
+        Cached suggestions are valid while the version is the same. Managers,
+        which don't track versions, return None, so their suggestions aren't
+        cached.
+
+        :return: Version number or None
+        """
+        return None
@@ -0,0 +1,156 @@
+from typing import List, Set
+
+# Only first characters of a chunk are indexed, so number of deletion keys
+# doesn't depend on a chunk length
+FUZZY_PREFIX_LENGTH = 7
+
+
+def get_max_distance(text: str) -> int:
+    """
+    Get an edit distance allowed for a typed chunk: short chunks tolerate
+    one typo, longer ones tolerate two.
+
+    :param text: Typed chunk
+    :return: Max edit distance
+    """
+    if len(text) < 3:
+        return 0
+    return 1 if len(text) < 6 else 2
+
+
+def get_deletes(
+    text: str,
+    max_distance: int = 2,
+    prefix_length: int = FUZZY_PREFIX_LENGTH,
+) -> Set[str]:
+    """
+    Build a deletion neighbourhood of a chunk prefix: all strings made by
+    deleting up to `max_distance` characters (SymSpell).
+
+    Two strings within `max_distance` edits share at least one deletion key,
+    so fuzzy candidates are found by exact lookups of query deletion keys.
+
+    :param text: Normalized chunk
+    :param max_distance: Max number of deleted characters
+    :param prefix_length: Number of first characters to use
+    :return: Deletion keys, including the prefix itself
+    """
+    text = text[:prefix_length]
+    deletes = {text}
+    level = {text}
+    for _ in range(max_distance):
+        next_level = set()
+        for word in level:
+            if len(word) <= 1:
+                continue
+            for index in range(len(word)):
+                next_level.add(word[:index] + word[index + 1 :])
+        deletes |= next_level
+        level = next_level
+
+    deletes.discard("")
+    return deletes
+
+
+def get_prefixes_deletes(
+    chunk: str,
+    max_distance: int = 2,
+    prefix_length: int = FUZZY_PREFIX_LENGTH,
+    min_length: int = 3,
+) -> Set[str]:
+    """
+    Build deletion keys of all chunk prefixes, so a partially typed chunk
+    with typos finds the stored chunk.
+
+    A prefix is expanded up to its own `get_max_distance`: a typed chunk
+    is looked up with the distance of its length, and a longer typed chunk
+    needs fewer deletions of a shorter prefix.
+
+    :param chunk: Normalized stored chunk
+    :param max_distance: Max number of deleted characters of any prefix
+    :param prefix_length: Max length of a prefix
+    :param min_length: Min length of a prefix, shorter ones aren't fuzzy
+                       matched
+    :return: Deletion keys of the prefixes
+    """
+    deletes = set()
+    for length in range(min_length, min(len(chunk), prefix_length) + 1):
+        prefix = chunk[:length]
+        deletes |= get_deletes(
+            prefix,
+            min(max_distance, get_max_distance(prefix)),
+            prefix_length,
+        )
+    return deletes
+
+
+def get_query_deletes(text: str) -> List[str]:
+    """
+    Build deletion keys to look fuzzy candidates of a typed chunk up.
+
+    :param text: Normalized typed chunk
+    :return: Sorted deletion keys, empty if the chunk is too short for typos
+    """
+    max_distance = get_max_distance(text)
+    if max_distance == 0:
+        return []
+    return sorted(get_deletes(text, max_distance))
+
+
+def damerau_levenshtein(first: str, second: str, max_distance: int) -> int:
+    """
+    Compute the optimal string alignment (restricted Damerau-Levenshtein)
+    distance, stopping early once it exceeds `max_distance`.
+
+    :param first: First string
+    :param second: Second string
+    :param max_distance: Max distance of interest
+    :return: Distance, or max_distance + 1 if it's greater than max_distance
+    """
+    if abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+
+    previous_row: List[int] = []
+    row = list(range(len(second) + 1))
+    for i in range(1, len(first) + 1):
+        two_rows_back, previous_row = previous_row, row
+        row = [i] + [0] * len(second)
+        for j in range(1, len(second) + 1):
+            cost = 0 if first[i - 1] == second[j - 1] else 1
+            row[j] = min(
+                previous_row[j] + 1,
+                row[j - 1] + 1,
+                previous_row[j - 1] + cost,
+            )
+            if (
+                i > 1
+                and j > 1
+                and first[i - 1] == second[j - 2]
+                and first[i - 2] == second[j - 1]
+            ):
+                row[j] = min(row[j], two_rows_back[j - 2] + 1)
+
+        if min(row) > max_distance:
+            return max_distance + 1
+
+    return min(row[-1], max_distance + 1)
+
+
+def is_fuzzy_prefix(text: str, chunk: str, max_distance: int) -> bool:
+    """
+    Check whether a typed chunk is a prefix of a stored chunk with at most
+    `max_distance` typos.
+
+    :param text: Normalized typed chunk
+    :param chunk: Normalized stored chunk
+    :param max_distance: Max edit distance
+    :return: True if the typed chunk fuzzy matches the stored chunk prefix
+    """
+    for length in range(
+        max(len(text) - max_distance, 1), len(text) + max_distance + 1
+    ):
+        if damerau_levenshtein(text, chunk[:length], max_distance) <= (
+            max_distance
+        ):
+            return True
+    return False
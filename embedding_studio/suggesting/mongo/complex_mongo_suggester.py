@@ -70,17 +70,19 @@ class ComplexMongoSuggester(MongoSuggester):
         :return:
             A list of MongoDB aggregation pipeline stages (dictionaries).
         """
-        if len(request.found_chunks) == 0 and len(request.next_chunk) > 0:
+        found_chunks = request.chunks.found_chunks
+        next_chunk = request.chunks.next_chunk
+        if len(found_chunks) == 0 and len(next_chunk) > 0:
             return self._simple_pipeline_generator.generate_pipeline(
                 request=request, top_k=top_k
             )
 
-        elif len(request.found_chunks) > 0 and len(request.next_chunk) == 0:
+        elif len(found_chunks) > 0 and len(next_chunk) == 0:
             return self._prefix_pipeline_generator.generate_pipeline(
                 request=request, top_k=top_k
             )
 
-        elif len(request.found_chunks) > 0 and len(request.next_chunk) > 0:
+        elif len(found_chunks) > 0 and len(next_chunk) > 0:
             return self._full_pipeline_generator.generate_pipeline(
                 request=request, top_k=top_k
             )
@@ -1,10 +1,18 @@
 from typing import List
 
 from embedding_studio.models.suggesting import SuggestingRequest
+from embedding_studio.suggesting.fuzzy import get_query_deletes
+from embedding_studio.suggesting.mongo.keys import (
+    FUZZY_KEYS_FIELD,
+    PREFIX_KEYS_FIELD,
+    SHINGLES_FIELD,
+    get_chunk_keys,
+    get_suffix_shingles,
+)
 from embedding_studio.suggesting.mongo.pipeline_generator import (
     AbstractPipelineGenerator,
 )
-from embedding_studio.utils.string_utils import generate_fuzzy_regex
+from embedding_studio.utils.string_utils import normalize_chunk
 
 
 class FullSuggestsPipelineGenerator(AbstractPipelineGenerator):
@@ -41,150 +49,67 @@ class FullSuggestsPipelineGenerator(AbstractPipelineGenerator):
         :return:
             A list of dictionaries representing each stage in the MongoDB aggregation pipeline.
         """
-        fuzzy_pattern = generate_fuzzy_regex(request.next_chunk)
-        n_chunks = len(request.found_chunks)
-        if n_chunks == 0:
-            return []
-
-        # Build the $or conditions for all possible starting positions
-        found_chunks = request.found_chunks
-        if len(found_chunks) > self.max_chunks:
-            found_chunks = request.found_chunks[-self.max_chunks :]
-
-        matching_shift_exprs = []
-        for index in range(len(found_chunks)):
-            matching_shifts = list()
-            for pos in range(len(found_chunks) - index):
-                current_matching_shifts = []
-                current_matching_shifts.append(
-                    {
-                        f"chunk_{pos}": found_chunks[index + pos],
-                    }
-                )
-                current_matching_shifts.append(
-                    {
-                        f"chunk_{pos}": found_chunks[index + pos].lower(),
-                    }
-                )
-                current_matching_shifts.append(
-                    {
-                        f"chunk_{pos}": found_chunks[index + pos].upper(),
-                    }
-                )
-                current_matching_shifts.append(
-                    {
-                        f"chunk_{pos}": found_chunks[index + pos]
-                        .lower()
-                        .capitalize(),
-                    }
-                )
-
-                matching_shifts.append(
-                    {
-                        "$or": current_matching_shifts,
+        next_chunk = request.chunks.next_chunk
+        next_key = normalize_chunk(next_chunk)
+        # Phrases, which first chunk shares a deletion key with the next
+        # chunk, are within a few typos from it
+        query_deletes = get_query_deletes(next_key)
+        is_fuzzy = {
+            "$gt": [
+                {
+                    "$size": {
+                        "$setIntersection": [
+                            {"$ifNull": [f"${FUZZY_KEYS_FIELD}", []]},
+                            query_deletes,
+                        ]
                     }
-                )
+                },
+                0,
+            ]
+        }
 
-            matching_shift_exprs.append(
-                {
-                    "$and": [
-                        {"n_chunks": {"$gte": len(matching_shifts)}},
-                        *matching_shifts,
-                    ]
-                }
-            )
+        found_chunks = request.chunks.found_chunks
+        if len(found_chunks) == 0:
+            return []
 
-        match_prefix_part_or_conditions = []
-        for index in range(0, len(request.next_chunk)):
-            match_prefix_part_or_conditions.append(
-                {"search_0": request.next_chunk[: index + 1]}
-            )
-            match_prefix_part_or_conditions.append(
-                {"search_0": request.next_chunk[: index + 1].lower()}
-            )
-            match_prefix_part_or_conditions.append(
-                {"search_0": request.next_chunk[: index + 1].upper()}
-            )
-            match_prefix_part_or_conditions.append(
-                {
-                    "search_0": request.next_chunk[: index + 1]
-                    .lower()
-                    .capitalize()
-                }
-            )
+        if len(found_chunks) > self.max_chunks:
+            found_chunks = found_chunks[-self.max_chunks :]
 
-        case_branches = []
-        for index in range(len(found_chunks)):
-            case_branches.append(
-                {
-                    "case": {
-                        "$or": [
-                            {"$eq": [f"$chunk_0", found_chunks[index]]},
-                            {
-                                "$eq": [
-                                    f"$chunk_0",
-                                    found_chunks[index].lower(),
-                                ]
-                            },
-                            {
-                                "$eq": [
-                                    f"$chunk_0",
-                                    found_chunks[index].upper(),
-                                ]
-                            },
-                            {
-                                "$eq": [
-                                    f"$chunk_0",
-                                    found_chunks[index].lower().capitalize(),
-                                ]
-                            },
-                        ]
-                    },
-                    "then": len(found_chunks) - index - 1,
-                },
-            )
+        # A phrase continues the query if it starts with one of query
+        # suffixes, the longest suffix goes first
+        n_chunks = len(found_chunks)
+        suffix_shingles = get_suffix_shingles(get_chunk_keys(found_chunks))
+        case_branches = [
+            {
+                "case": {"$in": [shingle, f"${SHINGLES_FIELD}"]},
+                "then": n_chunks - index - 1,
+            }
+            for index, shingle in enumerate(suffix_shingles)
+        ]
 
         case_branches.append(
             {
                 "case": {
                     "$or": [
-                        {"$eq": [f"$search_0", request.next_chunk[:1]]},
-                        {
-                            "$eq": [
-                                f"$search_0",
-                                request.next_chunk[:1].lower(),
-                            ]
-                        },
-                        {
-                            "$eq": [
-                                f"$search_0",
-                                request.next_chunk[:1].upper(),
-                            ]
-                        },
-                        {
-                            "$regexMatch": {
-                                "input": "$chunk_0",
-                                "regex": fuzzy_pattern,
-                                "options": "i",
-                            }
-                        },
+                        {"$in": [next_key, f"${PREFIX_KEYS_FIELD}"]},
+                        is_fuzzy,
                     ]
                 },
                 "then": 0,
             },
         )
 
-        # Create an array of chunks for $indexOfArray usage
-        [f"$chunk_{i}" for i in range(self.max_chunks)]
-
         pipeline = [
             # ------------------------------
             # 1) MATCH STAGE
             # ------------------------------
             {
                 "$match": {
-                    "$or": matching_shift_exprs
-                    + match_prefix_part_or_conditions
+                    "$or": [
+                        {SHINGLES_FIELD: {"$in": suffix_shingles}},
+                        {PREFIX_KEYS_FIELD: next_key},
+                        {FUZZY_KEYS_FIELD: {"$in": query_deletes}},
+                    ]
                 }
             },
             # ------------------------------
@@ -206,29 +131,22 @@ class FullSuggestsPipelineGenerator(AbstractPipelineGenerator):
                                         "case": {
                                             "$eq": [
                                                 "$chunk_0",
-                                                request.next_chunk,
+                                                next_chunk,
                                             ]
                                         },
                                         "then": "exact",
                                     },
                                     {
                                         "case": {
-                                            "$regexMatch": {
-                                                "input": "$chunk_0",
-                                                "regex": f"^{request.next_chunk}",
-                                                "options": "i",
-                                            }
+                                            "$in": [
+                                                next_key,
+                                                f"${PREFIX_KEYS_FIELD}",
+                                            ]
                                         },
                                         "then": "prefix",
                                     },
                                     {
-                                        "case": {
-                                            "$regexMatch": {
-                                                "input": "$chunk_0",
-                                                "regex": fuzzy_pattern,
-                                                "options": "i",
-                                            }
-                                        },
+                                        "case": is_fuzzy,
                                         "then": "fuzzy",
                                     },
                                 ],
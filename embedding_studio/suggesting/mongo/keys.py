@@ -0,0 +1,67 @@
+from typing import List
+
+from embedding_studio.utils.string_utils import normalize_chunk
+
+# Normalized chunks of a phrase
+CHUNK_KEYS_FIELD = "chunk_keys"
+# Normalized n-grams of the first chunks: "a", "a b", "a b c", ...
+SHINGLES_FIELD = "shingles"
+# Normalized prefixes of the first chunk: "a", "ap", "app", ...
+PREFIX_KEYS_FIELD = "prefix_keys"
+# Deletion keys of the first chunk prefixes, see suggesting/fuzzy.py
+FUZZY_KEYS_FIELD = "fuzzy_keys"
+
+
+def get_chunk_keys(chunks: List[str]) -> List[str]:
+    """
+    Normalize chunks for case- and accent-insensitive lookups.
+
+    :param chunks: Chunks of a phrase or a query
+    :return: Normalized chunks
+    """
+    return [normalize_chunk(chunk) for chunk in chunks]
+
+
+def join_keys(keys: List[str]) -> str:
+    """
+    Join normalized chunks into a shingle key.
+
+    Chunks never contain whitespaces, so a space is a safe separator.
+
+    :param keys: Normalized chunks
+    :return: Shingle key
+    """
+    return " ".join(keys)
+
+
+def get_shingles(keys: List[str], max_chunks: int) -> List[str]:
+    """
+    Build shingle keys of a phrase: n-grams starting from its first chunk.
+
+    :param keys: Normalized chunks of a phrase
+    :param max_chunks: Max length of a shingle
+    :return: Shingle keys from the shortest to the longest one
+    """
+    keys = keys[:max_chunks]
+    return [join_keys(keys[: length + 1]) for length in range(len(keys))]
+
+
+def get_suffix_shingles(keys: List[str]) -> List[str]:
+    """
+    Build shingle keys of all query suffixes: a phrase starting with one of
+    them continues the query.
+
+    :param keys: Normalized chunks of a query
+    :return: Shingle keys from the longest suffix to the shortest one
+    """
+    return [join_keys(keys[index:]) for index in range(len(keys))]
+
+
+def get_prefix_keys(key: str) -> List[str]:
+    """
+    Build all prefixes of a normalized chunk.
+
+    :param key: Normalized chunk
+    :return: Prefixes from the shortest to the longest one
+    """
+    return [key[: length + 1] for length in range(len(key))]
@@ -1,6 +1,9 @@
+import logging
+import re
 from typing import List, Optional
 
 from bson import ObjectId
+from pymongo import UpdateOne
 from pymongo.collection import Collection
 
 from embedding_studio.models.suggesting import (
@@ -14,8 +17,26 @@ from embedding_studio.models.suggesting import (
 from embedding_studio.suggesting.abtract_phrase_manager import (
     AbstractSuggestionPhraseManager,
 )
+from embedding_studio.suggesting.fuzzy import get_prefixes_deletes
+from embedding_studio.suggesting.mongo.keys import (
+    CHUNK_KEYS_FIELD,
+    FUZZY_KEYS_FIELD,
+    PREFIX_KEYS_FIELD,
+    SHINGLES_FIELD,
+    get_chunk_keys,
+    get_prefix_keys,
+    get_shingles,
+)
 from embedding_studio.suggesting.tokenizer import SuggestingTokenizer
 
+logger = logging.getLogger(__name__)
+
+# Per-position indexes of collections stored before normalized keys
+_LEGACY_INDEX_NAME = re.compile(r"(chunk|search)_\d+_index")
+
+# ID of the document counting mutations of phrases
+_VERSION_ID = "version"
+
 
 class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
     """
@@ -48,6 +69,8 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
         self._tokenizer = tokenizer
         self._max_chunks = max_chunks
         self.collection = collection
+        # Stored apart, so phrase queries never meet the counter
+        self._versions = collection.database[f"{collection.name}_version"]
         self._create_indexes()
 
     def convert_phrase_to_request(self, phrase: str) -> SuggestingRequest:
@@ -84,31 +107,37 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
 
     def _create_indexes(self) -> None:
         """
-        Create necessary indexes on the collection for chunk fields,
-        search prefixes, document length, probability, and compound queries,
-        if they do not already exist.
+        Create necessary indexes on the collection for normalized chunk keys,
+        shingles, first chunk prefixes, document length, probability,
+        and compound queries, if they do not already exist.
+
+        Collections indexed by per-position chunk and search fields are
+        migrated once: keys of stored documents are built, then the old
+        indexes are dropped.
         """
         # 1. Retrieve existing index names so we can avoid duplicates or naming conflicts.
         existing_index_names = {
             idx["name"] for idx in self.collection.list_indexes()
         }
 
-        # 2. For each chunk field and search field
-        for i in range(self._max_chunks):
-            chunk_index_name = f"chunk_{i}_index"
-            search_index_name = f"search_{i}_index"
+        # 2. Multikey indexes used by suggests lookups
+        if "shingles_index" not in existing_index_names:
+            self.collection.create_index(
+                [(SHINGLES_FIELD, 1)],
+                name="shingles_index",
+            )
 
-            if chunk_index_name not in existing_index_names:
-                self.collection.create_index(
-                    [(f"chunk_{i}", 1)],
-                    name=chunk_index_name,
-                )
+        if "prefix_keys_index" not in existing_index_names:
+            self.collection.create_index(
+                [(PREFIX_KEYS_FIELD, 1)],
+                name="prefix_keys_index",
+            )
 
-            if search_index_name not in existing_index_names:
-                self.collection.create_index(
-                    [(f"search_{i}", 1)],
-                    name=search_index_name,
-                )
+        if "fuzzy_keys_index" not in existing_index_names:
+            self.collection.create_index(
+                [(FUZZY_KEYS_FIELD, 1)],
+                name="fuzzy_keys_index",
+            )
 
         # 3. Other indexes
         if "length_index" not in existing_index_names:
@@ -135,31 +164,122 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
                 name="length_first_chunk_index",
             )
 
+        # 4. Migrate documents stored before normalized keys
+        legacy_index_names = sorted(
+            name
+            for name in existing_index_names
+            if _LEGACY_INDEX_NAME.fullmatch(name)
+        )
+        if legacy_index_names:
+            logger.info(
+                f"Build suggesting keys of stored phrases and drop "
+                f"{len(legacy_index_names)} per-chunk indexes"
+            )
+            # Indexes are dropped after keys are built, so an interrupted
+            # migration is started again
+            self.rebuild_keys()
+            for name in legacy_index_names:
+                self.collection.drop_index(name)
+
+    def _get_keys(self, chunks: List[str]) -> dict:
+        """
+        Build normalized lookup keys of phrase chunks.
+
+        :param chunks:
+            Chunks of a phrase.
+        :return:
+            A dictionary with normalized chunks, shingles of the first chunks,
+            prefixes of the first chunk and their deletion keys.
+        """
+        keys = get_chunk_keys(chunks)
+        return {
+            CHUNK_KEYS_FIELD: keys,
+            SHINGLES_FIELD: get_shingles(keys, self._max_chunks),
+            PREFIX_KEYS_FIELD: get_prefix_keys(keys[0]) if keys else [],
+            FUZZY_KEYS_FIELD: (
+                sorted(get_prefixes_deletes(keys[0])) if keys else []
+            ),
+        }
+
     def _convert_phrase(self, suggesting_phrase: SuggestingPhrase) -> dict:
         """
         Convert a SuggestingPhrase into a flattened dictionary suitable for MongoDB.
-        Each token is stored as a separate 'chunk_{i}', and each prefix as 'search_{i}'.
+        Each token is stored as a separate 'chunk_{i}', normalized tokens,
+        shingles and prefixes of the first token are stored as arrays.
 
         :param suggesting_phrase:
             The SuggestingPhrase object to be converted.
         :return:
             A dictionary with fields for the original phrase, labels, probability,
-            and chunk/prefix pairs for each token.
+            chunks and their normalized keys.
         """
         tokenized = self._tokenizer.tokenize(suggesting_phrase.phrase)
-        chunks = []
-        for token in tokenized:
-            # Generate prefixes for search
-            prefixes = [token[:j] for j in range(1, len(token) + 1)]
-            chunks.append(Chunk(value=token, search_field=prefixes))
+        tokenized = tokenized[: self._max_chunks]
+
+        doc = {
+            "phrase": suggesting_phrase.phrase,
+            "n_chunks": len(tokenized),
+            "labels": suggesting_phrase.labels,
+            "domains": suggesting_phrase.domains,
+            "prob": suggesting_phrase.prob,
+        }
+        for i, token in enumerate(tokenized):
+            doc[f"chunk_{i}"] = token
 
-        doc = SearchDocument(
-            phrase=suggesting_phrase.phrase,
-            chunks=chunks,
-            labels=suggesting_phrase.labels,
-            prob=suggesting_phrase.prob,
+        doc.update(self._get_keys(tokenized))
+        return doc
+
+    def rebuild_keys(self, batch_size: int = 1000) -> None:
+        """
+        Build normalized keys of documents stored before they were introduced
+        and remove their per-chunk search fields.
+
+        :param batch_size:
+            Number of documents updated at once.
+        :return:
+            None
+        """
+        requests = []
+        cursor = self.collection.find(
+            {FUZZY_KEYS_FIELD: {"$exists": False}},
+            projection=["n_chunks"]
+            + [f"chunk_{i}" for i in range(self._max_chunks)],
+        )
+        for doc in cursor:
+            # Chunks beyond max_chunks aren't read by the projection
+            n_chunks = min(doc["n_chunks"], self._max_chunks)
+            chunks = [doc[f"chunk_{i}"] for i in range(n_chunks)]
+            requests.append(
+                UpdateOne(
+                    {"_id": doc["_id"]},
+                    {
+                        "$set": self._get_keys(chunks),
+                        "$unset": {
+                            f"search_{i}": "" for i in range(doc["n_chunks"])
+                        },
+                    },
+                )
+            )
+            if len(requests) >= batch_size:
+                self.collection.bulk_write(requests, ordered=False)
+                requests = []
+
+        if requests:
+            self.collection.bulk_write(requests, ordered=False)
+
+    def _increase_version(self) -> None:
+        self._versions.update_one(
+            {"_id": _VERSION_ID}, {"$inc": {"value": 1}}, upsert=True
         )
-        return doc.get_flattened_dict()
+
+    def get_version(self) -> Optional[int]:
+        """
+        Get the version of stored phrases, every mutation increases it.
+
+        :return: Version number
+        """
+        doc = self._versions.find_one({"_id": _VERSION_ID})
+        return int(doc["value"]) if doc else 0
 
     def add(self, phrases: List[SuggestingPhrase]) -> List[str]:
         """
@@ -177,7 +297,11 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
             for suggesting_phrase in phrases
         ]
 
-        result = self.collection.insert_many(documents, ordered=False)
+        try:
+            result = self.collection.insert_many(documents, ordered=False)
+        finally:
+            # Unordered inserts may be partially applied
+            self._increase_version()
         return [str(inserted_id) for inserted_id in result.inserted_ids]
 
     def find_phrases_by_values(
@@ -198,12 +322,7 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
                 # Convert flat document back to SearchDocument format
                 chunks = []
                 for i in range(doc["n_chunks"]):
-                    chunks.append(
-                        Chunk(
-                            value=doc[f"chunk_{i}"],
-                            search_field=doc[f"search_{i}"],
-                        )
-                    )
+                    chunks.append(Chunk(value=doc[f"chunk_{i}"]))
                 results.append(
                     SearchDocument(
                         phrase=doc["phrase"],
@@ -226,6 +345,7 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
             None
         """
         self.collection.delete_many({"phrase": {"$in": phrase_texts}})
+        self._increase_version()
 
     def delete(self, phrase_ids: List[str]) -> None:
         """
@@ -237,6 +357,7 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
             None
         """
         self.collection.delete_many({"_id": {"$in": phrase_ids}})
+        self._increase_version()
 
     def update_probability(
         self, phrase_id: str, new_probability: float
@@ -259,6 +380,7 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
         )
         if result.matched_count == 0:
             raise ValueError(f"No document found with _id={phrase_id}")
+        self._increase_version()
 
     def add_labels(self, phrase_id: str, labels: List[str]) -> None:
         """
@@ -277,6 +399,7 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
 
         if result.matched_count == 0:
             raise ValueError(f"No document found with _id={phrase_id}")
+        self._increase_version()
 
     def remove_labels(self, phrase_id: str, labels: List[str]) -> None:
         """
@@ -294,6 +417,7 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
         )
         if result.matched_count == 0:
             raise ValueError(f"No document found with _id={phrase_id}")
+        self._increase_version()
 
     def remove_all_label_values(self, labels: List[str]) -> None:
         """
@@ -307,6 +431,7 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
         self.collection.update_many(
             {"labels": {"$in": labels}}, {"$pull": {"labels": {"$in": labels}}}
         )
+        self._increase_version()
 
     def get_info_by_id(self, phrase_id: str) -> SearchDocument:
         """
@@ -336,12 +461,7 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
         # Reconstruct the chunk list from the flattened fields
         chunks = []
         for i in range(doc["n_chunks"]):
-            chunks.append(
-                Chunk(
-                    value=doc[f"chunk_{i}"],
-                    search_field=doc[f"search_{i}"],
-                )
-            )
+            chunks.append(Chunk(value=doc[f"chunk_{i}"]))
 
         # Build and return the SearchDocument
         return SearchDocument(
@@ -371,12 +491,7 @@ class MongoSuggestionPhraseManager(AbstractSuggestionPhraseManager):
             # Reconstruct the chunk list from the flattened fields
             chunks = []
             for i in range(doc["n_chunks"]):
-                chunks.append(
-                    Chunk(
-                        value=doc[f"chunk_{i}"],
-                        search_field=doc[f"search_{i}"],
-                    )
-                )
+                chunks.append(Chunk(value=doc[f"chunk_{i}"]))
 
             # Build the SearchDocument object
             search_doc = SearchDocument(
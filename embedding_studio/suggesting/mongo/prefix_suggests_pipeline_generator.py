@@ -1,6 +1,11 @@
 from typing import List
 
 from embedding_studio.models.suggesting import SuggestingRequest
+from embedding_studio.suggesting.mongo.keys import (
+    SHINGLES_FIELD,
+    get_chunk_keys,
+    get_suffix_shingles,
+)
 from embedding_studio.suggesting.mongo.pipeline_generator import (
     AbstractPipelineGenerator,
 )
@@ -45,91 +50,27 @@ class PrefixSuggestsPipelineGenerator(AbstractPipelineGenerator):
             chunks_dict[f"chunk_{index}"] = f"$chunk_{index}"
             chunks_list.append(f"$chunk_{index}")
 
-        found_chunks = request.found_chunks
+        found_chunks = request.chunks.found_chunks
         if len(found_chunks) > self.max_chunks:
-            found_chunks = request.found_chunks[-self.max_chunks :]
+            found_chunks = found_chunks[-self.max_chunks :]
 
         n_chunks = len(found_chunks)
         if n_chunks == 0:
             return []
 
-        # For multiple chunks, match either sequence or last chunk at start
-        matching_shift_exprs = []
-        for index in range(len(found_chunks)):
-            matching_shifts = list()
-            for pos in range(len(found_chunks) - index):
-                current_matching_shifts = []
-                current_matching_shifts.append(
-                    {
-                        f"chunk_{pos}": found_chunks[index + pos],
-                    }
-                )
-                current_matching_shifts.append(
-                    {
-                        f"chunk_{pos}": found_chunks[index + pos].lower(),
-                    }
-                )
-                current_matching_shifts.append(
-                    {
-                        f"chunk_{pos}": found_chunks[index + pos].upper(),
-                    }
-                )
-                current_matching_shifts.append(
-                    {
-                        f"chunk_{pos}": found_chunks[index + pos]
-                        .lower()
-                        .capitalize(),
-                    }
-                )
-
-                matching_shifts.append(
-                    {
-                        "$or": current_matching_shifts,
-                    }
-                )
-
-            matching_shift_exprs.append(
-                {
-                    "$and": [
-                        {"n_chunks": {"$gte": len(matching_shifts)}},
-                        *matching_shifts,
-                    ]
-                }
-            )
-
-        case_branches = []
-        for index in range(len(found_chunks)):
-            case_branches.append(
-                {
-                    "case": {
-                        "$or": [
-                            {"$eq": [f"$chunk_0", found_chunks[index]]},
-                            {
-                                "$eq": [
-                                    f"$chunk_0",
-                                    found_chunks[index].lower(),
-                                ]
-                            },
-                            {
-                                "$eq": [
-                                    f"$chunk_0",
-                                    found_chunks[index].upper(),
-                                ]
-                            },
-                            {
-                                "$eq": [
-                                    f"$chunk_0",
-                                    found_chunks[index].lower().capitalize(),
-                                ]
-                            },
-                        ]
-                    },
-                    "then": len(found_chunks) - index - 1,
-                },
-            )
+        # A phrase continues the query if it starts with one of query
+        # suffixes, the longest suffix goes first
+        suffix_shingles = get_suffix_shingles(get_chunk_keys(found_chunks))
+        case_branches = [
+            {
+                "case": {"$in": [shingle, f"${SHINGLES_FIELD}"]},
+                "then": n_chunks - index - 1,
+            }
+            for index, shingle in enumerate(suffix_shingles)
+        ]
 
         pipeline = [
-            {"$match": {"$or": matching_shift_exprs}},
+            {"$match": {SHINGLES_FIELD: {"$in": suffix_shingles}}},
             {
                 "$addFields": {
                     "match_length": {
@@ -1,10 +1,15 @@
 from typing import List
 
 from embedding_studio.models.suggesting import SuggestingRequest
+from embedding_studio.suggesting.fuzzy import get_query_deletes
+from embedding_studio.suggesting.mongo.keys import (
+    FUZZY_KEYS_FIELD,
+    PREFIX_KEYS_FIELD,
+)
 from embedding_studio.suggesting.mongo.pipeline_generator import (
     AbstractPipelineGenerator,
 )
-from embedding_studio.utils.string_utils import generate_fuzzy_regex
+from embedding_studio.utils.string_utils import normalize_chunk
 
 
 class SimpleSuggestsPipelineGenerator(AbstractPipelineGenerator):
@@ -39,33 +44,34 @@ class SimpleSuggestsPipelineGenerator(AbstractPipelineGenerator):
         :return:
             A list of dictionaries, each representing a stage in the MongoDB aggregation pipeline.
         """
-        fuzzy_pattern = generate_fuzzy_regex(request.next_chunk)
-        chunks_dict = dict()
-        for index in range(self.max_chunks):
-            chunks_dict[f"chunk_{index}"] = f"$chunk_{index}"
-
-        match_prefix_part_or_conditions = []
-        for index in range(0, len(request.next_chunk)):
-            match_prefix_part_or_conditions.append(
-                {"search_0": request.next_chunk[: index + 1]}
-            )
-            match_prefix_part_or_conditions.append(
-                {"search_0": request.next_chunk[: index + 1].lower()}
-            )
-            match_prefix_part_or_conditions.append(
-                {"search_0": request.next_chunk[: index + 1].upper()}
-            )
-            match_prefix_part_or_conditions.append(
+        next_chunk = request.chunks.next_chunk
+        next_key = normalize_chunk(next_chunk)
+        # Phrases, which first chunk shares a deletion key with the next
+        # chunk, are within a few typos from it
+        query_deletes = get_query_deletes(next_key)
+        is_fuzzy = {
+            "$gt": [
                 {
-                    "search_0": request.next_chunk[: index + 1]
-                    .lower()
-                    .capitalize()
-                }
-            )
+                    "$size": {
+                        "$setIntersection": [
+                            {"$ifNull": [f"${FUZZY_KEYS_FIELD}", []]},
+                            query_deletes,
+                        ]
+                    }
+                },
+                0,
+            ]
+        }
 
         pipeline = [
-            {"$match": {"n_chunks": {"$gte": 1}}},
-            {"$match": {"$or": match_prefix_part_or_conditions}},
+            {
+                "$match": {
+                    "$or": [
+                        {PREFIX_KEYS_FIELD: next_key},
+                        {FUZZY_KEYS_FIELD: {"$in": query_deletes}},
+                    ]
+                }
+            },
             {
                 "$addFields": {
                     "match_info": {
@@ -76,29 +82,22 @@ class SimpleSuggestsPipelineGenerator(AbstractPipelineGenerator):
                                         "case": {
                                             "$eq": [
                                                 "$chunk_0",
-                                                request.next_chunk,
+                                                next_chunk,
                                             ]
                                         },
                                         "then": "exact",
                                     },
                                     {
                                         "case": {
-                                            "$regexMatch": {
-                                                "input": "$chunk_0",
-                                                "regex": f"^{request.next_chunk}",
-                                                "options": "i",
-                                            }
+                                            "$in": [
+                                                next_key,
+                                                f"${PREFIX_KEYS_FIELD}",
+                                            ]
                                         },
                                         "then": "prefix",
                                     },
                                     {
-                                        "case": {
-                                            "$regexMatch": {
-                                                "input": "$chunk_0",
-                                                "regex": fuzzy_pattern,
-                                                "options": "i",
-                                            }
-                                        },
+                                        "case": is_fuzzy,
                                         "then": "fuzzy",
                                     },
                                 ],
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pymongo.collection import Collection
 from pymongo.database import Database
@@ -8,10 +8,12 @@ from embedding_studio.suggesting.abstract_suggester import AbstractSuggester
 from embedding_studio.suggesting.abtract_phrase_manager import (
     AbstractSuggestionPhraseManager,
 )
+from embedding_studio.suggesting.fuzzy import get_max_distance, is_fuzzy_prefix
 from embedding_studio.suggesting.mongo.phrases_manager import (
     MongoSuggestionPhraseManager,
 )
 from embedding_studio.suggesting.tokenizer import SuggestingTokenizer
+from embedding_studio.utils.string_utils import normalize_chunk
 
 
 def _get_or_create_collection(
@@ -127,6 +129,24 @@ class MongoSuggester(AbstractSuggester):
             labels=doc["labels"],
         )
 
+    @staticmethod
+    def _is_fuzzy_match(doc: dict, next_key: str) -> bool:
+        """
+        Check a fuzzy candidate: a shared deletion key doesn't guarantee
+        that chunks are within the allowed edit distance.
+
+        :param doc: A single document from the aggregation pipeline
+        :param next_key: Normalized next chunk of the request
+        :return: False if the document is a false positive fuzzy match
+        """
+        if doc["match_info"]["type"] != "fuzzy":
+            return True
+
+        chunk_0 = doc["chunks"].get("chunk_0") or ""
+        return is_fuzzy_prefix(
+            next_key, normalize_chunk(chunk_0), get_max_distance(next_key)
+        )
+
     def get_topk_suggestions(
         self, request: SuggestingRequest, top_k: int = 10
     ) -> List[Suggest]:
@@ -137,13 +157,66 @@ class MongoSuggester(AbstractSuggester):
         :param top_k: How many suggestions to retrieve.
         :return: A list of Suggest objects that satisfy the request criteria.
         """
-        pipeline = self._generate_pipeline(request, top_k)
+        # Fetch extra documents to replace rejected fuzzy candidates
+        pipeline = self._generate_pipeline(request, top_k * 2)
         if not pipeline:
             return []
 
         # Execute the pipeline and transform each resulting document
-
+        next_key = normalize_chunk(request.chunks.next_chunk)
         docs = self._collection.aggregate(pipeline)
-        docs = [doc for doc in docs]
-        result = [self._doc_to_suggest(doc) for doc in docs]
-        return result
+        return self._docs_to_suggests(docs, next_key, top_k)
+
+    def _docs_to_suggests(
+        self, docs: List[dict], next_key: str, top_k: int
+    ) -> List[Suggest]:
+        docs = [doc for doc in docs if self._is_fuzzy_match(doc, next_key)]
+        return [self._doc_to_suggest(doc) for doc in docs[:top_k]]
+
+    def get_topk_suggestions_by_domains(
+        self,
+        request: SuggestingRequest,
+        domains: List[Optional[str]],
+        top_k: int = 10,
+    ) -> List[List[Suggest]]:
+        """
+        Retrieve the top-k suggestions of the same request for each domain
+        with a single aggregation.
+
+        Candidates of all domains are matched once, then $facet runs the rest
+        of the pipeline for each domain.
+
+        :param request: The SuggestingRequest, its domain is ignored.
+        :param domains: Domains to get suggestions for, None means any domain.
+        :param top_k: How many suggestions to retrieve per domain.
+        :return: A list of suggestions for each domain, in the same order.
+        """
+        pipeline = self._generate_pipeline(request, top_k * 2)
+        if not pipeline or not domains:
+            return [[] for _ in domains]
+
+        # Every pipeline starts with a $match stage, which uses indexes
+        match, stages = pipeline[0]["$match"], pipeline[1:]
+        if None not in domains:
+            match = {"$and": [match, {"domains": {"$in": domains}}]}
+
+        facets = dict()
+        for index, domain in enumerate(domains):
+            domain_stages = (
+                [] if domain is None else [{"$match": {"domains": domain}}]
+            )
+            facets[f"domain_{index}"] = domain_stages + stages
+
+        result = next(
+            self._collection.aggregate(
+                [{"$match": match}, {"$facet": facets}]
+            ),
+            dict(),
+        )
+        next_key = normalize_chunk(request.chunks.next_chunk)
+        return [
+            self._docs_to_suggests(
+                result.get(f"domain_{index}", []), next_key, top_k
+            )
+            for index in range(len(domains))
+        ]
@@ -1,7 +1,10 @@
 from typing import Optional
 
 from embedding_studio.models.suggesting import SuggestingRequest
-from embedding_studio.suggesting.redis.query_generator import QueryGenerator
+from embedding_studio.suggesting.redis.query_generator import (
+    QueryGenerator,
+    get_fuzzy_keys_clause,
+)
 
 
 class CombinedSuggestsQueryGenerator(QueryGenerator):
@@ -101,10 +104,11 @@ class CombinedSuggestsQueryGenerator(QueryGenerator):
         # The original snippet does exact partial matching for each prefix length.
         prefix = request.chunks.next_chunk
         prefix_clauses = ""
+        fuzzy_clause = get_fuzzy_keys_clause(prefix) if soft_match else ""
         # Do exact match: @search_0:"prefix"
         # (If you want real prefix search, do @search_0:prefix*)
-        if soft_match and len(prefix_span) > 1:
-            prefix_clauses = f"(@chunk_0:%{prefix}%)"
+        if fuzzy_clause:
+            prefix_clauses = f"({fuzzy_clause})"
         else:
             prefix_clauses = f"(@chunk_0:{prefix}*)"
 
@@ -28,6 +28,7 @@ class ComplexRedisSuggester(RedisSuggester):
         tokenizer: SuggestingTokenizer,
         index_name: str = "suggestion_phrases",
         max_chunks: int = 20,
+        fetch_factor: int = 5,
     ):
         """
         Initialize the MongoSuggester.
@@ -39,9 +40,10 @@ class ComplexRedisSuggester(RedisSuggester):
         :param index_name:
             Name of the index storing suggestion data.
         :param max_chunks: Maximum number of chunks that each document can have.
+        :param fetch_factor: Number of documents fetched per suggestion.
         """
         super(ComplexRedisSuggester, self).__init__(
-            redis_url, tokenizer, index_name, max_chunks
+            redis_url, tokenizer, index_name, max_chunks, fetch_factor
         )
         self._most_probable_query_generator = (
             MostProbableSuggestsQueryGenerator(self._max_chunks)
@@ -1,4 +1,9 @@
-from typing import List, Optional
+import logging
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from redis import Redis
 from redis.connection import ConnectionPool
@@ -8,6 +13,7 @@ from embedding_studio.models.suggesting import (
     Chunk,
     SearchDocument,
     SuggestingPhrase,
+    SuggestingPhrasesIngestionReport,
     SuggestingRequest,
     SuggestingRequestChunks,
     SuggestingRequestSpans,
@@ -15,8 +21,97 @@ from embedding_studio.models.suggesting import (
 from embedding_studio.suggesting.abtract_phrase_manager import (
     AbstractSuggestionPhraseManager,
 )
+from embedding_studio.suggesting.fuzzy import get_prefixes_deletes
 from embedding_studio.suggesting.tokenizer import SuggestingTokenizer
 from embedding_studio.utils.redis_utils import ft_escape_punctuation
+from embedding_studio.utils.string_utils import normalize_chunk
+
+logger = logging.getLogger(__name__)
+
+
+def convert_phrase(
+    tokenizer: SuggestingTokenizer, suggesting_phrase: SuggestingPhrase
+) -> dict:
+    """
+    Convert a SuggestingPhrase into a Redis-compatible format.
+
+    Chunks are stored as they are: prefix lookups are done by RediSearch
+    prefix queries (@chunk_0:text*), so no prefixes are expanded.
+
+    :param tokenizer:
+        The SuggestingTokenizer responsible for splitting phrases into chunks.
+    :param suggesting_phrase:
+        The SuggestingPhrase object to be converted.
+    :return:
+        A dictionary with fields for Redis.
+    """
+    tokenized = tokenizer.tokenize(suggesting_phrase.phrase)
+
+    # Create document
+    doc = SearchDocument(
+        phrase=suggesting_phrase.phrase,
+        chunks=[Chunk(value=token) for token in tokenized],
+        labels=suggesting_phrase.labels,
+        prob=suggesting_phrase.prob,
+        domains=suggesting_phrase.domains,
+    )
+
+    redis_doc = doc.get_flattened_dict()
+    fuzzy_keys = (
+        get_prefixes_deletes(normalize_chunk(tokenized[0]))
+        if tokenized
+        else set()
+    )
+    redis_doc["fuzzy_keys"] = " ".join(sorted(fuzzy_keys))
+    return redis_doc
+
+
+def _convert_phrases(
+    tokenizer: SuggestingTokenizer,
+    max_chunks: int,
+    phrases: List[SuggestingPhrase],
+) -> Tuple[List[dict], int]:
+    """
+    Convert a batch of phrases, it runs in worker processes of bulk_add.
+
+    :return: Redis documents and number of skipped phrases
+    """
+    docs = []
+    for suggesting_phrase in phrases:
+        redis_doc = convert_phrase(tokenizer, suggesting_phrase)
+        # Skip if too many chunks
+        if redis_doc["n_chunks"] <= max_chunks:
+            docs.append(redis_doc)
+    return docs, len(phrases) - len(docs)
+
+
+# Tokenizer and max chunks of a bulk_add worker process, they're passed once
+# by the pool initializer instead of being pickled with every batch
+_worker_tokenizer: Optional[SuggestingTokenizer] = None
+_worker_max_chunks: int = 0
+
+
+def _init_worker(tokenizer: SuggestingTokenizer, max_chunks: int):
+    global _worker_tokenizer, _worker_max_chunks
+    _worker_tokenizer = tokenizer
+    _worker_max_chunks = max_chunks
+
+
+def _convert_phrases_in_worker(
+    phrases: List[SuggestingPhrase],
+) -> Tuple[List[dict], int]:
+    return _convert_phrases(_worker_tokenizer, _worker_max_chunks, phrases)
+
+
+def _iter_batches(
+    phrases: Iterable[SuggestingPhrase], batch_size: int
+) -> Iterator[List[SuggestingPhrase]]:
+    iterator = iter(phrases)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
 
 
 class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
@@ -60,6 +155,7 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
         self._create_main_index(index_name)
 
         self._index_name = index_name
+        self._version_key = f"{index_name}:version"
 
     @property
     def redis_client(self) -> Redis:
@@ -100,6 +196,8 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
                     TagField("label_ids", separator=" "),
                     TagField("domains", separator=" "),
                     NumericField("is_original_phrase", sortable=True),
+                    # Deletion keys of the first chunk, see fuzzy.py
+                    TagField("fuzzy_keys", separator=" "),
                 ]
             )
 
@@ -109,10 +207,43 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
             self._redis_client.execute_command(
                 "FT.CONFIG", "SET", "MINPREFIX", "1"
             )
-            print("Index is created")
+            logger.info(f"Index {index_name} is created")
 
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception(
+                f"Index {index_name} isn't created, it may already exist"
+            )
+            self._add_fuzzy_keys_field(index_name)
+
+    def _has_field(self, name: str) -> bool:
+        """Check if the main index schema has a field"""
+        info = self._search_client.info()
+        # RediSearch 2.x reports "attributes", older versions "fields"
+        for field in info.get("attributes", info.get("fields", [])):
+            values = [
+                value.decode() if isinstance(value, bytes) else value
+                for value in field
+            ]
+            if name in values:
+                return True
+        return False
+
+    def _add_fuzzy_keys_field(self, index_name: str):
+        """Add the fuzzy keys field to an index created without it"""
+        if self._has_field("fuzzy_keys"):
+            return
+
+        logger.info(f"Add fuzzy keys field to index {index_name}")
+        self._redis_client.execute_command(
+            "FT.ALTER",
+            index_name,
+            "SCHEMA",
+            "ADD",
+            "fuzzy_keys",
+            "TAG",
+            "SEPARATOR",
+            " ",
+        )
 
     def convert_phrase_to_request(
         self, phrase: str, domain: Optional[str] = None
@@ -130,7 +261,6 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
             )
 
         """Convert a phrase to a suggesting request"""
-        # TODO: add LRU-cache
         tokens, spans = self._tokenizer.tokenize_with_spans(phrase.lower())
         chunks = [ft_escape_punctuation(t) for t in tokens]
         next_chunk = ""
@@ -171,24 +301,33 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
         :return:
             A dictionary with fields for Redis.
         """
-        tokenized = self._tokenizer.tokenize(suggesting_phrase.phrase)
-        chunks = []
-
-        for token in tokenized:
-            # Generate prefixes for search
-            prefixes = [token[:j] for j in range(1, len(token) + 1)]
-            chunks.append(Chunk(value=token, search_field=prefixes))
-
-        # Create document
-        doc = SearchDocument(
-            phrase=suggesting_phrase.phrase,
-            chunks=chunks,
-            labels=suggesting_phrase.labels,
-            prob=suggesting_phrase.prob,
-            domains=suggesting_phrase.domains,
-        )
+        return convert_phrase(self._tokenizer, suggesting_phrase)
+
+    def _write_docs(self, docs: List[dict]) -> List[str]:
+        """
+        Store converted documents in one non-transactional pipeline.
+
+        :param docs:
+            Redis documents made by convert_phrase.
+        :return:
+            IDs of the stored documents.
+        """
+        doc_ids = []
+        pipe = self._redis_client.pipeline(transaction=False)
+        for redis_doc in docs:
+            redis_doc = dict(redis_doc)
+            doc_id = redis_doc.pop("id")
+
+            key = f"{self._index_name}:{doc_id}"
+            pipe.hset(key, mapping=redis_doc)
+            pipe.persist(key)
 
-        return doc.get_flattened_dict()
+            doc_ids.append(doc_id)
+
+        # Bump the version to invalidate cached suggestions
+        pipe.incr(self._version_key)
+        pipe.execute()
+        return doc_ids
 
     def add(self, phrases: List[SuggestingPhrase]) -> List[str]:
         """
@@ -199,27 +338,115 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
         :return:
             A list of newly inserted document IDs (as strings).
         """
-        inserted_ids = []
+        docs, _ = _convert_phrases(self._tokenizer, self._max_chunks, phrases)
+        return self._write_docs(docs)
 
-        for suggesting_phrase in phrases:
-            # Convert to Redis format
-            redis_doc = self._convert_phrase(suggesting_phrase)
+    def bulk_add(
+        self,
+        phrases: Iterable[SuggestingPhrase],
+        batch_size: int = 1000,
+        n_workers: int = 1,
+        max_pending_batches: Optional[int] = None,
+    ) -> SuggestingPhrasesIngestionReport:
+        """
+        Stream a large number of phrases into Redis.
 
-            # Skip if too many chunks
-            if redis_doc["n_chunks"] > self._max_chunks:
-                continue
+        Phrases are read lazily in batches, tokenized in `n_workers`
+        processes and written by pipelines, one round-trip per batch.
+        At most `max_pending_batches` batches are being converted at once,
+        so a fast reader doesn't pile phrases up in memory while Redis
+        writes are behind.
 
-            # Create document ID
-            doc_id = redis_doc.pop("id")
+        :param phrases:
+            Any iterable of SuggestingPhrase objects, e.g. a file reader.
+        :param batch_size:
+            Number of phrases converted and written at once.
+        :param n_workers:
+            Number of tokenizer processes, 1 converts phrases in place.
+        :param max_pending_batches:
+            Max number of batches being converted, 2 * n_workers by default.
+        :return:
+            Numbers of phrases, ingest rate and the index memory.
+        """
+        report = SuggestingPhrasesIngestionReport()
+        started_at = time.perf_counter()
+
+        def write(converted: Tuple[List[dict], int]):
+            docs, skipped = converted
+            self._write_docs(docs)
+            report.inserted += len(docs)
+            report.skipped += skipped
+
+        if n_workers <= 1:
+            for batch in _iter_batches(phrases, batch_size):
+                report.total += len(batch)
+                write(
+                    _convert_phrases(self._tokenizer, self._max_chunks, batch)
+                )
 
-            # Store in Redis
-            key = f"{self._index_name}:{doc_id}"
-            self._redis_client.hset(key, mapping=redis_doc)
-            self._redis_client.persist(key)
+        else:
+            max_pending = max_pending_batches or 2 * n_workers
+            pending = deque()
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_worker,
+                initargs=(self._tokenizer, self._max_chunks),
+            ) as executor:
+                for batch in _iter_batches(phrases, batch_size):
+                    report.total += len(batch)
+                    # Write the oldest batch before reading more phrases
+                    if len(pending) >= max_pending:
+                        write(pending.popleft().result())
+
+                    pending.append(
+                        executor.submit(_convert_phrases_in_worker, batch)
+                    )
+
+                while pending:
+                    write(pending.popleft().result())
+
+        report.elapsed_seconds = time.perf_counter() - started_at
+        report.index_memory_mb = self.get_index_memory_mb()
+        logger.info(
+            f"Ingested {report.inserted} of {report.total} phrases in "
+            f"{report.elapsed_seconds:.1f}s "
+            f"({report.phrases_per_second:.0f} phrases/s), "
+            f"index memory: {report.index_memory_mb} MB"
+        )
+        return report
 
-            inserted_ids.append(doc_id)
+    def get_version(self) -> Optional[int]:
+        """
+        Get the version of stored phrases, every mutation increases it.
+
+        :return: Version number
+        """
+        return int(self._redis_client.get(self._version_key) or 0)
 
-        return inserted_ids
+    def get_index_memory_mb(self) -> Optional[float]:
+        """
+        Get the memory used by the index structures, as reported by FT.INFO.
+
+        :return:
+            Size in megabytes, None if it's not available.
+        """
+        try:
+            info = self._search_client.info()
+        except Exception as e:
+            logger.warning(
+                f"Failed to get info of index {self._index_name}: {e}"
+            )
+            return None
+
+        fields = [
+            "inverted_sz_mb",
+            "offset_vectors_sz_mb",
+            "doc_table_size_mb",
+            "sortable_values_size_mb",
+            "key_table_size_mb",
+        ]
+        sizes = [float(info[field]) for field in fields if field in info]
+        return sum(sizes) if sizes else None
 
     def delete(self, phrase_ids: List[str]) -> None:
         """
@@ -237,6 +464,7 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
             key = f"{self._index_name}:{doc_id}"
             pipe.delete(key)
 
+        pipe.incr(self._version_key)
         pipe.execute()
 
     def update_probability(
@@ -263,7 +491,10 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
             raise ValueError(f"No document found with id={phrase_id}")
 
         # Update probability
-        self._redis_client.hset(key, "prob", str(new_probability))
+        pipe = self._redis_client.pipeline()
+        pipe.hset(key, "prob", str(new_probability))
+        pipe.incr(self._version_key)
+        pipe.execute()
 
     def add_labels(self, phrase_id: str, labels: List[str]) -> None:
         """
@@ -300,6 +531,7 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
         # Set individual label fields
         pipe.hset(key, f"labels", new_labels)
         pipe.hset(key, f"label_ids", new_label_ids)
+        pipe.incr(self._version_key)
         pipe.execute()
 
     def remove_labels(self, phrase_id: str, labels: List[str]) -> None:
@@ -347,6 +579,7 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
         pipe = self._redis_client.pipeline()
         pipe.hset(key, "labels", new_labels)
         pipe.hset(key, "label_ids", new_label_ids)
+        pipe.incr(self._version_key)
         pipe.execute()
 
     def remove_all_label_values(self, labels: List[str]) -> None:
@@ -416,6 +649,7 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
                 pipe.hset(key, "labels", updated_labels_str)
                 pipe.hset(key, "label_ids", updated_label_ids)
 
+            pipe.incr(self._version_key)
             pipe.execute()
 
             offset += batch_size
@@ -454,6 +688,7 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
         pipe = self._redis_client.pipeline()
         pipe.hset(key, "domains", " ".join(current_domains))
 
+        pipe.incr(self._version_key)
         pipe.execute()
 
     def remove_domains(self, phrase_id: str, domains: List[str]) -> None:
@@ -502,6 +737,7 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
 
         pipe = self._redis_client.pipeline()
         pipe.hset(key, "domains", updated_domains_str)
+        pipe.incr(self._version_key)
         pipe.execute()
 
     def remove_all_domain_values(self, domains: List[str]) -> None:
@@ -573,6 +809,7 @@ class RedisSuggestionPhraseManager(AbstractSuggestionPhraseManager):
                 updated_domains_str = " ".join(updated_domains)
                 pipe.hset(key, "domains", updated_domains_str)
 
+            pipe.incr(self._version_key)
             pipe.execute()
 
             offset += batch_size
@@ -2,6 +2,29 @@ from abc import ABC, abstractmethod
 from typing import Optional
 
 from embedding_studio.models.suggesting import SuggestingRequest
+from embedding_studio.suggesting.fuzzy import get_query_deletes
+from embedding_studio.utils.redis_utils import (
+    ft_escape_punctuation,
+    ft_unescape_punctuation,
+)
+from embedding_studio.utils.string_utils import normalize_chunk
+
+
+def get_fuzzy_keys_clause(chunk: str) -> str:
+    """
+    Build a clause matching phrases, which first chunk is within a few typos
+    from the given one: any of their deletion keys equals a query one.
+
+    :param chunk: Escaped next chunk of a request
+    :return: A Redis search clause, empty if the chunk is too short for typos
+    """
+    deletes = get_query_deletes(
+        normalize_chunk(ft_unescape_punctuation(chunk))
+    )
+    if not deletes:
+        return ""
+    keys = " | ".join(ft_escape_punctuation(key) for key in deletes)
+    return f"@fuzzy_keys:{{{keys}}}"
 
 
 class QueryGenerator(ABC):
@@ -1,7 +1,10 @@
 from typing import Optional
 
 from embedding_studio.models.suggesting import SuggestingRequest
-from embedding_studio.suggesting.redis.query_generator import QueryGenerator
+from embedding_studio.suggesting.redis.query_generator import (
+    QueryGenerator,
+    get_fuzzy_keys_clause,
+)
 
 
 class SimpleSuggestsQueryGenerator(QueryGenerator):
@@ -37,22 +40,20 @@ class SimpleSuggestsQueryGenerator(QueryGenerator):
         starts with the provided next_chunk text.
 
         The query is formatted differently based on whether soft matching is enabled:
-        - For soft matching: performs a contains search (@chunk_0:%text%)
+        - For soft matching: looks deletion keys of the text up
+          (@fuzzy_keys:{key_1 | key_2 | ...})
         - For regular matching: performs a prefix search (@chunk_0:text*)
 
         :param request: The suggesting request containing the next chunk to match
         :param top_k: The maximum number of suggestions to return
         :param domain: Optional domain to filter the suggestions
-        :param soft_match: Whether to perform a soft (contains) match instead of a prefix match
+        :param soft_match: Whether to perform a typo-tolerant match instead of a prefix match
         :return: A Redis search query string
         ```
         """
         chunk = request.chunks.next_chunk.lower()
-        final_query = ""
-        if soft_match and len(chunk) > 1:
-            final_query = f"@chunk_0:%{chunk}%"
-
-        else:
+        final_query = get_fuzzy_keys_clause(chunk) if soft_match else ""
+        if not final_query:
             final_query = f"@chunk_0:{chunk}*"
 
         if domain:
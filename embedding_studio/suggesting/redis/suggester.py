@@ -1,18 +1,24 @@
-import concurrent.futures
-from difflib import get_close_matches
-from typing import List
+from typing import List, Optional, Tuple
 
 from redisearch import Query
+from redisearch.result import Result
 
 from embedding_studio.models.suggesting import Suggest, SuggestingRequest
 from embedding_studio.suggesting.abstract_suggester import AbstractSuggester
 from embedding_studio.suggesting.abtract_phrase_manager import (
     AbstractSuggestionPhraseManager,
 )
+from embedding_studio.suggesting.fuzzy import (
+    damerau_levenshtein,
+    get_max_distance,
+    is_fuzzy_prefix,
+)
 from embedding_studio.suggesting.redis.phrases_manager import (
     RedisSuggestionPhraseManager,
 )
 from embedding_studio.suggesting.tokenizer import SuggestingTokenizer
+from embedding_studio.utils.redis_utils import ft_unescape_punctuation
+from embedding_studio.utils.string_utils import normalize_chunk
 
 
 class RedisSuggester(AbstractSuggester):
@@ -28,6 +34,7 @@ class RedisSuggester(AbstractSuggester):
         tokenizer: SuggestingTokenizer,
         index_name: str = "suggestion_phrases",
         max_chunks: int = 20,
+        fetch_factor: int = 5,
     ):
         """
         Initialize the MongoSuggester.
@@ -39,8 +46,19 @@ class RedisSuggester(AbstractSuggester):
         :param index_name:
             Name of the index storing suggestion data.
         :param max_chunks: Maximum number of chunks that each document can have.
+        :param fetch_factor:
+            Number of documents fetched per suggestion, extra documents
+            replace duplicates and ones with already suggested labels.
         """
         self._max_chunks = max_chunks
+        self._fetch_factor = fetch_factor
+        # Only these fields are needed to build suggestions
+        self._return_fields = [
+            "phrase",
+            "prob",
+            "labels",
+            "label_ids",
+        ] + [f"chunk_{i}" for i in range(self._max_chunks)]
         self._phrases_manager = RedisSuggestionPhraseManager(
             redis_url=redis_url,
             tokenizer=tokenizer,
@@ -88,29 +106,35 @@ class RedisSuggester(AbstractSuggester):
         return -1
 
     def _find_match_position_soft(
-        self, raw_chunks: List[str], found_chunk: str, max_distance: int = 1
+        self,
+        raw_chunks: List[str],
+        found_chunk: str,
+        max_distance: Optional[int] = None,
     ) -> int:
         """
         Find the chunk that is closest to 'found_chunk' using fuzzy matching.
 
-        Uses difflib.get_close_matches to find approximate matches with
-        at least 80% similarity.
+        Uses Damerau-Levenshtein distance of normalized chunks, so transposed
+        characters count as a single typo.
 
         :param raw_chunks: List of chunk strings to search through
         :param found_chunk: The chunk to find a close match for
-        :param max_distance: Maximum edit distance for matches (not directly used)
+        :param max_distance: Maximum edit distance for matches, by default
+                             it depends on the chunk length
         :return: Index of the best fuzzy match, or -1 if no good match found
         """
-        # get_close_matches won't directly limit "single-edit distance," but it does
-        # approximate similarity. We'll do a quick pass to find best matches:
-        close = get_close_matches(found_chunk, raw_chunks, n=1, cutoff=0.8)
-        # 'cutoff=0.8' means "80% similarity" from difflib's perspective, *not*
-        # strictly "<=1 edit distance," but it’s a workable example.
-        if close:
-            # close[0] is the best match
-            # find its index
-            return raw_chunks.index(close[0])
-        return -1
+        found_key = normalize_chunk(found_chunk)
+        if max_distance is None:
+            max_distance = get_max_distance(found_key)
+
+        best_pos, best_distance = -1, max_distance + 1
+        for i, chunk_val in enumerate(raw_chunks):
+            distance = damerau_levenshtein(
+                found_key, normalize_chunk(chunk_val), max_distance
+            )
+            if distance < best_distance:
+                best_pos, best_distance = i, distance
+        return best_pos
 
     def _find_match_position_exact(
         self, raw_chunks: List[str], found_chunk: str
@@ -197,68 +221,112 @@ class RedisSuggester(AbstractSuggester):
             labels=doc.get("labels", "").split("\n"),
         )
 
-    def _search_docs(self, text_query: str, top_k: int) -> List:
+    def _search_docs(self, text_queries: List[str], top_k: int) -> List[List]:
         """
-        Run the RediSearch query and return matching documents.
+        Run RediSearch queries in one round-trip and return matching documents.
 
-        Executes the provided text query against the Redis search index,
-        sorting results by probability in descending order.
+        Queries are sent as a single non-transactional pipeline, Redis sorts
+        results by probability in descending order and returns only the
+        fields needed to build suggestions.
 
-        :param text_query: The RediSearch query string to execute
-        :param top_k: The maximum number of results to return (multiplied by 100 for initial fetch)
-        :return: A list of document objects from RediSearch matching the query
+        :param text_queries: The RediSearch query strings to execute, empty
+                             ones are skipped
+        :param top_k: The maximum number of suggestions (multiplied by
+                      the fetch factor for the fetch)
+        :return: A list of documents from RediSearch for each query
         """
-        if not text_query:
-            return []
-        query = (
-            Query(text_query).sort_by("prob", asc=False).paging(0, top_k * 100)
-        )
-        return self.phrases_manager.search_client.search(query).docs
+        queries = [
+            Query(text_query)
+            .sort_by("prob", asc=False)
+            .paging(0, top_k * self._fetch_factor)
+            .return_fields(*self._return_fields)
+            if text_query
+            else None
+            for text_query in text_queries
+        ]
+        if not any(queries):
+            return [[] for _ in queries]
+
+        pipe = self.phrases_manager.redis_client.pipeline(transaction=False)
+        index_name = self.phrases_manager.search_client.index_name
+        for query in queries:
+            if query is not None:
+                pipe.execute_command(
+                    "FT.SEARCH", index_name, *query.get_args()
+                )
+        responses = iter(pipe.execute())
 
-    def get_topk_suggestions(
-        self, request: SuggestingRequest, top_k: int = 10
-    ) -> List[Suggest]:
+        return [
+            Result(next(responses), True).docs if query is not None else []
+            for query in queries
+        ]
+
+    @staticmethod
+    def _is_fuzzy_match(doc, next_key: str) -> bool:
         """
-        Retrieve the top-k suggestions for the given request.
+        Check a candidate found by deletion keys: a shared key doesn't
+        guarantee that chunks are within the allowed edit distance.
 
-        This method implements a parallel search strategy:
-        1. Submits both strict and soft queries concurrently
-        2. Waits for the strict query to complete first
-        3. If strict returns enough results, cancels the soft query
-        4. Otherwise, waits for the soft query and merges the results
-        5. Deduplicates and prioritizes results based on labels and scores
+        :param doc: A document from RediSearch
+        :param next_key: Normalized next chunk of the request
+        :return: False if the document is a false positive fuzzy match
+        """
+        chunk_0 = normalize_chunk(
+            ft_unescape_punctuation(getattr(doc, "chunk_0", "") or "")
+        )
+        return chunk_0.startswith(next_key) or is_fuzzy_prefix(
+            next_key, chunk_0, get_max_distance(next_key)
+        )
+
+    def _generate_queries(
+        self, request: SuggestingRequest, top_k: int
+    ) -> Tuple[str, str]:
+        """
+        Generate strict and soft queries of a request.
 
         :param request: The suggesting request containing context for suggestions
         :param top_k: The maximum number of suggestions to return
-        :return: A list of Suggest objects representing the top suggestions
+        :return: Strict and soft query strings, empty ones aren't run
         """
         strict_text_query = self._generate_query(
             request, top_k, soft_match=False
         )
         soft_text_query = self._generate_query(request, top_k, soft_match=True)
 
-        # If both queries are empty, no point in proceeding
-        if not strict_text_query and not soft_text_query:
-            return []
+        # The same query can't find anything new
+        if soft_text_query == strict_text_query:
+            soft_text_query = ""
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            # Schedule both queries
-            f_strict = executor.submit(
-                self._search_docs, strict_text_query, top_k
-            )
-            f_soft = executor.submit(self._search_docs, soft_text_query, top_k)
+        return strict_text_query, soft_text_query
 
-            # 1) Wait on the strict future
-            strict_docs = f_strict.result()
+    def _select_suggestions(
+        self,
+        request: SuggestingRequest,
+        strict_docs: List,
+        soft_docs: List,
+        top_k: int,
+    ) -> List[Suggest]:
+        """
+        Merge strict and soft documents into the top-k suggestions.
 
-            # 2) Check if we already have enough
-            if len(strict_docs) >= top_k:
-                # Cancel the soft query; skip waiting for it
-                f_soft.cancel()
-                soft_docs = []
-            else:
-                # Not enough strict docs => get soft docs as well
-                soft_docs = f_soft.result()
+        :param request: The suggesting request containing context for suggestions
+        :param strict_docs: Documents found by the strict query
+        :param soft_docs: Documents found by the soft query
+        :param top_k: The maximum number of suggestions to return
+        :return: A list of Suggest objects representing the top suggestions
+        """
+        if len(strict_docs) >= top_k:
+            # Strict docs are enough
+            soft_docs = []
+
+        if not request.chunks.found_chunks:
+            # Soft docs of a single chunk are found only by deletion keys
+            next_key = normalize_chunk(
+                ft_unescape_punctuation(request.chunks.next_chunk)
+            )
+            soft_docs = [
+                doc for doc in soft_docs if self._is_fuzzy_match(doc, next_key)
+            ]
 
         # Merge them in a "strict-first" list
         combined_docs = strict_docs + soft_docs
@@ -289,3 +357,63 @@ class RedisSuggester(AbstractSuggester):
             self._doc_to_suggest(doc.__dict__, request)
             for doc in final_docs[:top_k]
         ]
+
+    def get_topk_suggestions(
+        self, request: SuggestingRequest, top_k: int = 10
+    ) -> List[Suggest]:
+        """
+        Retrieve the top-k suggestions for the given request.
+
+        This method implements a strict-first search strategy:
+        1. Sends both strict and soft queries in one round-trip
+        2. Uses soft results only if strict ones aren't enough
+        3. Deduplicates and prioritizes results based on labels and scores
+
+        :param request: The suggesting request containing context for suggestions
+        :param top_k: The maximum number of suggestions to return
+        :return: A list of Suggest objects representing the top suggestions
+        """
+        strict_text_query, soft_text_query = self._generate_queries(
+            request, top_k
+        )
+
+        # If both queries are empty, no point in proceeding
+        if not strict_text_query and not soft_text_query:
+            return []
+
+        strict_docs, soft_docs = self._search_docs(
+            [strict_text_query, soft_text_query], top_k
+        )
+        return self._select_suggestions(request, strict_docs, soft_docs, top_k)
+
+    def get_topk_suggestions_by_domains(
+        self,
+        request: SuggestingRequest,
+        domains: List[Optional[str]],
+        top_k: int = 10,
+    ) -> List[List[Suggest]]:
+        """
+        Retrieve the top-k suggestions of the same request for each domain.
+
+        Strict and soft queries of all domains are sent in one round-trip.
+
+        :param request: The suggesting request, its domain is ignored
+        :param domains: Domains to get suggestions for, None means any domain
+        :param top_k: The maximum number of suggestions per domain
+        :return: A list of suggestions for each domain, in the same order
+        """
+        domain_requests = [
+            request.model_copy(update={"domain": domain}) for domain in domains
+        ]
+
+        text_queries = []
+        for domain_request in domain_requests:
+            text_queries.extend(self._generate_queries(domain_request, top_k))
+
+        docs = self._search_docs(text_queries, top_k)
+        return [
+            self._select_suggestions(
+                domain_request, docs[2 * index], docs[2 * index + 1], top_k
+            )
+            for index, domain_request in enumerate(domain_requests)
+        ]
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from redis import Redis
+from redis.connection import ConnectionPool
+
+from embedding_studio.core.config import settings
+from embedding_studio.models.suggesting import SuggestionsCacheStats
+
+logger = logging.getLogger(__name__)
+
+
+class SuggestionsCache:
+    """
+    Two-tier cache of suggestions: an in-process LRU and optionally Redis,
+    shared between processes.
+
+    Entries are keyed by the phrases version, so any mutation of phrases
+    makes older entries unreachable: they're evicted from the LRU and expire
+    in Redis.
+
+    The version itself is kept in-process for `version_ttl` seconds, so
+    in-process hits don't touch the phrases storage. Mutations become
+    visible after at most this delay.
+
+    Entries are keyed by the exact typed phrase: its case, punctuation and
+    trailing whitespaces change the highlighted spans of suggestions.
+
+    Redis failures are logged and never raised: the cache degrades to the
+    in-process tier.
+
+    :param max_size: Max number of in-process entries, 0 disables the tier
+    :param redis_url: Redis URL, None disables the Redis tier
+    :param prefix: Prefix of Redis keys
+    :param redis_ttl: Seconds to keep entries in Redis
+    :param version_ttl: Seconds to keep the phrases version in-process
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        redis_url: Optional[str] = None,
+        prefix: str = "suggestions_cache",
+        redis_ttl: int = 10 * 60,
+        version_ttl: float = 1.0,
+    ):
+        self._max_size = int(max_size)
+        self._redis_url = redis_url
+        self._prefix = prefix
+        self._redis_ttl = int(redis_ttl)
+        self._redis_client: Optional[Redis] = None
+        self._version_ttl = float(version_ttl)
+        self._version: Optional[int] = None
+        self._version_expires_at = 0.0
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._stats = SuggestionsCacheStats()
+
+    @property
+    def redis_client(self) -> Optional[Redis]:
+        if self._redis_client is None and self._redis_url:
+            self._redis_client = Redis(
+                connection_pool=ConnectionPool.from_url(self._redis_url)
+            )
+        return self._redis_client
+
+    @staticmethod
+    def _key(
+        version: int, phrase: str, top_k: int, domain: Optional[str]
+    ) -> str:
+        return json.dumps([version, phrase, top_k, domain or ""])
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self._prefix}:{hashlib.sha1(key.encode()).hexdigest()}"
+
+    def _put_local(self, key: str, value: dict):
+        if self._max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def get_version(
+        self, load_version: Callable[[], Optional[int]]
+    ) -> Optional[int]:
+        """
+        Get the phrases version, loading it once per `version_ttl` seconds.
+
+        :param load_version: Function to get the current version of phrases
+        :return: Version of phrases or None, if phrases aren't versioned
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now < self._version_expires_at:
+                return self._version
+
+        version = load_version()
+        with self._lock:
+            self._version = version
+            self._version_expires_at = now + self._version_ttl
+        return version
+
+    def get(
+        self, version: int, phrase: str, top_k: int, domain: Optional[str]
+    ) -> Optional[dict]:
+        """
+        Get cached suggestions.
+
+        :param version: Version of phrases
+        :param phrase: Typed phrase
+        :param top_k: Number of suggestions
+        :param domain: Domain of suggestions
+        :return: Cached response or None
+        """
+        key = self._key(version, phrase, top_k, domain)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._stats.local_hits += 1
+                return value
+
+        if self.redis_client is not None:
+            try:
+                raw = self.redis_client.get(self._redis_key(key))
+            except Exception as e:
+                logger.warning(f"Failed to get cached suggestions: {e}")
+                raw = None
+
+            if raw is not None:
+                value = json.loads(raw)
+                self._put_local(key, value)
+                with self._lock:
+                    self._stats.redis_hits += 1
+                return value
+
+        with self._lock:
+            self._stats.misses += 1
+        return None
+
+    def put(
+        self,
+        version: int,
+        phrase: str,
+        top_k: int,
+        domain: Optional[str],
+        value: dict,
+    ):
+        """
+        Cache suggestions.
+
+        :param version: Version of phrases
+        :param phrase: Typed phrase
+        :param top_k: Number of suggestions
+        :param domain: Domain of suggestions
+        :param value: JSON-serializable response
+        """
+        key = self._key(version, phrase, top_k, domain)
+        self._put_local(key, value)
+
+        if self.redis_client is not None:
+            try:
+                self.redis_client.set(
+                    self._redis_key(key), json.dumps(value), ex=self._redis_ttl
+                )
+            except Exception as e:
+                logger.warning(f"Failed to cache suggestions: {e}")
+
+    def stats(self) -> SuggestionsCacheStats:
+        """
+        Get hits and misses of the cache.
+
+        :return: Counters and the share of hits
+        """
+        with self._lock:
+            stats = self._stats.model_copy()
+
+        total = stats.local_hits + stats.redis_hits + stats.misses
+        if total > 0:
+            stats.hit_rate = (stats.local_hits + stats.redis_hits) / total
+        return stats
+
+
+suggestions_cache = SuggestionsCache(
+    max_size=settings.SUGGESTING_CACHE_MAX_SIZE,
+    redis_url=(
+        settings.REDIS_URL if settings.SUGGESTING_CACHE_USE_REDIS else None
+    ),
+    prefix=settings.SUGGESTING_CACHE_PREFIX,
+    redis_ttl=settings.SUGGESTING_CACHE_REDIS_TTL,
+    version_ttl=settings.SUGGESTING_CACHE_VERSION_TTL,
+)
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+from typing import List, Optional
+
+import mongomock
+import pytest
+
+from embedding_studio.api.api_v1.endpoints import suggesting
+from embedding_studio.api.api_v1.schemas.suggesting import (
+    GetBatchSuggestionsRequest,
+)
+from embedding_studio.models.suggesting import Suggest, SuggestingPhrase
+from embedding_studio.suggesting.mongo.phrases_manager import (
+    MongoSuggestionPhraseManager,
+)
+from embedding_studio.suggesting.suggestions_cache import SuggestionsCache
+from embedding_studio.suggesting.tokenizer import SuggestingTokenizer
+
+
+class PhrasesManager(MongoSuggestionPhraseManager):
+    # Domains aren't changed by these tests
+    def add_domains(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def remove_domains(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def remove_all_domain_values(self, *args, **kwargs):
+        raise NotImplementedError
+
+
+class FakeSuggester:
+    def __init__(self):
+        self.phrases_manager = PhrasesManager(
+            mongomock.MongoClient().db.phrases,
+            SuggestingTokenizer(),
+            max_chunks=3,
+        )
+        self.queried_domains: List[List[Optional[str]]] = []
+
+    def get_topk_suggestions_by_domains(self, request, domains, top_k=10):
+        self.queried_domains.append(list(domains))
+        return [
+            [
+                Suggest(
+                    chunks=[domain or "any"],
+                    prefix_chunks=["hello"],
+                    prob=0.5,
+                )
+            ]
+            for domain in domains
+        ]
+
+
+@pytest.fixture
+def suggester(monkeypatch) -> FakeSuggester:
+    suggester = FakeSuggester()
+    monkeypatch.setattr(
+        suggesting, "context", SimpleNamespace(suggester=suggester)
+    )
+    monkeypatch.setattr(
+        suggesting,
+        "suggestions_cache",
+        SuggestionsCache(max_size=10, version_ttl=0),
+    )
+    return suggester
+
+
+def _postfixes(response) -> List[tuple]:
+    return [
+        (result.domain, [s.postfix.strip() for s in result.suggestions])
+        for result in response.results
+    ]
+
+
+def test_domains_are_queried_together(suggester):
+    response = suggesting.get_batch_suggestions(
+        GetBatchSuggestionsRequest(phrase="hello ", domains=[None, "books"])
+    )
+
+    assert suggester.queried_domains == [[None, "books"]]
+    assert _postfixes(response) == [(None, ["any"]), ("books", ["books"])]
+
+
+def test_cached_domains_are_not_queried(suggester):
+    suggesting.get_batch_suggestions(
+        GetBatchSuggestionsRequest(phrase="hello ", domains=[None, "books"])
+    )
+
+    response = suggesting.get_batch_suggestions(
+        GetBatchSuggestionsRequest(
+            phrase="hello ", domains=["music", "books", None]
+        )
+    )
+
+    assert suggester.queried_domains == [[None, "books"], ["music"]]
+    assert _postfixes(response) == [
+        ("music", ["music"]),
+        ("books", ["books"]),
+        (None, ["any"]),
+    ]
+
+    # Changed phrases invalidate cached suggestions
+    suggester.phrases_manager.add([SuggestingPhrase(phrase="hello world")])
+    suggesting.get_batch_suggestions(
+        GetBatchSuggestionsRequest(phrase="hello ", domains=["books"])
+    )
+    assert suggester.queried_domains[-1] == ["books"]
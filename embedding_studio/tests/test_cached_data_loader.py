@@ -0,0 +1,133 @@
+from typing import Dict, List, Type
+
+import pytest
+
+from embedding_studio.data_storage.loaders.cached_data_loader import (
+    CachedDataLoader,
+)
+from embedding_studio.data_storage.loaders.data_loader import DataLoader
+from embedding_studio.data_storage.loaders.downloaded_item import (
+    DownloadedItem,
+)
+from embedding_studio.data_storage.loaders.item_meta import ItemMeta
+from embedding_studio.utils.disk_cache import DiskLRUCache
+
+
+class FileMeta(ItemMeta):
+    path: str
+
+    @property
+    def derived_id(self) -> str:
+        return self.path
+
+
+class FakeLoader(DataLoader):
+    def __init__(self):
+        super(FakeLoader, self).__init__()
+        self.versions: Dict[str, str] = dict()
+        self.checked: List[str] = []
+        self.loaded: List[str] = []
+
+    @property
+    def item_meta_cls(self) -> Type[ItemMeta]:
+        return FileMeta
+
+    def get_versions(self, items_data: List[ItemMeta]) -> Dict[str, str]:
+        self.checked += [item.id for item in items_data]
+        return {
+            item.id: self.versions[item.id]
+            for item in items_data
+            if item.id in self.versions
+        }
+
+    def load(self, items_data: List[ItemMeta]):
+        raise NotImplementedError
+
+    def load_items(self, items_data: List[ItemMeta]) -> List[DownloadedItem]:
+        self.loaded += [item.id for item in items_data]
+        return [
+            DownloadedItem(
+                id=item.id,
+                data=f"{item.id}@{self.versions.get(item.id)}",
+                meta=item,
+            )
+            for item in items_data
+        ]
+
+    def _load_batch_with_offset(self, offset: int, batch_size: int, **kwargs):
+        raise NotImplementedError
+
+    def total_count(self, **kwargs):
+        return None
+
+
+def _items(*paths: str) -> List[FileMeta]:
+    return [FileMeta(path=path) for path in paths]
+
+
+def _data(downloaded: List[DownloadedItem]) -> List[str]:
+    return [item.data for item in downloaded]
+
+
+@pytest.fixture
+def loader():
+    loader = FakeLoader()
+    loader.versions = {"a": "1", "b": "1"}
+    return loader
+
+
+def test_cached_items_are_not_checked_until_revalidation(tmp_path, loader):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024**2)
+    cached_loader = CachedDataLoader(loader, cache, revalidate_after=60)
+
+    assert _data(cached_loader.load_items(_items("a", "b"))) == ["a@1", "b@1"]
+    assert loader.checked == ["a", "b"]
+
+    loader.checked = []
+    loader.versions["a"] = "2"
+    assert _data(cached_loader.load_items(_items("a", "b"))) == ["a@1", "b@1"]
+    assert loader.checked == []
+    assert loader.loaded == ["a", "b"]
+
+
+def test_stale_items_are_revalidated(tmp_path, loader):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024**2)
+    cached_loader = CachedDataLoader(loader, cache, revalidate_after=0)
+    cached_loader.load_items(_items("a", "b"))
+
+    loader.checked, loader.loaded = [], []
+    loader.versions["a"] = "2"
+    assert _data(cached_loader.load_items(_items("a", "b"))) == ["a@2", "b@1"]
+    assert loader.checked == ["a", "b"]
+    assert loader.loaded == ["a"]
+
+
+def test_known_versions_are_not_checked(tmp_path, loader):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024**2)
+    cached_loader = CachedDataLoader(loader, cache, revalidate_after=0)
+    items = [FileMeta(path="a", version="1")]
+
+    cached_loader.load_items(items)
+    assert _data(cached_loader.load_items(items)) == ["a@1"]
+    assert loader.checked == []
+    assert loader.loaded == ["a"]
+
+
+def test_items_without_versions_are_not_cached(tmp_path, monkeypatch, loader):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024**2)
+    cached_loader = CachedDataLoader(loader, cache)
+    deleted = []
+    monkeypatch.setattr(cache, "delete", deleted.append)
+
+    def restream(items_data):
+        # Data of "c" is streamed again after another item
+        downloaded = loader.load_items(items_data)
+        yield from downloaded + downloaded[:1]
+
+    monkeypatch.setattr(loader, "iter_items", restream)
+
+    streamed = list(cached_loader.iter_items(_items("c", "d")))
+
+    assert _data(streamed) == ["c@None", "d@None", "c@None"]
+    assert deleted == []
+    assert not list(tmp_path.rglob("*.pkl"))
@@ -0,0 +1,114 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import List
+
+from embedding_studio.api.api_v1.endpoints import clickstream_client
+from embedding_studio.core.config import settings
+from embedding_studio.models.clickstream.session_events import SessionEvent
+
+
+class FakeRequest:
+    def __init__(self, chunks: List[bytes]):
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class FakeClickstreamDao:
+    def __init__(self):
+        self.batches: List[List[SessionEvent]] = []
+
+    def push_events(self, session_events: List[SessionEvent]):
+        self.batches.append(list(session_events))
+
+
+def _iter_lines(chunks: List[bytes], max_length: int) -> list:
+    async def collect():
+        return [
+            item
+            async for item in clickstream_client._iter_lines(
+                FakeRequest(chunks), max_length
+            )
+        ]
+
+    return asyncio.run(collect())
+
+
+def test_lines_are_split_across_chunks():
+    chunks = [b'{"a":', b' 1}\n{"b"', b": 2}\n", b"\n", b'{"c": 3}']
+
+    assert _iter_lines(chunks, max_length=100) == [
+        (1, b'{"a": 1}'),
+        (2, b'{"b": 2}'),
+        (3, b""),
+        (4, b'{"c": 3}'),
+    ]
+
+
+def test_long_lines_are_not_kept():
+    chunks = [b"short\n" + b"x" * 6, b"x" * 6, b"x\nshort\n", b"y" * 12]
+
+    assert _iter_lines(chunks, max_length=10) == [
+        (1, b"short"),
+        (2, None),
+        (3, b"short"),
+        (4, None),
+    ]
+    # The limit is applied to a line split between chunks too
+    assert _iter_lines([b"12345", b"67890\n", b"1234", b"5678901"], 10) == [
+        (1, b"1234567890"),
+        (2, None),
+    ]
+
+
+def _line(**fields) -> bytes:
+    event = dict(
+        session_id="session",
+        event_id="event",
+        object_id="object",
+        event_type="click",
+    )
+    event.update(fields)
+    return json.dumps(event).encode()
+
+
+def test_bulk_events_are_pushed_by_batches(monkeypatch):
+    dao = FakeClickstreamDao()
+    monkeypatch.setattr(
+        clickstream_client, "context", SimpleNamespace(clickstream_dao=dao)
+    )
+    monkeypatch.setattr(settings, "CLICKSTREAM_EVENTS_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "CLICKSTREAM_BULK_MAX_LINE_BYTES", 200)
+    future = 2 * 10**10
+    body = b"\n".join(
+        [
+            _line(event_id="1", created_at=1),
+            b"not a json",
+            _line(event_id="2"),
+            b"",
+            _line(event_id="3", created_at=future),
+            _line(event_id="4", meta={"text": "x" * 200}),
+            _line(event_id="5", created_at=5),
+        ]
+    )
+
+    response = asyncio.run(
+        clickstream_client.push_events_bulk(FakeRequest([body]))
+    )
+
+    assert response.accepted == 3
+    assert response.rejected == 3
+    assert [error.split(":")[0] for error in response.errors] == [
+        "Line 2",
+        "Line 5",
+        "Line 6",
+    ]
+    assert [[e.event_id for e in batch] for batch in dao.batches] == [
+        ["1", "2"],
+        ["5"],
+    ]
+    # Replayed events keep their timestamps
+    assert dao.batches[0][0].created_at == 1
@@ -0,0 +1,90 @@
+from typing import List
+
+import mongomock
+import pytest
+
+from embedding_studio.data_access.mongo.clickstream import MongoClickstreamDao
+from embedding_studio.models.clickstream.session_events import SessionEvent
+from embedding_studio.models.clickstream.sessions import Session
+
+
+@pytest.fixture
+def dao() -> MongoClickstreamDao:
+    return MongoClickstreamDao(mongomock.MongoClient().db)
+
+
+def _register_sessions(dao: MongoClickstreamDao, count: int) -> str:
+    for index in range(count):
+        session = dao.register_session(
+            Session(
+                session_id=f"session_{index}",
+                search_query="query",
+                created_at=index,
+                search_results=[],
+            )
+        )
+        events = [
+            SessionEvent(
+                event_id=f"event_{event}",
+                session_id=session.session_id,
+                object_id="object",
+                event_type="click",
+                created_at=event,
+            )
+            for event in range(index % 3)
+        ]
+        if events:
+            dao.push_events(events)
+    return session.batch_id
+
+
+def _count_finds(monkeypatch, collection) -> List[dict]:
+    calls = []
+    find = collection.find
+
+    def counted_find(*args, **kwargs):
+        calls.append(kwargs.get("filter"))
+        return find(*args, **kwargs)
+
+    monkeypatch.setattr(collection, "find", counted_find)
+    return calls
+
+
+def test_batch_sessions_are_read_by_pages(monkeypatch, dao):
+    batch_id = _register_sessions(dao, 5)
+    session_finds = _count_finds(monkeypatch, dao._session_dao.collection)
+    event_finds = _count_finds(monkeypatch, dao._event_dao.collection)
+
+    sessions = list(dao.iter_batch_sessions(batch_id, page_size=2))
+
+    assert [s.session_number for s in sessions] == [1, 2, 3, 4, 5]
+    assert [len(s.events) for s in sessions] == [0, 1, 2, 0, 1]
+    assert all(
+        event.session_id == session.session_id
+        for session in sessions
+        for event in session.events
+    )
+    # Pages of 2, 2 and 1 sessions, one events query per page
+    assert len(session_finds) == 3
+    assert len(event_finds) == 3
+
+
+def test_batch_sessions_page_is_limited(dao):
+    batch_id = _register_sessions(dao, 5)
+
+    sessions = dao.get_batch_sessions(
+        batch_id, after_number=2, limit=2, events_limit=1
+    )
+
+    assert [s.session_number for s in sessions] == [3, 4]
+    assert [len(s.events) for s in sessions] == [1, 0]
+    assert dao.get_batch_sessions(batch_id, after_number=5, limit=2) == []
+
+
+def test_all_batch_sessions_are_read_without_limit(dao):
+    batch_id = _register_sessions(dao, 4)
+
+    sessions = dao.get_batch_sessions(batch_id, after_number=1, events_limit=1)
+
+    assert [s.session_number for s in sessions] == [2, 3, 4]
+    assert [len(s.events) for s in sessions] == [1, 1, 0]
@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import List
+
+import pytest
+
+from embedding_studio.data_access.events_buffer import SessionEventsBuffer
+from embedding_studio.models.clickstream.session_events import SessionEvent
+
+
+class FakeStorage:
+    def __init__(self, failures: int = 0):
+        self.batches: List[List[SessionEvent]] = []
+        self.failures = failures
+        self.written = threading.Event()
+
+    def push(self, batch: List[SessionEvent]):
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("Storage is unavailable")
+        self.batches.append(list(batch))
+        self.written.set()
+
+    @property
+    def event_ids(self) -> List[str]:
+        return [event.event_id for batch in self.batches for event in batch]
+
+
+def _events(count: int, start: int = 0) -> List[SessionEvent]:
+    return [
+        SessionEvent(
+            event_id=str(index),
+            session_id="session",
+            object_id="object",
+            event_type="click",
+            created_at=0,
+        )
+        for index in range(start, start + count)
+    ]
+
+
+def _wait_for(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_events_are_written_by_batches():
+    storage = FakeStorage()
+    buffer = SessionEventsBuffer(
+        storage.push, max_batch_size=3, flush_interval=60
+    )
+
+    buffer.add(_events(2))
+    buffer.add(_events(2, start=2))
+    _wait_for(lambda: len(storage.batches) == 1)
+    buffer.close()
+
+    assert [len(batch) for batch in storage.batches] == [3, 1]
+    assert storage.event_ids == ["0", "1", "2", "3"]
+
+
+def test_pending_events_are_written_after_interval():
+    storage = FakeStorage()
+    buffer = SessionEventsBuffer(
+        storage.push, max_batch_size=100, flush_interval=0.05
+    )
+
+    buffer.add(_events(2))
+
+    assert storage.written.wait(2.0)
+    assert storage.event_ids == ["0", "1"]
+    buffer.close()
+
+
+def test_retried_events_are_written_once():
+    storage = FakeStorage()
+    buffer = SessionEventsBuffer(
+        storage.push, max_batch_size=100, flush_interval=60
+    )
+
+    buffer.add(_events(2))
+    buffer.add(_events(3))
+    buffer.close()
+
+    assert storage.event_ids == ["0", "1", "2"]
+
+
+def test_failed_batch_is_retried():
+    storage = FakeStorage(failures=2)
+    buffer = SessionEventsBuffer(
+        storage.push, max_batch_size=2, flush_interval=0.05
+    )
+
+    buffer.add(_events(2))
+
+    _wait_for(lambda: storage.event_ids == ["0", "1"])
+    buffer.close()
+
+
+def test_failed_batch_is_bounded_by_max_pending():
+    storage = FakeStorage(failures=1)
+    buffer = SessionEventsBuffer(
+        storage.push, max_batch_size=100, flush_interval=60, max_pending=3
+    )
+    buffer._pending = {(e.session_id, e.event_id): e for e in _events(2)}
+
+    # One event of the failed batch fits into the buffer
+    assert not buffer._write(_events(2, start=2))
+    buffer.close()
+
+    assert storage.event_ids == ["0", "1", "2"]
+
+
+def test_errors_are_raised_beyond_max_pending():
+    storage = FakeStorage(failures=1)
+    buffer = SessionEventsBuffer(
+        storage.push, max_batch_size=100, flush_interval=60, max_pending=2
+    )
+
+    with pytest.raises(ConnectionError):
+        buffer.add(_events(2))
+
+    # Events stay in the buffer to be written later
+    buffer.close()
+    assert storage.event_ids == ["0", "1"]
+
+
+def test_events_added_after_close_are_written_at_once():
+    storage = FakeStorage()
+    buffer = SessionEventsBuffer(storage.push, flush_interval=60)
+    buffer.close()
+
+    buffer.add(_events(1))
+
+    assert storage.event_ids == ["0"]
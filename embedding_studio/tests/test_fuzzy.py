@@ -0,0 +1,87 @@
+import random
+
+from embedding_studio.suggesting.fuzzy import (
+    FUZZY_PREFIX_LENGTH,
+    damerau_levenshtein,
+    get_deletes,
+    get_max_distance,
+    get_prefixes_deletes,
+    get_query_deletes,
+    is_fuzzy_prefix,
+)
+
+
+def _is_found(text: str, chunk: str) -> bool:
+    return bool(set(get_query_deletes(text)) & get_prefixes_deletes(chunk))
+
+
+def test_deletes_of_short_text():
+    assert get_deletes("abc", 1) == {"abc", "bc", "ac", "ab"}
+    assert get_deletes("abc", 2) == {
+        "abc",
+        "bc",
+        "ac",
+        "ab",
+        "a",
+        "b",
+        "c",
+    }
+
+
+def test_prefixes_are_bounded_by_their_distance():
+    deletes = get_prefixes_deletes("abcdefgh")
+
+    # Prefixes shorter than 6 characters tolerate a single typo
+    assert "abc" in deletes
+    assert "ab" in deletes
+    assert "a" not in deletes
+    # Longer prefixes tolerate two typos
+    assert "abcd" in deletes
+    assert all(len(key) >= 2 for key in deletes)
+    assert max(len(key) for key in deletes) == FUZZY_PREFIX_LENGTH
+
+
+def test_short_query_is_not_fuzzy():
+    assert get_query_deletes("ab") == []
+    assert not _is_found("ab", "ab")
+
+
+def test_typos_are_found():
+    assert _is_found("helo", "hello")
+    assert _is_found("hlelo", "hello")
+    assert _is_found("wrold", "world")
+    assert _is_found("progrm", "programming")
+    assert _is_found("prgoam", "programming")
+    assert not _is_found("xyz", "hello")
+
+
+def test_keys_match_brute_force():
+    # Every fuzzy prefix of a stored chunk shares a key with the query
+    rng = random.Random(13)
+    alphabet = "abcde"
+    for _ in range(3000):
+        chunk = "".join(rng.choice(alphabet) for _ in range(rng.randint(3, 9)))
+        text = list(chunk[: rng.randint(3, FUZZY_PREFIX_LENGTH - 2)])
+        for _ in range(rng.randint(0, 2)):
+            position = rng.randrange(len(text))
+            operation = rng.choice("dis")
+            if operation == "d" and len(text) > 1:
+                del text[position]
+            elif operation == "i":
+                text.insert(position, rng.choice(alphabet))
+            else:
+                text[position] = rng.choice(alphabet)
+        text = "".join(text)
+
+        max_distance = get_max_distance(text)
+        if max_distance == 0:
+            continue
+        if is_fuzzy_prefix(text, chunk, max_distance):
+            assert _is_found(text, chunk), (text, chunk)
+
+
+def test_damerau_levenshtein():
+    assert damerau_levenshtein("hello", "hello", 2) == 0
+    assert damerau_levenshtein("hello", "hlelo", 2) == 1
+    assert damerau_levenshtein("hello", "help", 2) == 2
+    assert damerau_levenshtein("hello", "world", 2) == 3
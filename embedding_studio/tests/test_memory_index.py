@@ -0,0 +1,262 @@
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import numpy as np
+import pytest
+
+from embedding_studio.models.embeddings.models import (
+    MetricAggregationType,
+    MetricType,
+)
+from embedding_studio.models.embeddings.objects import (
+    Object,
+    ObjectPart,
+    ObjectsCommonDataBatch,
+    ObjectСommonData,
+)
+from embedding_studio.vectordb.memory_index import (
+    InMemoryIndex,
+    InMemoryIndexHolder,
+)
+
+
+def _make_objects(
+    rng: np.random.Generator, count: int, dimensions: int = 8
+) -> List[Object]:
+    objects = []
+    for index in range(count):
+        n_parts = int(rng.integers(1, 4))
+        parts = [
+            ObjectPart(
+                part_id=f"{index}_{part}",
+                vector=rng.normal(size=dimensions).tolist(),
+            )
+            for part in range(n_parts)
+        ]
+        parts.append(
+            ObjectPart(
+                part_id=f"{index}_avg",
+                vector=np.mean([p.vector for p in parts], axis=0).tolist(),
+                is_average=True,
+            )
+        )
+        objects.append(
+            Object(
+                object_id=str(index),
+                storage_meta={},
+                parts=parts,
+                # Personalized objects aren't searched
+                user_id="user" if index % 10 == 9 else None,
+            )
+        )
+    return objects
+
+
+def _distance(
+    metric_type: MetricType, vector: List[float], query: np.ndarray
+) -> float:
+    vector = np.asarray(vector, dtype=np.float64)
+    if metric_type == MetricType.COSINE:
+        return 1.0 - vector @ query / (
+            np.linalg.norm(vector) * np.linalg.norm(query)
+        )
+    if metric_type == MetricType.DOT:
+        return -float(vector @ query)
+    return float(np.linalg.norm(vector - query))
+
+
+def _brute_force(
+    objects: List[Object],
+    query: np.ndarray,
+    limit: int,
+    metric_type: MetricType,
+    aggregation_type: MetricAggregationType,
+    max_distance: Optional[float],
+) -> List[tuple]:
+    found = []
+    for obj in objects:
+        if obj.user_id is not None:
+            continue
+        distances = [
+            _distance(metric_type, part.vector, query)
+            for part in obj.parts
+            if aggregation_type != MetricAggregationType.AVG or part.is_average
+        ]
+        distances = [
+            distance
+            for distance in distances
+            if max_distance is None or distance <= max_distance
+        ]
+        if distances:
+            found.append((obj.object_id, min(distances)))
+    return sorted(found, key=lambda item: item[1])[:limit]
+
+
+@pytest.mark.parametrize("metric_type", list(MetricType))
+@pytest.mark.parametrize(
+    "aggregation_type",
+    [MetricAggregationType.MIN, MetricAggregationType.AVG],
+)
+@pytest.mark.parametrize("max_distance", [None, 0.9])
+def test_search_matches_brute_force(
+    metric_type, aggregation_type, max_distance
+):
+    rng = np.random.default_rng(7)
+    objects = _make_objects(rng, 200)
+    index = InMemoryIndex("collection", objects, metric_type, aggregation_type)
+    if metric_type != MetricType.COSINE and max_distance is not None:
+        max_distance = {MetricType.DOT: -1.0, MetricType.EUCLID: 4.0}[
+            metric_type
+        ]
+
+    for _ in range(10):
+        query = rng.normal(size=8)
+        found = index.find_similar_objects(
+            query.tolist(), limit=15, max_distance=max_distance
+        )
+        expected = _brute_force(
+            objects, query, 15, metric_type, aggregation_type, max_distance
+        )
+
+        assert [obj.object_id for obj in found] == [
+            object_id for object_id, _ in expected
+        ]
+        np.testing.assert_allclose(
+            [obj.distance for obj in found],
+            [distance for _, distance in expected],
+            rtol=1e-4,
+            atol=1e-4,
+        )
+
+
+def test_found_parts_are_sorted_and_have_vectors():
+    obj = Object(
+        object_id="1",
+        storage_meta={},
+        parts=[
+            ObjectPart(part_id="far", vector=[0.0, 1.0]),
+            ObjectPart(part_id="close", vector=[1.0, 0.1]),
+        ],
+    )
+    index = InMemoryIndex("collection", [obj], MetricType.COSINE)
+
+    [found] = index.find_similar_objects([1.0, 0.0], 1, with_vectors=True)
+
+    assert [part.part_id for part in found.parts] == ["close", "far"]
+    assert found.parts[0].vector == pytest.approx([1.0, 0.1])
+    assert index.find_similar_objects([1.0, 0.0], 1)[0].parts[0].vector is None
+
+
+class FakeCollection:
+    def __init__(self, collection_id: str, objects: List[Object]):
+        self.objects = objects
+        self.loaded = threading.Event()
+        self._info = SimpleNamespace(
+            collection_id=collection_id,
+            embedding_model=SimpleNamespace(
+                metric_type=MetricType.COSINE,
+                metric_aggregation_type=MetricAggregationType.MIN,
+            ),
+        )
+
+    def get_info(self):
+        return self._info
+
+    def get_objects_common_data_batch(
+        self, limit: int, offset: int
+    ) -> ObjectsCommonDataBatch:
+        batch = self.objects[offset : offset + limit]
+        next_offset = offset + limit
+        return ObjectsCommonDataBatch(
+            objects_info=[
+                ObjectСommonData(**obj.model_dump(exclude={"parts"}))
+                for obj in batch
+            ],
+            total=len(self.objects),
+            next_offset=(
+                next_offset if next_offset < len(self.objects) else None
+            ),
+        )
+
+    def find_by_ids(self, object_ids: List[str]) -> List[Object]:
+        self.loaded.set()
+        return [obj for obj in self.objects if obj.object_id in object_ids]
+
+
+class FakeVersions:
+    def __init__(self):
+        self.versions: Dict[str, int] = {}
+
+    def get(self, collection_id: str) -> Optional[int]:
+        return self.versions.get(collection_id)
+
+
+def _wait_for(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_holder_rebuilds_in_background():
+    objects = _make_objects(np.random.default_rng(1), 5)
+    collection = FakeCollection("collection", objects[:3])
+    versions = FakeVersions()
+    versions.versions["collection"] = 1
+    holder = InMemoryIndexHolder(
+        versions, max_objects=10, check_interval=0.0, rebuild_delay=0.0
+    )
+
+    # The vector DB is searched until the first index is built
+    assert holder.get(collection) is None
+    _wait_for(lambda: holder.get(collection) is not None)
+    old_index = holder.get(collection)
+    assert old_index.size == 3
+
+    # The old index is served while the new one is built
+    collection.objects = objects
+    versions.versions["collection"] = 2
+    assert holder.get(collection) is old_index
+    _wait_for(lambda: holder.get(collection) is not old_index)
+    assert holder.get(collection).size == 5
+
+
+def test_holder_debounces_rebuilds():
+    collection = FakeCollection(
+        "collection", _make_objects(np.random.default_rng(1), 3)
+    )
+    versions = FakeVersions()
+    versions.versions["collection"] = 1
+    holder = InMemoryIndexHolder(
+        versions, max_objects=10, check_interval=0.0, rebuild_delay=0.2
+    )
+
+    holder.get(collection)
+    # A burst of writes during the delay is built once, at its last version
+    for version in range(2, 6):
+        versions.versions["collection"] = version
+        holder.get(collection)
+    assert not collection.loaded.is_set()
+
+    _wait_for(lambda: holder.get(collection) is not None)
+    assert holder._state == ("collection", 5)
+
+
+def test_holder_skips_large_and_unversioned_collections():
+    collection = FakeCollection(
+        "collection", _make_objects(np.random.default_rng(1), 5)
+    )
+    versions = FakeVersions()
+    holder = InMemoryIndexHolder(
+        versions, max_objects=2, check_interval=0.0, rebuild_delay=0.0
+    )
+
+    assert holder.get(collection) is None
+
+    versions.versions["collection"] = 1
+    holder.get(collection)
+    _wait_for(lambda: holder._state is not None)
+    assert holder.get(collection) is None
+    assert not collection.loaded.is_set()
@@ -0,0 +1,88 @@
+import mongomock
+import pytest
+
+from embedding_studio.suggesting.mongo.keys import (
+    CHUNK_KEYS_FIELD,
+    FUZZY_KEYS_FIELD,
+    PREFIX_KEYS_FIELD,
+    SHINGLES_FIELD,
+)
+from embedding_studio.suggesting.mongo.phrases_manager import (
+    MongoSuggestionPhraseManager,
+)
+from embedding_studio.suggesting.tokenizer import SuggestingTokenizer
+
+
+class PhrasesManager(MongoSuggestionPhraseManager):
+    # Domains aren't used by the migration
+    def add_domains(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def remove_domains(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def remove_all_domain_values(self, *args, **kwargs):
+        raise NotImplementedError
+
+
+def _legacy_document(chunks):
+    doc = {"phrase": " ".join(chunks), "n_chunks": len(chunks), "prob": 1.0}
+    for i, chunk in enumerate(chunks):
+        doc[f"chunk_{i}"] = chunk
+        doc[f"search_{i}"] = [chunk[:j] for j in range(1, len(chunk) + 1)]
+    return doc
+
+
+@pytest.fixture
+def legacy_collection():
+    collection = mongomock.MongoClient().db.phrases
+    for i in range(3):
+        collection.create_index([(f"chunk_{i}", 1)], name=f"chunk_{i}_index")
+        collection.create_index([(f"search_{i}", 1)], name=f"search_{i}_index")
+    return collection
+
+
+def test_legacy_documents_are_migrated(legacy_collection):
+    legacy_collection.insert_one(_legacy_document(["Hello", "World"]))
+
+    PhrasesManager(legacy_collection, SuggestingTokenizer(), max_chunks=3)
+
+    index_names = {idx["name"] for idx in legacy_collection.list_indexes()}
+    legacy_names = {
+        f"{field}_{i}_index" for field in ("chunk", "search") for i in range(3)
+    }
+    assert not legacy_names & index_names
+    assert {"shingles_index", "prefix_keys_index", "fuzzy_keys_index"} <= (
+        index_names
+    )
+
+    doc = legacy_collection.find_one({})
+    assert doc[CHUNK_KEYS_FIELD] == ["hello", "world"]
+    assert doc[SHINGLES_FIELD] == ["hello", "hello world"]
+    assert "hel" in doc[PREFIX_KEYS_FIELD]
+    assert "helo" in doc[FUZZY_KEYS_FIELD]
+    assert "search_0" not in doc
+    assert doc["chunk_1"] == "World"
+
+
+def test_documents_longer_than_max_chunks_are_migrated(legacy_collection):
+    chunks = ["one", "two", "three", "four", "five"]
+    legacy_collection.insert_one(_legacy_document(chunks))
+
+    PhrasesManager(legacy_collection, SuggestingTokenizer(), max_chunks=3)
+
+    doc = legacy_collection.find_one({})
+    assert doc[CHUNK_KEYS_FIELD] == ["one", "two", "three"]
+    assert not [field for field in doc if field.startswith("search_")]
+
+
+def test_migration_runs_once(legacy_collection):
+    manager = PhrasesManager(
+        legacy_collection, SuggestingTokenizer(), max_chunks=3
+    )
+    legacy_collection.insert_one(_legacy_document(["Hello"]))
+
+    # Without legacy indexes, documents aren't scanned again
+    manager._create_indexes()
+
+    assert FUZZY_KEYS_FIELD not in legacy_collection.find_one({})
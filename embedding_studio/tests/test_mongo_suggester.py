@@ -0,0 +1,119 @@
+import mongomock
+import pytest
+
+from embedding_studio.models.suggesting import SuggestingPhrase
+from embedding_studio.suggesting.mongo import suggester
+from embedding_studio.suggesting.mongo.phrases_manager import (
+    MongoSuggestionPhraseManager,
+)
+from embedding_studio.suggesting.tokenizer import SuggestingTokenizer
+
+
+class PhrasesManager(MongoSuggestionPhraseManager):
+    # Domains are set on insertion only
+    def add_domains(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def remove_domains(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def remove_all_domain_values(self, *args, **kwargs):
+        raise NotImplementedError
+
+
+class PrefixSuggester(suggester.MongoSuggester):
+    # Operators of real pipelines aren't supported by mongomock
+    def _generate_pipeline(self, request, top_k=10):
+        chunks = {f"chunk_{i}": f"$chunk_{i}" for i in range(self._max_chunks)}
+        return [
+            {"$match": {"chunk_keys": request.chunks.found_chunks[-1]}},
+            {"$sort": {"prob": -1}},
+            {"$limit": top_k},
+            {
+                "$project": {
+                    "prob": 1,
+                    "labels": 1,
+                    "chunks": chunks,
+                    "match_info": {
+                        "type": {"$literal": "exact"},
+                        "length": {"$literal": 1},
+                        "position": {"$literal": 0},
+                    },
+                }
+            },
+        ]
+
+
+@pytest.fixture
+def mongo_suggester(monkeypatch) -> PrefixSuggester:
+    monkeypatch.setattr(
+        suggester, "MongoSuggestionPhraseManager", PhrasesManager
+    )
+    mongo_suggester = PrefixSuggester(
+        mongomock.MongoClient().db, SuggestingTokenizer(), max_chunks=5
+    )
+    mongo_suggester.phrases_manager.add(
+        [
+            SuggestingPhrase(
+                phrase="hello world", domains=["music"], prob=0.9
+            ),
+            SuggestingPhrase(
+                phrase="hello kitty", domains=["books"], prob=0.8
+            ),
+            SuggestingPhrase(
+                phrase="hello there", domains=["books", "music"], prob=0.7
+            ),
+            SuggestingPhrase(phrase="goodbye world", domains=["books"]),
+        ]
+    )
+    return mongo_suggester
+
+
+def _phrases(suggestions):
+    return [" ".join(s.prefix_chunks + s.chunks) for s in suggestions]
+
+
+def test_domains_are_suggested_by_one_aggregation(
+    monkeypatch, mongo_suggester
+):
+    request = mongo_suggester.phrases_manager.convert_phrase_to_request(
+        "hello "
+    )
+    collection = mongo_suggester._collection
+    aggregations = []
+    aggregate = collection.aggregate
+
+    def counted_aggregate(pipeline, *args, **kwargs):
+        aggregations.append(pipeline)
+        return aggregate(pipeline, *args, **kwargs)
+
+    monkeypatch.setattr(collection, "aggregate", counted_aggregate)
+
+    by_domains = mongo_suggester.get_topk_suggestions_by_domains(
+        request, [None, "books", "sports"], top_k=5
+    )
+
+    assert len(aggregations) == 1
+    assert [_phrases(suggestions) for suggestions in by_domains] == [
+        ["hello world", "hello kitty", "hello there"],
+        ["hello kitty", "hello there"],
+        [],
+    ]
+    # Suggestions of any domain are the same as of a single request
+    assert by_domains[0] == mongo_suggester.get_topk_suggestions(request, 5)
+
+
+def test_only_requested_domains_are_matched(mongo_suggester):
+    request = mongo_suggester.phrases_manager.convert_phrase_to_request(
+        "hello "
+    )
+
+    by_domains = mongo_suggester.get_topk_suggestions_by_domains(
+        request, ["music", "books"], top_k=1
+    )
+
+    assert [_phrases(suggestions) for suggestions in by_domains] == [
+        ["hello world"],
+        ["hello kitty"],
+    ]
+    assert mongo_suggester.get_topk_suggestions_by_domains(request, []) == []
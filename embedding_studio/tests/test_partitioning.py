@@ -0,0 +1,84 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+
+from embedding_studio.models.embeddings.collections import CollectionInfo
+from embedding_studio.models.embeddings.models import (
+    EmbeddingModelInfo,
+    PartitioningInfo,
+    PartitioningType,
+)
+from embedding_studio.models.embeddings.objects import Object, ObjectPart
+from embedding_studio.vectordb.pgvector.db_model import make_db_model
+
+
+def test_list_partitioning_requires_field():
+    with pytest.raises(ValidationError):
+        PartitioningInfo(type=PartitioningType.LIST, values=["a"])
+
+    assert PartitioningInfo(type=PartitioningType.HASH).field is None
+
+
+def _make_parts(partitioning: PartitioningInfo, collection_id: str):
+    _, DbObjectPart, _ = make_db_model(
+        CollectionInfo(
+            collection_id=collection_id,
+            embedding_model=EmbeddingModelInfo(
+                name="model",
+                id="model",
+                dimensions=2,
+                partitioning=partitioning,
+            ),
+        )
+    )
+    obj = Object(
+        object_id="1",
+        payload={"lang": "en"},
+        storage_meta={},
+        parts=[ObjectPart(part_id="1_0", vector=[0.0, 1.0])],
+    )
+    partition_key = DbObjectPart.get_partition_key(obj)
+    extra_fields = dict()
+    if partition_key is not None:
+        extra_fields["partition_key"] = partition_key
+
+    db_parts = [
+        DbObjectPart(
+            object_id=obj.object_id,
+            part_id=part.part_id,
+            vector=part.vector,
+            **extra_fields,
+        )
+        for part in obj.parts
+    ]
+    return DbObjectPart, db_parts
+
+
+def test_moved_parts_are_deleted_on_upsert():
+    DbObjectPart, db_parts = _make_parts(
+        PartitioningInfo(
+            type=PartitioningType.LIST, field="lang", values=["en"]
+        ),
+        "test_moved_parts",
+    )
+
+    statement = DbObjectPart.delete_moved_parts_statement(db_parts)
+    sql = str(
+        statement.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+    )
+
+    assert "DELETE FROM dbop_test_moved_parts" in sql
+    assert "part_id IN ('1_0')" in sql
+    assert "NOT IN (('1_0', 'en'))" in sql
+
+
+def test_hash_partitioned_parts_are_not_moved():
+    DbObjectPart, db_parts = _make_parts(
+        PartitioningInfo(type=PartitioningType.HASH, partitions=2),
+        "test_hash_parts",
+    )
+
+    assert DbObjectPart.delete_moved_parts_statement(db_parts) is None
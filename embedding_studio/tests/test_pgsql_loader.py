@@ -0,0 +1,87 @@
+from functools import partial
+
+import pytest
+import sqlalchemy
+from sqlalchemy.exc import OperationalError
+
+from embedding_studio.data_storage.loaders.loader_cursor import LoaderCursor
+from embedding_studio.data_storage.loaders.sql.pgsql.pgsql_loader import (
+    PgsqlDataLoader,
+)
+from embedding_studio.data_storage.loaders.sql.query_generator import (
+    QueryGenerator,
+)
+from embedding_studio.workers.fine_tuning.utils.config import (
+    RetryConfig,
+    RetryParams,
+)
+
+
+@pytest.fixture
+def loader(tmp_path):
+    connection_string = f"sqlite:///{tmp_path / 'items.db'}"
+    engine = sqlalchemy.create_engine(connection_string)
+    with engine.begin() as connection:
+        connection.execute(
+            sqlalchemy.text("CREATE TABLE items (id TEXT, item TEXT)")
+        )
+        connection.execute(
+            sqlalchemy.text("INSERT INTO items VALUES (:id, :item)"),
+            [{"id": str(i), "item": f"item {i}"} for i in range(1, 8)],
+        )
+
+    retry_config = RetryConfig()
+    retry_config["fetch_data"] = RetryParams(
+        max_attempts=2, wait_time_seconds=0
+    )
+    return PgsqlDataLoader(
+        connection_string,
+        partial(QueryGenerator, "items"),
+        retry_config=retry_config,
+        streaming=True,
+    )
+
+
+def _ids(batches):
+    return [[int(item.id) for item in batch] for batch, _ in batches]
+
+
+def test_streaming_resumes_from_cursor(loader):
+    batches = list(loader.load_all_with_cursor(3))
+    assert _ids(batches) == [[1, 2, 3], [4, 5, 6], [7]]
+
+    cursor = LoaderCursor.model_validate_json(batches[0][1].model_dump_json())
+    resumed = list(loader.load_all_with_cursor(3, cursor))
+
+    assert _ids(resumed) == [[4, 5, 6], [7]]
+    assert resumed[-1][1].offset == 7
+
+
+def test_streaming_is_retried_after_last_row(monkeypatch, loader):
+    stream_batches = loader._stream_batches
+    queries = []
+
+    def fail_once(query, batch_size):
+        queries.append(str(query))
+        for i, batch in enumerate(stream_batches(query, batch_size)):
+            if len(queries) == 1 and i == 1:
+                raise OperationalError("SELECT", {}, Exception("lost"))
+            yield batch
+
+    monkeypatch.setattr(loader, "_stream_batches", fail_once)
+
+    batches = list(loader.load_all_with_cursor(3))
+
+    assert _ids(batches) == [[1, 2, 3], [4, 5, 6], [7]]
+    assert len(queries) == 2 and "items.id >" in queries[1]
+
+
+def test_streaming_fails_after_max_attempts(monkeypatch, loader):
+    def fail(query, batch_size):
+        raise OperationalError("SELECT", {}, Exception("lost"))
+        yield
+
+    monkeypatch.setattr(loader, "_stream_batches", fail)
+
+    with pytest.raises(OperationalError):
+        list(loader.load_all_with_cursor(3))
@@ -0,0 +1,68 @@
+from typing import List
+
+import numpy as np
+import pytest
+from datasets import Dataset
+from PIL import Image
+
+from embedding_studio.embeddings.data.transforms.image import pixels_cache
+
+
+def fill_transform(n_pixels: int):
+    def transform(image):
+        return np.full((3, n_pixels, n_pixels), image.getpixel((0, 0))[0])
+
+    return transform
+
+
+class FakePool:
+    def __init__(self):
+        self.transformed = 0
+
+    def map_transform_factory(
+        self, transform_factory, n_pixels: int, images: List, mode=None
+    ):
+        self.transformed += len(images)
+        transform = transform_factory(n_pixels)
+        return [transform(image.convert(mode)) for image in images]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(pixels_cache, "get_image_transform_pool", lambda: pool)
+    return pool
+
+
+def _dataset(ids: List[int]) -> Dataset:
+    return Dataset.from_dict(
+        {
+            "item_id": [str(i) for i in ids],
+            "item": [Image.new("RGB", (4, 4), (i, i, i)) for i in ids],
+        }
+    )
+
+
+def _materialize(dataset: Dataset, cache_dir: str) -> Dataset:
+    return pixels_cache.materialize_pixel_values(
+        dataset,
+        cache_dir=cache_dir,
+        transform=fill_transform,
+        n_pixels=2,
+        image_field_name="item",
+        id_field_name="item_id",
+        pixel_values_name="pixel_values",
+    )
+
+
+def test_pixels_are_cached_per_item(tmp_path, pool):
+    _materialize(_dataset([1, 2, 3]), str(tmp_path))
+    assert pool.transformed == 3
+
+    # Another order and a new item: only the new item is transformed
+    dataset = _materialize(_dataset([3, 4, 1]), str(tmp_path))
+    assert pool.transformed == 4
+
+    values = np.asarray(dataset["pixel_values"])
+    assert values.shape == (3, 3, 2, 2)
+    np.testing.assert_array_equal(values[:, 0, 0, 0], [3, 4, 1])
@@ -0,0 +1,133 @@
+import time
+import uuid
+from typing import List, Tuple
+
+import pytest
+
+from embedding_studio.core.config import settings
+from embedding_studio.utils.ranges_queue import LeasedRangesQueue
+
+
+@pytest.fixture
+def queue():
+    queue = LeasedRangesQueue(
+        redis_url=settings.REDIS_URL,
+        prefix=f"test_ranges_{uuid.uuid4().hex}",
+        lease_time=0.5,
+        ttl=60,
+    )
+    yield queue
+    queue.clear("task")
+
+
+def test_claimed_ranges_are_completed(queue):
+    queue.fill("task", [(0, 10), (10, 10), (20, 5)])
+
+    claimed = [queue.claim("task") for _ in range(3)]
+
+    assert claimed == [(0, 10), (10, 10), (20, 5)]
+    assert queue.claim("task") is None
+    assert queue.progress("task").leased == 3
+
+    for offset, limit in claimed:
+        queue.complete("task", offset, limit, limit)
+    # Completing a range twice doesn't count its items twice
+    queue.complete("task", 0, 10, 10)
+
+    progress = queue.progress("task")
+    assert progress.is_finished
+    assert progress.done == 3
+    assert progress.done_items == 25
+
+
+def test_expired_range_is_claimed_again(queue):
+    queue.fill("task", [(0, 10)])
+    assert queue.claim("task") == (0, 10)
+    assert queue.claim("task") is None
+
+    time.sleep(queue.lease_time + 0.1)
+
+    assert queue.claim("task") == (0, 10)
+    assert queue.progress("task").leased == 1
+
+
+def test_heartbeat_prolongs_lease(queue):
+    queue.fill("task", [(0, 10)])
+    offset, limit = queue.claim("task")
+
+    with queue.keep_leased("task", offset, limit, interval=0.1):
+        time.sleep(queue.lease_time + 0.3)
+        assert queue.claim("task") is None
+
+
+def test_released_range_is_claimed_again(queue):
+    queue.fill("task", [(0, 10), (10, 10)])
+    assert queue.claim("task") == (0, 10)
+
+    assert queue.release("task", 0, 10, max_attempts=2)
+    assert queue.claim("task") == (10, 10)
+    assert queue.claim("task") == (0, 10)
+
+    # The second failure exhausts attempts, the range stays leased
+    assert not queue.release("task", 0, 10, max_attempts=2)
+    assert queue.progress("task").leased == 2
+
+
+def test_failed_range_is_retried(queue):
+    queue.fill("task", [(0, 10), (10, 10)])
+    calls: List[Tuple[int, int]] = []
+
+    def process(offset: int, limit: int) -> int:
+        calls.append((offset, limit))
+        if len(calls) == 1:
+            raise ValueError("Failed in the middle of a range")
+        return limit
+
+    def on_failure(offset: int, limit: int, exception: Exception):
+        pytest.fail("Range was retried successfully")
+
+    assert queue.run("task", process, on_failure, 0.1, max_attempts=2)
+
+    assert calls == [(0, 10), (10, 10), (0, 10)]
+    progress = queue.progress("task")
+    assert progress.is_finished
+    assert progress.done == 2
+    assert progress.done_items == 20
+
+
+def test_range_failed_too_many_times_is_recorded(queue):
+    queue.fill("task", [(0, 10), (10, 10)])
+    failures: List[Tuple[int, int, Exception]] = []
+
+    def process(offset: int, limit: int) -> int:
+        if offset == 10:
+            raise ValueError("Failed in the middle of a range")
+        return limit
+
+    def on_failure(offset: int, limit: int, exception: Exception):
+        # The range is still leased while its failure is recorded
+        assert queue.progress("task").leased == 1
+        failures.append((offset, limit, exception))
+
+    assert not queue.run("task", process, on_failure, 0.1, max_attempts=2)
+
+    assert [(offset, limit) for offset, limit, _ in failures] == [(10, 10)]
+    assert isinstance(failures[0][2], ValueError)
+    progress = queue.progress("task")
+    assert progress.is_finished
+    assert progress.done == 2
+    assert progress.done_items == 10
+
+
+def test_interrupted_range_keeps_lease(queue):
+    queue.fill("task", [(0, 10)])
+
+    def process(offset: int, limit: int) -> int:
+        raise KeyboardInterrupt()
+
+    with pytest.raises(KeyboardInterrupt):
+        queue.run("task", process, lambda *args: None, 0.1, max_attempts=2)
+
+    progress = queue.progress("task")
+    assert progress.leased == 1
+    assert progress.done == 0
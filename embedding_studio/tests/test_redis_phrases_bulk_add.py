@@ -0,0 +1,98 @@
+import uuid
+from typing import Iterator, List
+
+import pytest
+from redisearch import Client
+
+from embedding_studio.core.config import settings
+from embedding_studio.models.suggesting import SuggestingPhrase
+from embedding_studio.suggesting.redis.phrases_manager import (
+    RedisSuggestionPhraseManager,
+    convert_phrase,
+)
+from embedding_studio.suggesting.tokenizer import SuggestingTokenizer
+
+
+class PhrasesManager(RedisSuggestionPhraseManager):
+    # Documents are written by plain Redis commands, no index is needed
+    def _create_main_index(self, index_name: str):
+        self._search_client = Client(index_name, conn=self._redis_client)
+
+
+@pytest.fixture
+def manager() -> PhrasesManager:
+    manager = PhrasesManager(
+        redis_url=settings.REDIS_URL,
+        tokenizer=SuggestingTokenizer(),
+        index_name=f"test_phrases_{uuid.uuid4().hex}",
+        max_chunks=3,
+    )
+    yield manager
+    keys = list(manager.redis_client.scan_iter(f"{manager._index_name}:*"))
+    if keys:
+        manager.redis_client.delete(*keys)
+
+
+def _phrases() -> Iterator[SuggestingPhrase]:
+    # Phrases are read lazily, e.g. from a file
+    for phrase in [
+        "hello world",
+        "one two three four",
+        "good morning",
+        "hello",
+        "good night",
+    ]:
+        yield SuggestingPhrase(phrase=phrase, labels=["label"], prob=0.5)
+
+
+def _stored_phrases(manager: PhrasesManager) -> List[dict]:
+    docs = []
+    for key in manager.redis_client.scan_iter(f"{manager._index_name}:*"):
+        if key.decode() == manager._version_key:
+            continue
+        assert manager.redis_client.ttl(key) == -1
+        doc = manager.redis_client.hgetall(key)
+        docs.append({k.decode(): v.decode() for k, v in doc.items()})
+    return sorted(docs, key=lambda doc: doc["phrase"])
+
+
+def test_phrases_are_written_by_batches(monkeypatch, manager):
+    pipelines = []
+    pipeline = manager.redis_client.pipeline
+
+    def counted_pipeline(*args, **kwargs):
+        pipelines.append(kwargs)
+        return pipeline(*args, **kwargs)
+
+    monkeypatch.setattr(manager.redis_client, "pipeline", counted_pipeline)
+
+    report = manager.bulk_add(_phrases(), batch_size=2)
+
+    assert (report.total, report.inserted, report.skipped) == (5, 4, 1)
+    # One non-transactional pipeline per batch, each bumps the version
+    assert pipelines == [{"transaction": False}] * 3
+    assert manager.get_version() == 3
+
+    docs = _stored_phrases(manager)
+    assert [doc["phrase"] for doc in docs] == [
+        "good morning",
+        "good night",
+        "hello",
+        "hello world",
+    ]
+    expected = convert_phrase(
+        SuggestingTokenizer(), SuggestingPhrase(phrase="hello world")
+    )
+    assert docs[3]["chunk_1"] == expected["chunk_1"]
+    assert docs[3]["fuzzy_keys"] == expected["fuzzy_keys"]
+
+
+def test_workers_store_the_same_phrases(manager):
+    report = manager.bulk_add(
+        _phrases(), batch_size=1, n_workers=2, max_pending_batches=1
+    )
+
+    assert (report.total, report.inserted, report.skipped) == (5, 4, 1)
+    assert manager.get_version() == 5
+    phrases = [doc["phrase"] for doc in _stored_phrases(manager)]
+    assert phrases == ["good morning", "good night", "hello", "hello world"]
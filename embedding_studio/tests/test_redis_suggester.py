@@ -0,0 +1,149 @@
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pytest
+
+from embedding_studio.models.suggesting import (
+    SuggestingRequest,
+    SuggestingRequestChunks,
+    SuggestingRequestSpans,
+)
+from embedding_studio.suggesting.redis import suggester
+from embedding_studio.suggesting.tokenizer import SuggestingTokenizer
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.commands = []
+
+    def execute_command(self, *args):
+        self.commands.append(args)
+
+    def execute(self):
+        self.redis.executed.append(self.commands)
+        # FT.SEARCH <index> <query> ...
+        return [self.redis.responses[args[2]] for args in self.commands]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.responses: Dict[str, list] = {}
+        self.executed: List[list] = []
+
+    def pipeline(self, transaction: bool = True):
+        assert not transaction
+        return FakePipeline(self)
+
+
+class FakePhrasesManager:
+    def __init__(self, **kwargs):
+        self.redis_client = FakeRedis()
+        self.search_client = SimpleNamespace(index_name="phrases")
+
+
+class Suggester(suggester.RedisSuggester):
+    def _generate_query(self, request, top_k=10, soft_match=False) -> str:
+        if soft_match and request.domain == "same":
+            return f"strict:{request.domain}"
+        return f"{'soft' if soft_match else 'strict'}:{request.domain}"
+
+
+@pytest.fixture
+def redis_suggester(monkeypatch) -> Suggester:
+    monkeypatch.setattr(
+        suggester, "RedisSuggestionPhraseManager", FakePhrasesManager
+    )
+    return Suggester("redis://", SuggestingTokenizer(), max_chunks=3)
+
+
+def _response(*phrases: str) -> list:
+    response = [len(phrases)]
+    for index, phrase in enumerate(phrases):
+        fields = ["phrase", phrase, "prob", "1.0", "labels", ""]
+        fields += ["label_ids", phrase.replace(" ", "_")]
+        for chunk_index, chunk in enumerate(phrase.split()):
+            fields += [f"chunk_{chunk_index}", chunk]
+        response += [f"phrases:{index}", fields]
+    return response
+
+
+def _request(domain=None) -> SuggestingRequest:
+    return SuggestingRequest(
+        chunks=SuggestingRequestChunks(
+            found_chunks=["hello"], next_chunk="wo"
+        ),
+        # Spans aren't used by suggesters
+        spans=SuggestingRequestSpans(
+            found_chunk_spans=[], next_chunk_span=None
+        ),
+        domain=domain,
+    )
+
+
+def _phrases(suggestions) -> List[str]:
+    return [" ".join(s.prefix_chunks + s.chunks) for s in suggestions]
+
+
+def test_strict_and_soft_queries_are_sent_together(redis_suggester):
+    redis = redis_suggester.phrases_manager.redis_client
+    redis.responses = {
+        "strict:None": _response("hello world"),
+        "soft:None": _response("hello world", "hello word"),
+    }
+
+    suggestions = redis_suggester.get_topk_suggestions(_request(), top_k=5)
+
+    assert _phrases(suggestions) == ["hello world", "hello word"]
+    [commands] = redis.executed
+    assert [args[:3] for args in commands] == [
+        ("FT.SEARCH", "phrases", "strict:None"),
+        ("FT.SEARCH", "phrases", "soft:None"),
+    ]
+    # Only fields needed by suggestions are returned
+    assert "RETURN" in commands[0]
+
+
+def test_soft_docs_are_used_only_if_strict_are_not_enough(redis_suggester):
+    redis = redis_suggester.phrases_manager.redis_client
+    redis.responses = {
+        "strict:None": _response("hello world"),
+        "soft:None": _response("hello word"),
+        "strict:same": _response("hello there"),
+    }
+
+    suggestions = redis_suggester.get_topk_suggestions(_request(), top_k=1)
+    assert _phrases(suggestions) == ["hello world"]
+
+    # The same soft query isn't sent again
+    redis_suggester.get_topk_suggestions(_request("same"), top_k=5)
+    assert len(redis.executed[-1]) == 1
+
+
+def test_domains_are_queried_in_one_round_trip(redis_suggester):
+    redis = redis_suggester.phrases_manager.redis_client
+    redis.responses = {
+        "strict:None": _response("hello world"),
+        "soft:None": _response("hello word"),
+        "strict:books": _response("hello book"),
+        "soft:books": _response(),
+        "strict:same": _response("hello there"),
+    }
+    domains = [None, "books", "same"]
+
+    by_domains = redis_suggester.get_topk_suggestions_by_domains(
+        _request("ignored"), domains, top_k=5
+    )
+
+    assert len(redis.executed) == 1
+    assert len(redis.executed[0]) == 5
+    assert [_phrases(suggestions) for suggestions in by_domains] == [
+        ["hello world", "hello word"],
+        ["hello book"],
+        ["hello there"],
+    ]
+    # Results are the same as of requests made for each domain
+    assert by_domains == [
+        redis_suggester.get_topk_suggestions(_request(domain), top_k=5)
+        for domain in domains
+    ]
@@ -0,0 +1,142 @@
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pytest
+from bson import ObjectId
+
+from embedding_studio.core.config import settings
+from embedding_studio.models.reindex import (
+    ReindexSubtaskCreateSchema,
+    ReindexSubtaskInDb,
+    ReindexTaskInDb,
+)
+from embedding_studio.models.task import ModelParams, TaskStatus
+from embedding_studio.utils.ranges_queue import LeasedRangesQueue
+from embedding_studio.workers.upsertion.utils import reindex
+
+
+class FakeCrud:
+    def __init__(self):
+        self.objects: Dict[str, object] = {}
+
+    def get(self, id):
+        return self.objects.get(str(id))
+
+    def update(self, obj):
+        self.objects[str(obj.id)] = obj
+
+    def create(self, schema, return_obj: bool = False):
+        obj = ReindexSubtaskInDb(
+            **schema.model_dump(exclude={"id"}), _id=ObjectId()
+        )
+        self.update(obj)
+        return obj
+
+
+class FakeTaskEvents:
+    def clear(self, parent_id: str):
+        pass
+
+    def wait(self, parent_id: str, timeout: float) -> List[str]:
+        return []
+
+
+@pytest.fixture
+def ranges_queue(monkeypatch):
+    queue = LeasedRangesQueue(
+        redis_url=settings.REDIS_URL,
+        prefix=f"test_reindex_{uuid.uuid4().hex}",
+        lease_time=60,
+        ttl=60,
+    )
+    monkeypatch.setattr(reindex, "reindex_ranges", queue)
+    return queue
+
+
+@pytest.fixture
+def fake_context(monkeypatch):
+    fake_context = SimpleNamespace(
+        reindex_task=FakeCrud(), reindex_subtask=FakeCrud()
+    )
+    monkeypatch.setattr(reindex, "context", fake_context)
+    monkeypatch.setattr(reindex, "task_events", FakeTaskEvents())
+    return fake_context
+
+
+def _task() -> ReindexTaskInDb:
+    return ReindexTaskInDb(
+        _id=ObjectId(),
+        source=ModelParams(embedding_model_id="source"),
+        dest=ModelParams(embedding_model_id="dest"),
+        deploy_as_blue=False,
+        wait_on_conflict=False,
+    )
+
+
+def test_task_fails_when_subtasks_exit_early(
+    monkeypatch, ranges_queue, fake_context
+):
+    sent_subtasks = []
+
+    def exit_early(worker, subtask, task_crud):
+        # A subtask fails before claiming a range, e.g. a missing model
+        subtask.status = TaskStatus.failed
+        task_crud.update(subtask)
+        sent_subtasks.append(subtask)
+        return subtask
+
+    monkeypatch.setattr(reindex, "create_and_send_task", exit_early)
+    task = _task()
+    collection = SimpleNamespace(get_total=lambda: 100)
+
+    reindex.process_reindex(task, collection, reindex_subworker=None)
+
+    assert task.status == TaskStatus.failed
+    assert "without reindexing a range" in task.detail
+    assert len(sent_subtasks) <= (
+        int(settings.REINDEX_MAX_IDLE_FAILED_SUBTASKS)
+        + int(settings.REINDEX_MAX_SUBTASKS_COUNT)
+    )
+    assert ranges_queue.progress(task.id).pending == 0
+
+
+def test_task_fails_when_subtasks_cant_be_sent(
+    monkeypatch, ranges_queue, fake_context
+):
+    monkeypatch.setattr(
+        reindex, "create_and_send_task", lambda *args, **kwargs: None
+    )
+    task = _task()
+    collection = SimpleNamespace(get_total=lambda: 100)
+
+    reindex.process_reindex(task, collection, reindex_subworker=None)
+
+    assert task.status == TaskStatus.failed
+    assert task.children == []
+
+
+def test_dead_tasks_are_failed(fake_context):
+    subtask = fake_context.reindex_subtask.create(
+        ReindexSubtaskCreateSchema(
+            source=ModelParams(embedding_model_id="source"),
+            dest=ModelParams(embedding_model_id="dest"),
+            limit=10,
+            offset=None,
+        )
+    )
+    subtask_id = str(subtask.id)
+    now = time.monotonic()
+    started_at = {subtask_id: now - 120, "alive": now}
+
+    alive_ids, dead_count = reindex.fail_dead_tasks(
+        [subtask_id, "alive"], started_at, timeout=60
+    )
+
+    assert alive_ids == ["alive"]
+    assert dead_count == 1
+    assert subtask_id not in started_at
+    assert fake_context.reindex_subtask.get(subtask_id).status == (
+        TaskStatus.failed
+    )
@@ -0,0 +1,61 @@
+import time
+
+from embedding_studio.models.payload.models import PayloadFilter
+from embedding_studio.vectordb.pgvector.search_strategy import (
+    SearchStrategy,
+    SearchStrategyCache,
+    choose_search_strategy,
+    parse_estimated_rows,
+)
+
+
+def _filter(value: str) -> PayloadFilter:
+    return PayloadFilter.model_validate(
+        {"query": {"term": {"field": "category", "value": value}}}
+    )
+
+
+def test_strategy_is_chosen_by_estimate():
+    assert parse_estimated_rows('[{"Plan": {"Plan Rows": 12}}]') == 12
+    assert parse_estimated_rows("[]") is None
+
+    assert choose_search_strategy(10, 100) == SearchStrategy.EXACT
+    assert choose_search_strategy(1000, 100) == SearchStrategy.HNSW
+    assert choose_search_strategy(None, 100) == SearchStrategy.HNSW
+
+
+def test_strategies_are_cached_per_filter():
+    cache = SearchStrategyCache(ttl=60, max_size=10)
+    cache.put("collection", _filter("rare"), None, SearchStrategy.EXACT)
+
+    assert cache.get("collection", _filter("rare")) == SearchStrategy.EXACT
+    # Values drive the filtered set size, other filters are estimated again
+    assert cache.get("collection", _filter("common")) is None
+    assert cache.get("collection", _filter("rare"), user_id="user") is None
+    assert cache.get("other", _filter("rare")) is None
+
+
+def test_cached_strategies_expire_and_are_evicted():
+    cache = SearchStrategyCache(ttl=0.05, max_size=1)
+    cache.put("collection", _filter("a"), None, SearchStrategy.EXACT)
+    cache.put("collection", _filter("b"), None, SearchStrategy.EXACT)
+
+    assert cache.get("collection", _filter("a")) is None
+    assert cache.get("collection", _filter("b")) == SearchStrategy.EXACT
+    time.sleep(0.1)
+    assert cache.get("collection", _filter("b")) is None
+
+
+def test_strategies_are_invalidated_on_writes():
+    cache = SearchStrategyCache(ttl=60, max_size=10)
+    cache.put("collection", _filter("a"), None, SearchStrategy.EXACT)
+    cache.put("other", _filter("a"), None, SearchStrategy.EXACT)
+
+    cache.invalidate("collection")
+
+    assert cache.get("collection", _filter("a")) is None
+    assert cache.get("other", _filter("a")) == SearchStrategy.EXACT
+
+    disabled = SearchStrategyCache(ttl=0, max_size=10)
+    disabled.put("collection", _filter("a"), None, SearchStrategy.EXACT)
+    assert disabled.get("collection", _filter("a")) is None
@@ -0,0 +1,261 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from embedding_studio.embeddings.selectors.candidates import (
+    SelectionCandidates,
+)
+from embedding_studio.embeddings.selectors.prob_dist_based_selector import (
+    ProbsDistBasedSelector,
+)
+from embedding_studio.embeddings.selectors.vectors_based_selector import (
+    VectorsBasedSelector,
+)
+from embedding_studio.models.embeddings.models import (
+    MetricAggregationType,
+    MetricType,
+    SearchIndexInfo,
+)
+from embedding_studio.models.embeddings.objects import (
+    ObjectPart,
+    ObjectWithDistance,
+)
+
+
+class ThresholdSelector(VectorsBasedSelector):
+    def _calculate_binary_labels(
+        self, corrected_values: np.ndarray
+    ) -> np.ndarray:
+        return corrected_values > 0
+
+
+def _make_objects(
+    rng: np.random.Generator, parts_counts: List[int], dimensions: int = 4
+) -> List[ObjectWithDistance]:
+    return [
+        ObjectWithDistance(
+            object_id=str(index),
+            storage_meta={},
+            distance=float(rng.uniform(0, 1)),
+            parts=[
+                ObjectPart(
+                    part_id=f"{index}_{part}",
+                    vector=rng.normal(size=dimensions).tolist(),
+                )
+                for part in range(n_parts)
+            ],
+        )
+        for index, n_parts in enumerate(parts_counts)
+    ]
+
+
+def _reference_values(
+    objects: List[ObjectWithDistance],
+    query: np.ndarray,
+    metric_type: MetricType,
+    aggregation_type: MetricAggregationType,
+    is_similarity: bool,
+    scale_to_one: bool,
+    softmin_temperature: float = 1.0,
+) -> np.ndarray:
+    # Formulas of the former per-query selector, objects aren't padded
+    vectors = np.array(
+        [[part.vector for part in obj.parts] for obj in objects],
+        dtype=np.float64,
+    )
+    query = np.asarray(query, dtype=np.float64)
+    if metric_type == MetricType.COSINE:
+        values = (vectors @ query) / (
+            np.linalg.norm(vectors, axis=-1) * np.linalg.norm(query)
+        )
+        if scale_to_one:
+            values = (values + 1) / 2
+        if not is_similarity:
+            values = 1 - values
+    elif metric_type == MetricType.DOT:
+        values = vectors @ query
+        if scale_to_one:
+            values = (values - values.mean()) / values.std(ddof=1)
+        if not is_similarity:
+            values = -values
+    else:
+        values = np.linalg.norm(vectors - query, axis=-1)
+        if is_similarity:
+            values = -values
+
+    if aggregation_type == MetricAggregationType.AVG:
+        return values.mean(axis=-1)
+
+    weights = np.exp(-values / softmin_temperature)
+    weights /= weights.sum(axis=-1, keepdims=True)
+    return (weights * values).sum(axis=-1)
+
+
+def test_candidates_are_padded_and_masked():
+    objects = _make_objects(np.random.default_rng(1), [2, 1, 3])
+
+    candidates = SelectionCandidates.from_objects(objects, with_vectors=True)
+
+    assert candidates.object_ids == ["0", "1", "2"]
+    np.testing.assert_allclose(
+        candidates.distances, [obj.distance for obj in objects], rtol=1e-6
+    )
+    assert candidates.vectors.shape == (3, 3, 4)
+    assert candidates.parts_mask.tolist() == [
+        [True, True, False],
+        [True, False, False],
+        [True, True, True],
+    ]
+    assert not candidates.vectors[1, 1:].any()
+    np.testing.assert_allclose(
+        candidates.vectors[0, :2], [p.vector for p in objects[0].parts]
+    )
+    np.testing.assert_allclose(
+        candidates.norms[2],
+        [np.linalg.norm(p.vector) for p in objects[2].parts],
+        rtol=1e-6,
+    )
+
+    without_vectors = SelectionCandidates.from_objects(objects)
+    assert without_vectors.vectors is None
+    assert len(SelectionCandidates.from_objects([], with_vectors=True)) == 0
+
+
+@pytest.mark.parametrize("metric_type", list(MetricType))
+@pytest.mark.parametrize(
+    "aggregation_type",
+    [MetricAggregationType.MIN, MetricAggregationType.AVG],
+)
+@pytest.mark.parametrize("is_similarity", [False, True])
+@pytest.mark.parametrize("scale_to_one", [False, True])
+def test_select_matches_former_selector(
+    metric_type, aggregation_type, is_similarity, scale_to_one
+):
+    rng = np.random.default_rng(7)
+    objects = _make_objects(rng, [3] * 20)
+    query = rng.normal(size=4)
+    selector = ThresholdSelector(
+        SearchIndexInfo(
+            dimensions=4,
+            metric_type=metric_type,
+            metric_aggregation_type=aggregation_type,
+        ),
+        is_similarity=is_similarity,
+        margin=0.2,
+        scale_to_one=scale_to_one,
+    )
+    expected_values = _reference_values(
+        objects,
+        query,
+        metric_type,
+        aggregation_type,
+        is_similarity,
+        scale_to_one,
+    )
+
+    candidates = SelectionCandidates.from_objects(objects, with_vectors=True)
+    values = selector._calculate_distance(
+        query[None].astype(np.float32),
+        candidates.vectors[None],
+        candidates.parts_mask[None],
+        candidates.norms[None],
+        is_similarity=is_similarity,
+    )[0]
+
+    np.testing.assert_allclose(values, expected_values, rtol=1e-4, atol=1e-4)
+    threshold = 1 - 0.2 if is_similarity else 0.2
+    expected = np.flatnonzero(expected_values - threshold > 0).tolist()
+    assert selector.select(objects, query.tolist()) == expected
+
+
+@pytest.mark.parametrize("metric_type", list(MetricType))
+@pytest.mark.parametrize(
+    "aggregation_type",
+    [MetricAggregationType.MIN, MetricAggregationType.AVG],
+)
+def test_padded_parts_are_ignored(metric_type, aggregation_type):
+    rng = np.random.default_rng(3)
+    objects = _make_objects(rng, [1, 3, 2])
+    query = rng.normal(size=4)
+    selector = ThresholdSelector(
+        SearchIndexInfo(
+            dimensions=4,
+            metric_type=metric_type,
+            metric_aggregation_type=aggregation_type,
+        )
+    )
+
+    candidates = SelectionCandidates.from_objects(objects, with_vectors=True)
+    values = selector._calculate_distance(
+        query[None].astype(np.float32),
+        candidates.vectors[None],
+        candidates.parts_mask[None],
+        candidates.norms[None],
+    )[0]
+
+    # Each object is scored as if it was the only one, without padding
+    expected = [
+        _reference_values(
+            [obj], query, metric_type, aggregation_type, False, False
+        )[0]
+        for obj in objects
+    ]
+    np.testing.assert_allclose(values, expected, rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize("metric_type", list(MetricType))
+@pytest.mark.parametrize("scale_to_one", [False, True])
+def test_select_batch_matches_select(metric_type, scale_to_one):
+    rng = np.random.default_rng(5)
+    batches = [
+        _make_objects(rng, [2, 3, 1, 2]),
+        _make_objects(rng, [1]),
+        [],
+        _make_objects(rng, [4, 4, 4]),
+    ]
+    queries = rng.normal(size=(len(batches), 4))
+    selector = ThresholdSelector(
+        SearchIndexInfo(dimensions=4, metric_type=metric_type),
+        margin=0.5,
+        scale_to_one=scale_to_one,
+    )
+
+    selected = selector.select_batch(
+        [
+            SelectionCandidates.from_objects(objects, with_vectors=True)
+            for objects in batches
+        ],
+        queries,
+    )
+
+    # Stacking with candidates of other queries doesn't change selection
+    assert selected == [
+        selector.select(objects, query) if objects else []
+        for objects, query in zip(batches, queries)
+    ]
+
+
+@pytest.mark.parametrize("is_similarity", [False, True])
+@pytest.mark.parametrize("prob_threshold", [0.0, 0.3, 0.5, 0.9, 1.0])
+def test_probs_selector_matches_sigmoid(is_similarity, prob_threshold):
+    rng = np.random.default_rng(11)
+    batches = [_make_objects(rng, [1] * 30), _make_objects(rng, [1] * 7)]
+    selector = ProbsDistBasedSelector(
+        SearchIndexInfo(dimensions=4, metric_type=MetricType.COSINE),
+        is_similarity=is_similarity,
+        prob_threshold=prob_threshold,
+    )
+
+    selected = selector.select_batch(
+        [SelectionCandidates.from_objects(objects) for objects in batches]
+    )
+
+    threshold = 1 - 0.2 if is_similarity else 0.2
+    expected = []
+    for objects in batches:
+        distances = np.array([obj.distance for obj in objects])
+        values = 1.0 - distances if is_similarity else distances
+        probs = 1.0 / (1.0 + np.exp(-(values - threshold) * 10.0))
+        expected.append(np.flatnonzero(probs > prob_threshold).tolist())
+    assert selected == expected
@@ -0,0 +1,68 @@
+import mongomock
+
+from embedding_studio.models.suggesting import SuggestingPhrase
+from embedding_studio.suggesting.mongo.phrases_manager import (
+    MongoSuggestionPhraseManager,
+)
+from embedding_studio.suggesting.suggestions_cache import SuggestionsCache
+from embedding_studio.suggesting.tokenizer import SuggestingTokenizer
+
+
+class PhrasesManager(MongoSuggestionPhraseManager):
+    # Domains aren't versioned by these tests
+    def add_domains(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def remove_domains(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def remove_all_domain_values(self, *args, **kwargs):
+        raise NotImplementedError
+
+
+def test_entries_are_keyed_by_exact_phrase():
+    cache = SuggestionsCache(max_size=10)
+    cache.put(1, "Hello ", 5, None, {"suggestions": ["a"]})
+
+    assert cache.get(1, "Hello ", 5, None) == {"suggestions": ["a"]}
+    # Spans of suggestions depend on the exact typed phrase
+    assert cache.get(1, "hello ", 5, None) is None
+    assert cache.get(1, "Hello", 5, None) is None
+    assert cache.get(2, "Hello ", 5, None) is None
+    assert cache.stats().local_hits == 1
+
+
+def test_version_is_loaded_once_per_ttl():
+    calls = []
+
+    def load_version():
+        calls.append(1)
+        return len(calls)
+
+    cache = SuggestionsCache(max_size=10, version_ttl=60)
+    assert cache.get_version(load_version) == 1
+    assert cache.get_version(load_version) == 1
+    assert len(calls) == 1
+
+    cache = SuggestionsCache(max_size=10, version_ttl=0)
+    assert cache.get_version(load_version) == 2
+    assert cache.get_version(load_version) == 3
+
+
+def test_mongo_mutations_increase_version():
+    collection = mongomock.MongoClient().db.phrases
+    manager = PhrasesManager(collection, SuggestingTokenizer(), max_chunks=3)
+    assert manager.get_version() == 0
+
+    manager.add([SuggestingPhrase(phrase="hello world")])
+    assert manager.get_version() == 1
+
+    phrase_id = collection.find_one({})["_id"]
+
+    manager.add_labels(phrase_id, ["label"])
+    manager.remove_all_label_values(["label"])
+    manager.delete_by_value(["hello world"])
+    assert manager.get_version() == 4
+
+    # Phrases queries don't see the counter
+    assert collection.count_documents({}) == 0
@@ -0,0 +1,140 @@
+from typing import Dict, List, Optional
+
+from embedding_studio.data_storage.loaders.cloud_storage.s3.item_meta import (
+    S3FileMeta,
+)
+from embedding_studio.data_storage.loaders.downloaded_item import (
+    DownloadedItem,
+)
+from embedding_studio.models.embeddings.objects import Object, ObjectPart
+from embedding_studio.utils.fingerprint import content_fingerprint
+from embedding_studio.workers.upsertion.utils.upsertion_stages import (
+    split_items,
+    update_unchanged_objects,
+)
+
+
+class FakeCollection:
+    def __init__(self):
+        self.upserted: List[Object] = []
+
+    def upsert(self, objects: List[Object]):
+        self.upserted += objects
+
+
+def _preprocessor(data: str) -> str:
+    return data.lower()
+
+
+def _splitter(data: str) -> List[str]:
+    return data.split()
+
+
+def _item(
+    object_id: str, data: str, payload: Optional[Dict] = None
+) -> DownloadedItem:
+    meta = S3FileMeta(
+        bucket="bucket",
+        file=f"{object_id}.txt",
+        object_id=object_id,
+        payload=payload,
+    )
+    return DownloadedItem(id=object_id, data=data, meta=meta)
+
+
+def _stored(
+    item: DownloadedItem, data: str, payload: Optional[Dict] = None
+) -> Object:
+    meta = item.meta.model_copy(
+        update={
+            "payload": payload,
+            "content_fingerprint": content_fingerprint(_preprocessor(data)),
+        }
+    )
+    return Object(
+        object_id=item.meta.object_id,
+        payload=payload,
+        storage_meta=meta.model_dump(),
+        parts=[ObjectPart(part_id=f"{item.meta.object_id}_0", vector=[1.0])],
+    )
+
+
+def test_unchanged_items_are_not_split():
+    same = _item("same", "Hello World")
+    changed = _item("changed", "New text")
+    new = _item("new", "Brand new item")
+    existing_objects = {
+        "same": _stored(same, "hello world"),
+        "changed": _stored(changed, "Old text"),
+    }
+
+    parts, object_to_parts, failed, unchanged = split_items(
+        [same, changed, new], _splitter, _preprocessor, existing_objects
+    )
+
+    assert unchanged == [same]
+    assert failed == []
+    assert parts == ["new", "text", "brand", "new", "item"]
+    assert object_to_parts == {"changed": [0, 1], "new": [2, 3, 4]}
+    assert same.meta.content_fingerprint == content_fingerprint("hello world")
+
+
+def test_items_are_split_without_existing_objects():
+    item = _item("same", "Hello World")
+    existing = _stored(item, "Hello World")
+
+    parts, _, _, unchanged = split_items([item], _splitter, _preprocessor)
+
+    assert unchanged == []
+    assert parts == ["hello", "world"]
+    assert item.meta.content_fingerprint == (
+        existing.storage_meta["content_fingerprint"]
+    )
+
+
+def test_object_without_parts_is_split_again():
+    item = _item("same", "Hello World")
+    existing = _stored(item, "Hello World")
+    existing.parts = []
+
+    parts, _, _, unchanged = split_items(
+        [item], _splitter, _preprocessor, {"same": existing}
+    )
+
+    assert unchanged == []
+    assert parts == ["hello", "world"]
+
+
+def test_unchanged_objects_keep_vectors_and_get_new_payload():
+    same = _item("same", "Hello World")
+    moved = _item("moved", "Text", payload={"category": "new"})
+    existing_objects = {
+        "same": _stored(same, "Hello World"),
+        "moved": _stored(moved, "Text", payload={"category": "old"}),
+    }
+    _, _, _, unchanged = split_items(
+        [same, moved], _splitter, _preprocessor, existing_objects
+    )
+    collection = FakeCollection()
+
+    update_unchanged_objects(unchanged, existing_objects, collection)
+
+    assert [obj.object_id for obj in collection.upserted] == ["moved"]
+    upserted = collection.upserted[0]
+    assert upserted.payload == {"category": "new"}
+    assert upserted.parts == existing_objects["moved"].parts
+    assert upserted.storage_meta == moved.meta.model_dump()
+
+
+def test_nothing_is_written_for_identical_objects():
+    item = _item("same", "Hello World")
+    existing_objects = {"same": _stored(item, "Hello World")}
+    _, _, _, unchanged = split_items(
+        [item], _splitter, _preprocessor, existing_objects
+    )
+    collection = FakeCollection()
+
+    update_unchanged_objects(unchanged, existing_objects, collection)
+
+    assert unchanged == [item]
+    assert collection.upserted == []
@@ -31,6 +31,7 @@ def check_utc_timestamp(
     delta_sec: Optional[int] = None,
     delta_minus_sec: Optional[int] = None,
     delta_plus_sec: Optional[int] = None,
+    current_timestamp: Optional[int] = None,
 ) -> bool:
     """Check utc timestamp
 
@@ -38,9 +39,12 @@ def check_utc_timestamp(
     :param delta_sec: max delta between passed timestamp and current utc timestamp (seconds)
     :param delta_minus_sec:  max delta for timestamp in past
     :param delta_plus_sec: max delta for timestamp in future
+    :param current_timestamp: current utc timestamp, to check many timestamps against the same one
     :return: True if all checks passed
     """
-    cur_ts = utc_timestamp()
+    cur_ts = (
+        current_timestamp if current_timestamp is not None else utc_timestamp()
+    )
     ts_delta = timestamp - cur_ts
     delta_minus_sec = delta_minus_sec or delta_sec
     delta_plus_sec = delta_plus_sec or delta_sec
@@ -0,0 +1,170 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskLRUCache:
+    """
+    On-disk key-value cache with a size cap and LRU eviction.
+
+    Values are pickled into one file per key, named by the key digest. Files
+    are written into a temporary file and atomically renamed, so processes
+    sharing a directory never read a partially written value. Reading a value
+    touches its file, eviction removes the least recently touched files until
+    the cache takes at most 90% of `max_bytes`.
+
+    :param directory: Cache directory, created if missing
+    :param max_bytes: Max total size of cached files
+    :param max_age: Values older than this many seconds are missed, 0 - never
+    """
+
+    # Share of max_bytes left after eviction, so it doesn't run on each write
+    _EVICTION_TARGET = 0.9
+
+    def __init__(self, directory: str, max_bytes: int, max_age: float = 0):
+        self._directory = directory
+        self._max_bytes = int(max_bytes)
+        self._max_age = float(max_age)
+        self._lock = threading.Lock()
+        # Approximate size, shared directory may be written by other processes
+        self._size: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def max_age(self) -> float:
+        """Seconds after which values are missed, 0 - never."""
+        return self._max_age
+
+    @staticmethod
+    def digest(key: str) -> str:
+        """
+        Convert a key into a file-system safe digest.
+
+        :param key: Cache key
+        :return: Hex digest of the key
+        """
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        digest = self.digest(key)
+        return os.path.join(self._directory, digest[:2], f"{digest}.pkl")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        :param key: Cache key
+        :return: Cached value or None if it's missed or expired
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                created_at, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read cached value {path}: {e}")
+            return None
+
+        if self._max_age > 0 and time.time() - created_at > self._max_age:
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return value
+
+    def put(self, key: str, value: Any):
+        """
+        Cache a value, evicting the least recently used ones if needed.
+
+        :param key: Cache key
+        :param value: Picklable value
+        """
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(
+                        (time.time(), value),
+                        f,
+                        protocol=pickle.HIGHEST_PROTOCOL,
+                    )
+                size = os.path.getsize(tmp_path)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        except Exception as e:
+            # The cache is an optimization, callers shouldn't fail on it
+            logger.warning(f"Failed to cache value {path}: {e}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += size
+
+            if self._size > self._max_bytes:
+                self._evict()
+
+    def delete(self, key: str):
+        """
+        Remove a cached value, if any.
+
+        :param key: Cache key
+        """
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove cached value {key}: {e}")
+
+    def _list_files(self):
+        for entry in os.scandir(self._directory):
+            if not entry.is_dir():
+                continue
+            for file_entry in os.scandir(entry.path):
+                if file_entry.name.endswith(".pkl"):
+                    try:
+                        stat = file_entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield file_entry.path, stat.st_mtime, stat.st_size
+
+    def _scan_size(self) -> int:
+        return sum(size for _, _, size in self._list_files())
+
+    def _evict(self):
+        files = sorted(self._list_files(), key=lambda f: f[1])
+        size = sum(f[2] for f in files)
+        target = int(self._max_bytes * self._EVICTION_TARGET)
+        removed = 0
+        for path, _, file_size in files:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            size -= file_size
+
+        self._size = size
+        logger.info(f"Evicted {removed} values from {self._directory}")
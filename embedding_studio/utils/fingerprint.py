@@ -0,0 +1,62 @@
+import hashlib
+import json
+from typing import Any
+
+
+def _update(digest: Any, value: Any):
+    if value is None:
+        digest.update(b"N")
+
+    elif isinstance(value, bytes):
+        digest.update(b"B%d:" % len(value))
+        digest.update(value)
+
+    elif isinstance(value, str):
+        _update(digest, value.encode("utf-8"))
+
+    elif isinstance(value, (bool, int, float)):
+        digest.update(f"S{value!r};".encode())
+
+    elif isinstance(value, dict):
+        digest.update(b"D%d:" % len(value))
+        for key in sorted(value, key=str):
+            _update(digest, str(key))
+            _update(digest, value[key])
+
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"L%d:" % len(value))
+        for element in value:
+            _update(digest, element)
+
+    elif hasattr(value, "detach"):
+        # Torch tensor
+        _update(digest, value.detach().cpu().numpy())
+
+    elif hasattr(value, "dtype") and hasattr(value, "tobytes"):
+        # Numpy array
+        digest.update(f"A{value.dtype}{value.shape}:".encode())
+        _update(digest, value.tobytes())
+
+    elif hasattr(value, "mode") and hasattr(value, "tobytes"):
+        # PIL image
+        digest.update(f"I{value.mode}{value.size}:".encode())
+        _update(digest, value.tobytes())
+
+    else:
+        _update(digest, json.dumps(value, sort_keys=True, default=str))
+
+
+def content_fingerprint(value: Any) -> str:
+    """
+    Compute a digest of item content, e.g. a preprocessed text or image.
+
+    Equal content has equal fingerprints across processes and runs, so it's
+    used to find out whether a stored item has to be embedded again.
+
+    :param value: Content: str, bytes, numbers, numpy arrays, tensors,
+                  PIL images and dicts / lists of them
+    :return: Hex digest
+    """
+    digest = hashlib.sha256()
+    _update(digest, value)
+    return digest.hexdigest()
@@ -0,0 +1,357 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+from redis import Redis
+from redis.connection import ConnectionPool
+
+from embedding_studio.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Move expired leases back to pending ranges, then lease the first one
+_CLAIM_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, range in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], range)
+    redis.call('RPUSH', KEYS[1], range)
+end
+local range = redis.call('LPOP', KEYS[1])
+if range then
+    redis.call('ZADD', KEYS[2], ARGV[2], range)
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+return range
+"""
+
+# Count a range once, even if its lease expired and it was claimed again
+_COMPLETE_SCRIPT = """
+local removed = redis.call('ZREM', KEYS[1], ARGV[1])
+if removed == 1 then
+    redis.call('INCR', KEYS[2])
+    redis.call('INCRBY', KEYS[3], ARGV[2])
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+    redis.call('EXPIRE', KEYS[3], ARGV[3])
+end
+return removed
+"""
+
+# Return a failed range to pending ranges, unless it failed too many times.
+# A range, whose lease is lost, is already handled by another worker
+_RELEASE_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[2], ARGV[1]) then
+    return 1
+end
+local attempts = redis.call('HINCRBY', KEYS[3], ARGV[1], 1)
+redis.call('EXPIRE', KEYS[3], ARGV[3])
+if attempts >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('RPUSH', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+class RangesQueueProgress(BaseModel):
+    """
+    State of a ranges queue.
+
+    :param pending: Number of ranges, which aren't claimed yet
+    :param leased: Number of ranges, which are being processed
+    :param done: Number of completed ranges
+    :param done_items: Number of items in completed ranges
+    """
+
+    pending: int = 0
+    leased: int = 0
+    done: int = 0
+    done_items: int = 0
+
+    @property
+    def is_finished(self) -> bool:
+        return self.pending == 0 and self.leased == 0
+
+
+class LeasedRangesQueue:
+    """
+    A queue of (offset, limit) ranges of a task, stored in Redis.
+
+    Workers claim ranges atomically, a claimed range is leased for
+    `lease_time` seconds and the lease is prolonged by heartbeats while the
+    range is processed. Ranges of crashed workers are moved back to the queue
+    once their leases expire, so they're claimed by other workers. Ranges
+    failed with an exception are moved back right away, a limited number
+    of times.
+
+    :param redis_url: Redis URL
+    :param prefix: Prefix of queues keys
+    :param lease_time: Seconds a range is leased for without heartbeats
+    :param ttl: Seconds to keep queues of inactive tasks
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        prefix: str,
+        lease_time: float,
+        ttl: int = 24 * 60 * 60,
+    ):
+        self._redis_url = redis_url
+        self._prefix = prefix
+        self.lease_time = float(lease_time)
+        self._ttl = int(ttl)
+        self._redis_client: Optional[Redis] = None
+        self._scripts = dict()
+
+    @property
+    def redis_client(self) -> Redis:
+        if self._redis_client is None:
+            self._redis_client = Redis(
+                connection_pool=ConnectionPool.from_url(self._redis_url)
+            )
+        return self._redis_client
+
+    def _run_script(self, script: str, keys: List[str], args: List):
+        if script not in self._scripts:
+            self._scripts[script] = self.redis_client.register_script(script)
+        return self._scripts[script](keys=keys, args=args)
+
+    def _keys(self, task_id: str) -> Tuple[str, str, str, str, str]:
+        key = f"{self._prefix}:{task_id}"
+        return (
+            f"{key}:pending",
+            f"{key}:leases",
+            f"{key}:done",
+            f"{key}:done_items",
+            f"{key}:attempts",
+        )
+
+    @staticmethod
+    def _encode(offset: int, limit: int) -> str:
+        return f"{offset}:{limit}"
+
+    @staticmethod
+    def _decode(value: bytes) -> Tuple[int, int]:
+        if isinstance(value, bytes):
+            value = value.decode()
+        offset, limit = value.split(":")
+        return int(offset), int(limit)
+
+    def fill(self, task_id: str, ranges: List[Tuple[int, int]]):
+        """
+        Replace ranges of a task.
+
+        :param task_id: ID of the task
+        :param ranges: List of (offset, limit) ranges
+        """
+        keys = self._keys(str(task_id))
+        pipeline = self.redis_client.pipeline(transaction=True)
+        pipeline.delete(*keys)
+        if ranges:
+            pipeline.rpush(
+                keys[0], *[self._encode(*range_) for range_ in ranges]
+            )
+            pipeline.expire(keys[0], self._ttl)
+        pipeline.execute()
+
+    def claim(self, task_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Lease the next range of a task.
+
+        :param task_id: ID of the task
+        :return: (offset, limit) range or None if there are no free ranges
+        """
+        keys = self._keys(str(task_id))
+        now = time.time()
+        value = self._run_script(
+            _CLAIM_SCRIPT,
+            list(keys[:2]),
+            [now, now + self.lease_time, self._ttl],
+        )
+        return None if value is None else self._decode(value)
+
+    def heartbeat(self, task_id: str, offset: int, limit: int):
+        """
+        Prolong the lease of a range.
+
+        :param task_id: ID of the task
+        :param offset: Offset of the range
+        :param limit: Limit of the range
+        """
+        keys = self._keys(str(task_id))
+        self.redis_client.zadd(
+            keys[1],
+            {self._encode(offset, limit): time.time() + self.lease_time},
+            xx=True,
+        )
+
+    def complete(self, task_id: str, offset: int, limit: int, count: int):
+        """
+        Mark a range as done.
+
+        :param task_id: ID of the task
+        :param offset: Offset of the range
+        :param limit: Limit of the range
+        :param count: Number of items processed in the range
+        """
+        keys = self._keys(str(task_id))
+        self._run_script(
+            _COMPLETE_SCRIPT,
+            list(keys[1:4]),
+            [self._encode(offset, limit), count, self._ttl],
+        )
+
+    def release(
+        self, task_id: str, offset: int, limit: int, max_attempts: int
+    ) -> bool:
+        """
+        Return a failed range to the queue, so it's claimed again.
+
+        :param task_id: ID of the task
+        :param offset: Offset of the range
+        :param limit: Limit of the range
+        :param max_attempts: Max number of times a range is processed
+        :return: False if the range failed `max_attempts` times, it stays
+                 leased to be completed by the caller
+        """
+        keys = self._keys(str(task_id))
+        released = self._run_script(
+            _RELEASE_SCRIPT,
+            [keys[0], keys[1], keys[4]],
+            [self._encode(offset, limit), max_attempts, self._ttl],
+        )
+        return bool(released)
+
+    def progress(self, task_id: str) -> RangesQueueProgress:
+        """
+        Get the state of task ranges.
+
+        :param task_id: ID of the task
+        :return: Numbers of pending, leased and done ranges
+        """
+        keys = self._keys(str(task_id))
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.llen(keys[0])
+        pipeline.zcard(keys[1])
+        pipeline.get(keys[2])
+        pipeline.get(keys[3])
+        pending, leased, done, done_items = pipeline.execute()
+        return RangesQueueProgress(
+            pending=pending,
+            leased=leased,
+            done=int(done or 0),
+            done_items=int(done_items or 0),
+        )
+
+    def clear(self, task_id: str):
+        """
+        Remove ranges of a task.
+
+        :param task_id: ID of the task
+        """
+        self.redis_client.delete(*self._keys(str(task_id)))
+
+    def run(
+        self,
+        task_id: str,
+        process: Callable[[int, int], int],
+        on_failure: Callable[[int, int, Exception], None],
+        heartbeat_interval: float,
+        max_attempts: int = 1,
+    ) -> bool:
+        """
+        Claim and process ranges of a task until all of them are done.
+
+        A range is completed once `process` returns. If it raises, the range
+        is returned to the queue, and after `max_attempts` failures
+        `on_failure` is called and the range is completed without items.
+        Other exceptions (e.g. time limits) aren't caught, the range lease
+        expires and the range is claimed again.
+
+        :param task_id: ID of the task
+        :param process: Function processing an (offset, limit) range and
+                        returning the number of processed items
+        :param on_failure: Function recording a range, which failed
+                           `max_attempts` times, and the last exception
+        :param heartbeat_interval: Seconds between heartbeats of a range,
+                                   and between claims while other workers
+                                   are processing the last ranges
+        :param max_attempts: Max number of times a range is processed
+        :return: True if all ranges are done, False if a range failed
+        """
+        while True:
+            claimed_range = self.claim(task_id)
+            if claimed_range is None:
+                if self.progress(task_id).leased == 0:
+                    return True
+
+                # Ranges leased by crashed workers are claimed after expiry
+                time.sleep(heartbeat_interval)
+                continue
+
+            offset, limit = claimed_range
+            try:
+                with self.keep_leased(
+                    task_id, offset, limit, interval=heartbeat_interval
+                ):
+                    count = process(offset, limit)
+
+            except Exception as e:
+                if self.release(task_id, offset, limit, max_attempts):
+                    logger.exception(
+                        f"Range [{offset}:{offset + limit}] failed, it's "
+                        f"returned to the queue [task ID: {task_id}]"
+                    )
+                    continue
+
+                on_failure(offset, limit, e)
+                self.complete(task_id, offset, limit, 0)
+                return False
+
+            self.complete(task_id, offset, limit, count)
+
+    @contextmanager
+    def keep_leased(
+        self, task_id: str, offset: int, limit: int, interval: float
+    ) -> Iterator[None]:
+        """
+        Send heartbeats of a range in background while the block runs.
+
+        :param task_id: ID of the task
+        :param offset: Offset of the range
+        :param limit: Limit of the range
+        :param interval: Seconds between heartbeats
+        """
+        stopped = threading.Event()
+
+        def send_heartbeats():
+            while not stopped.wait(interval):
+                try:
+                    self.heartbeat(task_id, offset, limit)
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to prolong lease of range "
+                        f"[{offset}:{offset + limit}] [task ID: {task_id}]: "
+                        f"{e}"
+                    )
+
+        thread = threading.Thread(target=send_heartbeats, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+
+reindex_ranges = LeasedRangesQueue(
+    redis_url=settings.REDIS_URL,
+    prefix=settings.REINDEX_RANGES_PREFIX,
+    lease_time=settings.REINDEX_RANGE_LEASE_TIME,
+    ttl=settings.TASK_EVENTS_TTL,
+)
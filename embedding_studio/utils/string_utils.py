@@ -1,3 +1,4 @@
+import unicodedata
 from typing import List
 
 
@@ -112,3 +113,19 @@ def combine_chunks(chunks: List[str]) -> str:
 
     # Join the final tokens with a space
     return " ".join(result)
+
+
+def normalize_chunk(text: str) -> str:
+    """
+    Normalize a chunk for case- and accent-insensitive matching.
+
+    Example:
+      normalize_chunk("Café") returns "cafe"
+
+    :param text: The chunk to normalize
+    :return: Case folded chunk without combining characters (accents)
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).casefold()
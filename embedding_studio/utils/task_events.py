@@ -0,0 +1,124 @@
+import logging
+import time
+from typing import List, Optional
+
+from redis import Redis
+from redis.connection import ConnectionPool
+
+from embedding_studio.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TaskEvents:
+    """
+    Completion signals of subtasks for their parent tasks, stored in Redis.
+
+    Each parent task has a Redis list, a finished subtask pushes its ID
+    there. A parent blocks on the list instead of sleeping between status
+    checks, so it wakes up as soon as a subtask is finished. Events are kept
+    in the list until they're read, so none of them is lost while the parent
+    is busy.
+
+    Redis failures are logged and never raised: waiting degrades to sleeping
+    for the timeout, so parents fall back to polling statuses.
+
+    :param redis_url: Redis URL
+    :param prefix: Prefix of events lists keys
+    :param ttl: Seconds to keep events lists of inactive parents
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        prefix: str = "task_events",
+        ttl: int = 24 * 60 * 60,
+    ):
+        self._redis_url = redis_url
+        self._prefix = prefix
+        self._ttl = int(ttl)
+        self._redis_client: Optional[Redis] = None
+
+    @property
+    def redis_client(self) -> Redis:
+        if self._redis_client is None:
+            self._redis_client = Redis(
+                connection_pool=ConnectionPool.from_url(self._redis_url)
+            )
+        return self._redis_client
+
+    def _key(self, parent_id: str) -> str:
+        return f"{self._prefix}:{parent_id}"
+
+    def notify(self, parent_id: str, task_id: str):
+        """
+        Signal that a subtask is finished.
+
+        :param parent_id: ID of the parent task
+        :param task_id: ID of the finished subtask
+        """
+        key = self._key(str(parent_id))
+        try:
+            pipeline = self.redis_client.pipeline(transaction=True)
+            pipeline.rpush(key, str(task_id))
+            pipeline.expire(key, self._ttl)
+            pipeline.execute()
+
+        except Exception as e:
+            logger.warning(
+                f"Failed to notify task [{parent_id}] about "
+                f"subtask [{task_id}]: {e}"
+            )
+
+    def wait(self, parent_id: str, timeout: float) -> List[str]:
+        """
+        Wait for finished subtasks.
+
+        :param parent_id: ID of the parent task
+        :param timeout: Max seconds to wait
+        :return: IDs of finished subtasks, empty on timeout
+        """
+        key = self._key(str(parent_id))
+        try:
+            first = self.redis_client.blpop(
+                [key], timeout=max(int(timeout), 1)
+            )
+            if first is None:
+                return []
+
+            # Take the rest of events in one round-trip
+            pipeline = self.redis_client.pipeline(transaction=True)
+            pipeline.lrange(key, 0, -1)
+            pipeline.delete(key)
+            rest, _ = pipeline.execute()
+            return [
+                task_id.decode() if isinstance(task_id, bytes) else task_id
+                for task_id in [first[1]] + rest
+            ]
+
+        except Exception as e:
+            logger.warning(
+                f"Failed to wait for events of task [{parent_id}]: {e}"
+            )
+            time.sleep(timeout)
+            return []
+
+    def clear(self, parent_id: str):
+        """
+        Remove unread events of a parent task.
+
+        :param parent_id: ID of the parent task
+        """
+        try:
+            self.redis_client.delete(self._key(str(parent_id)))
+        except Exception as e:
+            logger.warning(
+                f"Failed to clear events of task [{parent_id}]: {e}"
+            )
+
+
+task_events = TaskEvents(
+    redis_url=settings.REDIS_URL,
+    prefix=settings.TASK_EVENTS_PREFIX,
+    ttl=settings.TASK_EVENTS_TTL,
+)
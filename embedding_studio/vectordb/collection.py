@@ -6,6 +6,10 @@ from embedding_studio.models.embeddings.collections import (
     CollectionInfo,
     CollectionStateInfo,
 )
+from embedding_studio.models.embeddings.counts import (
+    CountResult,
+    CountStrategy,
+)
 from embedding_studio.models.embeddings.objects import (
     Object,
     ObjectsCommonDataBatch,
@@ -484,6 +488,26 @@ class Collection(ABC):
         """
         raise NotImplementedError()
 
+    def estimate_count_by_payload_filter(
+        self,
+        payload_filter: Optional[PayloadFilter],
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> CountResult:
+        """
+        Count objects that match a payload filter using the given strategy.
+
+        Collections that can't estimate counts always return an exact one.
+
+        :param payload_filter: Filter to apply to object payloads
+        :param count_strategy: How the count should be computed
+        :return: Count of matching objects and whether it is approximate
+        """
+        return CountResult(
+            total_count=self.count_by_payload_filter(payload_filter),
+            is_approximate=False,
+            count_strategy=CountStrategy.EXACT,
+        )
+
 
 class QueryCollection(Collection):
     """
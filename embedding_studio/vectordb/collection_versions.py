@@ -0,0 +1,79 @@
+import logging
+from typing import Optional
+
+from redis import Redis
+from redis.connection import ConnectionPool
+
+from embedding_studio.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionVersions:
+    """
+    Content versions of collections, stored in Redis to be shared between
+    the API and workers writing into collections.
+
+    A version is incremented after each write, so in-process copies of
+    a collection content (e.g. in-memory indexes) know they're stale.
+
+    Redis failures are logged and never raised: writes aren't blocked, and
+    readers get None and rely on their own refresh interval.
+
+    :param redis_url: Redis URL
+    :param prefix: Prefix of Redis keys
+    """
+
+    def __init__(
+        self,
+        redis_url: str = settings.REDIS_URL,
+        prefix: str = settings.COLLECTION_VERSIONS_PREFIX,
+    ):
+        self._redis_url = redis_url
+        self._prefix = prefix
+        self._redis_client: Optional[Redis] = None
+
+    @property
+    def redis_client(self) -> Redis:
+        if self._redis_client is None:
+            self._redis_client = Redis(
+                connection_pool=ConnectionPool.from_url(self._redis_url)
+            )
+        return self._redis_client
+
+    def _key(self, collection_id: str) -> str:
+        return f"{self._prefix}:{collection_id}"
+
+    def bump(self, collection_id: str):
+        """
+        Mark a collection content as changed.
+
+        :param collection_id: ID of the collection
+        """
+        try:
+            self.redis_client.incr(self._key(collection_id))
+        except Exception as e:
+            logger.warning(
+                f"Failed to bump version of collection {collection_id}: {e}"
+            )
+
+    def get(self, collection_id: str) -> Optional[int]:
+        """
+        Get a content version of a collection.
+
+        :param collection_id: ID of the collection
+        :return: Version, 0 if the collection was never changed,
+                 None if Redis is unavailable
+        """
+        try:
+            version = self.redis_client.get(self._key(collection_id))
+        except Exception as e:
+            logger.warning(
+                f"Failed to get version of collection {collection_id}: {e}"
+            )
+            return None
+
+        return int(version) if version is not None else 0
+
+
+collection_versions = CollectionVersions()
@@ -0,0 +1,133 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from embedding_studio.core.config import settings
+from embedding_studio.models.embeddings.counts import (
+    CountResult,
+    CountStrategy,
+)
+from embedding_studio.models.payload.models import PayloadFilter
+
+logger = logging.getLogger(__name__)
+
+
+class CountCache:
+    """
+    In-process TTL cache of object counts per collection and payload filter.
+
+    Counts are keyed by the normalized payload filter and the count strategy.
+    Writing into a collection invalidates all its cached counts, writes made by
+    other processes become visible once the TTL expires.
+
+    :param ttl: Time to live of a cached count in seconds
+    :param max_size: Max number of cached counts, the oldest are evicted first
+    """
+
+    def __init__(
+        self,
+        ttl: float = settings.COUNT_CACHE_TTL,
+        max_size: int = settings.COUNT_CACHE_MAX_SIZE,
+    ):
+        self._ttl = float(ttl)
+        self._max_size = int(max_size)
+        self._lock = threading.Lock()
+        # key -> (expiration time, count)
+        self._counts: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def normalize_filter(payload_filter: Optional[PayloadFilter]) -> str:
+        """
+        Convert a payload filter into a stable string key.
+
+        :param payload_filter: Filter to normalize
+        :return: JSON string with sorted keys, empty string for no filter
+        """
+        if payload_filter is None:
+            return ""
+
+        return json.dumps(
+            payload_filter.model_dump(exclude_none=True),
+            sort_keys=True,
+            default=str,
+        )
+
+    def _key(
+        self,
+        collection_id: str,
+        payload_filter: Optional[PayloadFilter],
+        count_strategy: CountStrategy,
+    ) -> Tuple[str, str, str]:
+        return (
+            collection_id,
+            count_strategy.value,
+            self.normalize_filter(payload_filter),
+        )
+
+    def get(
+        self,
+        collection_id: str,
+        payload_filter: Optional[PayloadFilter],
+        count_strategy: CountStrategy,
+    ) -> Optional[CountResult]:
+        """
+        Get a cached count if it is not expired.
+
+        :param collection_id: ID of the collection
+        :param payload_filter: Filter the count was computed for
+        :param count_strategy: Strategy the count was computed with
+        :return: Cached count or None
+        """
+        if self._ttl <= 0:
+            return None
+
+        key = self._key(collection_id, payload_filter, count_strategy)
+        with self._lock:
+            cached = self._counts.get(key)
+            if cached is None:
+                return None
+
+            expires_at, count_result = cached
+            if expires_at < time.monotonic():
+                del self._counts[key]
+                return None
+
+            return count_result
+
+    def put(
+        self,
+        collection_id: str,
+        payload_filter: Optional[PayloadFilter],
+        count_strategy: CountStrategy,
+        count_result: CountResult,
+    ):
+        """
+        Cache a count.
+
+        :param collection_id: ID of the collection
+        :param payload_filter: Filter the count was computed for
+        :param count_strategy: Strategy the count was computed with
+        :param count_result: Count to cache
+        """
+        if self._ttl <= 0:
+            return
+
+        key = self._key(collection_id, payload_filter, count_strategy)
+        with self._lock:
+            self._counts[key] = (time.monotonic() + self._ttl, count_result)
+            self._counts.move_to_end(key)
+            while len(self._counts) > self._max_size:
+                self._counts.popitem(last=False)
+
+    def invalidate(self, collection_id: str):
+        """
+        Drop all cached counts of a collection.
+
+        :param collection_id: ID of the collection
+        """
+        with self._lock:
+            for key in [k for k in self._counts if k[0] == collection_id]:
+                del self._counts[key]
@@ -0,0 +1,330 @@
+import logging
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from embedding_studio.core.config import settings
+from embedding_studio.models.embeddings.models import (
+    MetricAggregationType,
+    MetricType,
+)
+from embedding_studio.models.embeddings.objects import (
+    Object,
+    ObjectPart,
+    ObjectWithDistance,
+)
+from embedding_studio.vectordb.collection import Collection
+from embedding_studio.vectordb.collection_versions import (
+    CollectionVersions,
+    collection_versions,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryIndex:
+    """
+    Exact in-memory vector index of a small collection.
+
+    Vectors of all object parts are kept as a single float32 matrix, so
+    a search is one matrix-vector product instead of a database round-trip.
+    Results reproduce the pgvector search of a collection without filters:
+    an object distance is the min distance of its parts, and only shared
+    (not personalized) objects are searched.
+
+    :param collection_id: ID of the indexed collection
+    :param objects: Objects of the collection with vectors of their parts
+    :param metric_type: Distance metric of the collection
+    :param aggregation_type: Aggregation of part distances, AVG searches
+                             only by average parts
+    """
+
+    def __init__(
+        self,
+        collection_id: str,
+        objects: List[Object],
+        metric_type: MetricType = MetricType.COSINE,
+        aggregation_type: MetricAggregationType = MetricAggregationType.MIN,
+    ):
+        self.collection_id = collection_id
+        self._metric_type = metric_type
+
+        self._objects: List[Object] = []
+        self._part_ids: List[Optional[str]] = []
+        self._part_is_average: List[bool] = []
+        offsets: List[int] = []
+        vectors: List[Any] = []
+        for obj in objects:
+            if obj.user_id is not None:
+                continue
+
+            parts = [
+                part
+                for part in obj.parts
+                if part.vector is not None
+                and (
+                    aggregation_type != MetricAggregationType.AVG
+                    or part.is_average
+                )
+            ]
+            if not parts:
+                continue
+
+            offsets.append(len(vectors))
+            self._objects.append(obj.model_copy(update={"parts": []}))
+            for part in parts:
+                vectors.append(part.vector)
+                self._part_ids.append(part.part_id)
+                self._part_is_average.append(bool(part.is_average))
+
+        # Parts of an object are contiguous rows starting at its offset
+        self._offsets = np.asarray(offsets, dtype=np.int64)
+        self._vectors = np.asarray(vectors, dtype=np.float32)
+        self._squared_norms = None
+        if self._metric_type == MetricType.COSINE and len(vectors) > 0:
+            norms = np.linalg.norm(self._vectors, axis=1, keepdims=True)
+            self._matrix = self._vectors / np.maximum(norms, 1e-12)
+        else:
+            self._matrix = self._vectors
+            if self._metric_type == MetricType.EUCLID and len(vectors) > 0:
+                self._squared_norms = np.einsum(
+                    "ij,ij->i", self._vectors, self._vectors
+                )
+
+    @property
+    def size(self) -> int:
+        """Number of indexed objects."""
+        return len(self._objects)
+
+    @classmethod
+    def load(
+        cls, collection: Collection, batch_size: int = 1000
+    ) -> "InMemoryIndex":
+        """
+        Read all objects of a collection into an index.
+
+        :param collection: Collection to index
+        :param batch_size: Number of objects read by a single query
+        :return: Index of the collection
+        """
+        info = collection.get_info()
+        objects = []
+        offset = 0
+        while offset is not None:
+            batch = collection.get_objects_common_data_batch(
+                batch_size, offset
+            )
+            object_ids = [obj.object_id for obj in batch.objects_info]
+            if object_ids:
+                objects.extend(collection.find_by_ids(object_ids))
+            offset = batch.next_offset
+
+        return cls(
+            collection_id=info.collection_id,
+            objects=objects,
+            metric_type=info.embedding_model.metric_type,
+            aggregation_type=info.embedding_model.metric_aggregation_type,
+        )
+
+    def _get_distances(self, query_vector: Any) -> np.ndarray:
+        query = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+        if self._metric_type == MetricType.COSINE:
+            query = query / max(float(np.linalg.norm(query)), 1e-12)
+            return 1.0 - self._matrix @ query
+
+        products = self._matrix @ query
+        if self._metric_type == MetricType.DOT:
+            return -products
+
+        squared = self._squared_norms - 2.0 * products + query @ query
+        return np.sqrt(np.maximum(squared, 0.0))
+
+    def find_similar_objects(
+        self,
+        query_vector: Any,
+        limit: int,
+        max_distance: Optional[float] = None,
+        with_vectors: bool = False,
+    ) -> List[ObjectWithDistance]:
+        """
+        Find the closest objects to a query vector.
+
+        :param query_vector: Query vector (list, numpy array or tensor)
+        :param limit: Max number of objects to return
+        :param max_distance: Parts further than this are ignored
+        :param with_vectors: Whether to return vectors of found parts
+        :return: Found objects, the closest first
+        """
+        if self.size == 0 or limit <= 0:
+            return []
+
+        distances = self._get_distances(query_vector)
+        if max_distance is not None:
+            distances = np.where(distances <= max_distance, distances, np.inf)
+
+        object_distances = np.minimum.reduceat(distances, self._offsets)
+        candidates = np.flatnonzero(np.isfinite(object_distances))
+        if len(candidates) > limit:
+            closest = np.argpartition(object_distances[candidates], limit - 1)
+            candidates = candidates[closest[:limit]]
+        candidates = candidates[
+            np.argsort(object_distances[candidates], kind="stable")
+        ]
+
+        return [
+            self._get_found_object(
+                index, distances, float(object_distances[index]), with_vectors
+            )
+            for index in candidates
+        ]
+
+    def _get_found_object(
+        self,
+        index: int,
+        distances: np.ndarray,
+        distance: float,
+        with_vectors: bool,
+    ) -> ObjectWithDistance:
+        start = self._offsets[index]
+        end = (
+            self._offsets[index + 1]
+            if index + 1 < len(self._offsets)
+            else len(distances)
+        )
+        rows = start + np.argsort(distances[start:end], kind="stable")
+        parts = [
+            ObjectPart(
+                part_id=self._part_ids[row],
+                vector=self._vectors[row].tolist() if with_vectors else None,
+                is_average=self._part_is_average[row],
+            )
+            for row in rows
+            if np.isfinite(distances[row])
+        ]
+        return ObjectWithDistance(
+            **self._objects[index].model_dump(exclude={"parts"}),
+            parts=parts,
+            distance=distance,
+        )
+
+
+class InMemoryIndexHolder:
+    """
+    Keeps an in-memory index of the current blue collection up to date.
+
+    The index is rebuilt when another collection becomes blue or the
+    collection version is bumped by a write (upsertion, deletion), the
+    version is checked at most once per `check_interval` seconds.
+
+    Indexes are built by a background thread, while the previous index of
+    the collection is still returned. Writes come in bursts, so a build
+    starts `rebuild_delay` seconds after a change and takes the latest
+    version, one build at a time.
+
+    If versions are unavailable, the collection is too large or its index
+    isn't built yet, no index is returned and the caller searches
+    the vector DB instead.
+
+    :param versions: Content versions of collections
+    :param max_objects: Max number of objects to keep in memory
+    :param check_interval: Seconds between checks of the collection version
+    :param rebuild_delay: Seconds to wait for more writes before a build
+    """
+
+    def __init__(
+        self,
+        versions: CollectionVersions = collection_versions,
+        max_objects: int = settings.QUERY_PARSING_IN_MEMORY_INDEX_MAX_OBJECTS,
+        check_interval: float = (
+            settings.QUERY_PARSING_IN_MEMORY_INDEX_CHECK_INTERVAL
+        ),
+        rebuild_delay: float = (
+            settings.QUERY_PARSING_IN_MEMORY_INDEX_REBUILD_DELAY
+        ),
+    ):
+        self._versions = versions
+        self._max_objects = int(max_objects)
+        self._check_interval = float(check_interval)
+        self._rebuild_delay = float(rebuild_delay)
+
+        self._lock = threading.Lock()
+        self._index: Optional[InMemoryIndex] = None
+        # (collection ID, version) of the index or of a too large collection
+        self._state: Optional[Tuple[str, int]] = None
+        self._checked_at = 0.0
+        self._builder: Optional[threading.Thread] = None
+
+    def get(self, collection: Collection) -> Optional[InMemoryIndex]:
+        """
+        Get an index of a collection, start a rebuild if it's outdated.
+
+        :param collection: Blue collection
+        :return: Index, it may lag behind the latest writes, or None if
+                 the collection can't be searched in memory yet
+        """
+        collection_id = collection.get_info().collection_id
+        with self._lock:
+            is_current = (
+                self._state is not None and self._state[0] == collection_id
+            )
+            index = self._index if is_current else None
+
+            now = time.monotonic()
+            if is_current and now - self._checked_at < self._check_interval:
+                return index
+
+            version = self._versions.get(collection_id)
+            if version is None:
+                self._index, self._state = None, None
+                return None
+
+            self._checked_at = now
+            if (collection_id, version) != self._state and (
+                self._builder is None or not self._builder.is_alive()
+            ):
+                self._builder = threading.Thread(
+                    target=self._build,
+                    args=(collection,),
+                    name="in-memory-index-builder",
+                    daemon=True,
+                )
+                self._builder.start()
+
+            return index
+
+    def _build(self, collection: Collection):
+        collection_id = collection.get_info().collection_id
+        try:
+            time.sleep(self._rebuild_delay)
+            version = self._versions.get(collection_id)
+            if version is None:
+                return
+
+            index = None
+            total = collection.get_objects_common_data_batch(1, 0).total
+            if total > self._max_objects:
+                logger.info(
+                    f"Collection {collection_id} has {total} objects, "
+                    f"it's too large to be searched in memory"
+                )
+            else:
+                started_at = time.perf_counter()
+                index = InMemoryIndex.load(collection)
+                logger.info(
+                    f"In-memory index of collection {collection_id} "
+                    f"(version {version}) with {index.size} objects is "
+                    f"built in {time.perf_counter() - started_at:.2f} sec"
+                )
+
+            with self._lock:
+                # Writes during the build bump the version, so the next
+                # check starts another build
+                self._index, self._state = index, (collection_id, version)
+
+        except Exception:
+            logger.exception(
+                f"Failed to build in-memory index of collection "
+                f"{collection_id}"
+            )
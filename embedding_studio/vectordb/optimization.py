@@ -11,10 +11,13 @@ class Optimization(ABC):
     indexing quality, or other operational aspects.
 
     :param name: The name of the optimization strategy
+    :param repeatable: If True, the optimization is applied each time optimizations
+                       are applied, otherwise only once per collection
     """
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, repeatable: bool = False):
         self.name = name
+        self.repeatable = repeatable
 
     @abstractmethod
     def __call__(self, collection: Collection):
@@ -4,9 +4,15 @@ from contextlib import contextmanager
 from typing import Any, List, Optional, Tuple
 
 import sqlalchemy
+from sqlalchemy import union_all
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
+from embedding_studio.core.config import settings
 from embedding_studio.models.embeddings.collections import CollectionStateInfo
+from embedding_studio.models.embeddings.counts import (
+    CountResult,
+    CountStrategy,
+)
 from embedding_studio.models.embeddings.objects import (
     Object,
     ObjectsCommonDataBatch,
@@ -21,11 +27,26 @@ from embedding_studio.vectordb.collection_info_cache import (
     CollectionInfo,
     CollectionInfoCache,
 )
+from embedding_studio.vectordb.collection_versions import CollectionVersions
+from embedding_studio.vectordb.count_cache import CountCache
 from embedding_studio.vectordb.exceptions import (
     CollectionNotFoundError,
     LockAcquisitionError,
 )
+from embedding_studio.vectordb.pgvector.count_estimation import (
+    scale_sampled_count,
+)
 from embedding_studio.vectordb.pgvector.db_model import make_db_model
+from embedding_studio.vectordb.pgvector.payload_usage import (
+    PayloadFieldUsage,
+    PayloadUsageRecorder,
+)
+from embedding_studio.vectordb.pgvector.search_strategy import (
+    SearchStrategy,
+    SearchStrategyCache,
+    choose_search_strategy,
+    parse_estimated_rows,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +85,10 @@ class PgvectorCollection(Collection):
         pg_database: sqlalchemy.Engine,
         collection_id: str,
         collection_info_cache: CollectionInfoCache,
+        count_cache: Optional[CountCache] = None,
+        usage_recorder: Optional[PayloadUsageRecorder] = None,
+        versions: Optional[CollectionVersions] = None,
+        strategy_cache: Optional[SearchStrategyCache] = None,
     ):
         """
         Initialize the pgvector collection.
@@ -71,6 +96,10 @@ class PgvectorCollection(Collection):
         :param pg_database: SQLAlchemy engine for PostgreSQL database connection
         :param collection_id: Unique identifier for the collection
         :param collection_info_cache: Cache for collection metadata
+        :param count_cache: Cache for filtered object counts, shared between collection instances
+        :param usage_recorder: Recorder of payload fields used by searches
+        :param versions: Content versions of collections, bumped on writes
+        :param strategy_cache: Cache of search strategies chosen for filters
         :raises CollectionNotFoundError: If the collection does not exist in the cache
         """
         collection_info = collection_info_cache.get_collection(collection_id)
@@ -78,7 +107,15 @@ class PgvectorCollection(Collection):
             raise CollectionNotFoundError(collection_id)
         self._collection_id = collection_id
         self._collection_info_cache = collection_info_cache
-        self.DbObject, self.DbObjectPart = make_db_model(collection_info)
+        self._count_cache = count_cache
+        self._usage_recorder = usage_recorder
+        self._versions = versions
+        self._strategy_cache = strategy_cache
+        (
+            self.DbObject,
+            self.DbObjectPart,
+            self.DbPersonalizedObjectPart,
+        ) = make_db_model(collection_info)
 
         self._pg_database = pg_database
         self.Session = sqlalchemy.orm.sessionmaker(pg_database)
@@ -178,6 +215,47 @@ class PgvectorCollection(Collection):
                 session.rollback()
                 raise
 
+    def _make_db_parts(
+        self, objects: List[Object], db_objects: List[Any]
+    ) -> Tuple[List[Any], List[Any]]:
+        """
+        Convert object parts to database parts, splitting shared and personalized ones.
+
+        :param objects: List of Object instances
+        :param db_objects: List of DbObject instances made from the objects
+        :return: Tuple of (shared DbObjectPart list, DbPersonalizedObjectPart list)
+        """
+        db_parts, db_personalized_parts = [], []
+        for i, obj in enumerate(objects):
+            if self.DbPersonalizedObjectPart.is_personalized(obj):
+                part_model, parts = (
+                    self.DbPersonalizedObjectPart,
+                    db_personalized_parts,
+                )
+            else:
+                part_model, parts = self.DbObjectPart, db_parts
+
+            # Parts of a list-partitioned collection are routed by payload
+            extra_fields = dict()
+            if part_model is self.DbObjectPart:
+                partition_key = part_model.get_partition_key(obj)
+                if partition_key is not None:
+                    extra_fields["partition_key"] = partition_key
+
+            for part in obj.parts:
+                parts.append(
+                    part_model(
+                        object_id=obj.object_id,
+                        part_id=part.part_id,
+                        vector=part.vector,
+                        object=db_objects[i],
+                        is_average=part.is_average,
+                        **extra_fields,
+                    )
+                )
+
+        return db_parts, db_personalized_parts
+
     def insert(self, objects: List[Object]) -> None:
         """
         Insert objects with their vector parts into the collection.
@@ -195,17 +273,9 @@ class PgvectorCollection(Collection):
             )
             for obj in objects
         ]
-        db_parts = [
-            self.DbObjectPart(
-                object_id=obj.object_id,
-                part_id=part.part_id,
-                vector=part.vector,
-                object=db_objects[i],
-                is_average=part.is_average,
-            )
-            for i, obj in enumerate(objects)
-            for part in obj.parts
-        ]
+        db_parts, db_personalized_parts = self._make_db_parts(
+            objects, db_objects
+        )
 
         with self.Session() as session, session.begin():
             try:
@@ -214,13 +284,26 @@ class PgvectorCollection(Collection):
                 session.execute(insert_st)
 
                 # Insert parts
-                insert_st = self.DbObjectPart.insert_parts_statement(db_parts)
-                session.execute(insert_st)
+                if db_parts:
+                    insert_st = self.DbObjectPart.insert_parts_statement(
+                        db_parts
+                    )
+                    session.execute(insert_st)
+
+                if db_personalized_parts:
+                    insert_st = (
+                        self.DbPersonalizedObjectPart.insert_parts_statement(
+                            db_personalized_parts
+                        )
+                    )
+                    session.execute(insert_st)
 
             except Exception as e:
                 logger.error(f"Failed to insert objects with parts: {e}")
                 raise
 
+        self._on_content_changed()
+
     def create_index(self) -> None:
         """
         Create a vector index for the collection.
@@ -252,17 +335,9 @@ class PgvectorCollection(Collection):
             )
             for obj in objects
         ]
-        db_parts = [
-            self.DbObjectPart(
-                object_id=obj.object_id,
-                part_id=part.part_id,
-                vector=part.vector,
-                object=db_objects[i],
-                is_average=part.is_average,
-            )
-            for i, obj in enumerate(objects)
-            for part in obj.parts
-        ]
+        db_parts, db_personalized_parts = self._make_db_parts(
+            objects, db_objects
+        )
 
         with self.Session() as session, session.begin():
             logger.info("Session obtained")
@@ -271,32 +346,47 @@ class PgvectorCollection(Collection):
                 upsert_st = self.DbObject.upsert_objects_statement(db_objects)
                 session.execute(upsert_st)
 
-                if shrink_parts:
-                    # Get object IDs
-                    object_ids = [obj.object_id for obj in objects]
+                for part_model, parts in (
+                    (self.DbObjectPart, db_parts),
+                    (self.DbPersonalizedObjectPart, db_personalized_parts),
+                ):
+                    if shrink_parts:
+                        # Get object IDs
+                        object_ids = [obj.object_id for obj in objects]
+
+                        # Delete old parts
+                        delete_parts_st = part_model.delete_statement(
+                            object_ids
+                        )
+                        session.execute(delete_parts_st)
 
-                    # Delete old parts
-                    delete_parts_st = self.DbObjectPart.delete_statement(
-                        object_ids
-                    )
-                    session.execute(delete_parts_st)
+                        if not parts:
+                            continue
 
-                    # Insert new parts
-                    insert_parts_st = self.DbObjectPart.insert_parts_statement(
-                        db_parts
-                    )
-                    session.execute(insert_parts_st)
-                else:
-                    # Upsert parts without deletion
-                    upsert_parts_st = self.DbObjectPart.upsert_parts_statement(
-                        db_parts
-                    )
-                    session.execute(upsert_parts_st)
+                        # Insert new parts
+                        insert_parts_st = part_model.insert_parts_statement(
+                            parts
+                        )
+                        session.execute(insert_parts_st)
+                    elif parts:
+                        moved_parts_st = (
+                            part_model.delete_moved_parts_statement(parts)
+                        )
+                        if moved_parts_st is not None:
+                            session.execute(moved_parts_st)
+
+                        # Upsert parts without deletion
+                        upsert_parts_st = part_model.upsert_parts_statement(
+                            parts
+                        )
+                        session.execute(upsert_parts_st)
 
             except Exception as e:
                 logger.exception(f"Failed to upsert objects with parts: {e}")
                 raise
 
+        self._on_content_changed()
+
     def delete(self, object_ids: List[str]) -> None:
         """
         Delete objects and their parts from the collection.
@@ -307,6 +397,9 @@ class PgvectorCollection(Collection):
             try:
                 # Delete from DbObjectPart first to avoid deadlocks
                 session.execute(self.DbObjectPart.delete_statement(object_ids))
+                session.execute(
+                    self.DbPersonalizedObjectPart.delete_statement(object_ids)
+                )
 
                 # Then delete from DbObject
                 session.execute(self.DbObject.delete_statement(object_ids))
@@ -318,6 +411,49 @@ class PgvectorCollection(Collection):
             else:
                 session.commit()
 
+        self._on_content_changed()
+
+    @contextmanager
+    def autocommit_connection(self):
+        """
+        Context manager providing a connection in autocommit mode, required by
+        statements that can't run inside a transaction (e.g. CREATE INDEX
+        CONCURRENTLY).
+        """
+        with self._pg_database.connect() as connection:
+            yield connection.execution_options(isolation_level="AUTOCOMMIT")
+
+    def _record_payload_usage(
+        self,
+        payload_filter: Optional[PayloadFilter] = None,
+        sort_by: Optional[SortByOptions] = None,
+    ):
+        """Record payload fields used by a search for the index advisor."""
+        if self._usage_recorder is not None:
+            self._usage_recorder.record(
+                self._collection_id, payload_filter, sort_by
+            )
+
+    def get_payload_field_usages(self) -> List[Tuple[PayloadFieldUsage, int]]:
+        """
+        Get payload fields used by searches of the collection.
+
+        :return: List of (usage, hits) pairs, most used first
+        """
+        if self._usage_recorder is None:
+            return []
+
+        return self._usage_recorder.get_usages(self._collection_id)
+
+    def _on_content_changed(self):
+        """Drop cached counts and bump the version after content changes."""
+        if self._count_cache is not None:
+            self._count_cache.invalidate(self._collection_id)
+        if self._strategy_cache is not None:
+            self._strategy_cache.invalidate(self._collection_id)
+        if self._versions is not None:
+            self._versions.bump(self._collection_id)
+
     def _reset_read_session(self):
         """
         Reconnect and reset the persistent read session.
@@ -357,7 +493,12 @@ class PgvectorCollection(Collection):
 
         def query(session):
             rows = session.execute(
-                self.DbObjectPart.find_by_id_statement(object_ids)
+                union_all(
+                    self.DbObjectPart.find_by_id_statement(object_ids),
+                    self.DbPersonalizedObjectPart.find_by_id_statement(
+                        object_ids
+                    ),
+                )
             )
             return self.DbObjectPart.objects_from_db(rows)
 
@@ -373,7 +514,14 @@ class PgvectorCollection(Collection):
 
         def query(session):
             rows = session.execute(
-                self.DbObjectPart.find_by_original_id_statement(object_ids)
+                union_all(
+                    self.DbObjectPart.find_by_original_id_statement(
+                        object_ids
+                    ),
+                    self.DbPersonalizedObjectPart.find_by_original_id_statement(
+                        object_ids
+                    ),
+                )
             )
             return self.DbObjectPart.objects_from_db(rows)
 
@@ -436,6 +584,62 @@ class PgvectorCollection(Collection):
 
         return self._with_read_session(query)
 
+    def _choose_search_strategy(
+        self,
+        session,
+        payload_filter: Optional[PayloadFilter] = None,
+        sort_by: Optional[SortByOptions] = None,
+        user_id: Optional[str] = None,
+        similarity_first: bool = False,
+        meta_info: Any = None,
+    ) -> SearchStrategy:
+        """
+        Choose how a similarity search should be executed.
+
+        Only filtered similarity-ordered searches have a choice: the filtered set
+        size is estimated by the planner and small sets are scanned exactly.
+        The strategy can be forced via `meta_info["search_strategy"]`. Chosen
+        strategies are cached per filter, so repeated filters skip EXPLAIN.
+
+        :param session: SQLAlchemy session
+        :param payload_filter: Filter to apply on object payloads
+        :param sort_by: Sorting options
+        :param user_id: Filter objects by user ID
+        :param similarity_first: If True, sort by similarity first, then by sort_by field
+        :param meta_info: Additional metadata for the query
+        :return: Chosen search strategy
+        """
+        if isinstance(meta_info, dict) and meta_info.get("search_strategy"):
+            return SearchStrategy(meta_info["search_strategy"])
+
+        similarity_ordered = sort_by is None or similarity_first
+        if payload_filter is None or not similarity_ordered:
+            return SearchStrategy.HNSW
+
+        if self._strategy_cache is not None:
+            search_strategy = self._strategy_cache.get(
+                self._collection_id, payload_filter, user_id
+            )
+            if search_strategy is not None:
+                return search_strategy
+
+        estimate_st = self.DbObjectPart.payload_estimate_statement(
+            payload_filter=payload_filter, user_id=user_id
+        )
+        estimated_count = parse_estimated_rows(
+            session.execute(estimate_st).scalar()
+        )
+        search_strategy = choose_search_strategy(estimated_count)
+        logger.debug(
+            f"Estimated filtered objects count: {estimated_count}, "
+            f"search strategy: {search_strategy.value}"
+        )
+        if self._strategy_cache is not None:
+            self._strategy_cache.put(
+                self._collection_id, payload_filter, user_id, search_strategy
+            )
+        return search_strategy
+
     def find_similarities(
         self,
         query_vector: List[float],
@@ -463,7 +667,17 @@ class PgvectorCollection(Collection):
         :return: SearchResults object containing similar objects and pagination info
         """
 
+        self._record_payload_usage(payload_filter, sort_by)
+
         def query(session):
+            search_strategy = self._choose_search_strategy(
+                session,
+                payload_filter=payload_filter,
+                sort_by=sort_by,
+                user_id=user_id,
+                similarity_first=similarity_first,
+                meta_info=meta_info,
+            )
             search_st = self.DbObjectPart.similarity_search_statement(
                 query_vector=query_vector,
                 limit=limit,
@@ -474,6 +688,7 @@ class PgvectorCollection(Collection):
                 user_id=user_id,
                 similarity_first=similarity_first,
                 meta_info=meta_info,
+                search_strategy=search_strategy,
             )
             result = session.execute(search_st)
             rows = [DotDict(dict(row._mapping)) for row in result]
@@ -522,7 +737,17 @@ class PgvectorCollection(Collection):
         :return: Tuple of (List of ObjectWithDistance instances, meta_info dictionary)
         """
 
+        self._record_payload_usage(payload_filter, sort_by)
+
         def query(session):
+            search_strategy = self._choose_search_strategy(
+                session,
+                payload_filter=payload_filter,
+                sort_by=sort_by,
+                user_id=user_id,
+                similarity_first=similarity_first,
+                meta_info=meta_info,
+            )
             search_st = self.DbObjectPart.similarity_search_statement(
                 query_vector=query_vector,
                 limit=limit,
@@ -534,6 +759,7 @@ class PgvectorCollection(Collection):
                 with_vectors=with_vectors,
                 similarity_first=similarity_first,
                 meta_info=meta_info,
+                search_strategy=search_strategy,
             )
             result = session.execute(search_st)
             rows = [DotDict(dict(row._mapping)) for row in result]
@@ -565,6 +791,8 @@ class PgvectorCollection(Collection):
         :return: SearchResults object containing found objects and pagination info
         """
 
+        self._record_payload_usage(payload_filter, sort_by)
+
         def query(session):
             search_st = self.DbObjectPart.payload_search_statement(
                 payload_filter=payload_filter,
@@ -603,6 +831,110 @@ class PgvectorCollection(Collection):
 
         return self._with_read_session(query)
 
+    def _count_by_payload_filter(
+        self,
+        payload_filter: Optional[PayloadFilter],
+        count_strategy: CountStrategy,
+    ) -> CountResult:
+        """
+        Count objects matching a payload filter, approximately if the strategy
+        allows it and the filtered set is estimated to be large.
+
+        :param payload_filter: Filter to apply on object payloads
+        :param count_strategy: How to count matching objects
+        :return: Count of matching objects, exact if it's cheap enough
+        """
+
+        def query(session):
+            if count_strategy == CountStrategy.EXACT:
+                return None
+
+            estimate_st = self.DbObjectPart.payload_count_estimate_statement(
+                payload_filter
+            )
+            estimated_count = parse_estimated_rows(
+                session.execute(estimate_st).scalar()
+            )
+            if (
+                estimated_count is None
+                or estimated_count <= settings.PGVECTOR_EXACT_COUNT_MAX_ROWS
+            ):
+                # Small sets are counted exactly, it's cheap enough
+                return None
+
+            if count_strategy == CountStrategy.ESTIMATE:
+                return CountResult(
+                    total_count=estimated_count,
+                    is_approximate=True,
+                    count_strategy=count_strategy,
+                )
+
+            sample_percent = settings.PGVECTOR_COUNT_SAMPLE_PERCENT
+            sample_st = self.DbObjectPart.payload_sample_count_statement(
+                payload_filter, sample_percent
+            )
+            sampled_count = int(session.execute(sample_st).scalar() or 0)
+            total_count, error_bound = scale_sampled_count(
+                sampled_count, sample_percent
+            )
+            return CountResult(
+                total_count=total_count,
+                is_approximate=True,
+                error_bound=error_bound,
+                count_strategy=count_strategy,
+            )
+
+        count_result = self._with_read_session(query)
+        if count_result is None:
+            count_result = CountResult(
+                total_count=self.count_by_payload_filter(payload_filter),
+                is_approximate=False,
+                count_strategy=CountStrategy.EXACT,
+            )
+
+        return count_result
+
+    def estimate_count_by_payload_filter(
+        self,
+        payload_filter: Optional[PayloadFilter],
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> CountResult:
+        """
+        Count objects matching a payload filter using the given strategy.
+
+        ESTIMATE takes the planner's row estimate, SAMPLED counts rows over
+        a `TABLESAMPLE` and scales the result. Approximate strategies fall back
+        to an exact count when the filtered set is estimated to be small.
+        Counts are cached per normalized filter until the TTL expires or
+        the collection is modified.
+
+        :param payload_filter: Filter to apply on object payloads
+        :param count_strategy: How the count should be computed
+        :return: Count of matching objects and whether it is approximate
+        """
+        self._record_payload_usage(payload_filter)
+
+        if self._count_cache is not None:
+            count_result = self._count_cache.get(
+                self._collection_id, payload_filter, count_strategy
+            )
+            if count_result is not None:
+                return count_result
+
+        count_result = self._count_by_payload_filter(
+            payload_filter, count_strategy
+        )
+
+        if self._count_cache is not None:
+            self._count_cache.put(
+                self._collection_id,
+                payload_filter,
+                count_strategy,
+                count_result,
+            )
+
+        return count_result
+
 
 class PgvectorQueryCollection(PgvectorCollection, QueryCollection):
     """
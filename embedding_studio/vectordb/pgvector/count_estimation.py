@@ -0,0 +1,31 @@
+import math
+from typing import Tuple
+
+# z-score of a two-sided ~95% confidence interval
+_CONFIDENCE_Z = 1.96
+
+
+def scale_sampled_count(
+    sampled_count: int, sample_percent: float
+) -> Tuple[int, int]:
+    """
+    Scale a count computed over a table sample to the whole table.
+
+    The error bound treats every row as sampled independently (binomial
+    model). `TABLESAMPLE SYSTEM` samples whole pages, so rows clustered by
+    the filtered value may give a larger error than reported.
+
+    :param sampled_count: Number of matching rows in the sample
+    :param sample_percent: Percent of the table that was sampled
+    :return: Tuple of (estimated count, half-width of ~95% confidence interval)
+    """
+    fraction = min(max(float(sample_percent) / 100.0, 1e-6), 1.0)
+    estimated_count = int(round(sampled_count / fraction))
+    error_bound = int(
+        math.ceil(
+            _CONFIDENCE_Z
+            * math.sqrt(sampled_count * (1.0 - fraction))
+            / fraction
+        )
+    )
+    return estimated_count, error_bound
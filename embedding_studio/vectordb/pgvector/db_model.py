@@ -1,6 +1,6 @@
 import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 import numpy as np
 import sqlalchemy
@@ -15,16 +15,19 @@ from sqlalchemy import (
     insert,
     select,
     text,
+    tuple_,
 )
 from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 from sqlalchemy.ext.declarative import declarative_base, declared_attr
 from sqlalchemy.orm import mapped_column, relationship
 from sqlalchemy.sql import func
 
+from embedding_studio.core.config import settings
 from embedding_studio.models.embeddings.collections import CollectionInfo
 from embedding_studio.models.embeddings.models import (
     MetricAggregationType,
     MetricType,
+    PartitioningInfo,
 )
 from embedding_studio.models.embeddings.objects import (
     FoundObject,
@@ -36,10 +39,19 @@ from embedding_studio.models.embeddings.objects import (
 )
 from embedding_studio.models.payload.models import PayloadFilter
 from embedding_studio.models.sort_by.models import SortByOptions
+from embedding_studio.vectordb.pgvector.partitioning import (
+    create_partitions_statements,
+    extract_partition_keys,
+    is_hash_partitioned,
+    is_list_partitioned,
+    partition_key_from_payload,
+    partition_keys_sql,
+)
 from embedding_studio.vectordb.pgvector.query_to_sql import (
     translate_query_to_orm_filters,
     translate_query_to_sql_filters,
 )
+from embedding_studio.vectordb.pgvector.search_strategy import SearchStrategy
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +63,31 @@ class DimensionsMismatch(Exception):
 Base = declarative_base()
 
 
+def _create_table_with_partitions(
+    table_class,
+    pg_database: Union[sqlalchemy.Engine, sqlalchemy.Connection],
+):
+    """
+    Create a table and, if it is partitioned, its partitions.
+
+    :param table_class: Declarative class of the table
+    :param pg_database: SQLAlchemy engine, or a connection to create the
+        table within its transaction
+    """
+    table_class.__table__.create(pg_database, checkfirst=True)
+    if not table_class.partition_statements:
+        return
+
+    if isinstance(pg_database, sqlalchemy.Connection):
+        for statement in table_class.partition_statements:
+            pg_database.execute(text(statement))
+        return
+
+    with pg_database.begin() as connection:
+        for statement in table_class.partition_statements:
+            connection.execute(text(statement))
+
+
 def convert_vectors(vectors_data: str) -> np.array:
     """
     Convert string representation of vectors to numpy array.
@@ -196,14 +233,19 @@ class DbObjectImpl:
     including SQL statement generation and data conversion utilities.
     """
 
+    # Statements creating partitions, empty if the table isn't partitioned
+    partition_statements: List[str] = []
+
     @classmethod
-    def create_table(cls, pg_database: sqlalchemy.Engine):
+    def create_table(
+        cls, pg_database: Union[sqlalchemy.Engine, sqlalchemy.Connection]
+    ):
         """
         Create the database table for objects.
 
-        :param pg_database: SQLAlchemy engine
+        :param pg_database: SQLAlchemy engine or connection
         """
-        cls.__table__.create(pg_database, checkfirst=True)
+        _create_table_with_partitions(cls, pg_database)
 
     @classmethod
     def insert_objects_statement(cls, db_objects: List["DbObject"]):
@@ -346,6 +388,9 @@ class DbObjectPartImpl:
 
     search_index = None
     db_object_class = None
+    partitioning: Optional[PartitioningInfo] = None
+    # Statements creating partitions, empty if the table isn't partitioned
+    partition_statements: List[str] = []
 
     @classmethod
     def initialize(cls, search_index, db_object_class):
@@ -359,13 +404,28 @@ class DbObjectPartImpl:
         cls.db_object_class = db_object_class
 
     @classmethod
-    def create_table(cls, pg_database: sqlalchemy.Engine):
+    def create_table(
+        cls, pg_database: Union[sqlalchemy.Engine, sqlalchemy.Connection]
+    ):
         """
         Create the database table for object parts.
 
-        :param pg_database: SQLAlchemy engine
+        :param pg_database: SQLAlchemy engine or connection
+        """
+        _create_table_with_partitions(cls, pg_database)
+
+    @classmethod
+    def get_partition_key(cls, obj: Object) -> Optional[str]:
+        """
+        Get the LIST partition key of an object's parts.
+
+        :param obj: Object the parts belong to
+        :return: Partition key or None if parts aren't partitioned by list
         """
-        cls.__table__.create(pg_database, checkfirst=True)
+        if not is_list_partitioned(cls.partitioning):
+            return None
+
+        return partition_key_from_payload(obj.payload, cls.partitioning)
 
     @classmethod
     def validate_dimensions(cls, vector: List[float]):
@@ -464,6 +524,7 @@ class DbObjectPartImpl:
                 cls.db_object_class.object_id,
                 cls.part_id,
                 cls.vector,
+                cls.is_average,
                 cls.db_object_class.payload,
                 cls.db_object_class.storage_meta,
                 cls.db_object_class.original_id,
@@ -487,6 +548,7 @@ class DbObjectPartImpl:
         with_vectors: bool = False,
         similarity_first: bool = False,
         meta_info: Any = None,
+        search_strategy: SearchStrategy = SearchStrategy.HNSW,
     ):
         """
         Generate a SQL statement for similarity search.
@@ -504,6 +566,7 @@ class DbObjectPartImpl:
         :param with_vectors: Include vectors in results
         :param similarity_first: Sort by similarity first
         :param meta_info: Additional metadata
+        :param search_strategy: Strategy of filtered similarity-ordered search
         :return: SQLAlchemy text statement
         """
         collection_id = cls.__name__.replace("DbObjectPart_", "")
@@ -538,6 +601,13 @@ class DbObjectPartImpl:
             else "null"
         )
 
+        # Partitions relevant for the filter, others are pruned
+        partition_keys_text = partition_keys_sql(
+            extract_partition_keys(payload_filter, cls.partitioning)
+            if is_list_partitioned(cls.partitioning)
+            else None
+        )
+
         # Determine if we're using sort fields
         if sort_by and not similarity_first:
             sort_field_text = f"'{sort_by.field}'"
@@ -600,7 +670,12 @@ class DbObjectPartImpl:
         {max_distance_text},
         {enlarged_limit},
         {enlarged_offset},
-        {average_only}
+        {average_only},
+        '{search_strategy.value}',
+        {cls.search_index.hnsw.ef_search},
+        '{settings.PGVECTOR_HNSW_ITERATIVE_SCAN}',
+        {settings.PGVECTOR_HNSW_MAX_SCAN_TUPLES},
+        {partition_keys_text}
     );"""
             else:
                 # Simple similarity ordered functions don't have subset_count and user_id/filter parameters
@@ -650,7 +725,8 @@ class DbObjectPartImpl:
         {is_payload_text},
         {enlarged_limit},
         {enlarged_offset},
-        {average_only}
+        {average_only},
+        {partition_keys_text}
     );"""
             else:
                 # Simple non-similarity ordered functions
@@ -680,6 +756,83 @@ class DbObjectPartImpl:
 
         return text(sql)
 
+    @classmethod
+    def payload_estimate_statement(
+        cls,
+        payload_filter: Optional[PayloadFilter],
+        user_id: Optional[str] = None,
+    ):
+        """
+        Generate a SQL statement that returns the planner's estimate of objects
+        matching a payload filter, without executing the filter.
+
+        :param payload_filter: Filter for payload
+        :param user_id: Filter by user ID
+        :return: SQLAlchemy text statement returning EXPLAIN output in JSON
+        """
+        payload_filter_sql = (
+            translate_query_to_sql_filters(payload_filter)
+            if payload_filter
+            else "TRUE"
+        )
+        user_id_sql = (
+            f"(user_id IS NULL OR user_id = '{user_id}')"
+            if user_id
+            else "user_id IS NULL"
+        )
+        return text(
+            f"EXPLAIN (FORMAT JSON) "
+            f"SELECT 1 FROM {cls.db_object_class.__tablename__} "
+            f"WHERE {user_id_sql} AND ({payload_filter_sql})"
+        )
+
+    @classmethod
+    def _payload_count_where_sql(
+        cls, payload_filter: Optional[PayloadFilter]
+    ) -> str:
+        payload_filter_sql = (
+            translate_query_to_sql_filters(payload_filter)
+            if payload_filter
+            else "TRUE"
+        )
+        return f"original_id IS NULL AND ({payload_filter_sql})"
+
+    @classmethod
+    def payload_count_estimate_statement(
+        cls, payload_filter: Optional[PayloadFilter]
+    ):
+        """
+        Generate a SQL statement that returns the planner's estimate of
+        the count computed by `payload_count_statement`.
+
+        :param payload_filter: Filter for payload
+        :return: SQLAlchemy text statement returning EXPLAIN output in JSON
+        """
+        return text(
+            f"EXPLAIN (FORMAT JSON) "
+            f"SELECT 1 FROM {cls.db_object_class.__tablename__} "
+            f"WHERE {cls._payload_count_where_sql(payload_filter)}"
+        )
+
+    @classmethod
+    def payload_sample_count_statement(
+        cls, payload_filter: Optional[PayloadFilter], sample_percent: float
+    ):
+        """
+        Generate a SQL statement counting objects matching a payload filter
+        over a random sample of table pages.
+
+        :param payload_filter: Filter for payload
+        :param sample_percent: Percent of table pages to read
+        :return: SQLAlchemy text statement returning the sampled count
+        """
+        return text(
+            f"SELECT count(*) "
+            f"FROM {cls.db_object_class.__tablename__} "
+            f"TABLESAMPLE SYSTEM ({float(sample_percent)}) "
+            f"WHERE {cls._payload_count_where_sql(payload_filter)}"
+        )
+
     @classmethod
     def payload_count_statement(cls, payload_filter: PayloadFilter):
         """
@@ -832,8 +985,34 @@ class DbObjectPartImpl:
         update_dict = {
             "vector": insert_st.excluded.vector,
         }
+        # Primary key of partitioned parts includes the partition key
         return insert_st.on_conflict_do_update(
-            index_elements=[cls.part_id], set_=update_dict
+            index_elements=list(cls.__table__.primary_key.columns),
+            set_=update_dict,
+        )
+
+    @classmethod
+    def delete_moved_parts_statement(cls, db_parts: List["DbObjectPart"]):
+        """
+        Generate a SQL statement deleting stored parts whose objects moved
+        to another LIST partition. The partition key is a part of the
+        primary key, so an upsert would keep such parts in the old partition.
+
+        :param db_parts: List of DbObjectPart instances to be upserted
+        :return: SQLAlchemy delete statement or None if parts aren't
+            partitioned by list
+        """
+        if not is_list_partitioned(cls.partitioning) or not db_parts:
+            return None
+
+        return delete(cls).where(
+            cls.part_id.in_([db_part.part_id for db_part in db_parts]),
+            tuple_(cls.part_id, cls.partition_key).not_in(
+                [
+                    (db_part.part_id, db_part.partition_key)
+                    for db_part in db_parts
+                ]
+            ),
         )
 
     @classmethod
@@ -858,7 +1037,7 @@ class DbObjectPartImpl:
         :return: Dictionary representation of the part
         """
         if with_metadata:
-            return {
+            db_dict = {
                 "part_id": db_part.part_id,
                 "object_id": db_part.object_id,
                 "vector": db_part.vector,
@@ -868,13 +1047,18 @@ class DbObjectPartImpl:
                 "user_id": db_part.object.user_id,
             }
         else:
-            return {
+            db_dict = {
                 "part_id": db_part.part_id,
                 "object_id": db_part.object_id,
                 "vector": db_part.vector,
                 "user_id": db_part.object.user_id,
             }
 
+        if is_list_partitioned(cls.partitioning):
+            db_dict["partition_key"] = db_part.partition_key
+
+        return db_dict
+
     @classmethod
     def db_parts_to_dicts(
         cls, db_parts: List["DbObjectPart"], with_metadata: bool = True
@@ -1091,6 +1275,82 @@ class DbObjectPartImpl:
         )
 
 
+class DbPersonalizedObjectPartImpl(DbObjectPartImpl):
+    """
+    Implementation mixin for personalized object part tables.
+
+    Personalized parts are user-specific copies of original objects' vectors
+    (e.g. created by the improvement worker). They are stored apart from the
+    shared parts, so they never take part in global search and the shared
+    HNSW index is not polluted by them.
+    """
+
+    @classmethod
+    def is_personalized(cls, obj: Object) -> bool:
+        """
+        Check whether an object is a personalized copy of an original object.
+
+        :param obj: Object instance
+        :return: True if parts of the object belong to the personalized table
+        """
+        return obj.user_id is not None and obj.original_id is not None
+
+    @classmethod
+    def db_part_to_dict(
+        cls, db_part: "DbPersonalizedObjectPart", with_metadata: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Convert a DbPersonalizedObjectPart instance to a dictionary.
+
+        :param db_part: DbPersonalizedObjectPart instance
+        :param with_metadata: Include metadata in the dictionary
+        :return: Dictionary representation of the part
+        """
+        db_dict = {
+            "part_id": db_part.part_id,
+            "object_id": db_part.object_id,
+            "vector": db_part.vector,
+            "is_average": db_part.is_average,
+            "user_id": db_part.object.user_id,
+            "original_id": db_part.object.original_id,
+        }
+        if with_metadata:
+            db_dict["payload"] = db_part.object.payload
+            db_dict["storage_meta"] = db_part.object.storage_meta
+
+        return db_dict
+
+    @classmethod
+    def move_from_shared_parts_statement(cls, db_object_part_class):
+        """
+        Generate a SQL statement moving personalized parts stored among
+        shared parts (by previous versions) to the personalized table.
+
+        :param db_object_part_class: DbObjectPart class of the same collection
+        :return: SQLAlchemy text statement
+        """
+        dbo_table = cls.db_object_class.__tablename__
+        dbop_table = db_object_part_class.__tablename__
+        return text(
+            f"""
+WITH moved AS (
+    DELETE FROM {dbop_table} op
+    USING {dbo_table} o
+    WHERE o.object_id = op.object_id
+      AND o.user_id IS NOT NULL
+      AND o.original_id IS NOT NULL
+    RETURNING op.part_id, op.object_id, op.vector, op.is_average,
+              o.user_id, o.original_id
+)
+INSERT INTO {cls.__tablename__}
+    (part_id, object_id, vector, is_average, user_id, original_id)
+SELECT part_id, object_id, vector, is_average, user_id, original_id
+FROM moved
+ON CONFLICT (part_id) DO NOTHING;
+"""
+        )
+
+
 def get_dbo_table_name(collection_info: CollectionInfo) -> Dict[str, str]:
     """
     Generate database table and index names for a collection.
@@ -1107,26 +1367,43 @@ def get_dbo_table_name(collection_info: CollectionInfo) -> Dict[str, str]:
         "dbo_session_id_index": f"ix_{collection_info.collection_id}_sid",
         "dbo_original_id_index": f"ix_{collection_info.collection_id}_oid",
         "dbo_user_id_index": f"ix_{collection_info.collection_id}_uid",
+        "dbpp_collection": f"dbpp_{collection_info.collection_id}",
+        "dbpp_relation": f"DbPersonalizedObjectPart_{collection_info.collection_id}",
+        "dbpp_user_id_index": f"ix_{collection_info.collection_id}_pp_uid",
     }
 
 
 def make_db_model(
     collection_info: CollectionInfo,
-) -> Tuple[Type[DbObjectBase], Type[DbObjectPartBase]]:
+) -> Tuple[Type[DbObjectBase], Type[DbObjectPartBase], Type[DbObjectPartBase]]:
     """
     Create database model classes for a collection.
 
-    Dynamically creates DbObject and DbObjectPart classes tailored to the
-    specific collection, with appropriate table names and relationships.
+    Dynamically creates DbObject, DbObjectPart and DbPersonalizedObjectPart
+    classes tailored to the specific collection, with appropriate table names
+    and relationships.
 
     :param collection_info: CollectionInfo object
-    :return: Tuple of (DbObject class, DbObjectPart class)
+    :return: Tuple of (DbObject class, DbObjectPart class, DbPersonalizedObjectPart class)
     """
     search_index = collection_info.embedding_model
     collection_id = collection_info.collection_id
+    partitioning = search_index.partitioning
+    hash_partitioned = is_hash_partitioned(partitioning)
+    list_partitioned = is_list_partitioned(partitioning)
 
     _names = get_dbo_table_name(collection_info)
 
+    # Objects are partitioned only by object ID hash: partitioning by a list
+    # key would require it in the primary key referenced by parts.
+    dbo_table_kwargs = {"extend_existing": True}
+    dbop_table_kwargs = {"extend_existing": True}
+    if hash_partitioned:
+        dbo_table_kwargs["postgresql_partition_by"] = "HASH (object_id)"
+        dbop_table_kwargs["postgresql_partition_by"] = "HASH (object_id)"
+    elif list_partitioned:
+        dbop_table_kwargs["postgresql_partition_by"] = "LIST (partition_key)"
+
     class DbObject(DbObjectBase, DbObjectImpl):
         __tablename__ = _names["dbo_collection"]
 
@@ -1148,19 +1425,25 @@ def make_db_model(
                 _names["dbo_user_id_index"],
                 "user_id",
             ),
-            {"extend_existing": True},
+            dbo_table_kwargs,
         )
 
     class DbObjectPart(DbObjectPartBase, DbObjectPartImpl):
         __tablename__ = _names["dbop_collection"]
+        # Primary key of a partitioned table must include the partition key
         object_id = mapped_column(
             String(128),
             ForeignKey(f"{_names['dbo_collection']}.object_id"),
             index=True,
+            primary_key=hash_partitioned,
         )
         vector = mapped_column(Vector(search_index.dimensions))
+        if list_partitioned:
+            partition_key = mapped_column(
+                String(128), primary_key=True, default=""
+            )
 
-        __table_args__ = {"extend_existing": True}
+        __table_args__ = dbop_table_kwargs
 
         @classmethod
         def hnsw_index(cls):
@@ -1186,14 +1469,56 @@ def make_db_model(
                 postgresql_ops={"vector": index_type},
             )
 
+    class DbPersonalizedObjectPart(
+        DbObjectPartBase, DbPersonalizedObjectPartImpl
+    ):
+        __tablename__ = _names["dbpp_collection"]
+        object_id = mapped_column(
+            String(128),
+            ForeignKey(f"{_names['dbo_collection']}.object_id"),
+            index=True,
+        )
+        original_id = mapped_column(String(128))
+        vector = mapped_column(Vector(search_index.dimensions))
+
+        # Personalized search does an exact scan over a single user's parts
+        __table_args__ = (
+            Index(
+                _names["dbpp_user_id_index"],
+                "user_id",
+                "original_id",
+            ),
+            {"extend_existing": True},
+        )
+
     DbObject.__name__ = f"DbObject_{collection_id}"
     DbObjectPart.__name__ = f"DbObjectPart_{collection_id}"
+    DbPersonalizedObjectPart.__name__ = _names["dbpp_relation"]
 
     DbObject.parts = relationship(
         DbObjectPart, back_populates="object", cascade="all, delete-orphan"
     )
     DbObjectPart.object = relationship(DbObject, back_populates="parts")
+    DbObject.personalized_parts = relationship(
+        DbPersonalizedObjectPart,
+        back_populates="object",
+        cascade="all, delete-orphan",
+    )
+    DbPersonalizedObjectPart.object = relationship(
+        DbObject, back_populates="personalized_parts"
+    )
 
     DbObjectPart.initialize(search_index, DbObject)
+    DbPersonalizedObjectPart.initialize(search_index, DbObject)
+
+    if partitioning is not None:
+        DbObjectPart.partitioning = partitioning
+        DbObjectPart.partition_statements = create_partitions_statements(
+            DbObjectPart.__tablename__, partitioning
+        )
+    if hash_partitioned:
+        DbObject.partition_statements = create_partitions_statements(
+            DbObject.__tablename__, partitioning
+        )
 
-    return DbObject, DbObjectPart
+    return DbObject, DbObjectPart, DbPersonalizedObjectPart
@@ -4,7 +4,9 @@ from embedding_studio.models.embeddings.models import MetricType
 
 
 def generate_advanced_vector_search_function(
-    model_id: str, metric_type: Optional[MetricType] = MetricType.COSINE
+    model_id: str,
+    metric_type: Optional[MetricType] = MetricType.COSINE,
+    partition_by_list: bool = False,
 ) -> str:
     """
     Generate a PostgreSQL function for advanced vector search with vectors in the results.
@@ -14,12 +16,13 @@ def generate_advanced_vector_search_function(
     returns vectors along with search results.
 
     The search process involves:
-    1. Applying payload and user filters to objects
+    1. Applying payload, user and max distance filters to objects
     2. Finding and scoring vectors within filtered objects
     3. Grouping results by object with distance and vector information
 
     :param model_id: ID of the embedding model, used for table name generation
     :param metric_type: Vector distance metric type (COSINE, EUCLID, DOT)
+    :param partition_by_list: Whether parts table is partitioned by list key
     :return: SQL string that creates a PostgreSQL function for advanced vector search
     :raises ValueError: If metric_type is not supported
     """
@@ -38,6 +41,19 @@ def generate_advanced_vector_search_function(
 
     dbo_table = f"dbo_{model_id}"
     dbop_table = f"dbop_{model_id}"
+    dbpp_table = f"dbpp_{model_id}"
+    user_parts_partition_filter = (
+        " WHERE ($13 IS NULL OR partition_key = ANY($13))"
+        if partition_by_list
+        else ""
+    )
+
+    # Parts outside of the partitions passed in partition_keys are pruned
+    partition_filter = (
+        " AND ($13 IS NULL OR op.partition_key = ANY($13))"
+        if partition_by_list
+        else ""
+    )
 
     sql_function = f"""
 CREATE OR REPLACE FUNCTION {function_name}(
@@ -52,7 +68,8 @@ CREATE OR REPLACE FUNCTION {function_name}(
     is_payload               BOOLEAN      DEFAULT FALSE,
     enlarged_limit           INT          DEFAULT 50,
     enlarged_offset          INT          DEFAULT 0,
-    average_only             BOOLEAN      DEFAULT FALSE
+    average_only             BOOLEAN      DEFAULT FALSE,
+    partition_keys           TEXT[]       DEFAULT NULL
 )
 RETURNS TABLE (
     result_object_id     VARCHAR(128),
@@ -96,9 +113,12 @@ BEGIN
 
     IF user_id IS NOT NULL THEN
         query := format('
-WITH customized_original_ids AS (
-    SELECT original_id 
-    FROM {dbo_table}
+WITH user_parts AS NOT MATERIALIZED (
+    SELECT object_id, part_id, vector, is_average
+    FROM {dbop_table}{user_parts_partition_filter}
+    UNION ALL
+    SELECT object_id, part_id, vector, is_average
+    FROM {dbpp_table}
     WHERE user_id = $2
 ),
 filtered_objects AS (
@@ -109,8 +129,16 @@ filtered_objects AS (
         user_id,  
         o.original_id%s
     FROM {dbo_table} o
-    LEFT JOIN customized_original_ids coi ON o.object_id = coi.original_id
-    WHERE (user_id = $2 OR user_id IS NULL) AND (coi.original_id IS NULL) AND (%s) %s
+    WHERE (user_id = $2 OR user_id IS NULL) AND (%s)
+      AND NOT EXISTS (
+          SELECT 1 FROM {dbpp_table} pp
+          WHERE pp.user_id = $2 AND pp.original_id = o.object_id
+      )
+      AND ($6 IS NULL OR EXISTS (
+          SELECT 1 FROM user_parts dp
+          WHERE dp.object_id = o.object_id AND (dp.vector {distance_operator} $1) <= $6
+      ))
+    %s
     limit $10
     offset $11
 ), prefiltered_vectors AS (
@@ -122,7 +150,7 @@ filtered_objects AS (
         o.user_id, 
         o.original_id, 
         (op.vector {distance_operator} $1) AS distance%s
-    FROM {dbop_table} op
+    FROM user_parts op
     INNER JOIN filtered_objects o ON op.object_id = o.object_id 
     WHERE (NOT $12 OR is_average = TRUE) AND ($6 IS NULL OR op.vector {distance_operator} $1 <= $6)
 ), total_count AS (
@@ -159,7 +187,12 @@ WITH filtered_objects AS (
         user_id,  
         o.original_id %s
     FROM {dbo_table} o
-    WHERE (user_id IS NULL) AND (%s) %s
+    WHERE (user_id IS NULL) AND (%s)
+      AND ($6 IS NULL OR EXISTS (
+          SELECT 1 FROM {dbop_table} dp
+          WHERE dp.object_id = o.object_id AND (dp.vector {distance_operator} $1) <= $6
+      ))
+    %s
     limit $10
     offset $11
 ), prefiltered_vectors AS (
@@ -173,7 +206,7 @@ WITH filtered_objects AS (
         (op.vector {distance_operator} $1) AS distance %s
     FROM {dbop_table} op
     INNER JOIN filtered_objects o ON op.object_id = o.object_id 
-    WHERE (NOT $12 OR is_average = TRUE) AND ($6 IS NULL OR op.vector {distance_operator} $1 <= $6)
+    WHERE (NOT $12 OR is_average = TRUE) AND ($6 IS NULL OR op.vector {distance_operator} $1 <= $6){partition_filter}
 ), total_count AS (
     SELECT cast(count(distinct(object_id)) as int) AS total_filtered_objects_count
     FROM prefiltered_vectors
@@ -201,7 +234,7 @@ WITH filtered_objects AS (
     END IF;
 
     RETURN QUERY EXECUTE query
-    USING input_vector, user_id, payload_filter_sql, limit_results, offset_value, max_distance, sort_field, sort_order, is_payload, enlarged_limit, enlarged_offset, average_only;
+    USING input_vector, user_id, payload_filter_sql, limit_results, offset_value, max_distance, sort_field, sort_order, is_payload, enlarged_limit, enlarged_offset, average_only, partition_keys;
 END;
 $$ LANGUAGE plpgsql;    
 """
@@ -209,7 +242,9 @@ $$ LANGUAGE plpgsql;
 
 
 def generate_advanced_vector_search_no_vectors_function(
-    model_id: str, metric_type: Optional[MetricType] = MetricType.COSINE
+    model_id: str,
+    metric_type: Optional[MetricType] = MetricType.COSINE,
+    partition_by_list: bool = False,
 ) -> str:
     """
     Generate a PostgreSQL function for advanced vector search without vectors in the results.
@@ -219,12 +254,13 @@ def generate_advanced_vector_search_no_vectors_function(
     and memory usage while maintaining the same search capabilities.
 
     The search process involves:
-    1. Applying payload and user filters to objects
+    1. Applying payload, user and max distance filters to objects
     2. Finding and scoring vectors within filtered objects
     3. Grouping results by object with distance information (no vectors)
 
     :param model_id: ID of the embedding model, used for table name generation
     :param metric_type: Vector distance metric type (COSINE, EUCLID, DOT)
+    :param partition_by_list: Whether parts table is partitioned by list key
     :return: SQL string that creates a PostgreSQL function for advanced vector search
     :raises ValueError: If metric_type is not supported
     """
@@ -243,6 +279,19 @@ def generate_advanced_vector_search_no_vectors_function(
 
     dbo_table = f"dbo_{model_id}"
     dbop_table = f"dbop_{model_id}"
+    dbpp_table = f"dbpp_{model_id}"
+    user_parts_partition_filter = (
+        " WHERE ($13 IS NULL OR partition_key = ANY($13))"
+        if partition_by_list
+        else ""
+    )
+
+    # Parts outside of the partitions passed in partition_keys are pruned
+    partition_filter = (
+        " AND ($13 IS NULL OR op.partition_key = ANY($13))"
+        if partition_by_list
+        else ""
+    )
 
     sql_function = f"""
 CREATE OR REPLACE FUNCTION {function_name}(
@@ -257,7 +306,8 @@ CREATE OR REPLACE FUNCTION {function_name}(
     is_payload               BOOLEAN      DEFAULT FALSE,
     enlarged_limit           INT          DEFAULT 50,
     enlarged_offset          INT          DEFAULT 0,
-    average_only             BOOLEAN      DEFAULT FALSE
+    average_only             BOOLEAN      DEFAULT FALSE,
+    partition_keys           TEXT[]       DEFAULT NULL
 )
 RETURNS TABLE (
     result_object_id     VARCHAR(128),
@@ -300,9 +350,12 @@ BEGIN
 
     IF user_id IS NOT NULL THEN
         query := format('
-WITH customized_original_ids AS (
-    SELECT original_id 
-    FROM {dbo_table}
+WITH user_parts AS NOT MATERIALIZED (
+    SELECT object_id, part_id, vector, is_average
+    FROM {dbop_table}{user_parts_partition_filter}
+    UNION ALL
+    SELECT object_id, part_id, vector, is_average
+    FROM {dbpp_table}
     WHERE user_id = $2
 ),
 filtered_objects AS (
@@ -313,8 +366,16 @@ filtered_objects AS (
         user_id,  
         o.original_id%s
     FROM {dbo_table} o
-    LEFT JOIN customized_original_ids coi ON o.object_id = coi.original_id
-    WHERE (user_id = $2 OR user_id IS NULL) AND (coi.original_id IS NULL) AND (%s) %s
+    WHERE (user_id = $2 OR user_id IS NULL) AND (%s)
+      AND NOT EXISTS (
+          SELECT 1 FROM {dbpp_table} pp
+          WHERE pp.user_id = $2 AND pp.original_id = o.object_id
+      )
+      AND ($6 IS NULL OR EXISTS (
+          SELECT 1 FROM user_parts dp
+          WHERE dp.object_id = o.object_id AND (dp.vector {distance_operator} $1) <= $6
+      ))
+    %s
     limit $10
     offset $11
 ), prefiltered_vectors AS (
@@ -326,7 +387,7 @@ filtered_objects AS (
         o.user_id, 
         o.original_id, 
         (op.vector {distance_operator} $1) AS distance%s
-    FROM {dbop_table} op
+    FROM user_parts op
     INNER JOIN filtered_objects o ON op.object_id = o.object_id 
     WHERE (NOT $12 OR is_average = TRUE) AND ($6 IS NULL OR op.vector {distance_operator} $1 <= $6)
 ), total_count AS (
@@ -362,7 +423,12 @@ WITH filtered_objects AS (
         user_id,  
         o.original_id %s
     FROM {dbo_table} o
-    WHERE (user_id IS NULL) AND (%s) %s
+    WHERE (user_id IS NULL) AND (%s)
+      AND ($6 IS NULL OR EXISTS (
+          SELECT 1 FROM {dbop_table} dp
+          WHERE dp.object_id = o.object_id AND (dp.vector {distance_operator} $1) <= $6
+      ))
+    %s
     limit $10
     offset $11
 ), prefiltered_vectors AS (
@@ -376,7 +442,7 @@ WITH filtered_objects AS (
         (op.vector {distance_operator} $1) AS distance %s
     FROM {dbop_table} op
     INNER JOIN filtered_objects o ON op.object_id = o.object_id 
-    WHERE (NOT $12 OR is_average = TRUE) AND ($6 IS NULL OR op.vector {distance_operator} $1 <= $6)
+    WHERE (NOT $12 OR is_average = TRUE) AND ($6 IS NULL OR op.vector {distance_operator} $1 <= $6){partition_filter}
 ), total_count AS (
     SELECT cast(count(distinct(object_id)) as int) AS total_filtered_objects_count
     FROM prefiltered_vectors
@@ -403,7 +469,7 @@ WITH filtered_objects AS (
     END IF;
 
     RETURN QUERY EXECUTE query
-    USING input_vector, user_id, payload_filter_sql, limit_results, offset_value, max_distance, sort_field, sort_order, is_payload, enlarged_limit, enlarged_offset, average_only;
+    USING input_vector, user_id, payload_filter_sql, limit_results, offset_value, max_distance, sort_field, sort_order, is_payload, enlarged_limit, enlarged_offset, average_only, partition_keys;
 END;
 $$ LANGUAGE plpgsql;    
 """
@@ -411,22 +477,27 @@ $$ LANGUAGE plpgsql;
 
 
 def generate_advanced_vector_search_similarity_ordered_function(
-    model_id: str, metric_type: Optional[MetricType] = MetricType.COSINE
+    model_id: str,
+    metric_type: Optional[MetricType] = MetricType.COSINE,
+    partition_by_list: bool = False,
 ) -> str:
     """
     Generate a PostgreSQL function for similarity-ordered advanced vector search with vectors.
 
     This function creates SQL for an advanced vector search that prioritizes similarity
-    ordering over other sorting criteria. It's optimized for finding the most similar
-    vectors first, then applying payload filters. Returns vectors in the results.
+    ordering over other sorting criteria. The payload filter is applied inside the
+    vector scan, so the top-k is taken only among vectors of matching objects.
+    When a user is set, the user's personalized vectors are scanned from the
+    separate personalized parts table and merged with the shared candidates.
+    Returns vectors in the results.
 
-    The search process differs from non-similarity-ordered by:
-    1. First finding the most similar vectors
-    2. Then applying payload and user filters
-    3. Finally grouping by object with full vector information
+    The scan is executed with one of two strategies (see SearchStrategy):
+    1. 'exact' - filter objects first and compute distances over the filtered set
+    2. 'hnsw' - walk the HNSW index with iterative scan and post-filter candidates
 
     :param model_id: ID of the embedding model, used for table name generation
     :param metric_type: Vector distance metric type (COSINE, EUCLID, DOT)
+    :param partition_by_list: Whether parts table is partitioned by list key
     :return: SQL string that creates a PostgreSQL function for similarity-ordered search
     :raises ValueError: If metric_type is not supported
     """
@@ -445,6 +516,14 @@ def generate_advanced_vector_search_similarity_ordered_function(
 
     dbo_table = f"dbo_{model_id}"
     dbop_table = f"dbop_{model_id}"
+    dbpp_table = f"dbpp_{model_id}"
+
+    # Parts outside of the partitions passed in partition_keys are pruned
+    partition_filter = (
+        " AND ($10 IS NULL OR op.partition_key = ANY($10))"
+        if partition_by_list
+        else ""
+    )
 
     sql_function = f"""
 CREATE OR REPLACE FUNCTION {function_name}(
@@ -456,7 +535,12 @@ CREATE OR REPLACE FUNCTION {function_name}(
     max_distance             FLOAT        DEFAULT NULL,
     enlarged_limit           INT          DEFAULT 50,
     enlarged_offset          INT          DEFAULT 0,
-    average_only             BOOLEAN      DEFAULT FALSE
+    average_only             BOOLEAN      DEFAULT FALSE,
+    search_strategy          TEXT         DEFAULT 'hnsw',
+    ef_search                INT          DEFAULT 40,
+    iterative_scan           TEXT         DEFAULT 'relaxed_order',
+    max_scan_tuples          INT          DEFAULT 20000,
+    partition_keys           TEXT[]       DEFAULT NULL
 )
 RETURNS TABLE (
     result_object_id     VARCHAR(128),
@@ -471,132 +555,192 @@ RETURNS TABLE (
 ) AS $$
 DECLARE
     payload_where_clause TEXT;
+    order_expression     TEXT;
     query                TEXT;
 BEGIN
     payload_where_clause := COALESCE(payload_filter_sql, 'TRUE');
 
+    IF search_strategy = 'exact' THEN
+        -- "+ 0" hides the ordering from the HNSW index, so the planner
+        -- filters objects first and computes exact distances over them
+        order_expression := '(op.vector {distance_operator} $1) + 0';
+    ELSE
+        order_expression := 'op.vector {distance_operator} $1';
+    END IF;
+
+    -- ef_search caps the number of index candidates, it shouldn't be less than the window
+    PERFORM set_config(
+        'hnsw.ef_search',
+        LEAST(GREATEST(ef_search, enlarged_limit + enlarged_offset), 1000)::TEXT,
+        true
+    );
+    -- Iterative index scans are available since pgvector 0.8.0, checking the
+    -- setting avoids a subtransaction of an EXCEPTION block on every call
+    IF current_setting('hnsw.iterative_scan', true) IS NOT NULL THEN
+        PERFORM set_config(
+            'hnsw.iterative_scan',
+            CASE WHEN search_strategy = 'hnsw' THEN COALESCE(iterative_scan, 'off') ELSE 'off' END,
+            true
+        );
+        PERFORM set_config('hnsw.max_scan_tuples', max_scan_tuples::TEXT, true);
+    END IF;
+
     IF user_id IS NOT NULL THEN
-        query := format('
-WITH customized_original_ids AS (
-    SELECT original_id 
-    FROM {dbo_table}
-    WHERE user_id = $2
-),
-filtered_vectors AS (
+        query := format($fmt$
+WITH filtered_vectors AS (
     SELECT
         op.object_id,
-        op.part_id AS part_id,
-        op.vector AS vector,
+        op.part_id,
+        op.vector,
         (op.vector {distance_operator} $1) AS distance
     FROM {dbop_table} op
-    WHERE (op.user_id is NULL or op.user_id = $2) AND (NOT $9 OR op.is_average = TRUE)
-	ORDER BY distance
-	LIMIT $7
-	OFFSET $8
+    WHERE
+        op.user_id IS NULL
+        AND (NOT $9 OR op.is_average = TRUE){partition_filter}
+        AND ($6 IS NULL OR (op.vector {distance_operator} $1) <= $6)
+        AND EXISTS (
+            SELECT 1 FROM {dbo_table} o
+            WHERE o.object_id = op.object_id
+              AND (%s)
+              AND NOT EXISTS (
+                  SELECT 1 FROM {dbpp_table} pp
+                  WHERE pp.user_id = $2 AND pp.original_id = o.object_id
+              )
+        )
+    ORDER BY %s
+    LIMIT $7 + $8
+),
+personal_vectors AS (
+    -- Personalized parts of the user are few, so they're scanned exactly
+    SELECT
+        pp.object_id,
+        pp.part_id,
+        pp.vector,
+        (pp.vector {distance_operator} $1) AS distance
+    FROM {dbpp_table} pp
+    WHERE
+        pp.user_id = $2
+        AND (NOT $9 OR pp.is_average = TRUE)
+        AND ($6 IS NULL OR (pp.vector {distance_operator} $1) <= $6)
+        AND EXISTS (
+            SELECT 1 FROM {dbo_table} o
+            WHERE o.object_id = pp.object_id AND (%s)
+        )
+),
+merged_vectors AS (
+    SELECT * FROM filtered_vectors
+    UNION ALL
+    SELECT * FROM personal_vectors
+    ORDER BY distance
+    LIMIT $7 OFFSET $8
 ),
 filtered_objects AS (
-    SELECT 
-        o.object_id, 
-        v.part_id, 
+    SELECT
+        v.object_id,
+        o.payload,
+        o.storage_meta,
+        o.user_id,
+        o.original_id,
+        v.distance,
         v.vector,
-        v.distance, 
-        o.payload, 
-        o.storage_meta, 
-        o.user_id, 
-        o.original_id
-    FROM {dbo_table} o
-    INNER JOIN filtered_vectors v ON o.object_id = v.object_id
-    LEFT JOIN customized_original_ids coi ON coi.original_id = o.object_id
-    WHERE (coi.original_id IS NULL) and (%s) 
+        v.part_id
+    FROM merged_vectors v
+    JOIN {dbo_table} o ON o.object_id = v.object_id
 ),
 total_count AS (
-    SELECT cast(count(distinct(object_id)) as int) AS total_filtered_objects_count
-    FROM filtered_objects o WHERE ($6 IS NULL OR o.distance <= $6)
-) SELECT 
-	object_id AS result_object_id, 	
-	payload AS result_payload, 
-	storage_meta AS result_storage_meta, 
-	user_id AS result_user_id, 
-	original_id AS result_original_id, 
-	ARRAY_AGG(part_id ORDER BY distance) AS result_part_ids,
-    ARRAY_AGG(vector ORDER BY distance) AS result_vectors,
-    MAX(distance) AS result_distance,
+    SELECT COUNT(DISTINCT object_id)::INT AS total_filtered_objects_count
+    FROM filtered_objects
+)
+SELECT
+    o.object_id AS result_object_id,
+    o.payload AS result_payload,
+    o.storage_meta AS result_storage_meta,
+    o.user_id AS result_user_id,
+    o.original_id AS result_original_id,
+    ARRAY_AGG(o.part_id ORDER BY o.distance) AS result_part_ids,
+    ARRAY_AGG(o.vector ORDER BY o.distance) AS result_vectors,
+    MIN(o.distance) AS result_distance,
     tc.total_filtered_objects_count AS subset_count
-  FROM filtered_objects 
-  CROSS JOIN total_count tc
-  GROUP BY 
-    object_id, 
-    payload, 
-    storage_meta,  
-    user_id, 
-    original_id, 
-    tc.total_filtered_objects_count
-  ORDER BY result_distance ASC
-  LIMIT $4 OFFSET $5;', payload_where_clause);
+FROM filtered_objects o
+CROSS JOIN total_count tc
+GROUP BY
+    o.object_id, o.payload, o.storage_meta,
+    o.user_id, o.original_id, tc.total_filtered_objects_count
+ORDER BY result_distance ASC
+LIMIT $4 OFFSET $5;
+$fmt$, payload_where_clause, order_expression, payload_where_clause);
     ELSE
-        query := format('
+        query := format($fmt$
 WITH filtered_vectors AS (
     SELECT
         op.object_id,
-        op.part_id AS part_id,
-        op.vector as vector,
+        op.part_id,
+        op.vector,
         (op.vector {distance_operator} $1) AS distance
     FROM {dbop_table} op
-    WHERE (op.user_id IS NULL) AND (NOT $9 OR op.is_average = TRUE)
-	ORDER BY distance
-	LIMIT $7
-	OFFSET $8
+    WHERE
+        op.user_id IS NULL
+        AND (NOT $9 OR op.is_average = TRUE){partition_filter}
+        AND ($6 IS NULL OR (op.vector {distance_operator} $1) <= $6)
+        AND EXISTS (
+            SELECT 1 FROM {dbo_table} o
+            WHERE o.object_id = op.object_id AND (%s)
+        )
+    ORDER BY %s
+    LIMIT $7 OFFSET $8
 ),
 filtered_objects AS (
-    SELECT 
-        o.object_id, 
-        v.part_id, 
+    SELECT
+        v.object_id,
+        o.payload,
+        o.storage_meta,
+        o.user_id,
+        o.original_id,
+        v.distance,
         v.vector,
-        v.distance, 
-        o.payload, 
-        o.storage_meta, 
-        o.user_id, 
-        o.original_id
-    FROM {dbo_table} o
-    INNER JOIN filtered_vectors v ON o.object_id = v.object_id
-    WHERE (o.user_id IS NULL) AND ($6 IS NULL OR distance <= $6) AND (%s)
+        v.part_id
+    FROM filtered_vectors v
+    JOIN {dbo_table} o ON o.object_id = v.object_id
 ),
 total_count AS (
-    SELECT cast(count(distinct(object_id)) as int) AS total_filtered_objects_count
-    FROM filtered_objects o WHERE ($6 IS NULL OR o.distance <= $6)
-) SELECT 
-	object_id AS result_object_id, 	
-	payload AS result_payload, 
-	storage_meta AS result_storage_meta, 
-	user_id AS result_user_id, 
-	original_id AS result_original_id, 
-	ARRAY_AGG(part_id ORDER BY distance) AS result_part_ids,
-    ARRAY_AGG(vector ORDER BY distance) AS result_vectors,
-    MIN(distance) AS result_distance,
+    SELECT COUNT(DISTINCT object_id)::INT AS total_filtered_objects_count
+    FROM filtered_objects
+)
+SELECT
+    o.object_id AS result_object_id,
+    o.payload AS result_payload,
+    o.storage_meta AS result_storage_meta,
+    o.user_id AS result_user_id,
+    o.original_id AS result_original_id,
+    ARRAY_AGG(o.part_id ORDER BY o.distance) AS result_part_ids,
+    ARRAY_AGG(o.vector ORDER BY o.distance) AS result_vectors,
+    MIN(o.distance) AS result_distance,
     tc.total_filtered_objects_count AS subset_count
-  FROM filtered_objects 
-  CROSS JOIN total_count tc
-  GROUP BY 
-    object_id, 
-    payload, 
-    storage_meta,  
-    user_id, 
-    original_id, 
-    tc.total_filtered_objects_count 
-  ORDER BY result_distance ASC
-  LIMIT $4 OFFSET $5;', payload_where_clause);
+FROM filtered_objects o
+CROSS JOIN total_count tc
+GROUP BY
+    o.object_id, o.payload, o.storage_meta,
+    o.user_id, o.original_id, tc.total_filtered_objects_count
+ORDER BY result_distance ASC
+LIMIT $4 OFFSET $5;
+$fmt$, payload_where_clause, order_expression);
     END IF;
 
     RETURN QUERY EXECUTE query
-    USING input_vector, user_id, payload_filter_sql, limit_results, offset_value, max_distance, enlarged_limit, enlarged_offset, average_only;
+    USING input_vector, user_id, payload_filter_sql,
+          limit_results, offset_value, max_distance,
+          enlarged_limit, enlarged_offset, average_only,
+          partition_keys;
 END;
-$$ LANGUAGE plpgsql;    
+$$ LANGUAGE plpgsql;
 """
     return sql_function
 
 
 def generate_advanced_vector_search_similarity_ordered_no_vectors_function(
-    model_id: str, metric_type: Optional[MetricType] = MetricType.COSINE
+    model_id: str,
+    metric_type: Optional[MetricType] = MetricType.COSINE,
+    partition_by_list: bool = False,
 ) -> str:
     """
     Generate a PostgreSQL function for similarity-ordered advanced search without vectors.
@@ -605,13 +749,13 @@ def generate_advanced_vector_search_similarity_ordered_no_vectors_function(
     include vector values in the results. This is more efficient for cases where
     only object metadata and distance scores are needed.
 
-    The search process follows the same approach as the with-vectors version:
-    1. First finding the most similar vectors
-    2. Then applying payload and user filters
-    3. Finally grouping by object without including vector data
+    The scan is executed with one of two strategies (see SearchStrategy):
+    1. 'exact' - filter objects first and compute distances over the filtered set
+    2. 'hnsw' - walk the HNSW index with iterative scan and post-filter candidates
 
     :param model_id: ID of the embedding model, used for table name generation
     :param metric_type: Vector distance metric type (COSINE, EUCLID, DOT)
+    :param partition_by_list: Whether parts table is partitioned by list key
     :return: SQL string that creates a PostgreSQL function for similarity-ordered search
     :raises ValueError: If metric_type is not supported
     """
@@ -630,6 +774,14 @@ def generate_advanced_vector_search_similarity_ordered_no_vectors_function(
 
     dbo_table = f"dbo_{model_id}"
     dbop_table = f"dbop_{model_id}"
+    dbpp_table = f"dbpp_{model_id}"
+
+    # Parts outside of the partitions passed in partition_keys are pruned
+    partition_filter = (
+        " AND ($10 IS NULL OR op.partition_key = ANY($10))"
+        if partition_by_list
+        else ""
+    )
 
     sql_function = f"""
 CREATE OR REPLACE FUNCTION {function_name}(
@@ -641,7 +793,12 @@ CREATE OR REPLACE FUNCTION {function_name}(
     max_distance             FLOAT        DEFAULT NULL,
     enlarged_limit           INT          DEFAULT 50,
     enlarged_offset          INT          DEFAULT 0,
-    average_only             BOOLEAN      DEFAULT FALSE
+    average_only             BOOLEAN      DEFAULT FALSE,
+    search_strategy          TEXT         DEFAULT 'hnsw',
+    ef_search                INT          DEFAULT 40,
+    iterative_scan           TEXT         DEFAULT 'relaxed_order',
+    max_scan_tuples          INT          DEFAULT 20000,
+    partition_keys           TEXT[]       DEFAULT NULL
 )
 RETURNS TABLE (
     result_object_id     VARCHAR(128),
@@ -655,196 +812,80 @@ RETURNS TABLE (
 ) AS $$
 DECLARE
     payload_where_clause TEXT;
+    order_expression     TEXT;
     query                TEXT;
 BEGIN
     payload_where_clause := COALESCE(payload_filter_sql, 'TRUE');
 
-    IF user_id IS NOT NULL THEN
-        query := format('
-WITH customized_original_ids AS (
-    SELECT original_id 
-    FROM {dbo_table}
-    WHERE user_id = $2
-),
-filtered_vectors AS (
-    SELECT
-        op.object_id,
-        op.part_id AS part_id,
-        (op.vector {distance_operator} $1) AS distance
-    FROM {dbop_table} op
-    WHERE (op.user_id is NULL or op.user_id = $2) AND (NOT $9 OR op.is_average = TRUE)
-	ORDER BY distance
-	LIMIT $7
-	OFFSET $8
-),
-filtered_objects AS (
-    SELECT 
-        o.object_id, 
-        v.part_id, 
-        v.distance, 
-        o.payload, 
-        o.storage_meta, 
-        o.user_id, 
-        o.original_id
-    FROM {dbo_table} o
-    INNER JOIN filtered_vectors v ON o.object_id = v.object_id
-    LEFT JOIN customized_original_ids coi ON coi.original_id = o.object_id
-    WHERE (coi.original_id IS NULL) and (%s)
-),
-total_count AS (
-    SELECT cast(count(distinct(object_id)) as int) AS total_filtered_objects_count
-    FROM filtered_objects o WHERE ($6 IS NULL OR o.distance <= $6)
-) SELECT 
-	object_id AS result_object_id, 	
-	payload AS result_payload, 
-	storage_meta AS result_storage_meta, 
-	user_id AS result_user_id, 
-	original_id AS result_original_id, 
-	ARRAY_AGG(part_id) AS result_part_ids,
-    MAX(distance) AS result_distance,
-    tc.total_filtered_objects_count AS subset_count
-  FROM filtered_objects 
-  CROSS JOIN total_count tc
-  GROUP BY 
-    object_id, 
-    payload, 
-    storage_meta,  
-    user_id, 
-    original_id, 
-    tc.total_filtered_objects_count
-  ORDER BY result_distance ASC
-  LIMIT $4 OFFSET $5;', payload_where_clause);
+    IF search_strategy = 'exact' THEN
+        -- "+ 0" hides the ordering from the HNSW index, so the planner
+        -- filters objects first and computes exact distances over them
+        order_expression := '(op.vector {distance_operator} $1) + 0';
     ELSE
-        query := format('
-WITH filtered_vectors AS (
-    SELECT
-        op.object_id,
-        op.part_id AS part_id,
-        (op.vector {distance_operator} $1) AS distance
-    FROM {dbop_table} op
-    WHERE (op.user_id IS NULL) AND (NOT $9 OR op.is_average = TRUE)
-	ORDER BY distance
-	LIMIT $7
-	OFFSET $8
-),
-filtered_objects AS (
-    SELECT 
-        o.object_id, 
-        v.part_id, 
-        v.distance, 
-        o.payload, 
-        o.storage_meta, 
-        o.user_id, 
-        o.original_id
-    FROM {dbo_table} o
-    INNER JOIN filtered_vectors v ON o.object_id = v.object_id
-    WHERE (o.user_id IS NULL) AND ($6 IS NULL OR distance <= $6) AND (%s)
-),
-total_count AS (
-    SELECT cast(count(distinct(object_id)) as int) AS total_filtered_objects_count
-    FROM filtered_objects o WHERE ($6 IS NULL OR o.distance <= $6)
-) SELECT 
-	object_id AS result_object_id, 	
-	payload AS result_payload, 
-	storage_meta AS result_storage_meta, 
-	user_id AS result_user_id, 
-	original_id AS result_original_id, 
-	ARRAY_AGG(part_id) AS result_part_ids,
-    MIN(distance) AS result_distance,
-    tc.total_filtered_objects_count AS subset_count
-  FROM filtered_objects 
-  CROSS JOIN total_count tc
-  GROUP BY 
-    object_id, 
-    payload, 
-    storage_meta,  
-    user_id, 
-    original_id, 
-    tc.total_filtered_objects_count 
-  ORDER BY result_distance ASC
-  LIMIT $4 OFFSET $5;', payload_where_clause);
+        order_expression := 'op.vector {distance_operator} $1';
     END IF;
 
-    RETURN QUERY EXECUTE query
-    USING input_vector, user_id, payload_filter_sql, limit_results, offset_value, max_distance, enlarged_limit, enlarged_offset, average_only;
-END;
-$$ LANGUAGE plpgsql;    
-"""
-    return sql_function
-
-
-def generate_advanced_vector_search_similarity_ordered_no_vectors_function_(
-    model_id: str, metric_type: Optional[MetricType] = MetricType.COSINE
-) -> str:
-    operator_map = {
-        MetricType.COSINE: "<=>",
-        MetricType.EUCLID: "<->",
-        MetricType.DOT: "<#>",
-    }
-
-    if metric_type not in operator_map:
-        raise ValueError(f"Unsupported metric type: {metric_type}")
-
-    distance_operator = operator_map[metric_type]
-    metric_name = metric_type.value
-    function_name = f"advanced_so_{model_id}_{metric_name}"
-
-    dbo_table = f"dbo_{model_id}"
-    dbop_table = f"dbop_{model_id}"
-
-    base_query = f"""
-CREATE OR REPLACE FUNCTION {function_name}(
-    input_vector             vector,
-    user_id                  VARCHAR(128) DEFAULT NULL,
-    payload_filter_sql       TEXT         DEFAULT NULL,
-    limit_results            INT          DEFAULT 10,
-    offset_value             INT          DEFAULT 0,
-    max_distance             FLOAT        DEFAULT NULL,
-    enlarged_limit           INT          DEFAULT 50,
-    enlarged_offset          INT          DEFAULT 0,
-    average_only             BOOLEAN      DEFAULT FALSE
-)
-RETURNS TABLE (
-    result_object_id     VARCHAR(128),
-    result_payload       JSONB,
-    result_storage_meta  JSONB,
-    result_user_id       VARCHAR(128),
-    result_original_id   VARCHAR(128),
-    result_part_ids      VARCHAR(128)[],
-    result_distance      FLOAT,
-    subset_count         INT
-) AS $$
-DECLARE
-    payload_where_clause TEXT;
-    query                TEXT;
-BEGIN
-    payload_where_clause := COALESCE(payload_filter_sql, 'TRUE');
+    -- ef_search caps the number of index candidates, it shouldn't be less than the window
+    PERFORM set_config(
+        'hnsw.ef_search',
+        LEAST(GREATEST(ef_search, enlarged_limit + enlarged_offset), 1000)::TEXT,
+        true
+    );
+    -- Iterative index scans are available since pgvector 0.8.0, checking the
+    -- setting avoids a subtransaction of an EXCEPTION block on every call
+    IF current_setting('hnsw.iterative_scan', true) IS NOT NULL THEN
+        PERFORM set_config(
+            'hnsw.iterative_scan',
+            CASE WHEN search_strategy = 'hnsw' THEN COALESCE(iterative_scan, 'off') ELSE 'off' END,
+            true
+        );
+        PERFORM set_config('hnsw.max_scan_tuples', max_scan_tuples::TEXT, true);
+    END IF;
 
     IF user_id IS NOT NULL THEN
         query := format($fmt$
-WITH customized_original_ids AS (
-    SELECT original_id FROM {dbo_table}
-    WHERE user_id = $2
-),
-filtered_vectors AS (
+WITH filtered_vectors AS (
     SELECT
         op.object_id,
         op.part_id,
         (op.vector {distance_operator} $1) AS distance
     FROM {dbop_table} op
     WHERE
-        (op.user_id IS NULL OR op.user_id = $2)
-        AND (NOT $9 OR op.is_average = TRUE)
+        op.user_id IS NULL
+        AND (NOT $9 OR op.is_average = TRUE){partition_filter}
         AND ($6 IS NULL OR (op.vector {distance_operator} $1) <= $6)
         AND EXISTS (
             SELECT 1 FROM {dbo_table} o
             WHERE o.object_id = op.object_id
               AND (%s)
               AND NOT EXISTS (
-                  SELECT 1 FROM customized_original_ids coi
-                  WHERE coi.original_id = o.object_id
+                  SELECT 1 FROM {dbpp_table} pp
+                  WHERE pp.user_id = $2 AND pp.original_id = o.object_id
               )
         )
+    ORDER BY %s
+    LIMIT $7 + $8
+),
+personal_vectors AS (
+    -- Personalized parts of the user are few, so they're scanned exactly
+    SELECT
+        pp.object_id,
+        pp.part_id,
+        (pp.vector {distance_operator} $1) AS distance
+    FROM {dbpp_table} pp
+    WHERE
+        pp.user_id = $2
+        AND (NOT $9 OR pp.is_average = TRUE)
+        AND ($6 IS NULL OR (pp.vector {distance_operator} $1) <= $6)
+        AND EXISTS (
+            SELECT 1 FROM {dbo_table} o
+            WHERE o.object_id = pp.object_id AND (%s)
+        )
+),
+merged_vectors AS (
+    SELECT * FROM filtered_vectors
+    UNION ALL
+    SELECT * FROM personal_vectors
     ORDER BY distance
     LIMIT $7 OFFSET $8
 ),
@@ -857,7 +898,7 @@ filtered_objects AS (
         o.original_id,
         v.distance,
         v.part_id
-    FROM filtered_vectors v
+    FROM merged_vectors v
     JOIN {dbo_table} o ON o.object_id = v.object_id
 ),
 total_count AS (
@@ -870,7 +911,7 @@ SELECT
     o.storage_meta AS result_storage_meta,
     o.user_id AS result_user_id,
     o.original_id AS result_original_id,
-    ARRAY_AGG(o.part_id) AS result_part_ids,
+    ARRAY_AGG(o.part_id ORDER BY o.distance) AS result_part_ids,
     MIN(o.distance) AS result_distance,
     tc.total_filtered_objects_count AS subset_count
 FROM filtered_objects o
@@ -880,7 +921,7 @@ GROUP BY
     o.user_id, o.original_id, tc.total_filtered_objects_count
 ORDER BY result_distance ASC
 LIMIT $4 OFFSET $5;
-$fmt$, payload_where_clause);
+$fmt$, payload_where_clause, order_expression, payload_where_clause);
     ELSE
         query := format($fmt$
 WITH filtered_vectors AS (
@@ -891,13 +932,13 @@ WITH filtered_vectors AS (
     FROM {dbop_table} op
     WHERE
         op.user_id IS NULL
-        AND (NOT $9 OR op.is_average = TRUE)
+        AND (NOT $9 OR op.is_average = TRUE){partition_filter}
         AND ($6 IS NULL OR (op.vector {distance_operator} $1) <= $6)
         AND EXISTS (
             SELECT 1 FROM {dbo_table} o
             WHERE o.object_id = op.object_id AND (%s)
         )
-    ORDER BY distance
+    ORDER BY %s
     LIMIT $7 OFFSET $8
 ),
 filtered_objects AS (
@@ -922,7 +963,7 @@ SELECT
     o.storage_meta AS result_storage_meta,
     o.user_id AS result_user_id,
     o.original_id AS result_original_id,
-    ARRAY_AGG(o.part_id) AS result_part_ids,
+    ARRAY_AGG(o.part_id ORDER BY o.distance) AS result_part_ids,
     MIN(o.distance) AS result_distance,
     tc.total_filtered_objects_count AS subset_count
 FROM filtered_objects o
@@ -932,14 +973,15 @@ GROUP BY
     o.user_id, o.original_id, tc.total_filtered_objects_count
 ORDER BY result_distance ASC
 LIMIT $4 OFFSET $5;
-$fmt$, payload_where_clause);
+$fmt$, payload_where_clause, order_expression);
     END IF;
 
     RETURN QUERY EXECUTE query
     USING input_vector, user_id, payload_filter_sql,
           limit_results, offset_value, max_distance,
-          enlarged_limit, enlarged_offset, average_only;
+          enlarged_limit, enlarged_offset, average_only,
+          partition_keys;
 END;
 $$ LANGUAGE plpgsql;
 """
-    return base_query
+    return sql_function
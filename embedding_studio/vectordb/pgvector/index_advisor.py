@@ -0,0 +1,225 @@
+import hashlib
+import logging
+from typing import List
+
+from pydantic import BaseModel
+from sqlalchemy import text
+
+from embedding_studio.core.config import settings
+from embedding_studio.vectordb.optimization import Optimization
+from embedding_studio.vectordb.pgvector.collection import PgvectorCollection
+from embedding_studio.vectordb.pgvector.payload_usage import (
+    PayloadFieldUsage,
+    PayloadFieldUsageKind,
+    PayloadValueType,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PayloadIndexProposal(BaseModel):
+    """
+    An index proposed for a payload field.
+
+    :param index_name: Name of the index to create
+    :param field: Payload field name
+    :param kind: How the field is used by searches
+    :param value_type: Type the field value is compared as
+    :param hits: Number of recorded searches using the field this way
+    :param statement: SQL statement creating the index
+    """
+
+    index_name: str
+    field: str
+    kind: PayloadFieldUsageKind
+    value_type: PayloadValueType
+    hits: int
+    statement: str
+
+
+def _index_expression(usage: PayloadFieldUsage) -> str:
+    # Expressions must be the same as the ones built by query_to_sql and
+    # payload sorting, otherwise the planner won't match them with the index
+    field = usage.field.replace("'", "''")
+    if usage.kind == PayloadFieldUsageKind.FULLTEXT:
+        return (
+            f"USING gin "
+            f"(to_tsvector('simple', jsonb_extract_path_text(payload, '{field}')))"
+        )
+    elif usage.kind == PayloadFieldUsageKind.LIST:
+        return f"USING gin ((payload -> '{field}'))"
+    elif usage.kind == PayloadFieldUsageKind.SORT:
+        return f"((payload -> '{field}'))"
+    elif usage.value_type == PayloadValueType.NUMERIC:
+        return f"(((payload ->> '{field}')::numeric))"
+    else:
+        return f"((payload ->> '{field}'))"
+
+
+def make_payload_index_proposal(
+    tablename: str,
+    usage: PayloadFieldUsage,
+    hits: int,
+    concurrently: bool = True,
+) -> PayloadIndexProposal:
+    """
+    Make an index proposal serving a payload field usage.
+
+    Range and numeric term filters share a btree index over the numeric cast.
+
+    :param tablename: Name of the objects table
+    :param usage: Payload field usage
+    :param hits: Number of recorded searches with this usage
+    :param concurrently: Whether to build the index without blocking writes
+        (not supported by partitioned tables)
+    :return: Index proposal
+    """
+    kind = (
+        PayloadFieldUsageKind.RANGE
+        if usage.value_type == PayloadValueType.NUMERIC
+        and usage.kind == PayloadFieldUsageKind.TERM
+        else usage.kind
+    )
+    digest = hashlib.md5(
+        f"{usage.field}:{kind.value}:{usage.value_type.value}".encode()
+    ).hexdigest()[:10]
+    index_name = f"{tablename}_pa_{digest}"
+
+    return PayloadIndexProposal(
+        index_name=index_name,
+        field=usage.field,
+        kind=kind,
+        value_type=usage.value_type,
+        hits=hits,
+        statement=(
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}"
+            f"IF NOT EXISTS {index_name} "
+            f"ON {tablename} {_index_expression(usage)}"
+        ),
+    )
+
+
+class PayloadIndexAdvisorOptimization(Optimization):
+    """
+    Creates indexes for payload fields actually used by searches.
+
+    Searches record which payload fields they filter and sort by (see
+    PayloadUsageRecorder). Fields used at least `min_hits` times get an
+    expression index matching the SQL generated for them: btree for term,
+    range and sort usages, GIN tsvector for full text queries and GIN for
+    list queries. Indexes are created concurrently, so writes aren't blocked.
+
+    The optimization is repeatable: it's re-evaluated each time optimizations
+    are applied and only creates indexes that don't exist yet.
+
+    :param min_hits: Min number of searches using a field to propose an index
+    :param dry_run: If True, only log proposals without creating indexes
+    """
+
+    def __init__(
+        self,
+        min_hits: int = settings.PAYLOAD_INDEX_ADVISOR_MIN_HITS,
+        dry_run: bool = False,
+    ):
+        super().__init__(
+            name="PayloadIndexAdvisorOptimization", repeatable=True
+        )
+        self.min_hits = int(min_hits)
+        self.dry_run = dry_run
+
+    def propose(
+        self, collection: PgvectorCollection
+    ) -> List[PayloadIndexProposal]:
+        """
+        Propose indexes that don't exist yet for a collection.
+
+        :param collection: The collection to analyze
+        :return: List of index proposals, most used fields first
+        """
+        tablename = collection.DbObject.__tablename__
+        # Partitioned tables can't be indexed concurrently
+        concurrently = not collection.DbObject.partition_statements
+        with collection.Session() as session:
+            existing_indexes = {
+                row.indexname
+                for row in session.execute(
+                    text(
+                        "SELECT indexname FROM pg_indexes "
+                        "WHERE tablename = :tablename"
+                    ),
+                    dict(tablename=tablename),
+                )
+            }
+
+        proposals = dict()
+        for usage, hits in collection.get_payload_field_usages():
+            proposal = make_payload_index_proposal(
+                tablename, usage, hits, concurrently
+            )
+            if proposal.index_name in existing_indexes:
+                continue
+
+            if proposal.index_name in proposals:
+                proposals[proposal.index_name].hits += hits
+            else:
+                proposals[proposal.index_name] = proposal
+
+        return sorted(
+            [p for p in proposals.values() if p.hits >= self.min_hits],
+            key=lambda p: p.hits,
+            reverse=True,
+        )
+
+    @staticmethod
+    def report(proposals: List[PayloadIndexProposal]) -> str:
+        """
+        Format proposals as a human-readable report.
+
+        :param proposals: List of index proposals
+        :return: Report text
+        """
+        if not proposals:
+            return "No payload indexes to create."
+
+        lines = [f"{len(proposals)} payload indexes to create:"]
+        for proposal in proposals:
+            lines.append(
+                f"- {proposal.field} ({proposal.kind.value}, "
+                f"{proposal.value_type.value}, {proposal.hits} hits): "
+                f"{proposal.statement}"
+            )
+        return "\n".join(lines)
+
+    def __call__(
+        self, collection: PgvectorCollection
+    ) -> List[PayloadIndexProposal]:
+        """
+        Propose and create payload indexes for a collection.
+
+        :param collection: The collection to optimize
+        :return: List of proposals (created unless it's a dry run)
+        """
+        proposals = self.propose(collection)
+        logger.info(
+            f"Payload index advisor for {collection.get_info().collection_id}"
+            f"{' (dry run)' if self.dry_run else ''}. "
+            f"{self.report(proposals)}"
+        )
+        if self.dry_run:
+            return proposals
+
+        # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+        with collection.autocommit_connection() as connection:
+            for proposal in proposals:
+                try:
+                    connection.execute(text(proposal.statement))
+                except Exception as e:
+                    # E.g. a numeric cast failing on a non-numeric value
+                    logger.error(
+                        f"Failed to create index {proposal.index_name}: {e}"
+                    )
+                    connection.execute(
+                        text(f"DROP INDEX IF EXISTS {proposal.index_name}")
+                    )
+
+        return proposals
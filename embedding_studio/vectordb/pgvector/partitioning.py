@@ -0,0 +1,132 @@
+from typing import Any, Dict, List, Optional
+
+from embedding_studio.models.embeddings.models import (
+    PartitioningInfo,
+    PartitioningType,
+)
+from embedding_studio.models.payload.models import (
+    BoolQuery,
+    PayloadFilter,
+    TermQuery,
+    TermsQuery,
+)
+
+
+def is_hash_partitioned(partitioning: Optional[PartitioningInfo]) -> bool:
+    return (
+        partitioning is not None and partitioning.type == PartitioningType.HASH
+    )
+
+
+def is_list_partitioned(partitioning: Optional[PartitioningInfo]) -> bool:
+    return (
+        partitioning is not None and partitioning.type == PartitioningType.LIST
+    )
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def create_partitions_statements(
+    tablename: str, partitioning: PartitioningInfo
+) -> List[str]:
+    """
+    Generate SQL statements creating partitions of a partitioned table.
+
+    :param tablename: Name of the partitioned (parent) table
+    :param partitioning: Partitioning configuration
+    :return: List of CREATE TABLE ... PARTITION OF statements
+    """
+    if partitioning.type == PartitioningType.HASH:
+        return [
+            f"CREATE TABLE IF NOT EXISTS {tablename}_p{remainder} "
+            f"PARTITION OF {tablename} "
+            f"FOR VALUES WITH (MODULUS {partitioning.partitions}, "
+            f"REMAINDER {remainder})"
+            for remainder in range(partitioning.partitions)
+        ]
+
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS {tablename}_p{i} "
+        f"PARTITION OF {tablename} FOR VALUES IN ({_quote(value)})"
+        for i, value in enumerate(partitioning.values)
+    ]
+    statements.append(
+        f"CREATE TABLE IF NOT EXISTS {tablename}_pdefault "
+        f"PARTITION OF {tablename} DEFAULT"
+    )
+    return statements
+
+
+def partition_key_from_payload(
+    payload: Optional[Dict[str, Any]], partitioning: PartitioningInfo
+) -> str:
+    """
+    Get the LIST partition key of an object.
+
+    :param payload: Payload of the object
+    :param partitioning: Partitioning configuration
+    :return: Partition key, empty string if the payload has no such field
+    """
+    value = (payload or dict()).get(partitioning.field)
+    return "" if value is None else str(value)
+
+
+def extract_partition_keys(
+    payload_filter: Optional[PayloadFilter], partitioning: PartitioningInfo
+) -> Optional[List[str]]:
+    """
+    Get LIST partition keys every object matching a filter belongs to.
+
+    Only term / terms queries over the partition field, on the top level or
+    in `must` / `filter` clauses of a bool query, constrain partitions.
+
+    :param payload_filter: Payload filter of the search
+    :param partitioning: Partitioning configuration
+    :return: List of partition keys or None if all partitions are relevant
+    """
+    if payload_filter is None:
+        return None
+
+    def visit(query) -> Optional[set]:
+        if isinstance(query, TermQuery):
+            if (
+                query.term.field == partitioning.field
+                and not query.term.force_not_payload
+            ):
+                return {str(query.term.value)}
+        elif isinstance(query, TermsQuery):
+            if (
+                query.terms.field == partitioning.field
+                and not query.terms.force_not_payload
+            ):
+                return {str(value) for value in query.terms.values}
+        elif isinstance(query, BoolQuery):
+            keys = None
+            for subquery in (query.must or []) + (query.filter or []):
+                subquery_keys = visit(subquery)
+                if subquery_keys is not None:
+                    keys = (
+                        subquery_keys if keys is None else keys & subquery_keys
+                    )
+            return keys
+
+        return None
+
+    keys = visit(payload_filter.query)
+    return sorted(keys) if keys is not None else None
+
+
+def partition_keys_sql(partition_keys: Optional[List[str]]) -> str:
+    """
+    Render partition keys as a SQL array literal.
+
+    :param partition_keys: List of partition keys or None
+    :return: SQL expression of type TEXT[]
+    """
+    if partition_keys is None:
+        return "NULL::TEXT[]"
+
+    values = ", ".join(_quote(key) for key in partition_keys)
+    return f"ARRAY[{values}]::TEXT[]"
@@ -0,0 +1,320 @@
+import logging
+import threading
+import time
+from collections import Counter
+from enum import Enum
+from typing import List, Optional, Tuple
+
+import sqlalchemy
+from pydantic import BaseModel
+from sqlalchemy import text
+
+from embedding_studio.core.config import settings
+from embedding_studio.models.payload.models import (
+    BoolQuery,
+    ListHasAllQuery,
+    ListHasAnyQuery,
+    MatchPhraseQuery,
+    MatchQuery,
+    PayloadFilter,
+    RangeQuery,
+    TermQuery,
+    TermsQuery,
+    WildcardQuery,
+)
+from embedding_studio.models.sort_by.models import SortByOptions
+
+logger = logging.getLogger(__name__)
+
+
+class PayloadFieldUsageKind(str, Enum):
+    """
+    How a payload field is used by searches, defines which index serves it.
+
+    TERM: equality / IN over the field's text or numeric value
+    RANGE: numeric comparisons
+    FULLTEXT: match, match phrase and wildcard full text queries
+    LIST: `?|` / `?&` checks over a list field
+    SORT: ordering by the field
+    """
+
+    TERM = "term"
+    RANGE = "range"
+    FULLTEXT = "fulltext"
+    LIST = "list"
+    SORT = "sort"
+
+
+class PayloadValueType(str, Enum):
+    """Type a payload field value is compared as."""
+
+    TEXT = "text"
+    NUMERIC = "numeric"
+
+
+class PayloadFieldUsage(BaseModel):
+    """
+    A single kind of usage of a payload field.
+
+    :param field: Payload field name
+    :param kind: How the field is used
+    :param value_type: Type the field value is compared as
+    """
+
+    field: str
+    kind: PayloadFieldUsageKind
+    value_type: PayloadValueType = PayloadValueType.TEXT
+
+
+def _value_type(value) -> PayloadValueType:
+    # Mirrors the casts made by query_to_sql translators
+    if isinstance(value, (int, float)):
+        return PayloadValueType.NUMERIC
+    return PayloadValueType.TEXT
+
+
+def extract_payload_field_usages(
+    payload_filter: Optional[PayloadFilter] = None,
+    sort_by: Optional[SortByOptions] = None,
+) -> List[PayloadFieldUsage]:
+    """
+    List payload fields used by a search and how they're used.
+
+    Fields with `force_not_payload` are real table columns and are skipped.
+
+    :param payload_filter: Filter of the search
+    :param sort_by: Sorting options of the search
+    :return: List of field usages (may contain duplicates)
+    """
+    usages = []
+
+    def add(
+        query,
+        kind: PayloadFieldUsageKind,
+        value_type: PayloadValueType = PayloadValueType.TEXT,
+    ):
+        if not query.force_not_payload:
+            usages.append(
+                PayloadFieldUsage(
+                    field=query.field, kind=kind, value_type=value_type
+                )
+            )
+
+    def visit(query):
+        if isinstance(query, TermQuery):
+            add(
+                query.term,
+                PayloadFieldUsageKind.TERM,
+                _value_type(query.term.value),
+            )
+        elif isinstance(query, TermsQuery):
+            if query.terms.values:
+                add(
+                    query.terms,
+                    PayloadFieldUsageKind.TERM,
+                    _value_type(query.terms.values[0]),
+                )
+        elif isinstance(query, RangeQuery):
+            add(query, PayloadFieldUsageKind.RANGE, PayloadValueType.NUMERIC)
+        elif isinstance(query, MatchQuery):
+            add(query.match, PayloadFieldUsageKind.FULLTEXT)
+        elif isinstance(query, MatchPhraseQuery):
+            add(query.match_phrase, PayloadFieldUsageKind.FULLTEXT)
+        elif isinstance(query, WildcardQuery):
+            add(query.wildcard, PayloadFieldUsageKind.FULLTEXT)
+        elif isinstance(query, ListHasAnyQuery):
+            add(query.any, PayloadFieldUsageKind.LIST)
+        elif isinstance(query, ListHasAllQuery):
+            add(query.all, PayloadFieldUsageKind.LIST)
+        elif isinstance(query, BoolQuery):
+            for subqueries in (
+                query.must,
+                query.should,
+                query.filter,
+                query.must_not,
+            ):
+                for subquery in subqueries or []:
+                    visit(subquery)
+
+    if payload_filter is not None:
+        visit(payload_filter.query)
+
+    if sort_by is not None and not sort_by.force_not_payload:
+        usages.append(
+            PayloadFieldUsage(
+                field=sort_by.field, kind=PayloadFieldUsageKind.SORT
+            )
+        )
+
+    return usages
+
+
+class PayloadUsageRecorder:
+    """
+    Records payload fields used by searches into the `payload_field_usage`
+    table, which is read by the payload index advisor.
+
+    Usages are counted in memory and flushed in a single statement once
+    enough of them are collected or enough time has passed, so searches
+    don't pay for a write each.
+
+    :param pg_database: SQLAlchemy engine for PostgreSQL database connection
+    :param flush_size: Number of recorded usages that triggers a flush
+    :param flush_interval: Max seconds between flushes
+    """
+
+    TABLE_NAME = "payload_field_usage"
+
+    def __init__(
+        self,
+        pg_database: sqlalchemy.Engine,
+        flush_size: int = settings.PAYLOAD_USAGE_FLUSH_SIZE,
+        flush_interval: float = settings.PAYLOAD_USAGE_FLUSH_INTERVAL,
+    ):
+        self._pg_database = pg_database
+        self._flush_size = int(flush_size)
+        self._flush_interval = float(flush_interval)
+        self._lock = threading.Lock()
+        self._counter: Counter = Counter()
+        self._recorded = 0
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def create_table_statement(cls):
+        """
+        Generate a SQL statement creating the usage table.
+
+        :return: SQLAlchemy text statement
+        """
+        return text(
+            f"""
+CREATE TABLE IF NOT EXISTS {cls.TABLE_NAME} (
+    collection_id VARCHAR(128) NOT NULL,
+    field         TEXT         NOT NULL,
+    kind          VARCHAR(16)  NOT NULL,
+    value_type    VARCHAR(16)  NOT NULL,
+    hits          BIGINT       NOT NULL DEFAULT 0,
+    last_used_at  TIMESTAMPTZ  NOT NULL DEFAULT now(),
+    PRIMARY KEY (collection_id, field, kind, value_type)
+)"""
+        )
+
+    def record(
+        self,
+        collection_id: str,
+        payload_filter: Optional[PayloadFilter] = None,
+        sort_by: Optional[SortByOptions] = None,
+    ):
+        """
+        Record payload fields used by a search.
+
+        :param collection_id: ID of the searched collection
+        :param payload_filter: Filter of the search
+        :param sort_by: Sorting options of the search
+        """
+        usages = extract_payload_field_usages(payload_filter, sort_by)
+        if not usages:
+            return
+
+        with self._lock:
+            for usage in usages:
+                self._counter[
+                    (
+                        collection_id,
+                        usage.field,
+                        usage.kind.value,
+                        usage.value_type.value,
+                    )
+                ] += 1
+            self._recorded += len(usages)
+            should_flush = (
+                self._recorded >= self._flush_size
+                or time.monotonic() - self._last_flush >= self._flush_interval
+            )
+
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Write counted usages into the usage table."""
+        with self._lock:
+            counter, self._counter = self._counter, Counter()
+            self._recorded = 0
+            self._last_flush = time.monotonic()
+
+        if not counter:
+            return
+
+        rows = [
+            dict(
+                collection_id=key[0],
+                field=key[1],
+                kind=key[2],
+                value_type=key[3],
+                hits=hits,
+            )
+            for key, hits in counter.items()
+        ]
+        try:
+            with self._pg_database.begin() as connection:
+                connection.execute(
+                    text(
+                        f"""
+INSERT INTO {self.TABLE_NAME} (collection_id, field, kind, value_type, hits)
+VALUES (:collection_id, :field, :kind, :value_type, :hits)
+ON CONFLICT (collection_id, field, kind, value_type) DO UPDATE
+SET hits = {self.TABLE_NAME}.hits + EXCLUDED.hits, last_used_at = now()"""
+                    ),
+                    rows,
+                )
+        except Exception as e:
+            # Usage statistics are advisory, searches shouldn't fail on them
+            logger.warning(f"Failed to flush payload field usage: {e}")
+
+    def get_usages(
+        self, collection_id: str
+    ) -> List[Tuple[PayloadFieldUsage, int]]:
+        """
+        Get recorded usages of a collection, most used first.
+
+        :param collection_id: ID of the collection
+        :return: List of (usage, hits) pairs
+        """
+        self.flush()
+        with self._pg_database.connect() as connection:
+            rows = connection.execute(
+                text(
+                    f"SELECT field, kind, value_type, hits "
+                    f"FROM {self.TABLE_NAME} "
+                    f"WHERE collection_id = :collection_id "
+                    f"ORDER BY hits DESC"
+                ),
+                dict(collection_id=collection_id),
+            ).all()
+
+        return [
+            (
+                PayloadFieldUsage(
+                    field=row.field,
+                    kind=PayloadFieldUsageKind(row.kind),
+                    value_type=PayloadValueType(row.value_type),
+                ),
+                int(row.hits),
+            )
+            for row in rows
+        ]
+
+    def delete_usages(self, collection_id: str):
+        """
+        Delete recorded usages of a collection.
+
+        :param collection_id: ID of the collection
+        """
+        with self._pg_database.begin() as connection:
+            connection.execute(
+                text(
+                    f"DELETE FROM {self.TABLE_NAME} "
+                    f"WHERE collection_id = :collection_id"
+                ),
+                dict(collection_id=collection_id),
+            )
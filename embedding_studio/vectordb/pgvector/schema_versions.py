@@ -0,0 +1,133 @@
+import hashlib
+from typing import Iterable, Optional
+
+import sqlalchemy
+from sqlalchemy import text
+
+
+class SchemaVersions:
+    """
+    Versions of per-collection DDL (search functions, migrations) applied
+    to the database.
+
+    Every API and worker process refreshes collections on startup, so
+    the DDL is applied under a transaction-level advisory lock of
+    the collection and skipped when the stored version matches the current
+    one. A version is written in the same transaction as the DDL it
+    describes, so it can't be stored for a change that was rolled back.
+    """
+
+    TABLE_NAME = "es_schema_versions"
+
+    @classmethod
+    def create_table_statement(cls):
+        """
+        Generate a SQL statement creating the versions table.
+
+        :return: SQLAlchemy text statement
+        """
+        return text(
+            f"""
+CREATE TABLE IF NOT EXISTS {cls.TABLE_NAME} (
+    collection_id VARCHAR(128) NOT NULL,
+    name          VARCHAR(128) NOT NULL,
+    version       VARCHAR(64)  NOT NULL,
+    updated_at    TIMESTAMPTZ  NOT NULL DEFAULT now(),
+    PRIMARY KEY (collection_id, name)
+)"""
+        )
+
+    @staticmethod
+    def make_version(statements: Iterable[str]) -> str:
+        """
+        Make a version of DDL from its statements.
+
+        :param statements: SQL statements
+        :return: Hex digest of the statements
+        """
+        digest = hashlib.sha256()
+        for statement in statements:
+            digest.update(statement.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def lock(connection: sqlalchemy.Connection, collection_id: str):
+        """
+        Wait for the DDL lock of a collection, it's released when
+        the transaction of the connection ends.
+
+        :param connection: Connection with an open transaction
+        :param collection_id: ID of the collection
+        """
+        connection.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+            {"key": f"{SchemaVersions.TABLE_NAME}:{collection_id}"},
+        )
+
+    @classmethod
+    def get(
+        cls, connection: sqlalchemy.Connection, collection_id: str, name: str
+    ) -> Optional[str]:
+        """
+        Get a stored version.
+
+        :param connection: Database connection
+        :param collection_id: ID of the collection
+        :param name: Name of the versioned DDL
+        :return: Version or None if it was never applied
+        """
+        return connection.execute(
+            text(
+                f"SELECT version FROM {cls.TABLE_NAME} "
+                f"WHERE collection_id = :collection_id AND name = :name"
+            ),
+            {"collection_id": collection_id, "name": name},
+        ).scalar()
+
+    @classmethod
+    def set(
+        cls,
+        connection: sqlalchemy.Connection,
+        collection_id: str,
+        name: str,
+        version: str,
+    ):
+        """
+        Store a version of applied DDL.
+
+        :param connection: Connection with the transaction applying the DDL
+        :param collection_id: ID of the collection
+        :param name: Name of the versioned DDL
+        :param version: Version of the DDL
+        """
+        connection.execute(
+            text(
+                f"""
+INSERT INTO {cls.TABLE_NAME} (collection_id, name, version)
+VALUES (:collection_id, :name, :version)
+ON CONFLICT (collection_id, name)
+DO UPDATE SET version = EXCLUDED.version, updated_at = now()"""
+            ),
+            {
+                "collection_id": collection_id,
+                "name": name,
+                "version": version,
+            },
+        )
+
+    @classmethod
+    def delete(cls, connection: sqlalchemy.Connection, collection_id: str):
+        """
+        Forget versions of a deleted collection.
+
+        :param connection: Database connection
+        :param collection_id: ID of the collection
+        """
+        connection.execute(
+            text(
+                f"DELETE FROM {cls.TABLE_NAME} "
+                f"WHERE collection_id = :collection_id"
+            ),
+            {"collection_id": collection_id},
+        )
@@ -0,0 +1,178 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Optional, Tuple
+
+from embedding_studio.core.config import settings
+from embedding_studio.models.payload.models import PayloadFilter
+from embedding_studio.vectordb.count_cache import CountCache
+
+logger = logging.getLogger(__name__)
+
+
+class SearchStrategy(str, Enum):
+    """
+    Execution strategy of a filtered vector search.
+
+    EXACT: apply the payload filter first and compute distances for every
+    filtered vector (used when the filtered set is small).
+    HNSW: walk the HNSW index and post-filter candidates, relying on
+    iterative index scans to keep the result filled (used when the filtered
+    set is large).
+    """
+
+    EXACT = "exact"
+    HNSW = "hnsw"
+
+
+def parse_estimated_rows(explain_result: Any) -> Optional[int]:
+    """
+    Extract the planner's row estimate from `EXPLAIN (FORMAT JSON)` output.
+
+    :param explain_result: Scalar value returned by the EXPLAIN statement
+    :return: Estimated number of rows or None if the plan can't be parsed
+    """
+    try:
+        plan = (
+            json.loads(explain_result)
+            if isinstance(explain_result, str)
+            else explain_result
+        )
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        logger.warning(f"Failed to parse planner estimate: {e}")
+        return None
+
+
+def choose_search_strategy(
+    estimated_count: Optional[int],
+    exact_search_max_rows: int = settings.PGVECTOR_EXACT_SEARCH_MAX_ROWS,
+) -> SearchStrategy:
+    """
+    Choose a filtered search strategy from the estimated filtered set size.
+
+    A small filtered set is scanned exactly: it is cheap and guarantees the
+    correct top-k. A large one goes through the HNSW index, since post-filtering
+    only drops a small share of candidates.
+
+    :param estimated_count: Estimated number of objects passing the filter
+    :param exact_search_max_rows: Max filtered set size to be scanned exactly
+    :return: Chosen search strategy
+    """
+    if (
+        estimated_count is not None
+        and estimated_count <= exact_search_max_rows
+    ):
+        return SearchStrategy.EXACT
+
+    return SearchStrategy.HNSW
+
+
+class SearchStrategyCache:
+    """
+    In-process TTL cache of search strategies chosen per collection and
+    payload filter, so repeated filters don't run EXPLAIN on every search.
+
+    Strategies are keyed by the normalized payload filter, including its
+    values, since they drive the filtered set size, and by whether objects
+    of a user are searched too. Writing into a collection invalidates its
+    strategies, writes made by other processes are seen once the TTL expires.
+
+    :param ttl: Time to live of a cached strategy in seconds
+    :param max_size: Max number of cached strategies, the oldest are evicted
+    """
+
+    def __init__(
+        self,
+        ttl: float = settings.SEARCH_STRATEGY_CACHE_TTL,
+        max_size: int = settings.SEARCH_STRATEGY_CACHE_MAX_SIZE,
+    ):
+        self._ttl = float(ttl)
+        self._max_size = int(max_size)
+        self._lock = threading.Lock()
+        # key -> (expiration time, strategy)
+        self._strategies: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def _key(
+        collection_id: str,
+        payload_filter: Optional[PayloadFilter],
+        user_id: Optional[str],
+    ) -> Tuple[str, str, bool]:
+        return (
+            collection_id,
+            CountCache.normalize_filter(payload_filter),
+            user_id is not None,
+        )
+
+    def get(
+        self,
+        collection_id: str,
+        payload_filter: Optional[PayloadFilter],
+        user_id: Optional[str] = None,
+    ) -> Optional[SearchStrategy]:
+        """
+        Get a cached strategy if it is not expired.
+
+        :param collection_id: ID of the collection
+        :param payload_filter: Filter the strategy was chosen for
+        :param user_id: User the strategy was chosen for
+        :return: Cached strategy or None
+        """
+        if self._ttl <= 0:
+            return None
+
+        key = self._key(collection_id, payload_filter, user_id)
+        with self._lock:
+            cached = self._strategies.get(key)
+            if cached is None:
+                return None
+
+            expires_at, search_strategy = cached
+            if expires_at < time.monotonic():
+                del self._strategies[key]
+                return None
+
+            self._strategies.move_to_end(key)
+            return search_strategy
+
+    def put(
+        self,
+        collection_id: str,
+        payload_filter: Optional[PayloadFilter],
+        user_id: Optional[str],
+        search_strategy: SearchStrategy,
+    ):
+        """
+        Cache a strategy.
+
+        :param collection_id: ID of the collection
+        :param payload_filter: Filter the strategy was chosen for
+        :param user_id: User the strategy was chosen for
+        :param search_strategy: Chosen strategy
+        """
+        if self._ttl <= 0:
+            return
+
+        key = self._key(collection_id, payload_filter, user_id)
+        with self._lock:
+            self._strategies[key] = (
+                time.monotonic() + self._ttl,
+                search_strategy,
+            )
+            self._strategies.move_to_end(key)
+            while len(self._strategies) > self._max_size:
+                self._strategies.popitem(last=False)
+
+    def invalidate(self, collection_id: str):
+        """
+        Drop all cached strategies of a collection.
+
+        :param collection_id: ID of the collection
+        """
+        with self._lock:
+            for key in [k for k in self._strategies if k[0] == collection_id]:
+                del self._strategies[key]
@@ -1,3 +1,4 @@
+import logging
 from typing import List, Optional
 
 import pymongo
@@ -12,6 +13,8 @@ from embedding_studio.models.embeddings.collections import (
 from embedding_studio.models.embeddings.models import EmbeddingModelInfo
 from embedding_studio.vectordb.collection import Collection, QueryCollection
 from embedding_studio.vectordb.collection_info_cache import CollectionInfoCache
+from embedding_studio.vectordb.collection_versions import collection_versions
+from embedding_studio.vectordb.count_cache import CountCache
 from embedding_studio.vectordb.exceptions import (
     CollectionNotFoundError,
     CreateCollectionConflictError,
@@ -35,8 +38,18 @@ from embedding_studio.vectordb.pgvector.functions.simple_similarity import (
     generate_simple_vector_search_similarity_ordered_function,
     generate_simple_vector_search_similarity_ordered_no_vectors_function,
 )
+from embedding_studio.vectordb.pgvector.partitioning import is_list_partitioned
+from embedding_studio.vectordb.pgvector.payload_usage import (
+    PayloadUsageRecorder,
+)
+from embedding_studio.vectordb.pgvector.schema_versions import SchemaVersions
+from embedding_studio.vectordb.pgvector.search_strategy import (
+    SearchStrategyCache,
+)
 from embedding_studio.vectordb.vectordb import VectorDb
 
+logger = logging.getLogger(__name__)
+
 
 class PgvectorDb(VectorDb):
     """
@@ -46,6 +59,9 @@ class PgvectorDb(VectorDb):
     extension for efficient vector similarity search and storage.
     """
 
+    _PERSONALIZED_PARTS_MIGRATION = "MovePersonalizedPartsMigration"
+    _SEARCH_FUNCTIONS = "search_functions"
+
     def __init__(
         self,
         pg_database: sqlalchemy.Engine,
@@ -70,7 +86,11 @@ class PgvectorDb(VectorDb):
             mongo_database=embeddings_mongo_database,
             db_id=db_id,
         )
+        self._count_cache = CountCache()
+        self._strategy_cache = SearchStrategyCache()
+        self._usage_recorder = PayloadUsageRecorder(pg_database)
         self._init_pgvector()
+        self._refresh_search_functions()
 
     def _init_pgvector(self):
         """
@@ -82,6 +102,108 @@ class PgvectorDb(VectorDb):
             connection.execute(
                 sqlalchemy.text("CREATE EXTENSION IF NOT EXISTS vector")
             )
+            connection.execute(PayloadUsageRecorder.create_table_statement())
+            connection.execute(SchemaVersions.create_table_statement())
+
+    def _refresh_search_functions(self):
+        """
+        Recreate SQL search functions of existing collections.
+
+        Keeps functions and tables of collections created by previous versions
+        in line with the statements generated by the current code. Personalized
+        parts stored among shared parts are moved to their own table once.
+
+        Each collection is refreshed under its DDL lock, so concurrently
+        starting processes don't replace the same functions, and a process
+        finding the current version of functions stored skips them.
+        """
+        for collection_info in self._collection_info_cache.list_collections():
+            (
+                db_object_model,
+                db_object_part_model,
+                db_personalized_part_model,
+            ) = make_db_model(collection_info)
+
+            with self._pg_database.begin() as connection:
+                SchemaVersions.lock(connection, collection_info.collection_id)
+                # Within the locked transaction, not on another connection
+                db_personalized_part_model.create_table(connection)
+
+                self._move_personalized_parts(
+                    connection,
+                    collection_info,
+                    db_object_part_model,
+                    db_personalized_part_model,
+                )
+                self._create_search_functions(
+                    collection_info.embedding_model, connection
+                )
+
+            # The migration marker above is authoritative, this flag only
+            # mirrors it in the collection metadata
+            if (
+                self._PERSONALIZED_PARTS_MIGRATION
+                not in collection_info.applied_optimizations
+            ):
+                collection_info.applied_optimizations.append(
+                    self._PERSONALIZED_PARTS_MIGRATION
+                )
+                self.save_collection_info(collection_info)
+
+        query_collections = (
+            self._collection_info_cache.list_query_collections()
+        )
+        for collection_info in query_collections:
+            _, _, db_personalized_part_model = make_db_model(collection_info)
+            db_personalized_part_model.create_table(self._pg_database)
+
+    def _move_personalized_parts(
+        self,
+        connection: sqlalchemy.Connection,
+        collection_info: CollectionInfo,
+        db_object_part_model,
+        db_personalized_part_model,
+    ):
+        """
+        Move personalized parts stored among shared parts to their own table,
+        once per collection.
+
+        The migration marker is stored in the same transaction as the moved
+        rows, so the migration is either applied and marked or neither.
+        The caller must hold the DDL lock of the collection.
+
+        :param connection: Connection with an open transaction
+        :param collection_info: Information of the migrated collection
+        :param db_object_part_model: DbObjectPart class of the collection
+        :param db_personalized_part_model: DbPersonalizedObjectPart class of the collection
+        """
+        if (
+            self._PERSONALIZED_PARTS_MIGRATION
+            in collection_info.applied_optimizations
+            or SchemaVersions.get(
+                connection,
+                collection_info.collection_id,
+                self._PERSONALIZED_PARTS_MIGRATION,
+            )
+            is not None
+        ):
+            return
+
+        moved = connection.execute(
+            db_personalized_part_model.move_from_shared_parts_statement(
+                db_object_part_model
+            )
+        ).rowcount
+        SchemaVersions.set(
+            connection,
+            collection_info.collection_id,
+            self._PERSONALIZED_PARTS_MIGRATION,
+            "1",
+        )
+        logger.info(
+            f"Moved {moved} personalized parts of collection "
+            f"{collection_info.collection_id} to their own table"
+        )
 
     def update_info(self):
         """
@@ -121,6 +243,10 @@ class PgvectorDb(VectorDb):
             pg_database=self._pg_database,
             collection_id=embedding_model_id,
             collection_info_cache=self._collection_info_cache,
+            count_cache=self._count_cache,
+            usage_recorder=self._usage_recorder,
+            versions=collection_versions,
+            strategy_cache=self._strategy_cache,
         )
 
     def get_query_collection(
@@ -137,6 +263,10 @@ class PgvectorDb(VectorDb):
             pg_database=self._pg_database,
             collection_id=self.get_query_collection_id(embedding_model_id),
             collection_info_cache=self._collection_info_cache,
+            count_cache=self._count_cache,
+            usage_recorder=self._usage_recorder,
+            versions=collection_versions,
+            strategy_cache=self._strategy_cache,
         )
 
     def get_blue_collection(self) -> Optional[Collection]:
@@ -195,6 +325,90 @@ class PgvectorDb(VectorDb):
         """
         self._collection_info_cache.update_query_collection(collection_info)
 
+    @staticmethod
+    def _search_functions_statements(
+        embedding_model: EmbeddingModelInfo,
+    ) -> List[str]:
+        """
+        Generate SQL statements creating functions for vector search.
+
+        :param embedding_model: The EmbeddingModelInfo object representing the model of a collection
+        :return: CREATE OR REPLACE FUNCTION statements
+        """
+        partition_by_list = is_list_partitioned(embedding_model.partitioning)
+        return [
+            generate_simple_vector_search_similarity_ordered_function(
+                embedding_model.id, metric_type=embedding_model.metric_type
+            ),
+            generate_simple_vector_search_similarity_ordered_no_vectors_function(
+                embedding_model.id, metric_type=embedding_model.metric_type
+            ),
+            generate_simple_vector_search_function(
+                embedding_model.id, metric_type=embedding_model.metric_type
+            ),
+            generate_simple_vector_search_no_vectors_function(
+                embedding_model.id, metric_type=embedding_model.metric_type
+            ),
+            generate_advanced_vector_search_similarity_ordered_function(
+                embedding_model.id,
+                metric_type=embedding_model.metric_type,
+                partition_by_list=partition_by_list,
+            ),
+            generate_advanced_vector_search_similarity_ordered_no_vectors_function(
+                embedding_model.id,
+                metric_type=embedding_model.metric_type,
+                partition_by_list=partition_by_list,
+            ),
+            generate_advanced_vector_search_function(
+                embedding_model.id,
+                metric_type=embedding_model.metric_type,
+                partition_by_list=partition_by_list,
+            ),
+            generate_advanced_vector_search_no_vectors_function(
+                embedding_model.id,
+                metric_type=embedding_model.metric_type,
+                partition_by_list=partition_by_list,
+            ),
+        ]
+
+    def _create_search_functions(
+        self,
+        embedding_model: EmbeddingModelInfo,
+        connection: sqlalchemy.Connection,
+        force: bool = False,
+    ):
+        """
+        Create or replace SQL functions for vector search operations.
+
+        Functions are skipped if their stored version matches the current
+        definitions. The caller must hold the DDL lock of the collection.
+
+        :param embedding_model: The EmbeddingModelInfo object representing the model of a collection
+        :param connection: Connection with an open transaction
+        :param force: Whether to recreate functions regardless of the stored version
+        """
+        statements = self._search_functions_statements(embedding_model)
+        version = SchemaVersions.make_version(statements)
+        if (
+            not force
+            and SchemaVersions.get(
+                connection, embedding_model.id, self._SEARCH_FUNCTIONS
+            )
+            == version
+        ):
+            return
+
+        for statement in statements:
+            connection.execute(text(statement))
+
+        SchemaVersions.set(
+            connection, embedding_model.id, self._SEARCH_FUNCTIONS, version
+        )
+        logger.info(
+            f"Search functions of collection {embedding_model.id} "
+            f"are updated to version {version[:12]}"
+        )
+
     # TODO: decided to think about potential functions merging later
     def _create_collection(
         self,
@@ -214,9 +428,14 @@ class PgvectorDb(VectorDb):
             collection_id=embedding_model.id,
             embedding_model=embedding_model,
         )
-        db_object_model, db_object_part_model = make_db_model(collection_info)
+        (
+            db_object_model,
+            db_object_part_model,
+            db_personalized_part_model,
+        ) = make_db_model(collection_info)
         db_object_model.create_table(self._pg_database)
         db_object_part_model.create_table(self._pg_database)
+        db_personalized_part_model.create_table(self._pg_database)
 
         db_object_part_model.hnsw_index().create(
             self._pg_database, checkfirst=True
@@ -228,70 +447,12 @@ class PgvectorDb(VectorDb):
             collection_info
         )
 
-        simple_vector_search_similarity_ordered_function = text(
-            generate_simple_vector_search_similarity_ordered_function(
-                embedding_model.id, metric_type=embedding_model.metric_type
-            )
-        )
-        simple_vector_search_similarity_ordered_no_vectors_function = text(
-            generate_simple_vector_search_similarity_ordered_no_vectors_function(
-                embedding_model.id, metric_type=embedding_model.metric_type
-            )
-        )
-
-        simple_vector_search_function = text(
-            generate_simple_vector_search_function(
-                embedding_model.id, metric_type=embedding_model.metric_type
-            )
-        )
-        simple_vector_search_no_vectors_function = text(
-            generate_simple_vector_search_no_vectors_function(
-                embedding_model.id, metric_type=embedding_model.metric_type
-            )
-        )
-
-        advanced_vector_search_similarity_ordered_function = text(
-            generate_advanced_vector_search_similarity_ordered_function(
-                embedding_model.id, metric_type=embedding_model.metric_type
-            )
-        )
-        advanced_vector_search_similarity_ordered_no_vectors_function = text(
-            generate_advanced_vector_search_similarity_ordered_no_vectors_function(
-                embedding_model.id, metric_type=embedding_model.metric_type
-            )
-        )
-
-        advanced_vector_search_function = text(
-            generate_advanced_vector_search_function(
-                embedding_model.id, metric_type=embedding_model.metric_type
-            )
-        )
-        advanced_vector_search_no_vectors_function = text(
-            generate_advanced_vector_search_no_vectors_function(
-                embedding_model.id, metric_type=embedding_model.metric_type
-            )
-        )
-
         with self._pg_database.begin() as connection:
-            connection.execute(
-                simple_vector_search_similarity_ordered_function
+            SchemaVersions.lock(connection, collection_info.collection_id)
+            # Functions of a deleted collection with the same ID may remain
+            self._create_search_functions(
+                embedding_model, connection, force=True
             )
-            connection.execute(
-                simple_vector_search_similarity_ordered_no_vectors_function
-            )
-
-            connection.execute(simple_vector_search_function)
-            connection.execute(simple_vector_search_no_vectors_function)
-
-            connection.execute(
-                advanced_vector_search_similarity_ordered_function
-            )
-            connection.execute(
-                advanced_vector_search_similarity_ordered_no_vectors_function
-            )
-
-            connection.execute(advanced_vector_search_function)
-            connection.execute(advanced_vector_search_no_vectors_function)
 
         if created_collection_info.embedding_model != embedding_model:
             raise CreateCollectionConflictError(
@@ -317,9 +478,14 @@ class PgvectorDb(VectorDb):
             collection_id=self.get_query_collection_id(embedding_model.id),
             embedding_model=embedding_model,
         )
-        db_object_model, db_object_part_model = make_db_model(collection_info)
+        (
+            db_object_model,
+            db_object_part_model,
+            db_personalized_part_model,
+        ) = make_db_model(collection_info)
         db_object_model.create_table(self._pg_database)
         db_object_part_model.create_table(self._pg_database)
+        db_personalized_part_model.create_table(self._pg_database)
 
         # TODO: protect from race condition
         # TODO: protect from inconsistent state (after crash at this point)
@@ -373,9 +539,19 @@ class PgvectorDb(VectorDb):
         if col_info.work_state == CollectionWorkState.BLUE:
             raise DeleteBlueCollectionError()
 
-        db_object_model, db_object_part_model = make_db_model(col_info)
+        (
+            db_object_model,
+            db_object_part_model,
+            db_personalized_part_model,
+        ) = make_db_model(col_info)
+        db_personalized_part_model.__table__.drop(
+            self._pg_database, checkfirst=True
+        )
         db_object_part_model.__table__.drop(self._pg_database, checkfirst=True)
         db_object_model.__table__.drop(self._pg_database, checkfirst=True)
+        self._usage_recorder.delete_usages(embedding_model_id)
+        with self._pg_database.begin() as connection:
+            SchemaVersions.delete(connection, col_info.collection_id)
 
         # TODO: protect from inconsistent state (after crash at this point)
         self._collection_info_cache.delete_collection(embedding_model_id)
@@ -398,7 +574,14 @@ class PgvectorDb(VectorDb):
         if col_info.work_state == CollectionWorkState.BLUE:
             raise DeleteBlueCollectionError()
 
-        db_object_model, db_object_part_model = make_db_model(col_info)
+        (
+            db_object_model,
+            db_object_part_model,
+            db_personalized_part_model,
+        ) = make_db_model(col_info)
+        db_personalized_part_model.__table__.drop(
+            self._pg_database, checkfirst=True
+        )
         db_object_part_model.__table__.drop(self._pg_database, checkfirst=True)
         db_object_model.__table__.drop(self._pg_database, checkfirst=True)
 
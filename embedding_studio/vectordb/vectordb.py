@@ -90,7 +90,9 @@ class VectorDb(ABC):
                 collection = self.get_collection(
                     collection_info.embedding_model.id
                 )
-                if (
+                if optimization.repeatable:
+                    optimization(collection)
+                elif (
                     optimization.name
                     not in collection_info.applied_optimizations
                 ):
@@ -114,7 +116,9 @@ class VectorDb(ABC):
                 collection = self.get_query_collection(
                     collection_info.embedding_model.id
                 )
-                if (
+                if optimization.repeatable:
+                    optimization(collection)
+                elif (
                     optimization.name
                     not in collection_info.applied_optimizations
                 ):
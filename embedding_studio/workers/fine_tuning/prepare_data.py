@@ -8,6 +8,9 @@ from embedding_studio.clickstream_storage.input_with_items import (
     FineTuningInputWithItems,
 )
 from embedding_studio.clickstream_storage.query_retriever import QueryRetriever
+from embedding_studio.data_storage.loaders.cached_data_loader import (
+    with_items_cache,
+)
 from embedding_studio.data_storage.loaders.data_loader import DataLoader
 from embedding_studio.data_storage.loaders.downloaded_item import (
     DownloadedItem,
@@ -60,7 +63,10 @@ def prepare_data(
 
     logger.info("Download files and prepare DataDict of ItemStorage values")
     files_to_load: List[ItemMeta] = list(files_to_load)
-    downloaded: List[DownloadedItem] = loader.load(files_to_load)
+    # Items of previous iterations are read from the items cache if enabled
+    downloaded: List[DownloadedItem] = with_items_cache(loader).load(
+        files_to_load
+    )
     if len(downloaded) == 0:
         raise ValueError("No data was downloaded.")
 
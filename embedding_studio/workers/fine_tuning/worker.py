@@ -74,7 +74,9 @@ def fine_tuning_worker(task_id: str):
             context.fine_tuning_task.update(obj=task)
 
         # TODO: add config with parameters
-        clickstream = context.clickstream_dao.get_batch_sessions(task.batch_id)
+        clickstream = list(
+            context.clickstream_dao.iter_batch_sessions(task.batch_id)
+        )
         if not clickstream:
             task.status = TaskStatus.refused
             context.fine_tuning_task.update(obj=task)
@@ -2,12 +2,14 @@ import logging
 
 import dramatiq
 
+from embedding_studio.context.app_context import context
 from embedding_studio.core.config import settings
 from embedding_studio.db.redis import redis_broker
 from embedding_studio.utils.dramatiq_middlewares import (
     ActionsOnStartMiddleware,
 )
 from embedding_studio.utils.initializer_actions import init_nltk
+from embedding_studio.utils.task_events import task_events
 from embedding_studio.workers.inference.utils.deletion import handle_deletion
 from embedding_studio.workers.inference.utils.deployment import (
     handle_deployment,
@@ -29,7 +31,13 @@ redis_broker.add_middleware(OnStartMiddleware())
     time_limit=settings.INFERENCE_WORKER_TIME_LIMIT,
 )
 def model_deployment_worker(task_id: str):
-    handle_deployment(task_id)
+    try:
+        handle_deployment(task_id)
+    finally:
+        task = context.model_deployment_task.get(id=task_id)
+        if task is not None and task.parent_id is not None:
+            # Wake the parent task (e.g. reindex) up
+            task_events.notify(task.parent_id, task_id)
 
 
 @dramatiq.actor(
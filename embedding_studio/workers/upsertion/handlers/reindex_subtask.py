@@ -4,9 +4,24 @@ import traceback
 from embedding_studio.context.app_context import context
 from embedding_studio.core.config import settings
 from embedding_studio.core.plugin import PluginManager
-from embedding_studio.models.items_handler import DataItem
+from embedding_studio.data_storage.loaders.cached_data_loader import (
+    with_items_cache,
+)
+from embedding_studio.data_storage.loaders.data_loader import DataLoader
+from embedding_studio.embeddings.data.preprocessors.preprocessor import (
+    ItemsDatasetDictPreprocessor,
+)
+from embedding_studio.embeddings.inference.triton.client import TritonClient
+from embedding_studio.embeddings.splitters.item_splitter import ItemSplitter
+from embedding_studio.models.items_handler import (
+    DataItem,
+    ItemProcessingFailureStage,
+)
 from embedding_studio.models.reindex import ReindexSubtaskInDb
 from embedding_studio.models.task import TaskStatus
+from embedding_studio.models.utils import create_failed_data_item
+from embedding_studio.utils.ranges_queue import reindex_ranges
+from embedding_studio.vectordb.collection import Collection
 from embedding_studio.workers.upsertion.utils.exceptions import (
     ReindexException,
 )
@@ -19,14 +34,62 @@ plugin_manager = PluginManager()
 plugin_manager.discover_plugins(directory=settings.ES_PLUGINS_PATH)
 
 
-def handle_reindex_subtask(task: ReindexSubtaskInDb):
+def reindex_range(
+    task: ReindexSubtaskInDb,
+    source_collection: Collection,
+    dest_collection: Collection,
+    data_loader: DataLoader,
+    items_splitter: ItemSplitter,
+    preprocessor: ItemsDatasetDictPreprocessor,
+    inference_client: TritonClient,
+):
     """
-    Handles the full reindex process for a given task for a batch of data items.
+    Reindex items of the range set in the task offset and limit.
     """
-    logger.info(
-        f"Starting reindex subprocess for task ID: {task.parent_id} [{task.offset}:{task.offset+task.limit}]"
+    objects_common_data_batch = (
+        source_collection.get_objects_common_data_batch(
+            task.limit, task.offset
+        )
+    )
+    items = [
+        DataItem(
+            object_id=info.object_id,
+            payload=info.payload,
+            item_info=info.storage_meta,
+        )
+        for info in objects_common_data_batch.objects_info
+    ]
+
+    task.items = items
+
+    if task.source.embedding_model_id == task.dest.embedding_model_id:
+        # Vectors of the same model can be copied without inference
+        dest_collection.upsert(
+            source_collection.find_by_ids([item.object_id for item in items])
+        )
+        task.skipped_count += len(items)
+        context.reindex_subtask.update(obj=task)
+        return
+
+    process_upsert(
+        task,
+        dest_collection,
+        data_loader,
+        items_splitter,
+        preprocessor,
+        inference_client,
+        context.reindex_subtask,
+        mark_as_done=False,
     )
 
+
+def handle_reindex_subtask(task: ReindexSubtaskInDb):
+    """
+    Handles the reindex process for a given task: claims ranges of the
+    parent task queue and reindexes them until there are no ranges left.
+    """
+    logger.info(f"Starting reindex subprocess for task ID: {task.parent_id}")
+
     # Update task status to processing
     task.status = TaskStatus.processing
     context.reindex_subtask.update(obj=task)
@@ -36,7 +99,7 @@ def handle_reindex_subtask(task: ReindexSubtaskInDb):
     )
     if source_iteration is None:
         task.status = TaskStatus.failed
-        context.reindex_task.update(obj=task)
+        context.reindex_subtask.update(obj=task)
         raise ReindexException(
             f"Fine tuning iteration with ID"
             f"[{task.source.embedding_model_id}] does not exist."
@@ -52,7 +115,7 @@ def handle_reindex_subtask(task: ReindexSubtaskInDb):
     )
     if dest_iteration is None:
         task.status = TaskStatus.failed
-        context.reindex_task.update(obj=task)
+        context.reindex_subtask.update(obj=task)
         raise ReindexException(
             f"Fine tuning iteration with ID"
             f"[{task.dest.embedding_model_id}] does not exist."
@@ -77,54 +140,72 @@ def handle_reindex_subtask(task: ReindexSubtaskInDb):
     dest_collection = context.vectordb.get_collection(
         dest_embedding_model_info.id
     )
-    if not source_collection:
+    if not dest_collection:
         logger.error(f"Dest collection is not found [task ID: {task.id}]")
         task.status = TaskStatus.failed
         context.reindex_subtask.update(obj=task)
         return
 
-    try:
-        objects_common_data_batch = (
-            source_collection.get_objects_common_data_batch(
-                task.limit, task.offset
+    data_loader = with_items_cache(dest_plugin.get_data_loader())
+    items_splitter = dest_plugin.get_items_splitter()
+    preprocessor = dest_plugin.get_items_preprocessor()
+    inference_client = dest_plugin.get_inference_client_factory().get_client(
+        task.dest.embedding_model_id
+    )
+
+    def process_range(offset: int, limit: int) -> int:
+        task.offset, task.limit = offset, limit
+        task.items = []
+        failed_items_count = len(task.failed_items)
+        logger.info(
+            f"Reindex range [{offset}:{offset+limit}] "
+            f"for task ID: {task.parent_id}"
+        )
+        try:
+            reindex_range(
+                task,
+                source_collection,
+                dest_collection,
+                data_loader,
+                items_splitter,
+                preprocessor,
+                inference_client,
             )
+        except Exception:
+            # The range is retried or marked failed as a whole
+            del task.failed_items[failed_items_count:]
+            raise
+
+        return len(task.items)
+
+    def on_range_failure(offset: int, limit: int, exception: Exception):
+        tb = "".join(traceback.format_exception(exception))
+        logger.error(
+            f"Can't reindex range [{offset}:{offset+limit}] "
+            f"[task ID: {task.id}]: {exception}"
         )
-        items = [
-            DataItem(
-                object_id=info.object_id,
-                payload=info.payload,
-                item_info=info.storage_meta,
+        for item in task.items:
+            task.failed_items.append(
+                create_failed_data_item(
+                    item, tb, ItemProcessingFailureStage.other
+                )
             )
-            for info in objects_common_data_batch.objects_info
-        ]
-
-        task.items = items
-
-    except Exception:
-        tb = traceback.format_exc()
-        logger.exception(f"Can't get uploading items [task ID: {task.id}]")
         task.status = TaskStatus.failed
         task.detail = tb[-1500:]
         context.reindex_subtask.update(obj=task)
-        return
 
-    data_loader = dest_plugin.get_data_loader()
-    items_splitter = dest_plugin.get_items_splitter()
-    preprocessor = dest_plugin.get_items_preprocessor()
-    inference_client = dest_plugin.get_inference_client_factory().get_client(
-        task.dest.embedding_model_id
-    )
+    if not reindex_ranges.run(
+        task.parent_id,
+        process_range,
+        on_range_failure,
+        heartbeat_interval=settings.REINDEX_RANGE_HEARTBEAT_TIME,
+        max_attempts=settings.REINDEX_RANGE_MAX_ATTEMPTS,
+    ):
+        return
 
-    process_upsert(
-        task,
-        dest_collection,
-        data_loader,
-        items_splitter,
-        preprocessor,
-        inference_client,
-        context.reindex_subtask,
-    )
+    task.status = TaskStatus.done
+    context.reindex_subtask.update(obj=task)
 
     logger.info(
-        f"Reindex subprocess for task ID: {task.parent_id} [{task.offset}:{task.offset+task.limit}] is finished."
+        f"Reindex subprocess for task ID: {task.parent_id} is finished."
     )
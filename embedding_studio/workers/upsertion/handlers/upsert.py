@@ -1,5 +1,8 @@
 from embedding_studio.context.app_context import context
 from embedding_studio.core.config import settings
+from embedding_studio.data_storage.loaders.cached_data_loader import (
+    with_items_cache,
+)
 from embedding_studio.models.task import TaskStatus
 from embedding_studio.models.upsert import UpsertionTaskInDb
 from embedding_studio.utils.plugin_utils import get_vectordb
@@ -44,7 +47,7 @@ def handle_upsert(task: UpsertionTaskInDb):
         task.embedding_model_id
     )
 
-    data_loader = plugin.get_data_loader()
+    data_loader = with_items_cache(plugin.get_data_loader())
     items_splitter = plugin.get_items_splitter()
     preprocessor = plugin.get_items_preprocessor()
     inference_client = plugin.get_inference_client_factory().get_client(
@@ -13,6 +13,7 @@ from embedding_studio.models.reindex import ReindexTaskInDb
 from embedding_studio.models.task import ModelParams, TaskStatus
 from embedding_studio.utils.dramatiq_task_handler import create_and_send_task
 from embedding_studio.utils.plugin_utils import get_vectordb
+from embedding_studio.utils.task_events import task_events
 from embedding_studio.workers.upsertion.utils.exceptions import (
     ReindexException,
 )
@@ -66,8 +67,10 @@ def initiate_model_deployment_and_wait(
                 > settings.REINDEX_INITIATE_MODEL_DEPLOYMENT_PENDING_TIME
             ):
                 raise TimeoutError("Deployment task is pending too long.")
-            time.sleep(
-                settings.REINDEX_INITIATE_MODEL_DEPLOYMENT_LOOP_WAIT_TIME
+            # The deployment worker signals when the task is finished
+            task_events.wait(
+                task.id,
+                timeout=settings.REINDEX_INITIATE_MODEL_DEPLOYMENT_LOOP_WAIT_TIME,
             )
         elif updated_task.status == TaskStatus.processing:
             if in_pending:
@@ -77,8 +80,9 @@ def initiate_model_deployment_and_wait(
                 attempt_end - start
             ).seconds > settings.INFERENCE_WORKER_TIME_LIMIT:
                 raise TimeoutError("Deployment task is processing too long.")
-            time.sleep(
-                settings.REINDEX_INITIATE_MODEL_DEPLOYMENT_LOOP_WAIT_TIME
+            task_events.wait(
+                task.id,
+                timeout=settings.REINDEX_INITIATE_MODEL_DEPLOYMENT_LOOP_WAIT_TIME,
             )
         elif updated_task.status in [TaskStatus.failed, TaskStatus.refused]:
             raise Exception(f"Deployment task failed: {updated_task.detail}")
@@ -1,7 +1,7 @@
 import logging
 import time
 import traceback
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from dramatiq import Actor
 
@@ -16,6 +16,8 @@ from embedding_studio.models.reindex import (
 )
 from embedding_studio.models.task import TaskStatus
 from embedding_studio.utils.dramatiq_task_handler import create_and_send_task
+from embedding_studio.utils.ranges_queue import reindex_ranges
+from embedding_studio.utils.task_events import task_events
 from embedding_studio.vectordb.collection import Collection
 
 logger = logging.getLogger(__name__)
@@ -30,60 +32,102 @@ def process_reindex(
 ):
     """
     Main loop for processing the reindex task.
+
+    The source collection is split into small ranges, which are put into
+    a queue. Subtasks claim ranges from the queue until it's empty, so
+    subtasks which are done with their ranges take the rest of work.
     """
     total = collection.get_total()
     batch_size = settings.REINDEX_BATCH_SIZE
-    batches_count = total // batch_size + 1
 
-    offsets = []
-    for i in range(batches_count):
-        start = min(i * batch_size, total)
-        end = min(start + batch_size, total)
+    ranges = [
+        (start, min(batch_size, total - start))
+        for start in range(0, total, batch_size)
+    ]
+    task.total = total
+    context.reindex_task.update(obj=task)
 
-        if start != end:
-            offsets.append(start)
+    reindex_ranges.fill(task.id, ranges)
+    started_at = time.monotonic()
 
-    max_tasks_count = settings.REINDEX_MAX_SUBTASKS_COUNT
+    max_tasks_count = int(settings.REINDEX_MAX_SUBTASKS_COUNT)
     processing_task_ids = []
-
-    while len(offsets) > 0:
+    # None - check statuses of all processing tasks
+    finished_task_ids = None
+    # Subtasks are killed by the time limit, a longer running one is dead
+    dead_timeout = int(settings.REINDEX_SUBWORKER_TIME_LIMIT) / 1000 + float(
+        settings.REINDEX_RANGE_LEASE_TIME
+    )
+    subtasks_started_at: Dict[str, float] = dict()
+    max_idle_failed_count = int(settings.REINDEX_MAX_IDLE_FAILED_SUBTASKS)
+    idle_failed_count = 0
+    done_ranges_count = 0
+
+    task_events.clear(task.id)
+    progress = reindex_ranges.progress(task.id)
+    while not progress.is_finished or len(processing_task_ids) > 0:
         # Check and update status of processing tasks
-        processing_task_ids = update_processing_tasks(
-            task, processing_task_ids
+        (
+            processing_task_ids,
+            done_count,
+            failed_count,
+        ) = update_processing_tasks(
+            task, processing_task_ids, finished_task_ids
+        )
+        processing_task_ids, dead_count = fail_dead_tasks(
+            processing_task_ids, subtasks_started_at, dead_timeout
+        )
+        failed_count += dead_count
+        max_tasks_count = adjust_subtasks_count(
+            max_tasks_count, done_count, failed_count
         )
 
-        # Create additional tasks if needed
+        progress = reindex_ranges.progress(task.id)
+        task.set_count(progress.done_items, time.monotonic() - started_at)
+        context.reindex_task.update(obj=task)
+
+        # Subtasks, which fail before claiming ranges, would be replaced
+        # forever: fail the task once they fail in a row
+        if progress.done > done_ranges_count:
+            done_ranges_count = progress.done
+            idle_failed_count = 0
+        idle_failed_count += failed_count
+        if idle_failed_count >= max_idle_failed_count:
+            fail_idle_task(task, idle_failed_count)
+            return
+
+        # Create additional tasks if there are ranges for them, leased ranges
+        # of crashed subtasks need a subtask to be claimed after expiry
+        free_ranges_count = progress.pending
+        if progress.leased > 0 and len(processing_task_ids) == 0:
+            free_ranges_count = max(free_ranges_count, 1)
+
         additional_tasks_count = min(
-            len(offsets), max_tasks_count - len(processing_task_ids)
+            free_ranges_count, max_tasks_count - len(processing_task_ids)
         )
         if additional_tasks_count > 0:
-            offsets = create_additional_tasks(
+            idle_failed_count += create_additional_tasks(
                 task,
-                offsets,
                 batch_size,
                 additional_tasks_count,
                 processing_task_ids,
                 reindex_subworker,
             )
+            now = time.monotonic()
+            for subtask_id in processing_task_ids:
+                subtasks_started_at.setdefault(str(subtask_id), now)
+
+        if len(processing_task_ids) > 0:
+            # Wake up once a subtask is finished, if events are missed
+            # (e.g. Redis is unavailable) all statuses are checked on timeout.
+            finished_task_ids = (
+                task_events.wait(
+                    task.id, timeout=settings.REINDEX_WORKER_LOOP_WAIT_TIME
+                )
+                or None
+            )
 
-        else:
-            time.sleep(
-                settings.REINDEX_WORKER_LOOP_WAIT_TIME
-            )  # Wait before next iteration
-
-    while len(processing_task_ids) > 0:
-        for reindex_subtask_id in processing_task_ids.copy():
-            reindex_subtask = context.reindex_subtask.get(reindex_subtask_id)
-
-            if reindex_subtask.status not in [
-                TaskStatus.processing,
-                TaskStatus.pending,
-            ]:
-                # We risk getting stuck in an infinite loop here.
-                # TODO: We may need to set some large timeout after which the task would be considered dead.
-                processing_task_ids.remove(reindex_subtask_id)
-
-        time.sleep(settings.REINDEX_WORKER_LOOP_WAIT_TIME)
+    reindex_ranges.clear(task.id)
 
     failed_count = 0
     if settings.REINDEX_WORKER_MAX_FAILED != -1:
@@ -117,14 +161,98 @@ def process_reindex(
     context.reindex_task.update(obj=task)
 
 
+def fail_idle_task(task: ReindexTaskInDb, failed_count: int):
+    """
+    Fail the reindex task, whose subtasks fail without reindexing ranges.
+    Subtasks, which are still running, find no ranges and finish.
+    """
+    detail = (
+        f"{failed_count} reindex subtasks failed in a row without "
+        f"reindexing a range"
+    )
+    logger.error(f"Task [{task.id}] is failed: {detail}")
+    reindex_ranges.clear(task.id)
+    task.status = TaskStatus.failed
+    task.detail = detail
+    context.reindex_task.update(obj=task)
+
+
+def fail_dead_tasks(
+    processing_task_ids: List[str],
+    started_at: Dict[str, float],
+    timeout: float,
+) -> Tuple[List[str], int]:
+    """
+    Mark processing tasks running longer than `timeout` seconds as failed.
+    Their workers are gone, so leases of their ranges expire and ranges
+    are claimed by other subtasks.
+    Returns list of alive tasks and count of dead ones.
+    """
+    now = time.monotonic()
+    alive_task_ids = []
+    dead_count = 0
+    for reindex_subtask_id in processing_task_ids:
+        if now - started_at.get(str(reindex_subtask_id), now) < timeout:
+            alive_task_ids.append(reindex_subtask_id)
+            continue
+
+        logger.error(
+            f"Reindex subtask [{reindex_subtask_id}] is dead: it's running "
+            f"longer than {timeout} seconds"
+        )
+        reindex_subtask = context.reindex_subtask.get(reindex_subtask_id)
+        if reindex_subtask is not None:
+            reindex_subtask.status = TaskStatus.failed
+            reindex_subtask.detail = "Subtask is considered dead"
+            context.reindex_subtask.update(obj=reindex_subtask)
+        started_at.pop(str(reindex_subtask_id), None)
+        dead_count += 1
+
+    return alive_task_ids, dead_count
+
+
+def adjust_subtasks_count(
+    max_tasks_count: int, done_count: int, failed_count: int
+) -> int:
+    """
+    Adjust the number of concurrent subtasks: increase it by one while
+    subtasks succeed, halve it once they fail.
+    """
+    if failed_count > 0:
+        return max(max_tasks_count // 2, 1)
+
+    if done_count > 0:
+        return min(
+            max_tasks_count + 1, int(settings.REINDEX_MAX_SUBTASKS_LIMIT)
+        )
+
+    return max_tasks_count
+
+
 def update_processing_tasks(
-    task: ReindexTaskInDb, processing_task_ids: List[str]
-) -> List[str]:
+    task: ReindexTaskInDb,
+    processing_task_ids: List[str],
+    finished_task_ids: Optional[Iterable[str]] = None,
+) -> Tuple[List[str], int, int]:
     """
     Check the status of processing tasks and update the main task accordingly.
+    Only tasks from `finished_task_ids` are checked, if it's passed.
+    Returns list of not finished tasks, counts of done and failed tasks.
     """
+    if finished_task_ids is not None:
+        finished_task_ids = set(map(str, finished_task_ids))
+
     not_finished_processing_task_ids = []
+    done_count = 0
+    failed_count = 0
     for reindex_subtask_id in processing_task_ids:
+        if (
+            finished_task_ids is not None
+            and str(reindex_subtask_id) not in finished_task_ids
+        ):
+            not_finished_processing_task_ids.append(reindex_subtask_id)
+            continue
+
         reindex_subtask = context.reindex_subtask.get(reindex_subtask_id)
 
         if reindex_subtask.status in [
@@ -134,10 +262,13 @@ def update_processing_tasks(
             not_finished_processing_task_ids.append(reindex_subtask_id)
         elif reindex_subtask.status == TaskStatus.done:
             task.failed_items += reindex_subtask.failed_items
-            task.add_count(len(reindex_subtask.items))
+            task.skipped_count += reindex_subtask.skipped_count
+            done_count += 1
         elif reindex_subtask.status == TaskStatus.failed:
             task.failed_items += reindex_subtask.failed_items
+            failed_count += 1
         elif reindex_subtask.status == TaskStatus.refused:
+            failed_count += 1
             for item in reindex_subtask.items:
                 failed_item = FailedDataItem.model_validate(item.dump())
                 failed_item.detail = (
@@ -146,24 +277,23 @@ def update_processing_tasks(
                 task.failed_items.append(failed_item)
 
     context.reindex_task.update(obj=task)
-    return not_finished_processing_task_ids
+    return not_finished_processing_task_ids, done_count, failed_count
 
 
 def create_additional_tasks(
     task: ReindexTaskInDb,
-    offsets: List[int],
     limit: int,
     additional_tasks_count: int,
     processing_task_ids: List[str],
     reindex_subworker: Actor,
-) -> List[int]:
+):
     """
-    Create additional upsertion tasks as needed.
-    Returns list of offsets, which weren't used.
+    Create additional subtasks, which claim ranges of the task.
+    Returns count of subtasks, which failed to be sent.
     """
-    offsets_to_keep = offsets[additional_tasks_count:]
-    for i in range(additional_tasks_count):
-        new_reindex_subtask = create_subtask(task, limit, offsets[i])
+    failed_count = 0
+    for _ in range(additional_tasks_count):
+        new_reindex_subtask = create_subtask(task, limit)
 
         updated_new_reindex_subtask = create_and_send_task(
             reindex_subworker, new_reindex_subtask, context.reindex_subtask
@@ -171,14 +301,14 @@ def create_additional_tasks(
 
         if not updated_new_reindex_subtask:
             handle_failed_subtask(task, new_reindex_subtask)
+            failed_count += 1
         else:
             processing_task_ids.append(updated_new_reindex_subtask.id)
             task.children.append(updated_new_reindex_subtask.id)
 
         context.reindex_task.update(obj=task)
-        time.sleep(settings.REINDEX_WORKER_LOOP_WAIT_TIME)
 
-    return offsets_to_keep
+    return failed_count
 
 
 def create_subtask(
@@ -27,9 +27,10 @@ from embedding_studio.workers.upsertion.utils.exceptions import (
     UploadException,
 )
 from embedding_studio.workers.upsertion.utils.upsertion_stages import (
-    download_items,
+    download_and_split_items,
+    find_existing_objects,
     run_inference,
-    split_items,
+    update_unchanged_objects,
     upload_vectors,
 )
 
@@ -117,23 +118,41 @@ def upsert_batch(
         id_to_index[item.object_id] = i
 
     try:
-        logger.info(
-            f"Download items for {batch_index} batch [task ID: {task.id}]"
-        )
-        downloaded_items = download_items(batch, data_loader)
+        existing_objects = None
+        if settings.UPSERTION_SKIP_UNCHANGED_ITEMS:
+            existing_objects = find_existing_objects(batch, collection)
 
         logger.info(
-            f"Split items data for {batch_index} batch "
-            f"with {len(downloaded_items)} items in it [task ID: {task.id}]"
+            f"Download and split items for {batch_index} batch "
+            f"[task ID: {task.id}]"
         )
-        parts, object_to_parts, failed = split_items(
-            downloaded_items, items_splitter, preprocessor
+        (
+            downloaded_items,
+            parts,
+            object_to_parts,
+            failed,
+            unchanged,
+            download_failed,
+        ) = download_and_split_items(
+            batch, data_loader, items_splitter, preprocessor, existing_objects
         )
         logger.info(
             f"Split result for {batch_index} batch: {len(downloaded_items)} "
-            f"items -> {len(parts)} parts, [task ID: {task.id}]"
+            f"items -> {len(parts)} parts, {len(unchanged)} unchanged items "
+            f"are skipped [task ID: {task.id}]"
         )
 
+        if len(download_failed) > 0:
+            handle_failed_items(
+                failed_items=[
+                    (batch[id_to_index[item.object_id]], tb)
+                    for item, tb in download_failed
+                ],
+                task=task,
+                exception=DownloadException(),
+                task_crud=task_crud,
+            )
+
         if len(failed) > 0:
             handle_failed_items(
                 failed_items=[
@@ -145,22 +164,30 @@ def upsert_batch(
                 task_crud=task_crud,
             )
 
-        logger.info(
-            f"Run inference for {batch_index} batch with {len(parts)} "
-            f"parts in total [task ID: {task.id}]"
-        )
-        vectors = run_inference(parts, inference_client)
+        if len(unchanged) > 0:
+            update_unchanged_objects(unchanged, existing_objects, collection)
+            task.skipped_count += len(
+                {item.meta.object_id for item in unchanged}
+            )
+            task_crud.update(obj=task)
 
-        logger.info(
-            f"Upload vectors for {batch_index} batch "
-            f"[dims: {vectors.shape}] [task ID: {task.id}]"
-        )
-        upload_vectors(
-            items=downloaded_items,
-            vectors=vectors,
-            object_to_parts=object_to_parts,
-            collection=collection,
-        )
+        if len(parts) > 0:
+            logger.info(
+                f"Run inference for {batch_index} batch with {len(parts)} "
+                f"parts in total [task ID: {task.id}]"
+            )
+            vectors = run_inference(parts, inference_client)
+
+            logger.info(
+                f"Upload vectors for {batch_index} batch "
+                f"[dims: {vectors.shape}] [task ID: {task.id}]"
+            )
+            upload_vectors(
+                items=downloaded_items,
+                vectors=vectors,
+                object_to_parts=object_to_parts,
+                collection=collection,
+            )
 
         logger.info(f"Batch {batch_index} processing is finished.")
 
@@ -182,6 +209,7 @@ def process_upsert(
     preprocessor: ItemsDatasetDictPreprocessor,
     inference_client: TritonClient,
     task_crud: CRUDBase,
+    mark_as_done: bool = True,
 ):
     # Extract all object IDs from the task items
     [item.object_id for item in task.items]
@@ -213,5 +241,6 @@ def process_upsert(
                 task_crud=task_crud,
             )
 
-    task.status = TaskStatus.done
-    task_crud.update(obj=task)
+    if mark_as_done:
+        task.status = TaskStatus.done
+        task_crud.update(obj=task)
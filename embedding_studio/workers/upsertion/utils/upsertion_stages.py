@@ -1,7 +1,7 @@
 import logging
 import traceback
 from collections import defaultdict
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 
@@ -10,6 +10,10 @@ from embedding_studio.data_storage.loaders.data_loader import DataLoader
 from embedding_studio.data_storage.loaders.downloaded_item import (
     DownloadedItem,
 )
+from embedding_studio.data_storage.loaders.exceptions import (
+    SourcesLoadingException,
+)
+from embedding_studio.data_storage.loaders.item_meta import ItemMeta
 from embedding_studio.embeddings.data.preprocessors.preprocessor import (
     ItemsDatasetDictPreprocessor,
 )
@@ -17,6 +21,7 @@ from embedding_studio.embeddings.inference.triton.client import TritonClient
 from embedding_studio.embeddings.splitters.item_splitter import ItemSplitter
 from embedding_studio.models.embeddings.objects import Object, ObjectPart
 from embedding_studio.models.items_handler import DataItem
+from embedding_studio.utils.fingerprint import content_fingerprint
 from embedding_studio.utils.retry import retry_function
 from embedding_studio.vectordb.collection import Collection
 from embedding_studio.workers.upsertion.utils.exceptions import (
@@ -29,6 +34,18 @@ from embedding_studio.workers.upsertion.utils.exceptions import (
 logger = logging.getLogger(__name__)
 
 
+def _get_items_to_download(
+    items: List[DataItem], data_loader: DataLoader
+) -> List[ItemMeta]:
+    items_to_download = []
+    for item in items:
+        item_to_download = data_loader.item_meta_cls(**item.item_info)
+        item_to_download.object_id = item.object_id
+        item_to_download.payload = item.payload
+        items_to_download.append(item_to_download)
+    return items_to_download
+
+
 @retry_function(
     max_attempts=10,
     wait_time_seconds=30,
@@ -45,41 +62,93 @@ def download_items(
     :return: List of DownloadedItem instances.
     """
     try:
-        items_to_download = []
-        for item in items:
-            item_to_download = data_loader.item_meta_cls(**item.item_info)
-            item_to_download.object_id = item.object_id
-            item_to_download.payload = item.payload
-            items_to_download.append(item_to_download)
-
+        items_to_download = _get_items_to_download(items, data_loader)
         return data_loader.load_items(items_to_download)
 
     except Exception:
         raise DownloadException()
 
 
+def find_existing_objects(
+    items: List[DataItem], collection: Collection
+) -> Dict[str, Object]:
+    """
+    Find objects of the collection, which are going to be upserted again.
+
+    :param items: List of DataItem instances to upsert.
+    :param collection: Collection instance to which items are upserted.
+    :return: Dictionary mapping object IDs to stored objects.
+    """
+    try:
+        return {
+            obj.object_id: obj
+            for obj in collection.find_by_ids(
+                [item.object_id for item in items]
+            )
+        }
+    except Exception:
+        # Skipping unchanged items is an optimization, embed everything
+        logger.exception("Failed to find existing objects")
+        return dict()
+
+
+def _is_unchanged(
+    item: DownloadedItem, existing_objects: Optional[Dict[str, Object]]
+) -> bool:
+    if not existing_objects:
+        return False
+
+    existing_object = existing_objects.get(item.meta.object_id)
+    return (
+        existing_object is not None
+        and len(existing_object.parts) > 0
+        and existing_object.storage_meta.get("content_fingerprint")
+        == item.meta.content_fingerprint
+    )
+
+
 def split_items(
-    items: List[DownloadedItem],
+    items: Iterable[DownloadedItem],
     item_splitter: ItemSplitter,
     preprocessor: ItemsDatasetDictPreprocessor,
-) -> Tuple[List[Any], Dict[str, List[int]], List[Tuple[DownloadedItem, str]]]:
+    existing_objects: Optional[Dict[str, Object]] = None,
+) -> Tuple[
+    List[Any],
+    Dict[str, List[int]],
+    List[Tuple[DownloadedItem, str]],
+    List[DownloadedItem],
+]:
     """
     Split each item into parts using the specified ItemSplitter.
 
-    :param items: List of DownloadedItem instances to split.
+    A fingerprint of preprocessed content is stored in the item meta. Items
+    with the same fingerprint as their existing objects aren't split.
+
+    :param items: DownloadedItem instances to split, a list or a stream of them.
     :param item_splitter: ItemSplitter instance used for splitting the items.
     :param preprocessor: ItemsDatasetDictPreprocessor instance used for preprocessing the items.
+    :param existing_objects: Dictionary mapping object IDs to stored objects, None - split all items.
     :return: A tuple containing a list of parts,
              a dictionary mapping objects to their parts,
-             and a list of tuples with failed items and their traceback.
+             a list of tuples with failed items and their traceback,
+             and a list of unchanged items.
     """
     try:
         object_to_parts = defaultdict(list)
         parts = []
         failed = []
+        unchanged = []
         for item in items:
             try:
-                split_data = item_splitter(preprocessor(item.data))
+                preprocessed = preprocessor(item.data)
+                item.meta.content_fingerprint = content_fingerprint(
+                    preprocessed
+                )
+                if _is_unchanged(item, existing_objects):
+                    unchanged.append(item)
+                    continue
+
+                split_data = item_splitter(preprocessed)
                 object_to_parts[item.meta.object_id] = [
                     i + len(parts) for i in range(len(split_data))
                 ]
@@ -88,12 +157,132 @@ def split_items(
                 tb = traceback.format_exc()[-1500:]
                 failed.append((item, tb))
 
-        return parts, object_to_parts, failed
+        return parts, object_to_parts, failed, unchanged
+
+    except DownloadException:
+        raise
 
     except Exception:
         raise SplitException()
 
 
+@retry_function(
+    max_attempts=10,
+    wait_time_seconds=30,
+    attempt_exception_types=(DownloadException,),
+)
+def download_and_split_items(
+    items: List[DataItem],
+    data_loader: DataLoader,
+    item_splitter: ItemSplitter,
+    preprocessor: ItemsDatasetDictPreprocessor,
+    existing_objects: Optional[Dict[str, Object]] = None,
+) -> Tuple[
+    List[DownloadedItem],
+    List[Any],
+    Dict[str, List[int]],
+    List[Tuple[DownloadedItem, str]],
+    List[DownloadedItem],
+    List[Tuple[ItemMeta, str]],
+]:
+    """
+    Download items and split each one as soon as it's downloaded, so
+    splitting doesn't wait for the slowest items (e.g. of another source).
+
+    Items of sources that failed to load (SourcesLoadingException) are
+    returned as failed downloads, so the loaded items aren't downloaded
+    again by a retry of the whole batch.
+
+    :param items: List of DataItem instances to download.
+    :param data_loader: DataLoader instance used for downloading items.
+    :param item_splitter: ItemSplitter instance used for splitting the items.
+    :param preprocessor: ItemsDatasetDictPreprocessor instance used for preprocessing the items.
+    :param existing_objects: Dictionary mapping object IDs to stored objects, None - split all items.
+    :return: A tuple containing a list of downloaded and changed items,
+             a list of parts, a dictionary mapping objects to their parts,
+             a list of tuples with failed items and their traceback,
+             a list of unchanged items,
+             and a list of tuples with items failed to be downloaded and their traceback.
+    """
+    downloaded_items = []
+    download_failed = []
+
+    def stream_items():
+        try:
+            items_to_download = _get_items_to_download(items, data_loader)
+            for item in data_loader.iter_items(items_to_download):
+                downloaded_items.append(item)
+                yield item
+
+        except SourcesLoadingException as e:
+            tb = traceback.format_exc()[-1500:]
+            download_failed.extend((item, tb) for item in e.failed_items)
+
+        except Exception:
+            raise DownloadException()
+
+    parts, object_to_parts, failed, unchanged = split_items(
+        stream_items(), item_splitter, preprocessor, existing_objects
+    )
+    unchanged_ids = {id(item) for item in unchanged}
+    changed_items = [
+        item for item in downloaded_items if id(item) not in unchanged_ids
+    ]
+    return (
+        changed_items,
+        parts,
+        object_to_parts,
+        failed,
+        unchanged,
+        download_failed,
+    )
+
+
+@retry_function(
+    max_attempts=10,
+    wait_time_seconds=30,
+    attempt_exception_types=(UploadException,),
+)
+def update_unchanged_objects(
+    items: List[DownloadedItem],
+    existing_objects: Dict[str, Object],
+    collection: Collection,
+):
+    """
+    Update payload and storage meta of unchanged items, keeping their
+    stored vectors. Objects with the same payload and meta aren't touched.
+
+    :param items: List of unchanged DownloadedItem instances.
+    :param existing_objects: Dictionary mapping object IDs to stored objects.
+    :param collection: Collection instance to which items are upserted.
+    """
+    try:
+        objects = []
+        for item in items:
+            existing_object = existing_objects[item.meta.object_id]
+            storage_meta = item.meta.dict()
+            if (
+                existing_object.payload == item.meta.payload
+                and existing_object.storage_meta == storage_meta
+            ):
+                continue
+
+            objects.append(
+                Object(
+                    object_id=item.meta.object_id,
+                    parts=existing_object.parts,
+                    payload=item.meta.payload,
+                    storage_meta=storage_meta,
+                )
+            )
+
+        if objects:
+            collection.upsert(objects)
+
+    except Exception:
+        raise UploadException()
+
+
 @retry_function(
     max_attempts=10,
     wait_time_seconds=2,
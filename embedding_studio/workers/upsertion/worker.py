@@ -16,6 +16,7 @@ from embedding_studio.utils.dramatiq_middlewares import (
 )
 from embedding_studio.utils.dramatiq_task_handler import create_and_send_task
 from embedding_studio.utils.initializer_actions import init_nltk
+from embedding_studio.utils.task_events import task_events
 from embedding_studio.workers.inference.worker import (
     model_deletion_worker,
     model_deployment_worker,
@@ -184,7 +185,12 @@ def reindex_subworker(task_id: str):
     if not task:
         return
 
-    handle_reindex_subtask(task)
+    try:
+        handle_reindex_subtask(task)
+    finally:
+        # Wake the reindex task up, it checks the subtask status
+        task_events.notify(task.parent_id, task.id)
+
     gc.collect()
     return
 
@@ -4,6 +4,7 @@ from sqlalchemy import Engine, MetaData, Select, Table, func, select
 
 from embedding_studio.data_storage.loaders.sql.query_generator import (
     QueryGenerator,
+    ids_filter,
 )
 
 
@@ -43,7 +44,7 @@ class HugsearchCategoriesQueryGenerator(QueryGenerator):
                 ":",
                 self.table.c.category_value,
             ).label("synthetic_text"),
-        ).where(self.table.c.id.in_(row_ids))
+        ).where(ids_filter(self.table.c.id, row_ids))
 
     def one(self, row_id: str) -> Select:
         """
@@ -4,6 +4,7 @@ from sqlalchemy import Engine, MetaData, Select, Table, func, select
 
 from embedding_studio.data_storage.loaders.sql.query_generator import (
     QueryGenerator,
+    ids_filter,
 )
 
 
@@ -69,7 +70,7 @@ class HugsearchModelsQueryGenerator(QueryGenerator):
                 self.tag_table,
                 self.model_tag_link.c.tag_id == self.tag_table.c.id,
             )
-            .where(self.table.c.id.in_(row_ids))
+            .where(ids_filter(self.table.c.id, row_ids))
             .group_by(*coalesced_columns.values())
         )
 
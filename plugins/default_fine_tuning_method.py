@@ -30,6 +30,9 @@ from embedding_studio.embeddings.data.items.managers.clip import (
 from embedding_studio.embeddings.data.preprocessors.preprocessor import (
     ItemsDatasetDictPreprocessor,
 )
+from embedding_studio.embeddings.data.transforms.image.center_padded import (
+    resize_by_longest_and_pad_uint8_transform,
+)
 from embedding_studio.embeddings.data.utils.fields_normalizer import (
     DatasetFieldsNormalizer,
 )
@@ -55,6 +58,9 @@ from embedding_studio.experiments.experiments_tracker import ExperimentsManager
 from embedding_studio.experiments.finetuning_settings import FineTuningSettings
 from embedding_studio.experiments.initial_params.clip import INITIAL_PARAMS
 from embedding_studio.experiments.metrics_accumulator import MetricsAccumulator
+from embedding_studio.inference_management.triton.utils.image_input import (
+    ImageInputMode,
+)
 from embedding_studio.models.clickstream.sessions import SessionWithEvents
 from embedding_studio.models.embeddings.models import (
     MetricAggregationType,
@@ -185,7 +191,10 @@ class DefaultFineTuningMethod(FineTuningMethod):
             model_name=self.model_name,
             download_fn=lambda mn: SentenceTransformer(mn),
         )
-        model = TextToImageCLIPModel(model)
+        # Deployed vision model receives uint8 pixels and normalizes them
+        model = TextToImageCLIPModel(
+            model, items_input_mode=ImageInputMode.UINT8
+        )
         self.manager.upload_initial_model(model)
 
         # Free memory
@@ -228,6 +237,7 @@ class DefaultFineTuningMethod(FineTuningMethod):
                 plugin_name=self.meta.name,
                 transform=self.items_set_manager.preprocessor,
                 model_name=self.model_name,
+                uint8_transform=resize_by_longest_and_pad_uint8_transform(224),
             )
         return self.inference_client_factory
 
@@ -98,6 +98,9 @@ from embedding_studio.models.embeddings.models import (
 )
 from embedding_studio.models.plugin import FineTuningBuilder, PluginMeta
 from embedding_studio.vectordb.optimization import Optimization
+from embedding_studio.vectordb.pgvector.index_advisor import (
+    PayloadIndexAdvisorOptimization,
+)
 from embedding_studio.workers.fine_tuning.prepare_data import prepare_data
 
 
@@ -380,6 +383,10 @@ class HFDictTextFineTuningMethod(FineTuningMethod):
     def get_vectordb_optimizations(self) -> List[Optimization]:
         """
         Returns a list of vector DB optimizations to apply.
-        In this case: index ordering by similarity or freshness.
+        In this case: index ordering by similarity or freshness, plus
+        indexes for payload fields frequently used by searches.
         """
-        return [CreateOrderingIndexesOptimization()]
+        return [
+            CreateOrderingIndexesOptimization(),
+            PayloadIndexAdvisorOptimization(),
+        ]
@@ -0,0 +1,93 @@
+"""
+Measure AwsS3DataLoader download throughput against a local S3 stand-in.
+
+Starts a moto server (pip install "moto[server]"), uploads a number of
+objects and loads them with different download concurrency, e.g.:
+
+    python scripts/benchmark_s3_loader.py --items 2000 --size 65536
+
+To run against MinIO or another S3 compatible server, pass its endpoint
+with --endpoint-url instead, the bucket is created if it's missing.
+"""
+import argparse
+import os
+import time
+
+import boto3
+from botocore import UNSIGNED
+from botocore.client import Config
+
+BUCKET = "benchmark"
+
+
+def prepare_bucket(endpoint_url: str, items: int, size: int):
+    client = boto3.client(
+        "s3",
+        endpoint_url=endpoint_url,
+        config=Config(signature_version=UNSIGNED),
+    )
+    try:
+        client.create_bucket(Bucket=BUCKET)
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+
+    payload = os.urandom(size)
+    for index in range(items):
+        client.put_object(Bucket=BUCKET, Key=f"item_{index}", Body=payload)
+
+
+def measure(items: int, concurrency: int) -> float:
+    from embedding_studio.data_storage.loaders.cloud_storage.s3.item_meta import (
+        S3FileMeta,
+    )
+    from embedding_studio.data_storage.loaders.cloud_storage.s3.s3_loader import (
+        AwsS3DataLoader,
+    )
+
+    loader = AwsS3DataLoader(download_concurrency=concurrency)
+    files = [
+        S3FileMeta(bucket=BUCKET, file=f"item_{index}")
+        for index in range(items)
+    ]
+    started_at = time.perf_counter()
+    downloaded = loader.load_items(files)
+    elapsed = time.perf_counter() - started_at
+    assert len(downloaded) == items
+    return items / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=64 * 1024)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 8, 32, 64]
+    )
+    parser.add_argument("--endpoint-url", default=None)
+    args = parser.parse_args()
+
+    server = None
+    endpoint_url = args.endpoint_url
+    if endpoint_url is None:
+        from moto.server import ThreadedMotoServer
+
+        server = ThreadedMotoServer(port=5055)
+        server.start()
+        endpoint_url = "http://127.0.0.1:5055"
+
+    # Loader clients pick the endpoint up from the environment
+    os.environ["AWS_ENDPOINT_URL"] = endpoint_url
+    try:
+        prepare_bucket(endpoint_url, args.items, args.size)
+        for concurrency in args.concurrency:
+            items_per_second = measure(args.items, concurrency)
+            print(
+                f"concurrency={concurrency}: {items_per_second:.1f} items/sec"
+            )
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
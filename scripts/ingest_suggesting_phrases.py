@@ -0,0 +1,69 @@
+"""
+Load suggestion phrases from a file into the Redis suggester index.
+
+Each line is either a JSON object with SuggestingPhrase fields
+({"phrase": ..., "labels": [...], "domains": [...], "prob": ...})
+or a plain phrase, e.g.:
+
+    python scripts/ingest_suggesting_phrases.py phrases.jsonl --workers 4
+
+The file is streamed, so it's never loaded into memory at once.
+"""
+import argparse
+import json
+from typing import Iterator
+
+from embedding_studio.models.suggesting import SuggestingPhrase
+
+
+def read_phrases(path: str) -> Iterator[SuggestingPhrase]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            if line.startswith("{"):
+                yield SuggestingPhrase(**json.loads(line))
+            else:
+                yield SuggestingPhrase(phrase=line)
+
+
+def main():
+    from embedding_studio.core.config import settings
+    from embedding_studio.suggesting.redis.phrases_manager import (
+        RedisSuggestionPhraseManager,
+    )
+    from embedding_studio.suggesting.tokenizer import SuggestingTokenizer
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--redis-url", default=settings.REDIS_URL)
+    parser.add_argument(
+        "--index-name", default=settings.SUGGESTING_REDIS_COLLECTION
+    )
+    args = parser.parse_args()
+
+    manager = RedisSuggestionPhraseManager(
+        redis_url=args.redis_url,
+        tokenizer=SuggestingTokenizer(),
+        index_name=args.index_name,
+        max_chunks=int(settings.SUGGESTING_MAX_CHUNKS),
+    )
+    report = manager.bulk_add(
+        read_phrases(args.path),
+        batch_size=args.batch_size,
+        n_workers=args.workers,
+    )
+    print(
+        f"inserted={report.inserted} skipped={report.skipped} "
+        f"total={report.total} elapsed={report.elapsed_seconds:.1f}s "
+        f"rate={report.phrases_per_second:.0f} phrases/sec "
+        f"index_memory={report.index_memory_mb} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()